@@ -0,0 +1,31 @@
+"""007_narrative_cache
+
+Add narrative_cache table — content-hash cache of AI report narratives.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "narrative_cache",
+        sa.Column("prompt_hash", sa.String(64), primary_key=True),  # sha256 hex
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("narrative_cache")
@@ -0,0 +1,39 @@
+"""008_narrative_batches
+
+Add narrative_batches table — submitted Message Batches API jobs, so a
+restart resumes them instead of orphaning them.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "narrative_batches",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("batch_id", sa.String(64), nullable=False),
+        sa.Column("anthropic_batch_id", sa.String(100), nullable=False, unique=True),
+        sa.Column("jobs", postgresql.JSONB(), nullable=False),       # report_id → submission_id
+        sa.Column("requests", postgresql.JSONB(), nullable=False),   # in custom_id order
+        sa.Column("status", sa.String(20), nullable=False, server_default="submitted"),
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_narrative_batches_batch_id", "narrative_batches", ["batch_id"])
+    op.create_index("ix_narrative_batches_status", "narrative_batches", ["status"])
+
+
+def downgrade():
+    op.drop_index("ix_narrative_batches_status", "narrative_batches")
+    op.drop_index("ix_narrative_batches_batch_id", "narrative_batches")
+    op.drop_table("narrative_batches")
@@ -0,0 +1,24 @@
+"""008_report_timings
+
+Add reports.timings — per-stage timing/token summary of the report pipeline.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("reports", sa.Column("timings", postgresql.JSONB(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("reports", "timings")
@@ -3,9 +3,12 @@ Agent routes — ESG Copilot Multi-Agent System
 =============================================
 
 POST /agent/chat          Conversational coach (SustainabilityCoachAgent)
+POST /agent/chat/stream   Same, streamed as SSE text deltas
 POST /agent/analyze       Full orchestrated analysis pipeline
+POST /agent/analyze/stream  Same, streamed as SSE (deltas + tool-call progress)
 POST /agent/compliance    VSME compliance check only
 POST /agent/climate-risk  Climate risk assessment only
+POST /agent/climate-risk/sites  Site exposure (flood, cloudburst, storm surge, heat) for many sites
 POST /agent/benchmark     Peer benchmark only
 POST /agent/improve       Improvement action plan only
 POST /agent/roadmap       Q1-Q4 implementation roadmap only
@@ -17,9 +20,11 @@ import logging
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from app.core.deps import CurrentUser
+from app.core.sse import SSE_HEADERS, sse_from_events
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +61,18 @@ class ComplianceRequest(BaseModel):
     industry_code: str = "technology"
 
 
+class Site(BaseModel):
+    id: str | None = None            # caller's reference, echoed back
+    zipcode: str | None = None
+    city: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+class SiteRiskRequest(BaseModel):
+    sites: list[Site] = Field(max_length=10_000)
+
+
 class ClimateRiskRequest(BaseModel):
     industry_code: str
     country_code: str = "DK"
@@ -63,6 +80,11 @@ class ClimateRiskRequest(BaseModel):
     scope1_co2e: float = 0
     scope2_co2e: float = 0
     scope3_co2e: float = 0
+    zipcode: str | None = None
+    city: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    sites: list[Site] = []
 
 
 class BenchmarkRequest(BaseModel):
@@ -70,6 +92,12 @@ class BenchmarkRequest(BaseModel):
     esg_score_total: float
     total_co2e_tonnes: float = 0
     employee_count: int = 25
+    esg_score_e: float | None = None
+    esg_score_s: float | None = None
+    esg_score_g: float | None = None
+    scope1_co2e: float | None = None
+    scope2_co2e: float | None = None
+    revenue_eur: float | None = None
 
 
 class ImprovementRequest(BaseModel):
@@ -92,8 +120,9 @@ class RoadmapRequest(BaseModel):
 @router.post("/chat", response_model=ChatResponse)
 async def chat(body: ChatRequest, current_user: CurrentUser):
     """Conversational ESG coach — answers questions, explains concepts, motivates."""
+    from app.services.agents.registry import get_agent
     from app.services.agents.sustainability_coach import SustainabilityCoachAgent
-    agent = SustainabilityCoachAgent()
+    agent = get_agent(SustainabilityCoachAgent)
     result = await agent.safe_run({
         "message": body.message,
         "history": body.history,
@@ -104,6 +133,11 @@ async def chat(body: ChatRequest, current_user: CurrentUser):
     return ChatResponse(response=result.get("response", ""), ok=True)
 
 
+def _tenant_scope(user) -> str:
+    """Orchestrator memo / tool-result handle scope: the user's company, else the user."""
+    return f"company:{user.company_id}" if user.company_id else f"user:{user.id}"
+
+
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze(body: AnalyzeRequest, current_user: CurrentUser):
     """
@@ -111,8 +145,9 @@ async def analyze(body: AnalyzeRequest, current_user: CurrentUser):
     based on the user's message and available context.
     """
     from app.services.agents.orchestrator import AgentOrchestrator
+    from app.services.agents.registry import get_agent
     try:
-        orchestrator = AgentOrchestrator()
+        orchestrator = get_agent(AgentOrchestrator)
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
 
@@ -120,15 +155,73 @@ async def analyze(body: AnalyzeRequest, current_user: CurrentUser):
         "user_message": body.user_message,
         "context":      body.context,
         "history":      body.history,
+        "scope":        _tenant_scope(current_user),
+        "company_id":   str(current_user.company_id) if current_user.company_id else "",
     })
     return AnalyzeResponse(answer=result["answer"], trace=result.get("trace", []), ok=result.get("ok", True))
 
 
+# ── Streaming variants (SSE) ───────────────────────────────────────────────────
+
+@router.post("/chat/stream")
+async def chat_stream(body: ChatRequest, current_user: CurrentUser):
+    """
+    /chat as Server-Sent Events, so the answer renders while it is written.
+
+    Events: `delta` {text} … then `done` {response}; `error` {detail} on failure.
+    """
+    from app.services.agents.registry import get_agent
+    from app.services.agents.sustainability_coach import SustainabilityCoachAgent
+    try:
+        agent = get_agent(SustainabilityCoachAgent)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        parts: list[str] = []
+        async for text in agent.stream({
+            "message": body.message,
+            "history": body.history,
+            "context": body.context,
+        }):
+            parts.append(text)
+            yield "delta", {"text": text}
+        yield "done", {"response": "".join(parts)}
+
+    return StreamingResponse(sse_from_events(events()), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(body: AnalyzeRequest, current_user: CurrentUser):
+    """
+    /analyze as Server-Sent Events.
+
+    Events: `delta` {text}, `tool_call` {tool}, `tool_result` {tool, ok, elapsed_s},
+    then `done` {answer, trace, ok}; `error` {detail} on failure.
+    """
+    from app.services.agents.orchestrator import AgentOrchestrator
+    from app.services.agents.registry import get_agent
+    try:
+        orchestrator = get_agent(AgentOrchestrator)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    events = orchestrator.stream({
+        "user_message": body.user_message,
+        "context":      body.context,
+        "history":      body.history,
+        "scope":        _tenant_scope(current_user),
+        "company_id":   str(current_user.company_id) if current_user.company_id else "",
+    })
+    return StreamingResponse(sse_from_events(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/compliance")
 async def compliance_check(body: ComplianceRequest, current_user: CurrentUser):
     """VSME Basic Modul completeness check — returns missing required + recommended fields."""
     from app.services.agents.vsme_compliance import VSMEComplianceAgent
-    result = await VSMEComplianceAgent().safe_run({
+    from app.services.agents.registry import get_agent
+    result = await get_agent(VSMEComplianceAgent).safe_run({
         "submission_data": body.submission_data,
         "industry_code":   body.industry_code,
     })
@@ -141,17 +234,35 @@ async def compliance_check(body: ComplianceRequest, current_user: CurrentUser):
 async def climate_risk(body: ClimateRiskRequest, current_user: CurrentUser):
     """Physical + transition climate risk assessment for the company's industry."""
     from app.services.agents.climate_risk import ClimateRiskAgent
-    result = await ClimateRiskAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    result = await get_agent(ClimateRiskAgent).safe_run(body.model_dump())
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
 
 
+@router.post("/climate-risk/sites")
+async def climate_risk_sites(body: SiteRiskRequest, current_user: CurrentUser):
+    """
+    Physical exposure of many sites in one call (e.g. every site in a portfolio).
+    Results are in request order; `risk` is null for sites that can't be placed in Denmark.
+    """
+    from app.services.climate_grid import GRID_SOURCE, get_climate_grid
+    sites = [site.model_dump() for site in body.sites]
+    risks = get_climate_grid().batch_site_risk(sites)
+    return {
+        "source":  GRID_SOURCE,
+        "results": [{"id": site["id"], "risk": risk} for site, risk in zip(sites, risks)],
+    }
+
+
 @router.post("/benchmark")
 async def benchmark(body: BenchmarkRequest, current_user: CurrentUser):
     """Compare ESG score + CO2 intensity vs. Danish SME industry peers."""
     from app.services.agents.benchmark import BenchmarkAgent
-    result = await BenchmarkAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    company_id = str(current_user.company_id) if current_user.company_id else None
+    result = await get_agent(BenchmarkAgent).safe_run({**body.model_dump(), "company_id": company_id})
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
@@ -161,7 +272,8 @@ async def benchmark(body: BenchmarkRequest, current_user: CurrentUser):
 async def improve(body: ImprovementRequest, current_user: CurrentUser):
     """Generate SMART improvement action plan from ESG score gaps."""
     from app.services.agents.improvement import ImprovementAgent
-    result = await ImprovementAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    result = await get_agent(ImprovementAgent).safe_run(body.model_dump())
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
@@ -171,7 +283,8 @@ async def improve(body: ImprovementRequest, current_user: CurrentUser):
 async def roadmap(body: RoadmapRequest, current_user: CurrentUser):
     """Build a Q1–Q4 implementation roadmap from improvement actions."""
     from app.services.agents.roadmap import RoadmapAgent
-    result = await RoadmapAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    result = await get_agent(RoadmapAgent).safe_run(body.model_dump())
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
@@ -219,7 +332,8 @@ async def ghg_calculate(body: GHGRequest, current_user: CurrentUser):
     Uses DEFRA 2024 + Energistyrelsen 2024 emission factors.
     """
     from app.services.agents.ghg_calculator import GHGCalculatorAgent
-    result = await GHGCalculatorAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    result = await get_agent(GHGCalculatorAgent).safe_run(body.model_dump())
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
@@ -232,7 +346,8 @@ async def materiality(body: MaterialityRequest, current_user: CurrentUser):
     required / recommended / not_relevant for the company's profile.
     """
     from app.services.agents.materiality_assessor import MaterialityAssessorAgent
-    result = await MaterialityAssessorAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    result = await get_agent(MaterialityAssessorAgent).safe_run(body.model_dump())
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
@@ -246,7 +361,8 @@ async def write_report(body: ReportWriterRequest, current_user: CurrentUser):
     Optionally runs QA validation on the output.
     """
     from app.services.agents.report_writer_agent import ReportWriterAgent
-    result = await ReportWriterAgent().safe_run(body.model_dump())
+    from app.services.agents.registry import get_agent
+    result = await get_agent(ReportWriterAgent).safe_run(body.model_dump())
     if not result.get("ok"):
         raise HTTPException(status_code=500, detail=result.get("error"))
     return result
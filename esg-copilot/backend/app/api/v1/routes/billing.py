@@ -8,6 +8,7 @@ GET  /billing/status                — Current subscription + credits status
 GET  /billing/history               — ESG snapshot history for company
 GET  /billing/trends                — ESG trend summary for company
 POST /billing/monthly-reports       — Cron: trigger monthly reports for all active subscribers
+GET  /billing/monthly-reports/{id}  — Cron: progress of a monthly report batch
 """
 
 import logging
@@ -297,13 +298,7 @@ async def _cancel_subscription(db, customer_id: str):
         await db.commit()
 
 
-@router.post("/monthly-reports", status_code=200)
-async def trigger_monthly_reports(request: Request, db: DB):
-    """
-    Cron endpoint — called by Railway/external scheduler on the 1st of each month.
-    Finds all active subscribers with a latest submitted submission and queues reports.
-    Protected by CRON_SECRET header.
-    """
+def _assert_cron_secret(request: Request) -> None:
     cron_secret = request.headers.get("X-Cron-Secret", "")
     if not settings.STRIPE_WEBHOOK_SECRET or cron_secret != settings.STRIPE_WEBHOOK_SECRET:
         # Reuse webhook secret as cron auth (set same secret in Railway cron env)
@@ -311,88 +306,144 @@ async def trigger_monthly_reports(request: Request, db: DB):
         if settings.STRIPE_WEBHOOK_SECRET:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
+
+@router.post("/monthly-reports", status_code=200)
+async def trigger_monthly_reports(request: Request, db: DB):
+    """
+    Cron endpoint — called by Railway/external scheduler on the 1st of each month.
+    Finds every subscribing company's latest submitted submission that has no
+    active or completed report (one set-based query), creates the reports and
+    hands them to the bounded ReportScheduler, which spreads them over
+    MONTHLY_REPORT_WINDOW_MINUTES at MONTHLY_REPORT_CONCURRENCY — or, with
+    MONTHLY_REPORTS_VIA_MESSAGE_BATCH, sends all narratives as one Message
+    Batches API job.
+    Narrative batches a stopped process left unfinished are resumed, and
+    reports a lost worker left "processing" are failed first, so calling the
+    endpoint again also retries them.
+    Poll GET /billing/monthly-reports/{batch_id} for progress.
+    Protected by CRON_SECRET header.
+    """
+    _assert_cron_secret(request)
+
+    from uuid import uuid4
+    from sqlalchemy import and_, exists, func
+    from app.models.audit_log import AuditLog
     from app.models.user import User
     from app.models.submission import DataSubmission
     from app.models.report import Report
-    from sqlalchemy import select
-    from datetime import datetime, timezone
+    from app.services.report_scheduler import get_report_scheduler, recover_stale_reports
 
     now = datetime.now(tz=timezone.utc)
-    triggered = 0
-    skipped = 0
-
-    # Find all active subscribers with a company
-    result = await db.execute(
-        select(User).where(
+    batch_id = uuid4().hex
+    await get_report_scheduler().resume_message_batches()
+    await recover_stale_reports()
+
+    # Latest submitted submission per company
+    latest_sub = (
+        select(
+            DataSubmission.id.label("submission_id"),
+            DataSubmission.company_id.label("company_id"),
+            func.row_number().over(
+                partition_by=DataSubmission.company_id,
+                order_by=DataSubmission.updated_at.desc(),
+            ).label("rn"),
+        )
+        .where(DataSubmission.status == "submitted")
+        .subquery()
+    )
+    # One active subscriber per company (earliest account) — owner of the auto report
+    subscriber = (
+        select(
+            User.id.label("user_id"),
+            User.company_id.label("company_id"),
+            func.row_number().over(
+                partition_by=User.company_id,
+                order_by=User.created_at,
+            ).label("rn"),
+        )
+        .where(
             User.subscription_status.in_(["active", "trialing"]),
             User.company_id.isnot(None),
         )
+        .subquery()
     )
-    subscribers = result.scalars().all()
-
-    for user in subscribers:
-        try:
-            # Find their latest submitted submission
-            sub_result = await db.execute(
-                select(DataSubmission)
-                .where(
-                    DataSubmission.company_id == user.company_id,
-                    DataSubmission.status == "submitted",
-                )
-                .order_by(DataSubmission.updated_at.desc())
-                .limit(1)
-            )
-            submission = sub_result.scalar_one_or_none()
-            if not submission:
-                skipped += 1
-                continue
-
-            # Skip if a report was already generated this month for this submission
-            existing = await db.execute(
-                select(Report).where(
-                    Report.submission_id == submission.id,
-                    Report.status.in_(["completed", "processing", "draft"]),
-                )
-            )
-            if existing.scalar_one_or_none():
-                skipped += 1
-                continue
-
-            # Create report + queue pipeline
-            from uuid import uuid4
-            from app.models.audit_log import AuditLog
-
-            report = Report(
-                id=uuid4(),
-                company_id=user.company_id,
-                submission_id=submission.id,
-                status="processing",
-                created_by=user.id,
-            )
-            db.add(report)
-            db.add(AuditLog(
-                user_id=user.id,
-                company_id=user.company_id,
-                action="report.monthly_auto",
-                entity_type="report",
-                entity_id=report.id,
-                new_value={"triggered_by": "monthly_cron", "month": now.month, "year": now.year},
-            ))
-            await db.flush()
-
-            # Fire background pipeline (import here to avoid circular deps)
-            from app.api.v1.routes.reports import _run_report_pipeline
-            import asyncio
-            asyncio.create_task(_run_report_pipeline(str(report.id), str(submission.id)))
-
-            triggered += 1
-        except Exception as exc:
-            logger.warning("Monthly report failed for user %s: %s", user.id, exc)
-            continue
+    eligible = (await db.execute(
+        select(latest_sub.c.submission_id, latest_sub.c.company_id, subscriber.c.user_id)
+        .join(subscriber, and_(
+            subscriber.c.company_id == latest_sub.c.company_id,
+            subscriber.c.rn == 1,
+        ))
+        .where(
+            latest_sub.c.rn == 1,
+            # Skip if a report already exists / is running for this submission
+            ~exists().where(
+                Report.submission_id == latest_sub.c.submission_id,
+                Report.status.in_(["completed", "processing", "draft"]),
+            ),
+        )
+    )).all()
 
+    subscribing_companies = (await db.execute(
+        select(func.count(func.distinct(User.company_id))).where(
+            User.subscription_status.in_(["active", "trialing"]),
+            User.company_id.isnot(None),
+        )
+    )).scalar_one()
+
+    jobs: list[tuple[str, str]] = []
+    for row in eligible:
+        report_id = uuid4()
+        db.add(Report(
+            id=report_id,
+            company_id=row.company_id,
+            submission_id=row.submission_id,
+            status="processing",
+            created_by=row.user_id,
+        ))
+        db.add(AuditLog(
+            user_id=row.user_id,
+            company_id=row.company_id,
+            action="report.monthly_auto",
+            entity_type="report",
+            entity_id=report_id,
+            new_value={
+                "triggered_by": "monthly_cron", "batch_id": batch_id,
+                "month": now.month, "year": now.year,
+            },
+        ))
+        jobs.append((str(report_id), str(row.submission_id)))
+
+    # Reports must be committed before any worker picks them up
     await db.commit()
-    logger.info("Monthly reports: triggered=%d skipped=%d", triggered, skipped)
-    return {"triggered": triggered, "skipped": skipped, "month": now.month, "year": now.year}
+    if settings.MONTHLY_REPORTS_VIA_MESSAGE_BATCH:
+        batch = get_report_scheduler().submit_message_batch(batch_id, jobs)
+    else:
+        batch = get_report_scheduler().submit(batch_id, jobs)
+
+    skipped = max(0, subscribing_companies - len(jobs))
+    logger.info("Monthly reports: batch=%s triggered=%d skipped=%d", batch_id, len(jobs), skipped)
+    return {
+        "batch_id": batch_id,
+        "triggered": len(jobs),
+        "skipped": skipped,
+        "month": now.month,
+        "year": now.year,
+        "concurrency": batch.concurrency,
+        "window_seconds": batch.window_seconds,
+        "message_batch": settings.MONTHLY_REPORTS_VIA_MESSAGE_BATCH,
+    }
+
+
+@router.get("/monthly-reports/{batch_id}")
+async def monthly_reports_progress(batch_id: str, request: Request):
+    """Cron/ops: progress of a monthly report batch started by this API process."""
+    _assert_cron_secret(request)
+    from app.services.report_scheduler import get_report_scheduler
+
+    batch = get_report_scheduler().progress(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Unknown batch (finished long ago or started by another worker)")
+    return batch.to_dict()
 
 
 async def _mark_past_due(db, customer_id: str):
@@ -11,7 +11,6 @@ GET    /companies/{id}/submissions
 import logging
 from uuid import UUID
 
-import httpx
 from fastapi import APIRouter, HTTPException, Query, Request, status
 from sqlalchemy import select
 
@@ -23,68 +22,41 @@ from app.models.company import Company
 from app.models.submission import DataSubmission
 from app.models.user import User
 from app.schemas.company import CompanyCreate, CompanyOut, CompanyUpdate, SubmissionCreate, SubmissionOut
+from app.services.cvr_service import CVRNotFound, CVRTimeout, CVRUnavailable, lookup_cvr
 
 router = APIRouter()
 
 
 # ── CVR Lookup ─────────────────────────────────────────────────────────────────
 
-_INDUSTRY_MAP = {
-    "Fremstilling":          "manufacturing",
-    "Handel og service":     "retail",
-    "Byggeri og anlæg":      "construction",
-    "Transport":             "logistics",
-    "Landbrug, skovbrug og fiskeri": "agriculture",
-    "Hotel og restauration": "hospitality",
-    "Sundhed og social":     "healthcare",
-    "Finans og forsikring":  "finance",
-    "IT og telekommunikation": "technology",
-}
-
-
 @router.get("/cvr-lookup")
 async def cvr_lookup(cvr: str = Query(..., min_length=8, max_length=10)):
     """
     Look up a Danish company by CVR number using the free cvrapi.dk API.
     Returns company name, industry, employee count, city, and country.
     No auth required (used during company setup before token is stored).
+    Lookups are cached and shared with CompanyResearcherAgent (services/cvr_service.py).
     """
-    cvr_clean = cvr.replace(" ", "").replace("-", "")
     try:
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            resp = await client.get(
-                "https://cvrapi.dk/api",
-                params={"search": cvr_clean, "country": "dk"},
-                headers={"User-Agent": "ESG-Copilot/1.0 (support@esgcopilot.dk)"},
-            )
-            if resp.status_code == 404:
-                raise HTTPException(status_code=404, detail="CVR-nummer ikke fundet")
-            resp.raise_for_status()
-            data = resp.json()
-    except httpx.TimeoutException:
+        company = await lookup_cvr(cvr)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except CVRNotFound:
+        raise HTTPException(status_code=404, detail="CVR-nummer ikke fundet")
+    except CVRTimeout:
         raise HTTPException(status_code=503, detail="CVR-opslag timeout — prøv igen")
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logger.warning("CVR lookup failed for %s: %s", cvr_clean, exc)
+    except CVRUnavailable:
         raise HTTPException(status_code=503, detail="CVR-opslag utilgængeligt")
 
-    # Map cvrapi industry description → our industry_code
-    raw_industry = data.get("industrydesc", "") or ""
-    industry_code = "technology"  # default
-    for dk_name, code in _INDUSTRY_MAP.items():
-        if dk_name.lower() in raw_industry.lower():
-            industry_code = code
-            break
-
     return {
-        "name":           data.get("name", ""),
-        "cvr":            cvr_clean,
-        "industry_code":  industry_code,
-        "industry_desc":  raw_industry,
-        "city":           data.get("city", ""),
-        "country_code":   "DK",
-        "employee_count": data.get("employees") or None,
+        "name":           company["name"],
+        "cvr":            company["cvr"],
+        "industry_code":  company["industry_code"],
+        "industry_desc":  company["industry_desc"],
+        "city":           company["city"],
+        "zipcode":        company["zipcode"],
+        "country_code":   company["country_code"],
+        "employee_count": company["employee_count"],
     }
 
 
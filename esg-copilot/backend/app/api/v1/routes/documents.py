@@ -18,6 +18,7 @@ from sqlalchemy import select
 from app.core.deps import CurrentUser, DB
 from app.models.audit_log import AuditLog
 from app.models.submission import DataSubmission
+from app.services.storage.async_storage import content_type_for, document_key, get_async_storage
 from app.services.storage.file_storage import StorageError, get_storage
 
 logger = logging.getLogger(__name__)
@@ -74,11 +75,12 @@ async def upload_document(
     except StorageError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    import io
-    storage_key, size = storage.upload(
-        io.BytesIO(content),
-        file.filename or "upload",
-        str(current_user.company_id),
+    storage_key = document_key(str(current_user.company_id), file.filename or "upload")
+    size = await get_async_storage().put_stream(
+        storage_key,
+        content,
+        content_type=content_type_for(file.filename or "upload"),
+        metadata={"company_id": str(current_user.company_id), "original_name": file.filename or "upload"},
     )
 
     ext = (file.filename or "").rsplit(".", 1)[-1].lower() if "." in (file.filename or "") else "unknown"
@@ -170,9 +172,8 @@ async def extract_document(
             detail=f"AI-udtræk understøtter kun PDF og billedfiler. Fik: '{ext}'",
         )
 
-    storage = get_storage()
     try:
-        file_bytes = storage.read(storage_key)
+        file_bytes = await get_async_storage().get_bytes(storage_key)
     except Exception as e:
         logger.error("Failed to read document %s: %s", storage_key, e)
         raise HTTPException(status_code=500, detail="Kunne ikke hente dokument fra storage")
@@ -231,7 +232,7 @@ async def delete_document(document_id: UUID, current_user: CurrentUser, db: DB):
 
     storage_key = (log.new_value or {}).get("storage_key")
     if storage_key:
-        get_storage().delete(storage_key)
+        await get_async_storage().delete(storage_key)
 
     db.add(AuditLog(
         user_id=current_user.id,
@@ -4,24 +4,35 @@ Report routes — ESG Copilot
 POST /reports/generate              Trigger async report generation
 GET  /reports/{id}                  Full report results
 GET  /reports/{id}/status           Poll generation status
+POST /reports/{id}/events/token     Short-lived token for the progress stream
+GET  /reports/{id}/events           Live generation progress (Server-Sent Events)
 GET  /reports/{id}/pdf              Download PDF (when ready)
 GET  /companies/{company_id}/reports  Report history
 """
 
+import time
 import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, status
+from fastapi.responses import StreamingResponse
+from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.deps import CurrentUser, DB
+from app.core.security import create_stream_token, decode_stream_token
+from app.core.sse import KEEPALIVE_COMMENT, SSE_HEADERS, format_sse
 from app.models.audit_log import AuditLog
 from app.models.report import Report, ReportResults
 from app.models.submission import DataSubmission
 from app.models.company import Company
+from app.models.user import User
 from app.schemas.report import GenerateReportRequest, ReportOut, ReportStatusOut
+from app.services.ai.llm_governor import LLMPriority, llm_priority
 
 router = APIRouter()
 
@@ -45,17 +56,8 @@ async def generate_report(
     6. PDFBuilder → downloadable PDF
     """
     # Validate submission exists and is submitted
-    result = await db.execute(
-        select(DataSubmission)
-        .options(
-            selectinload(DataSubmission.energy_data),
-            selectinload(DataSubmission.travel_data),
-            selectinload(DataSubmission.procurement_data),
-            selectinload(DataSubmission.policy_data),
-            selectinload(DataSubmission.company),
-        )
-        .where(DataSubmission.id == body.submission_id)
-    )
+    # Only the submission row is needed here — the pipeline loads the data bundle itself
+    result = await db.execute(select(DataSubmission).where(DataSubmission.id == body.submission_id))
     sub = result.scalar_one_or_none()
     if not sub:
         raise HTTPException(status_code=404, detail="Submission not found")
@@ -122,7 +124,8 @@ async def generate_report(
     return {
         "report_id": str(report.id),
         "status": "processing",
-        "message": "Report generation started. Poll GET /reports/{report_id}/status for updates.",
+        "message": "Report generation started. Subscribe to GET /reports/{report_id}/events "
+                   "with a token from POST /reports/{report_id}/events/token (or poll /status) for updates.",
     }
 
 
@@ -167,9 +170,80 @@ async def get_report_status(report_id: UUID, current_user: CurrentUser, db: DB):
         completed_at=report.completed_at.isoformat() if report.completed_at else None,
         pdf_ready=report.pdf_url is not None,
         error_message=report.error_message,
+        timings=report.timings,
     )
 
 
+_SSE_KEEPALIVE_SECONDS = 15
+_SSE_MAX_STREAM_SECONDS = 15 * 60   # EventSource reconnects on its own after this
+
+
+@router.post("/{report_id}/events/token")
+async def create_report_events_token(report_id: UUID, current_user: CurrentUser, db: DB):
+    """Short-lived token for GET /reports/{id}/events (EventSource cannot send the bearer header)."""
+    report = await _get_report_or_404(db, report_id)
+    _assert_access(current_user, report.company_id)
+    return {
+        "token": create_stream_token(str(current_user.id), str(report_id)),
+        "expires_in": settings.REPORT_STREAM_TOKEN_TTL_SECONDS,
+    }
+
+
+@router.get("/{report_id}/events")
+async def stream_report_events(report_id: UUID, token: str = Query(...)):
+    """
+    Server-Sent Events stream of generation progress.
+
+    `token` comes from POST /reports/{id}/events/token and is only valid for
+    this report. The user is loaded once when the stream opens (active, and
+    access checked against their current company); after the initial snapshot,
+    events are relayed from the report event bus without touching the DB. The
+    first frame is a `status` snapshot; the stream closes after `completed` or
+    `failed`.
+
+    Events: status, stage, section, pdf_ready, completed, failed.
+    """
+    from app.core.database import AsyncSessionLocal
+    from app.services.report_events import get_event_bus
+
+    invalid_token = HTTPException(status_code=401, detail="Invalid or expired token")
+    try:
+        user_id = UUID(decode_stream_token(token, str(report_id)))
+    except (JWTError, ValueError):
+        raise invalid_token
+
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        if not user or not user.is_active:
+            raise invalid_token
+        report = await _get_report_or_404(db, report_id)
+    _assert_access(user, report.company_id)
+
+    bus = get_event_bus()
+
+    async def _stream():
+        async with bus.subscribe(str(report_id)) as sub:
+            # Re-read the status after subscribing so no event can slip in between
+            async with AsyncSessionLocal() as db:
+                current = await _get_report_or_404(db, report_id)
+            snapshot = _status_payload(current)
+            yield format_sse("status", snapshot)
+            if snapshot["status"] in ("completed", "failed"):
+                return
+
+            deadline = time.monotonic() + _SSE_MAX_STREAM_SECONDS
+            while time.monotonic() < deadline:
+                event = await sub.next(timeout=_SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield KEEPALIVE_COMMENT
+                    continue
+                yield format_sse(event.event, event.data)
+                if event.is_terminal:
+                    return
+
+    return StreamingResponse(_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/{report_id}", response_model=ReportOut)
 async def get_report(report_id: UUID, current_user: CurrentUser, db: DB):
     result = await db.execute(
@@ -238,8 +312,8 @@ async def download_pdf(report_id: UUID, current_user: CurrentUser, db: DB):
         entity_id=report.id,
     ))
 
-    from app.services.storage.file_storage import get_storage
-    url = get_storage().presigned_url(report.pdf_url, expires_in=300)
+    from app.services.storage.async_storage import get_async_storage
+    url = await get_async_storage().presign(report.pdf_url, expires_in=300)
     return {"download_url": url, "expires_in_seconds": 300}
 
 
@@ -260,307 +334,380 @@ def _assert_access(user, company_id: UUID) -> None:
         raise HTTPException(status_code=403, detail="Access denied")
 
 
-async def _run_report_pipeline(report_id: str, submission_id: str):
+def _status_payload(report: Report) -> dict:
+    return {
+        "report_id": str(report.id),
+        "status": report.status,
+        "pdf_ready": report.pdf_url is not None,
+        "error_message": report.error_message,
+    }
+
+
+async def _run_report_pipeline(
+    report_id: str,
+    submission_id: str,
+    priority: LLMPriority | None = None,
+) -> str | None:
     """
-    Temporary BackgroundTask shim — Week 5 replaces this with Celery.
+    Report generation entry point — used by BackgroundTasks, the monthly
+    scheduler and the Celery `generate_report` task.
     Runs the full deterministic pipeline then calls the LLM for narratives.
+    Every stage is traced; the timing summary is stored on Report.timings and
+    the stage histograms are exported on GET /metrics.
+    LLM calls run in the governor's STANDARD lane unless `priority` says
+    otherwise (the monthly scheduler passes BATCH).
+    Returns the final report status ("completed" | "failed"), or None if the report is gone.
+    """
+    from app.core.metrics import histogram
+    from app.core.tracing import start_trace
+
+    with start_trace("report_pipeline") as trace, llm_priority(priority or LLMPriority.STANDARD):
+        status = await _report_pipeline(report_id, submission_id, trace)
+    histogram(
+        "report_pipeline_seconds", "Report pipeline wall time (seconds)",
+        buckets=(5.0, 10.0, 20.0, 30.0, 60.0, 90.0, 120.0, 180.0, 300.0, 600.0),
+        labels={"status": status or "missing"},
+    ).observe(trace.duration_ms / 1000)
+    return status
+
+
+async def _report_pipeline(report_id: str, submission_id: str, trace) -> str | None:
+    """
+    The pipeline in three phases, each usable on its own (the monthly
+    message-batch run in services/report_batch.py drives them separately):
+
+      _prepare_report    load + calculate + score + gap analysis
+      _write_narratives  AI narratives (falls back to templated text per section)
+      _complete_report   PDF + save results + snapshot
+
+    Each DB phase opens its own session, so no connection is held while
+    waiting for Claude.
     """
     import logging
     logger = logging.getLogger(__name__)
     logger.info("Starting report pipeline: report_id=%s", report_id)
 
+    from app.services.ai.report_writer import ReportWriter
+
+    try:
+        draft = await _prepare_report(report_id, submission_id)
+        if draft is None:
+            return None
+        writer = ReportWriter()
+        narratives = await _write_narratives(writer, draft)
+        return await _complete_report(draft, narratives, trace, ai_model=writer.model_used())
+    except Exception as e:
+        logger.exception("Report pipeline failed: report_id=%s", report_id)
+        await _mark_report_failed(report_id, e, trace)
+        return "failed"
+
+
+@dataclass(frozen=True)
+class _ReportDraft:
+    """Output of _prepare_report. Holds no ORM objects, so it outlives the DB session."""
+    report_id: str
+    report_version: int
+    disclaimer: str | None
+    bundle: Any            # SubmissionBundle
+    co2: Any               # CalculationReport
+    score: Any             # ESGScore
+    gaps: Any              # GapReport
+
+
+async def _emit(report_id: str, event: str, **data) -> None:
+    from app.services.report_events import publish_report_event
+    await publish_report_event(report_id, event, **data)
+
+
+async def _prepare_report(report_id: str, submission_id: str) -> _ReportDraft | None:
+    """Load the report + submission and run the deterministic engine. None if the report is gone."""
     from app.core.database import AsyncSessionLocal
-    from app.services.esg_engine.calculator import CO2Calculator, Scope1Input, Scope2Input, Scope3Input
-    from app.services.esg_engine.scorer import ESGScorer, ScorerInput
+    from app.core.tracing import span
     from app.services.esg_engine.gap_analyzer import GapAnalyzer
-    from app.services.ai.report_writer import ReportWriter
-    from app.core.config import settings
-    from datetime import datetime, timezone
-    from uuid import UUID
+    from app.services.submission_bundle import load_submission_bundle
 
+    # Load report + submission
+    await _emit(report_id, "stage", stage="loading")
     async with AsyncSessionLocal() as db:
-        try:
-            # Load report + submission
-            result = await db.execute(
-                select(Report)
-                .options(selectinload(Report.results))
-                .where(Report.id == UUID(report_id))
-            )
-            report = result.scalar_one_or_none()
+        with span("load"):
+            report = (await db.execute(select(Report).where(Report.id == UUID(report_id)))).scalar_one_or_none()
             if not report:
-                return
-
-            sub_result = await db.execute(
-                select(DataSubmission)
-                .options(
-                    selectinload(DataSubmission.energy_data),
-                    selectinload(DataSubmission.travel_data),
-                    selectinload(DataSubmission.procurement_data),
-                    selectinload(DataSubmission.policy_data),
-                    selectinload(DataSubmission.workforce_data),
-                    selectinload(DataSubmission.environment_data),
-                    selectinload(DataSubmission.company),
-                )
-                .where(DataSubmission.id == UUID(submission_id))
-            )
-            sub = sub_result.scalar_one_or_none()
-            if not sub:
+                return None
+            bundle = await load_submission_bundle(db, UUID(submission_id))
+            if not bundle:
                 raise ValueError("Submission not found")
+        report_version, disclaimer = report.version, report.disclaimer
+
+    # ── 1. CO2 Calculation ───────────────────────────────────────────────────
+    await _emit(report_id, "stage", stage="calculating")
+    with span("calculate"):
+        co2 = bundle.co2
+
+    # ── 2. ESG Scoring ───────────────────────────────────────────────────────
+    await _emit(report_id, "stage", stage="scoring")
+    with span("score"):
+        score = bundle.score
+
+    # ── 3. Gap Analysis ──────────────────────────────────────────────────────
+    await _emit(report_id, "stage", stage="gap_analysis")
+    with span("gap_analysis"):
+        gaps = GapAnalyzer().analyze(score)
+
+    return _ReportDraft(
+        report_id=report_id,
+        report_version=report_version,
+        disclaimer=disclaimer,
+        bundle=bundle,
+        co2=co2,
+        score=score,
+        gaps=gaps,
+    )
 
-            ed = sub.energy_data
-            td = sub.travel_data
-            pd = sub.procurement_data
-            pol = sub.policy_data
-            wf = sub.workforce_data
-            env = sub.environment_data
-            company = sub.company
-            revenue_dkk = float(company.revenue_eur or 0) * 7.46  # EUR → DKK
-            employee_count = company.employee_count or 0
-
-            # ── 1. CO2 Calculation ───────────────────────────────────────────
-            calc = CO2Calculator()
-            co2 = calc.calculate(
-                scope1=Scope1Input(
-                    natural_gas_m3=float(ed.natural_gas_m3 or 0) if ed else 0,
-                    diesel_liters=float(ed.diesel_liters or 0) if ed else 0,
-                    petrol_liters=float(ed.petrol_liters or 0) if ed else 0,
-                    lpg_liters=float(ed.lpg_liters or 0) if ed else 0,
-                    heating_oil_liters=float(ed.heating_oil_liters or 0) if ed else 0,
-                    coal_kg=float(ed.coal_kg or 0) if ed else 0,
-                    company_car_km=float(ed.company_car_km or 0) if ed else 0,
-                    company_van_km=float(ed.company_van_km or 0) if ed else 0,
-                    company_truck_km=float(ed.company_truck_km or 0) if ed else 0,
-                ),
-                scope2=Scope2Input(
-                    electricity_kwh=float(ed.electricity_kwh or 0) if ed else 0,
-                    district_heating_kwh=float(ed.district_heating_kwh or 0) if ed else 0,
-                    country_code=company.country_code,
-                ),
-                scope3=Scope3Input(
-                    air_short_haul_km=float(td.air_short_haul_km or 0) if td else 0,
-                    air_long_haul_km=float(td.air_long_haul_km or 0) if td else 0,
-                    air_business_class_pct=float(td.air_business_class_pct or 0) if td else 0,
-                    rail_km=float(td.rail_km or 0) if td else 0,
-                    rental_car_km=float(td.rental_car_km or 0) if td else 0,
-                    taxi_km=float(td.taxi_km or 0) if td else 0,
-                    employee_count=company.employee_count or 0,
-                    avg_commute_km_one_way=float(td.avg_commute_km_one_way or 0) if td else 0,
-                    commute_days_per_year=int(td.commute_days_per_year or 220) if td else 220,
-                    purchased_goods_spend_eur=float(pd.purchased_goods_spend_eur or 0) if pd else 0,
-                    industry_code=company.industry_code,
-                ),
-            )
 
-            # ── 2. ESG Scoring ───────────────────────────────────────────────
-            scorer = ESGScorer()
-            score = scorer.score(ScorerInput(
-                industry_code=company.industry_code,
-                employee_count=company.employee_count or 0,
-                country_code=company.country_code,
-                revenue_eur=float(company.revenue_eur or 0),
-                reporting_year=sub.reporting_year,
-                total_co2e_tonnes=co2.total_tonnes,
-                scope2_co2e_tonnes=co2.scope2_tonnes,
-                electricity_kwh=float(ed.electricity_kwh or 0) if ed else 0,
-                renewable_electricity_pct=float(ed.renewable_electricity_pct or 0) if ed else 0,
-                has_energy_reduction_target=pol.has_energy_reduction_target if pol else False,
-                has_net_zero_target=pol.has_net_zero_target if pol else False,
-                waste_recycled_pct=float(pol.waste_recycled_pct) if pol and pol.waste_recycled_pct else None,
-                has_waste_policy=pol.has_waste_policy if pol else False,
-                has_water_policy=pol.has_water_policy if pol else False,
-                has_health_safety_policy=pol.has_health_safety_policy if pol else False,
-                lost_time_injury_rate=float(pol.lost_time_injury_rate) if pol and pol.lost_time_injury_rate else None,
-                has_training_program=pol.has_training_program if pol else False,
-                avg_training_hours_per_employee=float(pol.avg_training_hours_per_employee or 0) if pol else 0,
-                has_diversity_policy=pol.has_diversity_policy if pol else False,
-                female_management_pct=float(pol.female_management_pct) if pol and pol.female_management_pct else None,
-                living_wage_commitment=pol.living_wage_commitment if pol else False,
-                has_esg_policy=pol.has_esg_policy if pol else False,
-                has_code_of_conduct=pol.has_code_of_conduct if pol else False,
-                has_anti_corruption_policy=pol.has_anti_corruption_policy if pol else False,
-                has_data_privacy_policy=pol.has_data_privacy_policy if pol else False,
-                has_board_esg_oversight=pol.has_board_esg_oversight if pol else False,
-                esg_reporting_year=pol.esg_reporting_year if pol else None,
-                supply_chain_code_of_conduct=pol.supply_chain_code_of_conduct if pol else False,
-            ))
-
-            # ── 3. Gap Analysis ──────────────────────────────────────────────
-            gaps = GapAnalyzer().analyze(score)
-
-            # ── 4. AI Narratives ─────────────────────────────────────────────
-            writer = ReportWriter()
-            wf_dict = None
-            if wf:
-                wf_dict = {c.name: getattr(wf, c.name) for c in wf.__table__.columns
-                           if c.name not in ("id", "submission_id", "created_at", "updated_at")}
-
-            # Build dicts for policy and environment data
-            pol_dict = None
-            if pol:
-                pol_dict = {c.name: getattr(pol, c.name) for c in pol.__table__.columns
-                            if c.name not in ("id", "submission_id", "created_at", "updated_at")}
-
-            env_dict = None
-            if env:
-                env_dict = {c.name: getattr(env, c.name) for c in env.__table__.columns
-                            if c.name not in ("id", "submission_id", "created_at", "updated_at")}
-
-            async def safe_generate(coro, fallback: str) -> str:
-                try:
-                    return await coro
-                except Exception as ai_err:
-                    logger.warning("AI narrative failed (using fallback): %s", ai_err)
-                    return fallback
-
-            exec_summary = await safe_generate(
-                writer.write_executive_summary(
-                    company.name, sub.reporting_year, co2, score, gaps,
-                    revenue_dkk=revenue_dkk, employee_count=employee_count,
-                    industry_code=company.industry_code or "",
-                    country_code=company.country_code or "DK",
-                    policy_data=pol_dict,
-                    workforce_data=wf_dict,
-                ),
-                f"{company.name} har gennemført sin VSME-bæredygtighedsrapportering for {sub.reporting_year}. "
-                f"ESG-score: {score.total:.1f}/100 (Rating {score.rating}). "
-                f"Samlet CO₂-aftryk: {co2.total_tonnes:.1f} tCO₂e.",
-            )
-            co2_narrative = await safe_generate(
-                writer.write_co2_narrative(
-                    company.name, sub.reporting_year, co2, company.industry_code or "",
-                    country_code=company.country_code or "DK",
-                    revenue_dkk=revenue_dkk, employee_count=employee_count,
-                ),
-                f"Samlet CO₂-aftryk: {co2.total_tonnes:.2f} tCO₂e "
-                f"(Scope 1: {co2.scope1_tonnes:.2f} t, Scope 2: {co2.scope2_tonnes:.2f} t, Scope 3: {co2.scope3_tonnes:.2f} t).",
-            )
-            esg_narrative = await safe_generate(
-                writer.write_esg_narrative(
-                    company.name, score,
-                    workforce_data=wf_dict,
-                    policy_data=pol_dict,
-                    environment_data=env_dict,
-                ),
-                f"ESG-score: E={score.environmental.score:.1f}, S={score.social.score:.1f}, G={score.governance.score:.1f}.",
-            )
-            improvements_narrative = await safe_generate(
-                writer.write_improvements(company.name, score, gaps, co2),
-                "Se identificerede mangler og handlingsplan nedenfor for konkrete forbedringsforslag.",
-            )
-            roadmap_narrative = await safe_generate(
-                writer.write_roadmap_narrative(
-                    company.name, score, gaps, reporting_year=sub.reporting_year
-                ),
-                "Implementer anbefalingerne kvartalsvis for at forbedre ESG-scoren over de næste 12 måneder.",
-            )
+def _narrative_plan(writer, draft: _ReportDraft) -> list[tuple[str, Awaitable[str], str]]:
+    """(section, ReportWriter coroutine, templated fallback text) for every narrative section."""
+    bundle, co2, score, gaps = draft.bundle, draft.co2, draft.score, draft.gaps
+    company = bundle.company
+    wf_dict = bundle.section_dict("workforce")
+    pol_dict = bundle.section_dict("policy")
+    env_dict = bundle.section_dict("environment")
+    return [
+        (
+            "executive_summary",
+            writer.write_executive_summary(
+                company.name, bundle.reporting_year, co2, score, gaps,
+                revenue_dkk=company.revenue_dkk, employee_count=company.employee_count,
+                industry_code=company.industry_code or "",
+                country_code=company.country_code or "DK",
+                policy_data=pol_dict,
+                workforce_data=wf_dict,
+            ),
+            f"{company.name} har gennemført sin VSME-bæredygtighedsrapportering for {bundle.reporting_year}. "
+            f"ESG-score: {score.total:.1f}/100 (Rating {score.rating}). "
+            f"Samlet CO₂-aftryk: {co2.total_tonnes:.1f} tCO₂e.",
+        ),
+        (
+            "co2_narrative",
+            writer.write_co2_narrative(
+                company.name, bundle.reporting_year, co2, company.industry_code or "",
+                country_code=company.country_code or "DK",
+                revenue_dkk=company.revenue_dkk, employee_count=company.employee_count,
+            ),
+            f"Samlet CO₂-aftryk: {co2.total_tonnes:.2f} tCO₂e "
+            f"(Scope 1: {co2.scope1_tonnes:.2f} t, Scope 2: {co2.scope2_tonnes:.2f} t, Scope 3: {co2.scope3_tonnes:.2f} t).",
+        ),
+        (
+            "esg_narrative",
+            writer.write_esg_narrative(
+                company.name, score,
+                workforce_data=wf_dict,
+                policy_data=pol_dict,
+                environment_data=env_dict,
+            ),
+            f"ESG-score: E={score.environmental.score:.1f}, S={score.social.score:.1f}, G={score.governance.score:.1f}.",
+        ),
+        (
+            "improvements_narrative",
+            writer.write_improvements(company.name, score, gaps, co2),
+            "Se identificerede mangler og handlingsplan nedenfor for konkrete forbedringsforslag.",
+        ),
+        (
+            "roadmap_narrative",
+            writer.write_roadmap_narrative(
+                company.name, score, gaps, reporting_year=bundle.reporting_year
+            ),
+            "Implementer anbefalingerne kvartalsvis for at forbedre ESG-scoren over de næste 12 måneder.",
+        ),
+    ]
+
+
+async def _write_narratives(writer, draft: _ReportDraft) -> dict[str, str]:
+    """All narrative sections, generated concurrently. A failed section gets its fallback text."""
+    import asyncio
+    import logging
+    from app.core.tracing import span
 
-            identified_gaps = score.environmental.gaps + score.social.gaps + score.governance.gaps
-            recommendations = gaps.to_dict()["actions"]
+    logger = logging.getLogger(__name__)
+    await _emit(draft.report_id, "stage", stage="narratives")
 
-            # ── 5. PDF Generation ────────────────────────────────────────────
-            pdf_url = None
+    async def safe_generate(section: str, coro: Awaitable[str], fallback: str) -> tuple[str, str]:
+        with span(f"narrative.{section}") as s:
             try:
-                from app.services.pdf.pdf_builder import build_pdf
-                from app.services.storage.file_storage import get_storage
-
-                pdf_bytes = build_pdf(
-                    company_name=company.name,
-                    reporting_year=sub.reporting_year,
-                    industry_code=company.industry_code,
-                    country_code=company.country_code,
-                    engine_version=settings.CALCULATION_ENGINE_VERSION,
-                    scope1_co2e_tonnes=co2.scope1_tonnes,
-                    scope2_co2e_tonnes=co2.scope2_tonnes,
-                    scope3_co2e_tonnes=co2.scope3_tonnes,
-                    total_co2e_tonnes=co2.total_tonnes,
-                    scope1_breakdown=co2.scope1_breakdown,
-                    scope2_breakdown=co2.scope2_breakdown,
-                    scope3_breakdown=co2.scope3_breakdown,
-                    esg_score_total=score.total,
-                    esg_score_e=score.environmental.score,
-                    esg_score_s=score.social.score,
-                    esg_score_g=score.governance.score,
-                    esg_rating=score.rating,
-                    industry_percentile=score.industry_percentile,
-                    identified_gaps=identified_gaps,
-                    recommendations=recommendations,
-                    executive_summary=exec_summary,
-                    co2_narrative=co2_narrative,
-                    esg_narrative=esg_narrative,
-                    improvements_narrative=improvements_narrative,
-                    roadmap_narrative=roadmap_narrative,
-                    disclaimer=report.disclaimer,
-                )
-                storage = get_storage()
-                pdf_url = await storage.upload(
-                    file_bytes=pdf_bytes,
-                    company_id=str(sub.company_id),
-                    filename=f"esg-report-{sub.reporting_year}-v{report.version}.pdf",
+                text = await coro
+                used_fallback = False
+            except Exception as ai_err:
+                logger.warning("AI narrative failed (using fallback): %s", ai_err)
+                text, used_fallback = fallback, True
+                s.set(fallback=True)
+        await _emit(draft.report_id, "section", section=section, fallback=used_fallback)
+        return section, text
+
+    with span("narratives"):
+        results = await asyncio.gather(*(
+            safe_generate(section, coro, fallback)
+            for section, coro, fallback in _narrative_plan(writer, draft)
+        ))
+    return dict(results)
+
+
+async def _complete_report(
+    draft: _ReportDraft, narratives: dict[str, str], trace, ai_model: str | None = None,
+) -> str | None:
+    """
+    Render + store the PDF, save ReportResults and the ESG snapshot. Returns the final status.
+    `ai_model` is the model(s) that actually wrote the narratives (None if all are templated).
+    """
+    import logging
+    from datetime import datetime, timezone
+    from app.core.database import AsyncSessionLocal
+    from app.core.tracing import span
+
+    logger = logging.getLogger(__name__)
+    report_id = draft.report_id
+    bundle, co2, score, gaps = draft.bundle, draft.co2, draft.score, draft.gaps
+    company = bundle.company
+
+    identified_gaps = score.environmental.gaps + score.social.gaps + score.governance.gaps
+    recommendations = gaps.to_dict()["actions"]
+
+    # ── 5. PDF Generation ────────────────────────────────────────────────────
+    await _emit(report_id, "stage", stage="pdf")
+    pdf_url = None
+    try:
+        from app.services.pdf.pdf_builder import build_context
+        from app.services.pdf.render_service import get_pdf_renderer
+        from app.services.storage.async_storage import (
+            LocalAsyncStorage, get_async_storage, report_pdf_key,
+        )
+
+        pdf_context = build_context(
+            company_name=company.name,
+            reporting_year=bundle.reporting_year,
+            industry_code=company.industry_code,
+            country_code=company.country_code,
+            engine_version=settings.CALCULATION_ENGINE_VERSION,
+            scope1_co2e_tonnes=co2.scope1_tonnes,
+            scope2_co2e_tonnes=co2.scope2_tonnes,
+            scope3_co2e_tonnes=co2.scope3_tonnes,
+            total_co2e_tonnes=co2.total_tonnes,
+            scope1_breakdown=co2.scope1_breakdown,
+            scope2_breakdown=co2.scope2_breakdown,
+            scope3_breakdown=co2.scope3_breakdown,
+            esg_score_total=score.total,
+            esg_score_e=score.environmental.score,
+            esg_score_s=score.social.score,
+            esg_score_g=score.governance.score,
+            esg_rating=score.rating,
+            industry_percentile=score.industry_percentile,
+            identified_gaps=identified_gaps,
+            recommendations=recommendations,
+            disclaimer=draft.disclaimer,
+            **narratives,
+        )
+        storage = get_async_storage()
+        pdf_key = report_pdf_key(str(bundle.company_id), bundle.reporting_year, draft.report_version)
+        renderer = get_pdf_renderer()
+        if isinstance(storage, LocalAsyncStorage):
+            # Render worker writes the file itself — no bytes over the pipe
+            with span("pdf.render", storage="local") as s:
+                s.add(bytes=await renderer.render_to_path(pdf_context, storage.path_for(pdf_key)))
+        else:
+            with span("pdf.render") as s:
+                pdf_bytes = await renderer.render(pdf_context)
+                s.add(bytes=len(pdf_bytes))
+            with span("pdf.upload", storage=settings.STORAGE_BACKEND) as s:
+                s.add(bytes=await storage.put_stream(
+                    pdf_key,
+                    pdf_bytes,
                     content_type="application/pdf",
-                )
-                logger.info("PDF uploaded: %s", pdf_url)
-            except ImportError:
-                logger.warning("WeasyPrint not installed — skipping PDF generation")
-            except Exception as pdf_exc:
-                logger.warning("PDF generation failed (non-fatal): %s", pdf_exc)
-
-            # ── 6. Save results ──────────────────────────────────────────────
-            rr = ReportResults(
-                report_id=report.id,
-                scope1_co2e_kg=co2.scope1_total_kg,
-                scope2_co2e_kg=co2.scope2_total_kg,
-                scope3_co2e_kg=co2.scope3_total_kg,
-                total_co2e_kg=co2.total_kg,
-                scope1_breakdown=co2.scope1_breakdown,
-                scope2_breakdown=co2.scope2_breakdown,
-                scope3_breakdown=co2.scope3_breakdown,
-                esg_score_total=score.total,
-                esg_score_e=score.environmental.score,
-                esg_score_s=score.social.score,
-                esg_score_g=score.governance.score,
-                esg_rating=score.rating,
-                industry_percentile=score.industry_percentile,
-                e_breakdown=score.environmental.breakdown,
-                s_breakdown=score.social.breakdown,
-                g_breakdown=score.governance.breakdown,
-                identified_gaps=identified_gaps,
-                recommendations=recommendations,
-                executive_summary=exec_summary,
-                co2_narrative=co2_narrative,
-                esg_narrative=esg_narrative,
-                improvements_narrative=improvements_narrative,
-                roadmap_narrative=roadmap_narrative,
-                ai_model_used=settings.ANTHROPIC_MODEL,
-                calculation_engine_version=settings.CALCULATION_ENGINE_VERSION,
-            )
-            db.add(rr)
+                    metadata={"company_id": str(bundle.company_id), "report_id": report_id},
+                ))
+        pdf_url = pdf_key
+        logger.info("PDF uploaded: %s", pdf_url)
+    except ImportError:
+        logger.warning("WeasyPrint not installed — skipping PDF generation")
+    except Exception as pdf_exc:
+        logger.warning("PDF generation failed (non-fatal): %s", pdf_exc)
 
+    async with AsyncSessionLocal() as db:
+        report = (await db.execute(select(Report).where(Report.id == UUID(report_id)))).scalar_one_or_none()
+        if not report:
+            return None
+
+        # ── 6. Save results ──────────────────────────────────────────────────
+        rr = ReportResults(
+            report_id=report.id,
+            scope1_co2e_kg=co2.scope1_total_kg,
+            scope2_co2e_kg=co2.scope2_total_kg,
+            scope3_co2e_kg=co2.scope3_total_kg,
+            total_co2e_kg=co2.total_kg,
+            scope1_breakdown=co2.scope1_breakdown,
+            scope2_breakdown=co2.scope2_breakdown,
+            scope3_breakdown=co2.scope3_breakdown,
+            esg_score_total=score.total,
+            esg_score_e=score.environmental.score,
+            esg_score_s=score.social.score,
+            esg_score_g=score.governance.score,
+            esg_rating=score.rating,
+            industry_percentile=score.industry_percentile,
+            e_breakdown=score.environmental.breakdown,
+            s_breakdown=score.social.breakdown,
+            g_breakdown=score.governance.breakdown,
+            identified_gaps=identified_gaps,
+            recommendations=recommendations,
+            **narratives,
+            ai_model_used=ai_model,
+            calculation_engine_version=settings.CALCULATION_ENGINE_VERSION,
+        )
+        with span("save"):
+            db.add(rr)
             report.status = "completed"
             report.completed_at = datetime.now(timezone.utc)
             report.pdf_url = pdf_url
+            report.timings = trace.summary()
             await db.commit()
-            logger.info("Report completed: report_id=%s", report_id)
+        logger.info("Report completed: report_id=%s", report_id)
+        if pdf_url:
+            await _emit(report_id, "pdf_ready", pdf_ready=True)
+        await _emit(report_id, "completed", status="completed", pdf_ready=pdf_url is not None)
 
-            # ── 7. Save ESG snapshot for trend tracking ──────────────────────
-            try:
-                from app.services.snapshot_service import save_snapshot
+        # ── 7. Save ESG snapshot for trend tracking ──────────────────────────
+        try:
+            from app.services.snapshot_service import save_snapshot
+            with span("snapshot"):
                 await db.refresh(rr)
                 await save_snapshot(
                     db,
-                    company_id=str(sub.company_id),
-                    report_id=str(report.id),
+                    company_id=str(bundle.company_id),
+                    report_id=report_id,
                     results=rr,
                     company=company,
-                    reporting_year=sub.reporting_year,
+                    reporting_year=bundle.reporting_year,
                 )
-            except Exception as snap_exc:
-                logger.warning("Snapshot save failed (non-fatal): %s", snap_exc)
+        except Exception as snap_exc:
+            logger.warning("Snapshot save failed (non-fatal): %s", snap_exc)
 
-        except Exception as e:
-            logger.exception("Report pipeline failed: report_id=%s", report_id)
-            try:
+        # Re-store the summary so it includes the snapshot stage
+        try:
+            report.timings = trace.summary()
+            await db.commit()
+        except Exception as timing_exc:
+            logger.warning("Storing report timings failed (non-fatal): %s", timing_exc)
+    logger.info("Report timings: report_id=%s %s", report_id, trace.summary()["totals"])
+    return "completed"
+
+
+async def _mark_report_failed(report_id: str, error: Exception, trace) -> None:
+    from app.core.database import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            report = (await db.execute(select(Report).where(Report.id == UUID(report_id)))).scalar_one_or_none()
+            if report:
                 report.status = "failed"
-                report.error_message = str(e)
+                report.error_message = str(error)
+                report.timings = trace.summary()
                 await db.commit()
-            except Exception:
-                pass
+    except Exception:
+        pass
+    await _emit(report_id, "failed", status="failed", error_message=str(error))
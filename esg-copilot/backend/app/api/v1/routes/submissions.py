@@ -261,59 +261,14 @@ async def calculate_preview(submission_id: UUID, current_user: CurrentUser, db:
     Returns results instantly — nothing is written to the database.
     Use this to give users live feedback as they fill in data.
     """
-    from app.services.esg_engine.calculator import (
-        CO2Calculator, Scope1Input, Scope2Input, Scope3Input,
-    )
-    from sqlalchemy.orm import selectinload as sio
+    from app.services.submission_bundle import load_submission_bundle
 
-    sub_result = await db.execute(
-        select(DataSubmission)
-        .options(
-            sio(DataSubmission.energy_data),
-            sio(DataSubmission.travel_data),
-            sio(DataSubmission.procurement_data),
-            sio(DataSubmission.company),
-        )
-        .where(DataSubmission.id == submission_id)
-    )
-    sub = sub_result.scalar_one_or_none()
-    if not sub:
+    bundle = await load_submission_bundle(db, submission_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Submission not found")
-    _assert_access(current_user, sub.company_id)
+    _assert_access(current_user, bundle.company_id)
 
-    ed, td, pd, co = sub.energy_data, sub.travel_data, sub.procurement_data, sub.company
-
-    calc = CO2Calculator()
-    report = calc.calculate(
-        scope1=Scope1Input(
-            natural_gas_m3=float(ed.natural_gas_m3 or 0) if ed else 0,
-            diesel_liters=float(ed.diesel_liters or 0) if ed else 0,
-            petrol_liters=float(ed.petrol_liters or 0) if ed else 0,
-            lpg_liters=float(ed.lpg_liters or 0) if ed else 0,
-            heating_oil_liters=float(ed.heating_oil_liters or 0) if ed else 0,
-            coal_kg=float(ed.coal_kg or 0) if ed else 0,
-            company_car_km=float(ed.company_car_km or 0) if ed else 0,
-            company_van_km=float(ed.company_van_km or 0) if ed else 0,
-            company_truck_km=float(ed.company_truck_km or 0) if ed else 0,
-        ),
-        scope2=Scope2Input(
-            electricity_kwh=float(ed.electricity_kwh or 0) if ed else 0,
-            district_heating_kwh=float(ed.district_heating_kwh or 0) if ed else 0,
-            country_code=co.country_code if co else "EU_AVERAGE",
-        ),
-        scope3=Scope3Input(
-            air_short_haul_km=float(td.air_short_haul_km or 0) if td else 0,
-            air_long_haul_km=float(td.air_long_haul_km or 0) if td else 0,
-            air_business_class_pct=float(td.air_business_class_pct or 0) if td else 0,
-            rail_km=float(td.rail_km or 0) if td else 0,
-            rental_car_km=float(td.rental_car_km or 0) if td else 0,
-            employee_count=co.employee_count or 0 if co else 0,
-            avg_commute_km_one_way=float(td.avg_commute_km_one_way or 0) if td else 0,
-            commute_days_per_year=int(td.commute_days_per_year or 220) if td else 220,
-            purchased_goods_spend_eur=float(pd.purchased_goods_spend_eur or 0) if pd else 0,
-            industry_code=co.industry_code if co else "general",
-        ),
-    )
+    report = bundle.co2
 
     return {
         "preview": True,
@@ -339,97 +294,15 @@ async def score_preview(submission_id: UUID, current_user: CurrentUser, db: DB):
     Returns scores, category breakdowns, gaps, and quick wins instantly.
     Nothing is written to the database.
     """
-    from app.services.esg_engine.calculator import (
-        CO2Calculator, Scope1Input, Scope2Input, Scope3Input,
-    )
-    from app.services.esg_engine.scorer import ESGScorer, ScorerInput
     from app.services.esg_engine.gap_analyzer import GapAnalyzer
-    from sqlalchemy.orm import selectinload as sio
+    from app.services.submission_bundle import load_submission_bundle
 
-    sub_result = await db.execute(
-        select(DataSubmission)
-        .options(
-            sio(DataSubmission.energy_data),
-            sio(DataSubmission.travel_data),
-            sio(DataSubmission.procurement_data),
-            sio(DataSubmission.policy_data),
-            sio(DataSubmission.company),
-        )
-        .where(DataSubmission.id == submission_id)
-    )
-    sub = sub_result.scalar_one_or_none()
-    if not sub:
+    bundle = await load_submission_bundle(db, submission_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Submission not found")
-    _assert_access(current_user, sub.company_id)
-
-    ed, td, pd, pol, co = (
-        sub.energy_data, sub.travel_data, sub.procurement_data,
-        sub.policy_data, sub.company,
-    )
-
-    # CO2 first (needed for intensity calculation)
-    calc = CO2Calculator()
-    co2 = calc.calculate(
-        scope1=Scope1Input(
-            natural_gas_m3=float(ed.natural_gas_m3 or 0) if ed else 0,
-            diesel_liters=float(ed.diesel_liters or 0) if ed else 0,
-            petrol_liters=float(ed.petrol_liters or 0) if ed else 0,
-            lpg_liters=float(ed.lpg_liters or 0) if ed else 0,
-            heating_oil_liters=float(ed.heating_oil_liters or 0) if ed else 0,
-            coal_kg=float(ed.coal_kg or 0) if ed else 0,
-            company_car_km=float(ed.company_car_km or 0) if ed else 0,
-            company_van_km=float(ed.company_van_km or 0) if ed else 0,
-            company_truck_km=float(ed.company_truck_km or 0) if ed else 0,
-        ),
-        scope2=Scope2Input(
-            electricity_kwh=float(ed.electricity_kwh or 0) if ed else 0,
-            district_heating_kwh=float(ed.district_heating_kwh or 0) if ed else 0,
-            country_code=co.country_code if co else "EU_AVERAGE",
-        ),
-        scope3=Scope3Input(
-            air_short_haul_km=float(td.air_short_haul_km or 0) if td else 0,
-            air_long_haul_km=float(td.air_long_haul_km or 0) if td else 0,
-            employee_count=co.employee_count or 0 if co else 0,
-            avg_commute_km_one_way=float(td.avg_commute_km_one_way or 0) if td else 0,
-            commute_days_per_year=int(td.commute_days_per_year or 220) if td else 220,
-            purchased_goods_spend_eur=float(pd.purchased_goods_spend_eur or 0) if pd else 0,
-            industry_code=co.industry_code if co else "general",
-        ),
-    )
-
-    # ESG scoring
-    scorer = ESGScorer()
-    score = scorer.score(ScorerInput(
-        industry_code=co.industry_code if co else "general",
-        employee_count=co.employee_count or 0 if co else 0,
-        country_code=co.country_code if co else "EU_AVERAGE",
-        revenue_eur=float(co.revenue_eur or 0) if co else 0,
-        reporting_year=sub.reporting_year,
-        total_co2e_tonnes=co2.total_tonnes,
-        scope2_co2e_tonnes=co2.scope2_tonnes,
-        electricity_kwh=float(ed.electricity_kwh or 0) if ed else 0,
-        renewable_electricity_pct=float(ed.renewable_electricity_pct or 0) if ed else 0,
-        has_energy_reduction_target=pol.has_energy_reduction_target if pol else False,
-        has_net_zero_target=pol.has_net_zero_target if pol else False,
-        waste_recycled_pct=float(pol.waste_recycled_pct) if pol and pol.waste_recycled_pct else None,
-        has_waste_policy=pol.has_waste_policy if pol else False,
-        has_water_policy=pol.has_water_policy if pol else False,
-        has_health_safety_policy=pol.has_health_safety_policy if pol else False,
-        lost_time_injury_rate=float(pol.lost_time_injury_rate) if pol and pol.lost_time_injury_rate else None,
-        has_training_program=pol.has_training_program if pol else False,
-        avg_training_hours_per_employee=float(pol.avg_training_hours_per_employee or 0) if pol else 0,
-        has_diversity_policy=pol.has_diversity_policy if pol else False,
-        female_management_pct=float(pol.female_management_pct) if pol and pol.female_management_pct else None,
-        living_wage_commitment=pol.living_wage_commitment if pol else False,
-        has_esg_policy=pol.has_esg_policy if pol else False,
-        has_code_of_conduct=pol.has_code_of_conduct if pol else False,
-        has_anti_corruption_policy=pol.has_anti_corruption_policy if pol else False,
-        has_data_privacy_policy=pol.has_data_privacy_policy if pol else False,
-        has_board_esg_oversight=pol.has_board_esg_oversight if pol else False,
-        esg_reporting_year=pol.esg_reporting_year if pol else None,
-        supply_chain_code_of_conduct=pol.supply_chain_code_of_conduct if pol else False,
-    ))
+    _assert_access(current_user, bundle.company_id)
 
+    co2, score = bundle.co2, bundle.score
     gaps = GapAnalyzer().analyze(score)
 
     return {
@@ -0,0 +1,141 @@
+"""
+Caches — ESG Copilot
+====================
+Small building blocks for caching expensive results (Claude answers, API
+lookups) in the API process.
+
+    TTLCache     — in-process dict with per-entry TTL and LRU eviction
+    TieredCache  — a TTLCache in front of an optional Redis tier shared by all
+                   workers; values must be JSON-serialisable
+
+    cache = TieredCache("coach", ttl_seconds=3600, max_entries=500, redis_url=None)
+    value = await cache.get(key)
+    if value is None:
+        value = await compute()
+        await cache.set(key, value)
+
+Lookups are counted per cache (cache_lookups_total, cache_hits_total{tier}),
+so the hit rate is hits / lookups. The Redis tier is best-effort: errors are
+logged and treated as a miss.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded in-memory cache. Not thread-safe — use from one event loop."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """TTLCache (per process) → Redis (shared). Keys are strings."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        max_entries: int,
+        redis_url: str | None = None,
+        local_ttl_seconds: float | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        # The local tier may expire sooner so workers pick up deletes from Redis
+        self.local = TTLCache(max_entries, ttl_seconds if local_ttl_seconds is None else local_ttl_seconds)
+        self._redis = None
+        if redis_url:
+            from redis import asyncio as aioredis
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    async def get(self, key: str) -> Any:
+        """Cached value or None."""
+        _count("cache_lookups_total", "Cache lookups", {"cache": self.name})
+        value = self.local.get(key)
+        if value is not None:
+            _count("cache_hits_total", "Cache hits", {"cache": self.name, "tier": "local"})
+            return value
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(self._redis_key(key))
+        except Exception as exc:
+            logger.warning("Redis cache %s lookup failed (treating as miss): %s", self.name, exc)
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        self.local.set(key, value)
+        _count("cache_hits_total", "Cache hits", {"cache": self.name, "tier": "redis"})
+        return value
+
+    async def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.local.set(key, value, min(ttl, self.local.ttl_seconds))
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(self._redis_key(key), json.dumps(value), ex=max(1, int(ttl)))
+        except Exception as exc:
+            logger.warning("Redis cache %s write failed: %s", self.name, exc)
+
+    async def delete(self, key: str) -> None:
+        self.local.pop(key)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(self._redis_key(key))
+        except Exception as exc:
+            logger.warning("Redis cache %s delete failed: %s", self.name, exc)
+
+    async def aclose(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+def _count(name: str, description: str, labels: dict[str, str]) -> None:
+    from app.core.metrics import counter
+    counter(name, description, labels=labels).inc()
@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24   # 24 hours
+    REPORT_STREAM_TOKEN_TTL_SECONDS: int = 120   # ?token= for GET /reports/{id}/events, checked on connect
     FRONTEND_URL: str = "http://localhost:3000"
 
     # ── Database ─────────────────────────────────────────────────────────────
@@ -30,10 +31,96 @@ class Settings(BaseSettings):
 
     # ── Redis (Celery task queue) ─────────────────────────────────────────────
     REDIS_URL: str = "redis://localhost:6379/0"
+    EVENT_BUS_BACKEND: str = "memory"        # memory | redis — report progress events (SSE)
 
     # ── Anthropic Claude ──────────────────────────────────────────────────────
     ANTHROPIC_API_KEY: str = ""
     ANTHROPIC_MODEL: str = "claude-sonnet-4-6"
+    ANTHROPIC_FALLBACK_MODEL: str = "claude-haiku-4-5-20251001"  # used while the primary model's breaker is open; "" = none
+    NARRATIVE_CACHE_ENABLED: bool = True     # reuse narratives for byte-identical prompts
+    PROMPT_CACHING_ENABLED: bool = True      # cache_control on static system prompts + tool schemas
+    ANTHROPIC_MAX_CONNECTIONS: int = 50      # shared client's httpx pool (all LLM calls in a process)
+    ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    ANTHROPIC_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    # Offline load testing (see services/ai/replay_transport.py); "" = real API
+    ANTHROPIC_TRANSPORT: str = ""            # "" | record | replay
+    ANTHROPIC_FIXTURES_DIR: str = "fixtures/llm"
+    ANTHROPIC_REPLAY_LATENCY: str = "recorded"     # recorded | fixed:<s> | lognormal:<median s>,<sigma>
+    ANTHROPIC_REPLAY_LATENCY_SCALE: float = 1.0
+    ANTHROPIC_REPLAY_429_RATE: float = 0.0
+    ANTHROPIC_REPLAY_529_RATE: float = 0.0
+    ANTHROPIC_REPLAY_ON_MISS: str = "synthesize"   # synthesize | error
+    ANTHROPIC_REPLAY_SEED: int | None = None
+
+    # ── LLM governor (admission control for all Claude calls) ───────────────
+    LLM_GOVERNOR_BACKEND: str = "memory"     # memory | redis — redis shares the limits across all workers
+    LLM_MAX_CONCURRENCY: int = 8             # Claude requests in flight
+    LLM_BATCH_MAX_CONCURRENCY: int = 3       # of which monthly-report (batch) calls may hold at most
+    LLM_REQUESTS_PER_MINUTE: int = 50        # token-bucket refill rate
+    LLM_BURST: int = 10                      # token-bucket capacity
+    LLM_SLOT_LEASE_SECONDS: int = 300        # redis: slot of a crashed worker is freed after this
+
+    # ── LLM retries + circuit breaker (see services/ai/resilience.py) ───────
+    LLM_MAX_ATTEMPTS: int = 3                # per call, including the first
+    LLM_RETRY_BUDGET_SECONDS: float = 12.0   # max total backoff per call — stays inside web timeouts
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8.0 # cap for a single wait (incl. retry-after)
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5   # consecutive overload/5xx errors that open a model's breaker
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+
+    # ── LLM model routing (see services/ai/model_router.py) ─────────────────
+    # task → model ("" = ANTHROPIC_MODEL), fallback (missing = ANTHROPIC_FALLBACK_MODEL)
+    # and latency budget. Set as JSON to override; tasks left out use ANTHROPIC_MODEL.
+    LLM_MODEL_ROUTES: dict[str, dict] = {
+        "narrative":          {"model": "", "budget_seconds": 90},
+        "chat":               {"model": "", "budget_seconds": 60},
+        "extraction":         {"model": "", "budget_seconds": 90},
+        "materiality":        {"model": "claude-haiku-4-5-20251001", "fallback": "claude-sonnet-4-6", "budget_seconds": 90},
+        "qa_review":          {"model": "claude-haiku-4-5-20251001", "fallback": "claude-sonnet-4-6", "budget_seconds": 30},
+        "anomaly_commentary": {"model": "claude-haiku-4-5-20251001", "fallback": "claude-sonnet-4-6", "budget_seconds": 20},
+        "roadmap":            {"model": "claude-haiku-4-5-20251001", "fallback": "claude-sonnet-4-6", "budget_seconds": 45},
+        "conversation_summary": {"model": "claude-haiku-4-5-20251001", "fallback": "claude-sonnet-4-6", "budget_seconds": 20},
+        "intent":             {"model": "claude-haiku-4-5-20251001", "fallback": "", "budget_seconds": 5},
+    }
+
+    # ── Coach response cache (first-turn questions, see sustainability_coach.py) ─
+    COACH_CACHE_ENABLED: bool = True
+    COACH_CACHE_BACKEND: str = "memory"      # memory | redis — redis shares answers across workers
+    COACH_CACHE_TTL_SECONDS: int = 24 * 3600
+    COACH_CACHE_LOCAL_TTL_SECONDS: int = 300 # in-process tier in front of redis
+    COACH_CACHE_MAX_ENTRIES: int = 1000      # in-process tier, LRU beyond this
+
+    # ── Orchestrator tool-result memo (per company, see agents/orchestrator.py) ─
+    ORCHESTRATOR_TOOL_MEMO_ENABLED: bool = True
+    ORCHESTRATOR_TOOL_MEMO_TTL_SECONDS: int = 15 * 60
+    ORCHESTRATOR_TOOL_MEMO_MAX_ENTRIES: int = 2000
+
+    # ── Orchestrator conversation compaction (see agents/conversation.py) ────
+    ORCHESTRATOR_HISTORY_TOKENS: int = 4000      # older client history beyond this is summarised
+    ORCHESTRATOR_TOOL_RESULT_TOKENS: int = 1000  # larger tool outputs go to Claude as summary + handle
+
+    # ── Orchestrator intent fast-path (see agents/intent.py) ────────────────
+    ORCHESTRATOR_FAST_PATH_ENABLED: bool = True  # single-tool requests skip the planning turn
+
+    # ── Peer benchmark index (see services/peer_index.py) ───────────────────
+    PEER_INDEX_ENABLED: bool = True
+    PEER_INDEX_K: int = 20                   # most similar companies per comparison
+    PEER_INDEX_MIN_PEERS: int = 5            # fewer → industry averages only (anonymity)
+    PEER_INDEX_REFRESH_SECONDS: int = 3600   # full reload; this worker's new snapshots are added at once
+
+    # ── CVR lookups (cvrapi.dk, see services/cvr_service.py) ─────────────────
+    CVR_API_URL: str = "https://cvrapi.dk/api"
+    CVR_TIMEOUT_SECONDS: float = 8.0
+    CVR_CACHE_BACKEND: str = "memory"        # memory | redis — redis shares lookups across workers
+    CVR_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    CVR_NEGATIVE_TTL_SECONDS: int = 3600     # unknown CVR numbers
+    CVR_CACHE_MAX_ENTRIES: int = 5000
+    CVR_TRANSPORT: str = "live"              # live | fixtures — fixtures reads CVR_FIXTURES_DIR/<cvr>.json
+    CVR_FIXTURES_DIR: str = "fixtures/cvr"
+
+    # ── Site climate exposure (see services/climate_grid.py) ────────────────
+    # The bundled grid is an indicative model, not DMI data: until a survey-grade
+    # raster ships, site exposure is reported as information only
+    CLIMATE_SITE_RISK_IN_SCORE: bool = False # blend site exposure into physical_score + narrative
 
     # ── File Storage ─────────────────────────────────────────────────────────
     STORAGE_BACKEND: str = "local"           # local | s3 | r2
@@ -42,6 +129,13 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_REGION: str = "eu-west-1"            # EU region for GDPR compliance
+    S3_MAX_POOL_CONNECTIONS: int = 20        # shared boto3 client connection pool
+
+    # ── PDF Rendering ────────────────────────────────────────────────────────
+    PDF_RENDER_MODE: str = "pool"            # pool | inline — inline renders in a thread (Celery workers)
+    PDF_RENDER_WORKERS: int = 2              # long-lived WeasyPrint worker processes
+    PDF_RENDER_MAX_CONCURRENCY: int = 2      # render jobs in flight; the rest queue
+    PDF_RENDER_WARM_ON_STARTUP: bool = True  # spawn + preload workers in the app lifespan
 
     # ── CORS ─────────────────────────────────────────────────────────────────
     ALLOWED_ORIGINS: List[str] = ["*"]
@@ -64,6 +158,19 @@ class Settings(BaseSettings):
     # Set REQUIRE_BILLING=true in Railway env vars to enforce billing (production)
     REQUIRE_BILLING: bool = False
 
+    # ── Monthly auto-reports ─────────────────────────────────────────────────
+    MONTHLY_REPORT_CONCURRENCY: int = 3      # pipelines running at once
+    MONTHLY_REPORT_WINDOW_MINUTES: int = 120 # start times spread evenly over this window
+    REPORT_PROCESSING_TIMEOUT_MINUTES: int = 60  # "processing" this long past the window → failed (lost worker)
+    MONTHLY_REPORTS_VIA_MESSAGE_BATCH: bool = True  # all narratives as one Message Batches job (50% cost)
+    NARRATIVE_BATCH_BACKEND: str = "anthropic"      # anthropic | local (direct calls — dev/tests)
+    NARRATIVE_BATCH_POLL_SECONDS: float = 30.0
+    NARRATIVE_BATCH_TIMEOUT_MINUTES: int = 360      # cancel; unfinished sections get fallback text
+
+    # ── Observability ────────────────────────────────────────────────────────
+    METRICS_ENABLED: bool = True             # GET /metrics (Prometheus text format, per process)
+    METRICS_TOKEN: str = ""                  # scrapers send "Authorization: Bearer <token>"; production without one = /metrics off
+
     class Config:
         env_file = ".env"
         case_sensitive = True
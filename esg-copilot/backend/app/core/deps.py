@@ -30,7 +30,7 @@ async def get_current_user(
     try:
         payload = decode_token(token)
         user_id: str = payload.get("sub")
-        if not user_id:
+        if not user_id or payload.get("typ"):      # stream tokens only open their report's stream
             raise credentials_exc
     except JWTError:
         raise credentials_exc
@@ -0,0 +1,170 @@
+"""
+In-process metrics — ESG Copilot
+
+Minimal histogram/counter registry (no external dependency). Metrics are per
+process; each uvicorn/Celery worker keeps its own. GET /metrics renders the
+registry in the Prometheus text exposition format.
+
+    RENDER_SECONDS = histogram("pdf_render_seconds", "PDF render wall time")
+    RENDER_SECONDS.observe(1.42)
+    with RENDER_SECONDS.time():
+        ...
+
+    TOKENS = counter("llm_tokens_total", "LLM tokens", labels={"direction": "input"})
+    TOKENS.inc(812)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds — covers sub-second API work up to multi-minute LLM/PDF jobs
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        labels: dict[str, str] | None = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)   # last slot = +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, plus count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            running += n
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": count, "sum": round(total, 6)}
+
+    def render(self) -> list[str]:
+        snap = self.snapshot()
+        lines = []
+        for bound, n in snap["buckets"].items():
+            le = "+Inf" if bound == float("inf") else _fmt(bound)
+            lines.append(f"{self.name}_bucket{_label_str({**self.labels, 'le': le})} {n}")
+        lines.append(f"{self.name}_sum{_label_str(self.labels)} {_fmt(snap['sum'])}")
+        lines.append(f"{self.name}_count{_label_str(self.labels)} {snap['count']}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: dict[str, str] | None = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_label_str(self.labels)} {_fmt(self._value)}"]
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _key(name: str, labels: dict[str, str] | None) -> tuple:
+    return (name, tuple(sorted((labels or {}).items())))
+
+
+_registry: dict[tuple, Histogram | Counter] = {}
+_registry_lock = threading.Lock()
+
+
+def histogram(
+    name: str,
+    description: str,
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    labels: dict[str, str] | None = None,
+) -> Histogram:
+    """Get or create a process-wide histogram by name (+ label values)."""
+    key = _key(name, labels)
+    with _registry_lock:
+        if key not in _registry:
+            _registry[key] = Histogram(name, description, buckets, labels)
+        return _registry[key]
+
+
+def counter(name: str, description: str, labels: dict[str, str] | None = None) -> Counter:
+    """Get or create a process-wide counter by name (+ label values)."""
+    key = _key(name, labels)
+    with _registry_lock:
+        if key not in _registry:
+            _registry[key] = Counter(name, description, labels)
+        return _registry[key]
+
+
+def render_prometheus() -> str:
+    """Whole registry in Prometheus text format (version 0.0.4)."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    by_name: dict[str, list] = {}
+    for m in metrics:
+        by_name.setdefault(m.name, []).append(m)
+
+    lines: list[str] = []
+    for name in sorted(by_name):
+        series = by_name[name]
+        lines.append(f"# HELP {name} {series[0].description}")
+        lines.append(f"# TYPE {name} {series[0].kind}")
+        for m in series:
+            lines.extend(m.render())
+    return "\n".join(lines) + "\n"
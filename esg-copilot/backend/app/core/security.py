@@ -10,6 +10,8 @@ from jose import JWTError, jwt
 
 from app.core.config import settings
 
+STREAM_TOKEN_TYPE = "report_stream"
+
 
 def hash_password(password: str) -> str:
     return _bcrypt.hashpw(password.encode("utf-8"), _bcrypt.gensalt()).decode("utf-8")
@@ -31,6 +33,31 @@ def create_access_token(subject: str, role: str, company_id: Optional[str] = Non
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def create_stream_token(subject: str, report_id: str) -> str:
+    """
+    Short-lived token for one report's progress stream. EventSource cannot send
+    an Authorization header, so this goes in the query string instead of the
+    access token; it is rejected everywhere else (see deps.get_current_user).
+    """
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": subject,
+        "typ": STREAM_TOKEN_TYPE,
+        "rid": report_id,
+        "exp": now + timedelta(seconds=settings.REPORT_STREAM_TOKEN_TTL_SECONDS),
+        "iat": now,
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_stream_token(token: str, report_id: str) -> str:
+    """User id of a stream token issued for `report_id`; raises JWTError otherwise."""
+    payload = decode_token(token)
+    if payload.get("typ") != STREAM_TOKEN_TYPE or payload.get("rid") != report_id or not payload.get("sub"):
+        raise JWTError("Not a stream token for this report")
+    return payload["sub"]
+
+
 def decode_token(token: str) -> dict:
     """Returns decoded payload or raises JWTError."""
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,91 @@
+"""
+Single-flight — ESG Copilot
+============================
+Coalesces identical calls that are in flight at the same time: the first
+caller runs the work, everyone who asks for the same key before it finishes
+awaits that result instead of starting their own.
+
+    _flight = SingleFlight("materiality")
+    result = await _flight.do(key, lambda: expensive(...))
+
+Typical duplicates: a double-clicked button, two tabs running the same
+assessment, or the frontend firing overlapping agent requests. Unlike a
+cache, nothing is kept once the call has finished — the next call runs again.
+
+  - The work runs in its own task, so a waiter that is cancelled (client
+    disconnect) does not cancel it for the others. It is cancelled only when
+    every waiter has gone.
+  - Exceptions are shared as well: all waiters see the leader's error.
+  - The result object is shared — callers must not mutate it.
+  - The task inherits the first caller's context (trace span, LLM priority);
+    token usage is recorded on that caller's trace only.
+
+Shared calls are counted as singleflight_shared_total{group}.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, group: str) -> None:
+        self.group = group
+        self._calls: dict[str, _Call] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is None or call.task.get_loop() is not asyncio.get_running_loop():
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _t, key=key, call=call: self._forget(key, call))
+        else:
+            from app.core.metrics import counter
+            counter("singleflight_shared_total", "Calls that awaited an identical in-flight call",
+                    labels={"group": self.group}).inc()
+            logger.debug("single-flight %s: joined in-flight call %s", self.group, key[:12])
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            call.task.exception()     # retrieved — no "exception was never retrieved" warning
+
+
+def request_key(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-able parts (dicts are key-sorted; bytes are hashed)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray)):
+            h.update(hashlib.sha256(part).digest())
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
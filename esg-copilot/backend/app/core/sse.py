@@ -0,0 +1,66 @@
+"""
+Server-Sent Events helpers — ESG Copilot
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Disable proxy buffering (nginx / Railway) so events reach the browser immediately
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+KEEPALIVE_COMMENT = ": keep-alive\n\n"
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Serialise one SSE frame. `data` is JSON-encoded on a single line."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def sse_from_events(
+    events: AsyncIterator[tuple[str, Any]],
+    keepalive_seconds: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    SSE frames for an async iterator of (event, data) pairs.
+
+    The iterator runs in its own task so that a keep-alive comment can be sent
+    while it is busy (e.g. waiting for the first token or a slow tool call).
+    An exception becomes a final `error` frame; if the client disconnects the
+    task is cancelled, which also aborts any in-flight upstream request.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def produce() -> None:
+        try:
+            async for item in events:
+                await queue.put(item)
+        except Exception as exc:
+            logger.exception("SSE stream failed")
+            await queue.put(("error", {"detail": str(exc)}))
+        finally:
+            await queue.put(done)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield KEEPALIVE_COMMENT
+                continue
+            if item is done:
+                break
+            event, data = item
+            yield format_sse(event, data)
+    finally:
+        task.cancel()
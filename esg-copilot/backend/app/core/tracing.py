@@ -0,0 +1,148 @@
+"""
+Lightweight tracing — ESG Copilot
+
+Spans for long-running background work (the report pipeline), without an
+external tracing backend. Each span records wall time plus counters
+(LLM tokens, retries, bytes); every finished span is also observed in the
+`<trace>_stage_seconds{stage=...}` histogram exported on GET /metrics.
+
+    with start_trace("report_pipeline") as trace:
+        with span("load"):
+            ...
+        with span("narrative.executive_summary"):
+            text = await writer.write_executive_summary(...)   # LLMClient calls record(...)
+        with span("pdf.upload") as s:
+            s.add(bytes=size)
+    report.timings = trace.summary()
+
+The current trace/span live in contextvars, so code deep in the call stack
+(LLMClient) can attach counters with `record(...)` without any plumbing.
+Outside a trace, `span()` only times the block and `record()` is a no-op.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from app.core.metrics import histogram
+
+_current_trace: ContextVar["Trace | None"] = ContextVar("current_trace", default=None)
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    parent: str | None = None
+    offset_ms: float = 0.0                 # start, relative to the trace start
+    duration_ms: float | None = None
+    status: str = "ok"
+    counts: dict[str, float] = field(default_factory=dict)
+    attrs: dict[str, object] = field(default_factory=dict)
+
+    def add(self, **counts: float) -> None:
+        for key, value in counts.items():
+            if value:
+                self.counts[key] = self.counts.get(key, 0) + value
+
+    def set(self, **attrs: object) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        out = {
+            "name": self.name,
+            "offset_ms": round(self.offset_ms, 1),
+            "duration_ms": round(self.duration_ms or 0.0, 1),
+            "status": self.status,
+        }
+        if self.parent:
+            out["parent"] = self.parent
+        out.update({k: int(v) if float(v).is_integer() else v for k, v in self.counts.items()})
+        out.update(self.attrs)
+        return out
+
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: list[Span] = []
+        self._start = time.perf_counter()
+        self.duration_ms: float | None = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def totals(self) -> dict[str, float]:
+        """Counters summed over top-level spans (nested spans are already rolled up)."""
+        totals: dict[str, float] = {}
+        for s in self.spans:
+            if s.parent is None:
+                for key, value in s.counts.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def summary(self) -> dict:
+        """JSON-serialisable timing summary (persisted on Report.timings)."""
+        return {
+            "total_ms": round(self.duration_ms if self.duration_ms is not None else self.elapsed_ms(), 1),
+            "totals": {k: int(v) if float(v).is_integer() else v for k, v in self.totals().items()},
+            "spans": [s.to_dict() for s in sorted(self.spans, key=lambda s: s.offset_ms)],
+        }
+
+
+@contextmanager
+def start_trace(name: str):
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        trace.duration_ms = trace.elapsed_ms()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attrs: object):
+    """Time a block as a child of the current span. Counters roll up into the parent."""
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    s = Span(
+        name=name,
+        parent=parent.name if parent else None,
+        offset_ms=trace.elapsed_ms() if trace else 0.0,
+        attrs=dict(attrs),
+    )
+    token = _current_span.set(s)
+    start = time.perf_counter()
+    try:
+        yield s
+    except BaseException:
+        s.status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        s.duration_ms = elapsed * 1000
+        _current_span.reset(token)
+        if parent is not None:
+            parent.add(**s.counts)
+        if trace is not None:
+            trace.spans.append(s)
+            histogram(
+                f"{trace.name}_stage_seconds",
+                f"{trace.name} stage wall time (seconds)",
+                labels={"stage": name},
+            ).observe(elapsed)
+
+
+def record(**counts: float) -> None:
+    """Add counters (input_tokens=…, retries=…, bytes=…) to the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.add(**counts)
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
@@ -3,20 +3,23 @@ ESG Copilot — Backend API
 FastAPI application entry point.
 """
 
+import hmac
 import uuid
 import time
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 from app.core.config import settings
+from app.core.metrics import histogram, render_prometheus
 import app.models  # noqa: F401 — ensures all ORM models are registered
 
 logging.basicConfig(level=logging.INFO)
@@ -25,12 +28,44 @@ logger = logging.getLogger(__name__)
 # ── Rate limiter ───────────────────────────────────────────────────────────────
 limiter = Limiter(key_func=get_remote_address, default_limits=["200/minute"])
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.services.agents.registry import get_agent_registry, shutdown_agent_registry
+    from app.services.agents.sustainability_coach import shutdown_coach_cache
+    from app.services.ai.anthropic_client import close_anthropic_client
+    from app.services.ai.llm_governor import shutdown_llm_governor
+    from app.services.climate_grid import shutdown_climate_grid
+    from app.services.cvr_service import close_cvr_service
+    from app.services.pdf.render_service import get_pdf_renderer, shutdown_pdf_renderer
+    from app.services.report_scheduler import get_report_scheduler, shutdown_report_scheduler
+
+    if settings.PDF_RENDER_WARM_ON_STARTUP:
+        try:
+            await get_pdf_renderer().warm()
+        except Exception as exc:
+            logger.warning("PDF render pool warm-up failed (will retry on first report): %s", exc)
+    logger.info("Agent registry ready: %d agents", get_agent_registry().warm())
+    # Resume narrative batches and fail reports a previous process left behind
+    get_report_scheduler().start_recovery()
+    yield
+    await shutdown_report_scheduler()
+    shutdown_agent_registry()
+    await close_anthropic_client()
+    await shutdown_llm_governor()
+    await shutdown_coach_cache()
+    shutdown_pdf_renderer()
+    shutdown_climate_grid()
+    await close_cvr_service()
+
+
 app = FastAPI(
     title="ESG Copilot API",
     description="AI-powered ESG analysis and reporting platform for SMEs.",
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+    lifespan=lifespan,
 )
 
 # ── Rate limiting ─────────────────────────────────────────────────────────────
@@ -56,7 +91,14 @@ async def request_middleware(request: Request, call_next):
 
     response = await call_next(request)
 
-    elapsed = round((time.perf_counter() - start) * 1000, 1)
+    seconds = time.perf_counter() - start
+    elapsed = round(seconds * 1000, 1)
+    # Label by route template, not raw path, to keep series cardinality bounded
+    route = request.scope.get("route")
+    histogram(
+        "http_request_duration_seconds", "HTTP request latency (seconds)",
+        labels={"method": request.method, "route": getattr(route, "path", "unmatched")},
+    ).observe(seconds)
     response.headers["X-Request-ID"] = request_id
     response.headers["X-Process-Time-Ms"] = str(elapsed)
 
@@ -90,6 +132,23 @@ async def health_check():
         "engine_version": settings.CALCULATION_ENGINE_VERSION,
     }
 
+# ── Prometheus metrics ────────────────────────────────────────────────────────
+def _assert_metrics_token(request: Request) -> None:
+    # Metric names and labels expose routes, models and load — not for the public
+    if not settings.METRICS_TOKEN:
+        return                                  # dev/staging only: production never mounts /metrics without a token
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied, settings.METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+if settings.METRICS_ENABLED and (settings.METRICS_TOKEN or settings.ENVIRONMENT != "production"):
+    @app.get("/metrics", tags=["system"], include_in_schema=False)
+    async def metrics(request: Request):
+        """Per-process metrics (this worker only) in Prometheus text format."""
+        _assert_metrics_token(request)
+        return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 # ── Calculation engine smoke test (dev only) ──────────────────────────────────
 if settings.ENVIRONMENT == "development":
     from app.services.esg_engine.calculator import CO2Calculator, Scope1Input, Scope2Input, Scope3Input
@@ -8,6 +8,8 @@ from app.models.report import Report, ReportResults
 from app.models.audit_log import AuditLog
 from app.models.materiality import MaterialityAssessment
 from app.models.esg_snapshot import EsgSnapshot
+from app.models.narrative_cache import NarrativeCache
+from app.models.narrative_batch import NarrativeBatch
 
 __all__ = [
     "User", "Company",
@@ -16,4 +18,6 @@ __all__ = [
     "AuditLog",
     "MaterialityAssessment",
     "EsgSnapshot",
+    "NarrativeCache",
+    "NarrativeBatch",
 ]
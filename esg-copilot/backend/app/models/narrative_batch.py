@@ -0,0 +1,37 @@
+"""SQLAlchemy NarrativeBatch model — Message Batches API jobs of the monthly report run."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class NarrativeBatch(Base):
+    """
+    One row per submitted Anthropic message batch (services/report_batch.py).
+
+    The batch runs for minutes to hours, so what is needed to finish it is
+    stored here rather than only in the submitting process: the reports it
+    belongs to (`jobs`, report_id → submission_id) and its requests in
+    custom_id order. A process that holds the batch renews `lease_until`;
+    once the lease has run out (restart, crash) another process claims the
+    row and resumes polling instead of paying for the batch again.
+    """
+
+    __tablename__ = "narrative_batches"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    batch_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)   # report batch (cron run)
+    anthropic_batch_id: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    jobs: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    requests: Mapped[list] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="submitted", index=True)  # submitted | done
+    lease_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<NarrativeBatch {self.anthropic_batch_id} batch={self.batch_id} status={self.status}>"
@@ -0,0 +1,32 @@
+"""SQLAlchemy NarrativeCache model — content-addressed store of generated report narratives."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class NarrativeCache(Base):
+    """
+    One row per unique narrative prompt.
+
+    `prompt_hash` is the SHA-256 of (model, system prompt, rendered user prompt,
+    max_tokens) — see app.services.ai.narrative_cache.narrative_cache_key.
+    Identical prompts always map to the same row, so unchanged sections are
+    served from here instead of calling Claude again.
+    """
+
+    __tablename__ = "narrative_cache"
+
+    prompt_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<NarrativeCache {self.prompt_hash[:12]} model={self.model} hits={self.hit_count}>"
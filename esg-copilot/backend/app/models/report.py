@@ -30,6 +30,7 @@ class Report(Base):
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     error_message: Mapped[str | None] = mapped_column(Text)
     disclaimer: Mapped[str] = mapped_column(Text, nullable=False, default=_DISCLAIMER)
+    timings: Mapped[dict | None] = mapped_column(JSONB)  # per-stage pipeline trace summary (app.core.tracing)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -17,6 +17,7 @@ class ReportStatusOut(BaseModel):
     completed_at: Optional[str]
     pdf_ready: bool
     error_message: Optional[str]
+    timings: Optional[dict] = None   # per-stage pipeline timings, LLM tokens, retries, bytes
 
 
 class ReportOut(BaseModel):
@@ -4,11 +4,17 @@ BenchmarkAgent
 Compares a company's ESG score and CO2 intensity against industry averages
 for Danish SMEs. Uses built-in benchmark data (updated annually).
 
+When enough comparable companies are on the platform, the result also has a
+"peers" block: the same comparison against the PEER_INDEX_K most similar
+companies (size, revenue, CO2 profile, E/S/G — see services/peer_index.py),
+reported as anonymised aggregates only.
+
 Data sources: ESRS SME pilot data 2024, Statistics Denmark, DEFRA.
 """
 
 from __future__ import annotations
 
+import statistics
 from typing import Any
 
 from .base import BaseAgent
@@ -43,6 +49,9 @@ class BenchmarkAgent(BaseAgent):
           esg_score_total:   float
           total_co2e_tonnes: float  (optional)
           employee_count:    int    (optional)
+          esg_score_e/s/g, revenue_eur, scope1_co2e/scope2_co2e,
+          company_id:        (optional) — sharpen the peer search; company_id
+                             keeps the company out of its own peer group
         """
         industry    = inputs.get("industry_code", "technology")
         esg_score   = inputs.get("esg_score_total", 50)
@@ -72,6 +81,8 @@ class BenchmarkAgent(BaseAgent):
 
         potential_score = min(100, round(p75_esg + (esg_score - avg_esg) * 0.3 + 5))
 
+        peers = await self._peer_comparison(inputs, industry, esg_score, co2_per_fte)
+
         return {
             "ok":                True,
             "industry":          industry,
@@ -93,5 +104,67 @@ class BenchmarkAgent(BaseAgent):
                     f"CO2-intensitet: {co2_per_fte:.1f} tCO2e/mda. vs. branchegennemsnit {avg_co2_fte:.1f}."
                     if co2_total > 0 else ""
                 )
+                + (
+                    f" Blandt de {peers['count']} mest sammenlignelige virksomheder ligger jeres ESG-score "
+                    f"over {peers['esg_percentile']}% (median: {peers['median_esg']})."
+                    if peers else ""
+                )
             ),
+            **({"peers": peers} if peers else {}),
         }
+
+    async def _peer_comparison(
+        self, inputs: dict[str, Any], industry: str, esg_score: float, co2_per_fte: float,
+    ) -> dict[str, Any] | None:
+        """Aggregates over the nearest peers, or None when too few are available."""
+        from app.core.config import settings
+        from app.services.peer_index import ensure_peer_index, peer_vector
+
+        if not settings.PEER_INDEX_ENABLED:
+            return None
+        index = await ensure_peer_index()
+        if len(index) < settings.PEER_INDEX_MIN_PEERS:
+            return None
+
+        vector = peer_vector(
+            employee_count=inputs.get("employee_count"),
+            revenue_eur=inputs.get("revenue_eur"),
+            total_co2e_tonnes=inputs.get("total_co2e_tonnes"),
+            scope1_co2e_tonnes=inputs.get("scope1_co2e"),
+            scope2_co2e_tonnes=inputs.get("scope2_co2e"),
+            esg_score_e=inputs.get("esg_score_e"),
+            esg_score_s=inputs.get("esg_score_s"),
+            esg_score_g=inputs.get("esg_score_g"),
+        )
+        found = index.nearest(vector, industry, k=settings.PEER_INDEX_K, exclude=inputs.get("company_id"))
+        if len(found) < settings.PEER_INDEX_MIN_PEERS:
+            return None
+
+        peers = [peer for _, peer in found]
+        scores = sorted(p.metrics["esg_score_total"] for p in peers)
+        co2 = sorted(p.metrics["co2_per_fte"] for p in peers if "co2_per_fte" in p.metrics)
+        bands: dict[str, int] = {}
+        for p in peers:
+            bands[p.size_band] = bands.get(p.size_band, 0) + 1
+        return {
+            "count":              len(peers),
+            "same_industry":      sum(p.industry == industry for p in peers),
+            "size_bands":         bands,
+            "median_esg":         round(statistics.median(scores), 1),
+            "p25_esg":            round(_quantile(scores, 0.25), 1),
+            "p75_esg":            round(_quantile(scores, 0.75), 1),
+            "esg_percentile":     round(sum(s < esg_score for s in scores) / len(scores) * 100),
+            "median_co2_per_fte": round(statistics.median(co2), 2) if co2 else None,
+            # Share of peers with a higher CO2 intensity (higher = better)
+            "co2_better_than_pct": (
+                round(sum(c > co2_per_fte for c in co2) / len(co2) * 100) if co2 and co2_per_fte > 0 else None
+            ),
+        }
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated quantile of an already sorted list."""
+    pos = (len(sorted_values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
@@ -7,6 +7,12 @@ its industry, country, and emissions profile.
 Uses LLM to generate tailored Danish risk narrative from a structured
 risk database. The risk categories are deterministic — only the narrative
 is LLM-generated.
+
+For Danish sites (postcode/city from the CVR lookup, or coordinates) the
+result includes the site's flood, cloudburst, storm-surge and heat exposure
+from the climate grid (services/climate_grid.py) as `site_risk`. Only with
+CLIMATE_SITE_RISK_IN_SCORE does that exposure change physical_score, the key
+risks and the narrative — the bundled grid is indicative, not DMI data.
 """
 
 from __future__ import annotations
@@ -34,6 +40,15 @@ _INDUSTRY_RISKS: dict[str, dict] = {
 }
 _DEFAULT_RISK = {"physical": 5, "transition": 5, "key_physical": ["generelle klimarisici"], "key_transition": ["CO2-regulering", "energiprisstigninger"]}
 
+_HAZARD_LABELS = {
+    "flood":       "oversvømmelse fra vandløb/lavbund",
+    "cloudburst":  "skybrud",
+    "storm_surge": "stormflod",
+    "heat":        "hedebølger",
+}
+_SITE_HAZARD_THRESHOLD = 60       # 0–100; at or above → named as a key physical risk
+_MAX_SITES_IN_RESULT = 20
+
 _DK_PHYSICAL_CONTEXT = (
     "Danmark er primært eksponeret for: stormflod og oversvømmelse (særligt i kystområder og lavtliggende byer), "
     "kraftige regnskyl (cloudburst), og hyppigere varmebølger. "
@@ -59,6 +74,8 @@ class ClimateRiskAgent(BaseAgent):
           scope1_co2e:    float  (optional)
           scope2_co2e:    float  (optional)
           scope3_co2e:    float  (optional)
+          zipcode, city, latitude, longitude  (optional) — the company's site
+          sites:          list[dict]  (optional) — several sites with the same keys
         """
         industry    = inputs.get("industry_code", "technology")
         country     = inputs.get("country_code", "DK")
@@ -73,6 +90,21 @@ class ClimateRiskAgent(BaseAgent):
         key_physical      = risk["key_physical"]
         key_transition    = risk["key_transition"]
 
+        from app.core.config import settings
+
+        # Location: blend in the exposure of the most exposed site (informational unless enabled)
+        sites = _site_risks(inputs) if country.upper() == "DK" else []
+        scored_sites = sites if settings.CLIMATE_SITE_RISK_IN_SCORE else []
+        if scored_sites:
+            worst = max(scored_sites, key=lambda site: site["score"])
+            physical_score = round((physical_score + worst["score"]) / 2)
+            key_physical = key_physical + [
+                f"{label} ved {site['label']}"
+                for hazard, label in _HAZARD_LABELS.items()
+                for site in scored_sites
+                if site[hazard] >= _SITE_HAZARD_THRESHOLD
+            ][:5]
+
         # Boost transition risk if high emissions
         if total_co2e > 500:
             transition_score = min(10, transition_score + 1)
@@ -93,7 +125,11 @@ class ClimateRiskAgent(BaseAgent):
             f"CO2-aftryk: {total_co2e:.1f} tCO2e/år (S1: {s1:.1f}, S2: {s2:.1f}, S3: {s3:.1f})\n"
             f"Fysisk risikoscore: {physical_score}/10 — nøglerisici: {', '.join(key_physical)}\n"
             f"Transitionsrisikoscore: {transition_score}/10 — nøglerisici: {', '.join(key_transition)}\n"
-            f"{dk_context}\n\n"
+            + "".join(
+                f"Lokation {site['label']}: " + ", ".join(f"{_HAZARD_LABELS[h]} {site[h]}/100" for h in _HAZARD_LABELS) + "\n"
+                for site in scored_sites[:5]
+            )
+            + f"{dk_context}\n\n"
             "Skriv en kort klimarisikovurdering (3-4 afsnit):\n"
             "1. Fysiske risici (konkrete for denne branche og dette land)\n"
             "2. Transitionsrisici (regulering, marked, teknologi)\n"
@@ -111,4 +147,22 @@ class ClimateRiskAgent(BaseAgent):
             "key_physical":     key_physical,
             "key_transition":   key_transition,
             "narrative":        narrative,
+            **({"site_risk": sites[:_MAX_SITES_IN_RESULT]} if sites else {}),
         }
+
+
+def _site_risks(inputs: dict[str, Any]) -> list[dict[str, Any]]:
+    """Grid exposure of every site in `inputs` that can be placed, labelled for the prompt."""
+    from app.services.climate_grid import get_climate_grid
+
+    sites = list(inputs.get("sites") or [])
+    if any(inputs.get(key) for key in ("zipcode", "city", "latitude")):
+        sites.insert(0, inputs)
+    if not sites:
+        return []
+    risks = get_climate_grid().batch_site_risk(sites)
+    return [
+        {"label": " ".join(str(site.get(k) or "") for k in ("zipcode", "city")).strip() or "lokationen", **risk}
+        for site, risk in zip(sites, risks)
+        if risk is not None
+    ]
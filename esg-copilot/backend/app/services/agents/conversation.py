@@ -0,0 +1,260 @@
+"""
+Conversation compaction — ESG Copilot
+======================================
+Keeps the orchestrator's input tokens roughly flat as a conversation grows.
+
+  compact_tool_result() — a tool output above ORCHESTRATOR_TOOL_RESULT_TOKENS is
+      stored server-side under a handle. Claude gets a shrunk copy (numbers and
+      top-level fields intact, long texts and lists cut) plus the handle, and
+      can fetch a single field with the read_tool_result tool.
+
+  compact_history()     — client history above ORCHESTRATOR_HISTORY_TOKENS: the
+      newest turns are kept verbatim, older turns are replaced by one summary.
+      The cut moves in steps of _SUMMARY_STEP messages so the same summary
+      (cached by the summarised turns) serves several requests in a row and
+      the message prefix stays prompt-cacheable. The summary is written by the
+      small "conversation_summary" model; if that fails an extractive summary
+      is used instead.
+
+    content = compact_tool_result("calculate_ghg_emissions", result, scope=company_id)
+    messages = await compact_history(history, settings.ORCHESTRATOR_HISTORY_TOKENS)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING, Any
+
+from app.core.singleflight import request_key
+
+from ..document_processor.context_packer import estimate_tokens
+
+if TYPE_CHECKING:
+    from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+READ_TOOL = "read_tool_result"
+
+# Shrinking of large tool outputs
+_MAX_STRING_CHARS = 240
+_MAX_LIST_ITEMS = 5
+_MAX_DEPTH = 3
+
+_HANDLE_TTL_SECONDS = 30 * 60
+_HANDLE_MAX_ENTRIES = 1000
+
+# History summaries
+_SUMMARY_STEP = 8                 # messages; the summarised prefix grows in these steps
+_SUMMARY_MAX_TOKENS = 400
+_TRANSCRIPT_MESSAGE_CHARS = 1500  # per message fed to the summariser
+_EXTRACT_MESSAGE_CHARS = 200      # per message in the extractive fallback
+_SUMMARY_TTL_SECONDS = 6 * 3600
+_SUMMARY_MAX_ENTRIES = 500
+
+_SUMMARY_PROMPT = (
+    "Du opsummerer en samtale mellem en bruger og en dansk ESG-rådgiver. "
+    "Skriv et kort resumé på dansk (højst 10 punkter) med de fakta, tal, beslutninger "
+    "og åbne spørgsmål, som er nødvendige for at fortsætte samtalen. Opfind intet."
+)
+
+READ_TOOL_SCHEMA: dict = {
+    "name": READ_TOOL,
+    "description": (
+        "Henter et felt fra et tidligere værktøjsresultat, som kun blev vist som kompakt resumé. "
+        "Brug handle fra resuméet og en sti med punktum, f.eks. 'breakdown.scope3' eller 'actions.2'."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "handle": {"type": "string", "description": "Handle fra det kompakte resultat, f.eks. 'tr_3f9a…'"},
+            "path":   {"type": "string", "description": "Felt-sti; tom = hele resultatet"},
+        },
+        "required": ["handle"],
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Tool results
+# ---------------------------------------------------------------------------
+
+def compact_tool_result(tool_name: str, result: dict, scope: str = "") -> str:
+    """tool_result content for Claude: the full JSON, or summary + handle when it is too large."""
+    from app.core.config import settings
+
+    content = _dumps(result)
+    if estimate_tokens(content) <= settings.ORCHESTRATOR_TOOL_RESULT_TOKENS:
+        return content
+
+    handle = "tr_" + request_key(scope, tool_name, content)[:16]
+    _handles().set(handle, (scope, result))
+    logger.info("Tool result of %s compacted (%d chars) → %s", tool_name, len(content), handle)
+    return _dumps({
+        "ok": result.get("ok", True),
+        "compacted": True,
+        "handle": handle,
+        "note": f"Kompakt resumé — kald {READ_TOOL} med handle og felt-sti for detaljer.",
+        "summary": _shrink(result),
+    })
+
+
+def read_tool_result(tool_input: dict, scope: str = "") -> dict:
+    """Result of the read_tool_result tool: one field of a stored tool output."""
+    from app.core.config import settings
+
+    stored = _handles().get(str(tool_input.get("handle", "")))
+    if stored is None or stored[0] != scope:
+        return {"ok": False, "error": "Ukendt eller udløbet handle — kald det oprindelige værktøj igen."}
+
+    value: Any = stored[1]
+    path = str(tool_input.get("path") or "").strip(".")
+    for part in path.split(".") if path else []:
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return {"ok": False, "error": f"Feltet '{path}' findes ikke i resultatet."}
+
+    # Large sub-trees come back shrunk again; Claude can drill further down
+    if estimate_tokens(_dumps(value)) > 2 * settings.ORCHESTRATOR_TOOL_RESULT_TOKENS:
+        value = _shrink(value)
+    return {"ok": True, "path": path, "value": value}
+
+
+def _shrink(value: Any, depth: int = 0) -> Any:
+    if isinstance(value, str):
+        if len(value) <= _MAX_STRING_CHARS:
+            return value
+        return value[:_MAX_STRING_CHARS] + f"… (+{len(value) - _MAX_STRING_CHARS} tegn)"
+    if isinstance(value, dict):
+        if depth >= _MAX_DEPTH:
+            return f"{{… {len(value)} felter}}"
+        return {k: _shrink(v, depth + 1) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if depth >= _MAX_DEPTH:
+            return f"[… {len(value)} elementer]"
+        items = [_shrink(v, depth + 1) for v in value[:_MAX_LIST_ITEMS]]
+        if len(value) > _MAX_LIST_ITEMS:
+            items.append(f"… +{len(value) - _MAX_LIST_ITEMS} elementer")
+        return items
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+# ---------------------------------------------------------------------------
+# History
+# ---------------------------------------------------------------------------
+
+async def compact_history(history: list[dict], budget_tokens: int) -> list[dict]:
+    """
+    Client history as Claude messages, with turns beyond `budget_tokens`
+    summarised. Always returns a thread that starts with a user message.
+    """
+    messages = [
+        {"role": turn["role"], "content": _text(turn.get("content"))}
+        for turn in history
+        if turn.get("role") in ("user", "assistant") and turn.get("content")
+    ]
+    while messages and messages[0]["role"] != "user":
+        messages.pop(0)
+    if sum(estimate_tokens(m["content"]) for m in messages) <= budget_tokens:
+        return messages
+
+    # Keep the newest turns within half the budget, summarise the rest
+    kept, cut = 0, len(messages)
+    while cut > 0 and kept + estimate_tokens(messages[cut - 1]["content"]) <= budget_tokens // 2:
+        cut -= 1
+        kept += estimate_tokens(messages[cut]["content"])
+    if cut >= _SUMMARY_STEP:
+        cut -= cut % _SUMMARY_STEP
+    while cut < len(messages) and messages[cut]["role"] != "user":
+        cut += 1
+    if cut == 0:
+        return messages
+
+    summary = await _summarise(messages[:cut])
+    return [
+        {"role": "user", "content": f"Resumé af samtalen indtil nu ({cut} beskeder):\n{summary}"},
+        {"role": "assistant", "content": "Tak — jeg fortsætter ud fra resuméet."},
+        *messages[cut:],
+    ]
+
+
+async def _summarise(turns: list[dict]) -> str:
+    key = request_key("history", turns)
+    summary = _summaries().get(key)
+    if summary is None:
+        try:
+            summary = await _llm_summary(turns)
+        except Exception as e:
+            logger.warning("Conversation summary failed, using extractive summary: %s", e)
+            return _extractive_summary(turns)
+        _summaries().set(key, summary)
+    return summary
+
+
+async def _llm_summary(turns: list[dict]) -> str:
+    from ..ai.llm_client import LLMClient
+
+    transcript = "\n\n".join(
+        f"{_speaker(turn)}: {turn['content'][:_TRANSCRIPT_MESSAGE_CHARS]}" for turn in turns
+    )
+    summary = await LLMClient(task="conversation_summary").generate(
+        _SUMMARY_PROMPT, transcript, max_tokens=_SUMMARY_MAX_TOKENS,
+    )
+    return summary.strip() or _extractive_summary(turns)
+
+
+def _extractive_summary(turns: list[dict]) -> str:
+    lines = []
+    for turn in turns:
+        text = " ".join(turn["content"].split())
+        if len(text) > _EXTRACT_MESSAGE_CHARS:
+            text = text[:_EXTRACT_MESSAGE_CHARS] + "…"
+        lines.append(f"- {_speaker(turn)}: {text}")
+    return "\n".join(lines)
+
+
+def _speaker(turn: dict) -> str:
+    return "Bruger" if turn["role"] == "user" else "Rådgiver"
+
+
+def _text(content: Any) -> str:
+    """Message content as text — content block lists keep only their text parts."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get("text", "") for block in content if isinstance(block, dict) and block.get("type") == "text"
+        )
+    return str(content or "")
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+_handle_store: TTLCache | None = None
+_summary_store: TTLCache | None = None
+
+
+def _handles() -> TTLCache:
+    global _handle_store
+    if _handle_store is None:
+        from app.core.cache import TTLCache
+        _handle_store = TTLCache(_HANDLE_MAX_ENTRIES, _HANDLE_TTL_SECONDS)
+    return _handle_store
+
+
+def _summaries() -> TTLCache:
+    global _summary_store
+    if _summary_store is None:
+        from app.core.cache import TTLCache
+        _summary_store = TTLCache(_SUMMARY_MAX_ENTRIES, _SUMMARY_TTL_SECONDS)
+    return _summary_store
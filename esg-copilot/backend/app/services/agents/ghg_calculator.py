@@ -43,7 +43,7 @@ class GHGCalculatorAgent(BaseAgent):
     def __init__(self) -> None:
         super().__init__()
         self._calc = CO2Calculator()
-        self._llm  = LLMClient()
+        self._llm  = LLMClient(task="anomaly_commentary")
 
     async def run(self, inputs: dict[str, Any]) -> dict[str, Any]:
         """
@@ -0,0 +1,127 @@
+"""
+Intent fast-path — ESG Copilot
+===============================
+Recognises requests that map to exactly one deterministic specialist tool
+("tjek compliance", "beregn CO2", "sammenlign med branchen") so the
+orchestrator can run that tool directly and call Claude once, without the
+tool schema, to phrase the answer — instead of a planning turn with all tools
+plus a second turn to answer.
+
+Keyword rules decide first. A message that matches a rule but is not clear-cut
+(several rules match, or it is long or asks "hvorfor/hvordan") goes to the
+small "intent" model; a message that matches no rule goes to the full
+tool-use loop without any extra call. The tool input is built from the
+request context — if the data the tool needs is missing, there is no
+fast-path either.
+
+    intent = await classify_intent("Beregn vores CO2-aftryk", context)
+    if intent: result = await agent.safe_run(intent.tool_input)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_RULES: dict[str, re.Pattern] = {
+    "check_vsme_compliance": re.compile(
+        r"\bcompliance\b|\b(tjek|kontroll\w*|mangler|komplet|fuldstændig)\b.*\b(vsme|indberetning\w*|rapport\w*)\b"
+    ),
+    "calculate_ghg_emissions": re.compile(
+        r"\b(beregn\w*|udregn\w*|opgør\w*)\b.*(co2|co₂|udledning\w*|emission\w*|klimaaftryk|aftryk|scope\s?[123])"
+    ),
+    "benchmark_vs_peers": re.compile(
+        r"\b(sammenlign\w*|benchmark\w*|placer\w*)\b.*\b(branche\w*|andre|peers|konkurrent\w*|smv\w*)\b"
+        r"|\bbranchegennemsnit\w*"
+    ),
+}
+
+# Open or compound questions need the planner even when a rule matches
+_UNCERTAIN = re.compile(r"\b(hvorfor|hvordan|og derefter|samt|plan|forbedr\w*|anbefal\w*)\b")
+_MAX_CERTAIN_CHARS = 120
+
+_CLASSIFIER_PROMPT = (
+    "Du klassificerer en brugers besked til en dansk ESG-assistent. Svar KUN med ét af ordene: "
+    "check_vsme_compliance (tjek af VSME-indberetningens fuldstændighed), "
+    "calculate_ghg_emissions (beregning af CO2-udledning), "
+    "benchmark_vs_peers (sammenligning med branchen) eller "
+    "none (alt andet, eller hvis beskeden kræver mere end ét af dem)."
+)
+
+
+@dataclass(frozen=True)
+class Intent:
+    tool: str
+    tool_input: dict
+    source: str               # "rules" | "model"
+
+
+async def classify_intent(message: str, context: dict[str, Any]) -> Intent | None:
+    """The single tool `message` asks for, with its input, or None for the full loop."""
+    text = " ".join(message.lower().split())
+    matches = [tool for tool, pattern in _RULES.items() if pattern.search(text)]
+    if not matches:
+        return None
+
+    if len(matches) == 1 and len(text) <= _MAX_CERTAIN_CHARS and not _UNCERTAIN.search(text):
+        tool, source = matches[0], "rules"
+    else:
+        tool, source = await _ask_model(message), "model"
+        if tool is None:
+            return None
+
+    tool_input = tool_input_for(tool, context)
+    if tool_input is None:
+        logger.info("Intent %s recognised, but the context lacks its data", tool)
+        return None
+    return Intent(tool, tool_input, source)
+
+
+def tool_input_for(tool: str, context: dict[str, Any]) -> dict | None:
+    """Tool input from the request context; None when required data is missing."""
+    submission: dict = context.get("submission_data") or {}
+    industry = context.get("industry_code")
+
+    if tool == "check_vsme_compliance":
+        if not submission:
+            return None
+        return {"submission_data": submission, **({"industry_code": industry} if industry else {})}
+
+    if tool == "calculate_ghg_emissions":
+        if not any(submission.get(scope) for scope in ("scope1", "scope2", "scope3")):
+            return None
+        tool_input = {scope: submission.get(scope) or {} for scope in ("scope1", "scope2", "scope3")}
+        for key in ("employee_count", "industry_code"):
+            if context.get(key):
+                tool_input[key] = context[key]
+        tool_input["explain_anomalies"] = False      # deterministic → memoizable; Claude phrases the answer
+        return tool_input
+
+    if tool == "benchmark_vs_peers":
+        if not industry or context.get("esg_score_total") is None:
+            return None
+        tool_input = {"industry_code": industry, "esg_score_total": context["esg_score_total"]}
+        # company_id is never taken from the client context — the orchestrator injects the trusted one
+        for key in ("total_co2e_tonnes", "employee_count", "esg_score_e", "esg_score_s", "esg_score_g",
+                    "revenue_eur"):
+            if context.get(key):
+                tool_input[key] = context[key]
+        return tool_input
+
+    return None
+
+
+async def _ask_model(message: str) -> str | None:
+    from ..ai.llm_client import LLMClient
+
+    try:
+        answer = await LLMClient(task="intent").generate(_CLASSIFIER_PROMPT, message[:1000], max_tokens=10)
+    except Exception as e:
+        logger.warning("Intent classifier unavailable: %s", e)
+        return None
+    tool = answer.strip().strip(".").lower()
+    return tool if tool in _RULES else None
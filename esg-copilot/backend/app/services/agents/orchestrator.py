@@ -20,19 +20,67 @@ Usage:
     })
     # result["answer"]  — final Danish response
     # result["trace"]   — list of agent calls made
+
+    async for event, data in orchestrator.stream({...}):
+        ...  # "delta" / "tool_call" / "tool_result" / "done" (see stream())
+
+All tool calls of one turn run concurrently — Claude cannot feed one call's
+output into another within a turn, so they are independent. Each has a
+timeout (_TOOL_TIMEOUTS); results go back to Claude in the order of the
+tool_use blocks.
+
+Deterministic tools (_MEMOIZED_TOOLS) are memoized per company for
+ORCHESTRATOR_TOOL_MEMO_TTL_SECONDS, keyed by tool name + canonical JSON
+input, so follow-up questions don't recompute them or call Claude again.
+
+Large tool outputs reach Claude as a summary + handle, and long client
+histories are summarised beyond a token budget (see conversation.py), so the
+input tokens per turn stay roughly flat as the conversation grows.
+
+Requests for exactly one deterministic tool ("beregn CO2", "tjek compliance",
+"sammenlign med branchen") skip the planning turn: the tool runs directly and
+Claude is called once, without tools, to phrase the answer (see intent.py).
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import os
-from typing import Any
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from app.core.singleflight import request_key
+
+from ..ai.llm_client import LLMClient
+from ..ai.prompt_cache import cached_system, cached_tools, with_message_breakpoint
+from .conversation import READ_TOOL, READ_TOOL_SCHEMA, compact_history, compact_tool_result, read_tool_result
+from .intent import Intent, classify_intent
 
-import anthropic
+if TYPE_CHECKING:
+    from app.core.cache import TTLCache
 
 logger = logging.getLogger("agents.orchestrator")
 
+# Per-tool timeouts (seconds). LLM-backed agents get more room than lookups.
+_DEFAULT_TOOL_TIMEOUT = 60.0
+_TOOL_TIMEOUTS: dict[str, float] = {
+    "check_vsme_compliance":      15.0,
+    "benchmark_vs_peers":         15.0,
+    "research_company":           30.0,
+    "calculate_ghg_emissions":    45.0,
+    "run_materiality_assessment": 90.0,
+    "write_report_sections":     120.0,
+}
+
+# Same input → same result. calculate_ghg_emissions only without LLM commentary.
+_MEMOIZED_TOOLS = {
+    "check_vsme_compliance", "benchmark_vs_peers", "calculate_ghg_emissions", "run_materiality_assessment",
+}
+
+# Tools that take the caller's company_id (set by the API route, never by Claude or the client)
+_COMPANY_TOOLS = {"benchmark_vs_peers"}
+
 # ---------------------------------------------------------------------------
 # Tool definitions — one per specialist capability
 # ---------------------------------------------------------------------------
@@ -60,7 +108,8 @@ _TOOLS: list[dict] = [
         "name": "assess_climate_risks",
         "description": (
             "Identificerer fysiske klimarisici (oversvømmelse, tørke, ekstremvarme) og transitionsrisici "
-            "(CO2-afgifter, regulering, markedsændringer) baseret på virksomhedens profil og branche."
+            "(CO2-afgifter, regulering, markedsændringer) baseret på virksomhedens profil og branche. "
+            "Med postnummer vurderes også lokationens eksponering for oversvømmelse, skybrud, stormflod og hede."
         ),
         "input_schema": {
             "type": "object",
@@ -71,6 +120,8 @@ _TOOLS: list[dict] = [
                 "scope1_co2e":    {"type": "number", "description": "Scope 1 CO2e i tCO2e"},
                 "scope2_co2e":    {"type": "number"},
                 "scope3_co2e":    {"type": "number"},
+                "zipcode":        {"type": "string", "description": "Postnummer for virksomhedens adresse (fra CVR)"},
+                "city":           {"type": "string"},
             },
             "required": ["industry_code"],
         },
@@ -138,7 +189,8 @@ _TOOLS: list[dict] = [
         "name": "benchmark_vs_peers",
         "description": (
             "Sammenligner virksomhedens ESG-score og CO2-aftryk med branchegennemsnittet "
-            "for SMV'er i Danmark. Returnerer percentilplacering og nøgleforskelle."
+            "for SMV'er i Danmark og med de mest sammenlignelige virksomheder på platformen (peers). "
+            "Returnerer percentilplacering og nøgleforskelle."
         ),
         "input_schema": {
             "type": "object",
@@ -147,6 +199,12 @@ _TOOLS: list[dict] = [
                 "esg_score_total":    {"type": "number"},
                 "total_co2e_tonnes":  {"type": "number"},
                 "employee_count":     {"type": "integer"},
+                "esg_score_e":        {"type": "number"},
+                "esg_score_s":        {"type": "number"},
+                "esg_score_g":        {"type": "number"},
+                "scope1_co2e":        {"type": "number", "description": "Scope 1 CO2e i tCO2e"},
+                "scope2_co2e":        {"type": "number"},
+                "revenue_eur":        {"type": "number"},
             },
             "required": ["industry_code", "esg_score_total"],
         },
@@ -180,6 +238,10 @@ _TOOLS: list[dict] = [
                 "scope3":         {"type": "object", "description": "Scope 3 data (employee_count, avg_commute_km_one_way, osv.)"},
                 "employee_count": {"type": "integer"},
                 "industry_code":  {"type": "string"},
+                "explain_anomalies": {
+                    "type": "boolean",
+                    "description": "AI-kommentarer til anomalier (standard true). Sæt false når kun tallene skal bruges — hurtigere.",
+                },
             },
             "required": [],
         },
@@ -222,8 +284,26 @@ _TOOLS: list[dict] = [
             "required": ["company_name", "calc_dict", "esg_score_dict"],
         },
     },
+    READ_TOOL_SCHEMA,
 ]
 
+# ---------------------------------------------------------------------------
+# Static system prompt — identical for every request, so it is prompt-cached
+# together with the tool schemas. Per-company context follows it uncached.
+# ---------------------------------------------------------------------------
+
+_SYSTEM_PROMPT = "\n".join([
+    "Du er ESG Copilot Orchestrator — en intelligent dansk ESG-rådgiver for SMV'er.",
+    "Du hjælper virksomheder med VSME Basic Modul (EFRAG 2024) rapportering og bæredygtighedsstrategi.",
+    "",
+    "REGLER:",
+    "1. Svar ALTID på dansk, professionelt og konkret.",
+    "2. Brug de tilgængelige værktøjer til at hente præcise data, inden du svarer.",
+    "3. Opfind aldrig tal — brug kun data fra værktøjsresultater eller den medfølgende kontekst.",
+    "4. Hold svar fokuserede og handlingsorienterede.",
+    "5. Afslut altid med et klart næste skridt eller en anbefaling.",
+])
+
 # ---------------------------------------------------------------------------
 # Orchestrator
 # ---------------------------------------------------------------------------
@@ -231,15 +311,14 @@ _TOOLS: list[dict] = [
 class AgentOrchestrator:
     """
     Master orchestrator: Claude with tool use routes to specialist agents.
-    Each specialist agent is imported lazily to avoid circular imports.
+    Specialist agents are long-lived instances from the AgentRegistry.
     """
 
+    MAX_TURNS = 8
+
     def __init__(self) -> None:
-        api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-        if not api_key:
-            raise RuntimeError("ANTHROPIC_API_KEY not set")
-        self._client = anthropic.AsyncAnthropic(api_key=api_key)
-        self._model = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-6")
+        self._llm = LLMClient(task="chat")   # fails fast if ANTHROPIC_API_KEY is missing
+        self._model = self._llm.model
 
     async def run(self, inputs: dict[str, Any]) -> dict[str, Any]:
         """
@@ -249,26 +328,68 @@ class AgentOrchestrator:
           user_message: str    — the user's question or request in Danish
           context: dict        — optional background data (company, submission, report)
           history: list        — optional prior conversation turns [{role, content}]
+          scope: str           — trusted tenant key set by the API route (never from `context`);
+                                 isolates memoized tool results and tool-result handles
+          company_id: str      — the caller's company, set by the API route; the only
+                                 company_id tools ever see (_COMPANY_TOOLS)
+        """
+        result: dict[str, Any] = {}
+        async for event, data in self.stream(inputs):
+            if event == "done":
+                result = data
+        return result
+
+    async def stream(self, inputs: dict[str, Any]) -> AsyncIterator[tuple[str, dict]]:
         """
+        The orchestration loop as (event, data) pairs, for SSE:
+
+          ("delta",       {"text"})                 — answer text as it is generated
+          ("tool_call",   {"tool"})                 — Claude started a tool call
+          ("tool_result", {"tool", "ok", "elapsed_s"})
+          ("done",        {"answer", "trace", "ok"}) — always last; same shape as run()
+        """
+        from app.core.config import settings
+
         user_message: str   = inputs.get("user_message", "")
         context: dict       = inputs.get("context", {})
         history: list       = inputs.get("history", [])
+        memo_scope: str     = inputs.get("scope", "")
+        company_id: str     = inputs.get("company_id", "")
 
-        system_prompt = self._build_system(context)
-        messages = list(history) + [{"role": "user", "content": user_message}]
+        system_prompt = cached_system(_SYSTEM_PROMPT, self._build_context(context))
+        tools = cached_tools(_TOOLS)
+        messages = await compact_history(history, settings.ORCHESTRATOR_HISTORY_TOKENS)
 
         trace: list[dict] = []
-        MAX_TURNS = 8
 
-        for _turn in range(MAX_TURNS):
-            response = await self._client.messages.create(
-                model=self._model,
+        # Unambiguous single-tool requests: run the tool directly, one Claude call to answer
+        intent = await classify_intent(user_message, context) if settings.ORCHESTRATOR_FAST_PATH_ENABLED else None
+        if intent is not None:
+            async for event, data in self._fast_path(
+                intent, user_message, system_prompt, messages, memo_scope, trace, company_id,
+            ):
+                yield event, data
+                if event == "done":
+                    return
+
+        messages.append({"role": "user", "content": user_message})
+
+        for _turn in range(self.MAX_TURNS):
+            response = None
+            async for ev in self._llm.stream(
+                system_prompt,
+                # Breakpoint on the newest turn: the next turn reads everything so far from cache
+                with_message_breakpoint(messages),
                 max_tokens=4096,
+                tools=tools,
                 temperature=0.2,
-                system=system_prompt,
-                tools=_TOOLS,  # type: ignore[arg-type]
-                messages=messages,
-            )
+            ):
+                if ev.type == "text":
+                    yield "delta", {"text": ev.text}
+                elif ev.type == "tool_use":
+                    yield "tool_call", {"tool": ev.name}
+                else:
+                    response = ev.message
 
             # Append assistant response to message history
             messages.append({"role": "assistant", "content": response.content})
@@ -279,26 +400,29 @@ class AgentOrchestrator:
                     (block.text for block in response.content if hasattr(block, "text")),
                     ""
                 )
-                return {"answer": answer, "trace": trace, "ok": True}
+                yield "done", {"answer": answer, "trace": trace, "ok": True}
+                return
 
             if response.stop_reason == "tool_use":
-                # Process all tool calls in this turn
+                # Run all tool calls of this turn concurrently
+                blocks = [block for block in response.content if block.type == "tool_use"]
+                results: list[dict] = [{}] * len(blocks)
+                async for i, agent_result, elapsed in self._run_tools(blocks, memo_scope, company_id):
+                    results[i] = agent_result
+                    yield "tool_result", {
+                        "tool": blocks[i].name,
+                        "ok": bool(agent_result.get("ok", True)),
+                        "elapsed_s": round(elapsed, 2),
+                    }
+
+                # Trace and tool_result blocks in tool_use order, whatever finished first
                 tool_results = []
-                for block in response.content:
-                    if block.type != "tool_use":
-                        continue
-                    tool_name: str = block.name
-                    tool_input: dict = block.input  # type: ignore[assignment]
-                    tool_use_id: str = block.id
-
-                    logger.info("Orchestrator → calling tool: %s", tool_name)
-                    agent_result = await self._dispatch(tool_name, tool_input)
-                    trace.append({"tool": tool_name, "input": tool_input, "output": agent_result})
-
+                for block, agent_result in zip(blocks, results):
+                    trace.append({"tool": block.name, "input": block.input, "output": agent_result})
                     tool_results.append({
                         "type": "tool_result",
-                        "tool_use_id": tool_use_id,
-                        "content": json.dumps(agent_result, ensure_ascii=False, default=str),
+                        "tool_use_id": block.id,
+                        "content": compact_tool_result(block.name, agent_result, memo_scope),
                     })
 
                 messages.append({"role": "user", "content": tool_results})
@@ -314,76 +438,110 @@ class AgentOrchestrator:
                 last_text = next((b.text for b in content if hasattr(b, "text")), "")
             elif isinstance(content, str):
                 last_text = content
-        return {"answer": last_text or "Beklager, kunne ikke fuldføre analysen.", "trace": trace, "ok": True}
+        yield "done", {"answer": last_text or "Beklager, kunne ikke fuldføre analysen.", "trace": trace, "ok": True}
+
+    async def _fast_path(
+        self, intent: Intent, user_message: str, system_prompt, messages: list[dict], memo_scope: str,
+        trace: list[dict], company_id: str = "",
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Run the intent's tool, then let Claude phrase the answer without tools.
+        Ends without "done" if the tool failed — the caller falls back to the full loop.
+        """
+        logger.info("Orchestrator fast-path (%s): %s", intent.source, intent.tool)
+        yield "tool_call", {"tool": intent.tool}
+        block = SimpleNamespace(name=intent.tool, input=intent.tool_input)
+        agent_result: dict = {"ok": False, "error": "Værktøjet returnerede intet resultat"}
+        async for _i, agent_result, elapsed in self._run_tools([block], memo_scope, company_id):
+            yield "tool_result", {
+                "tool": intent.tool,
+                "ok": bool(agent_result.get("ok", True)),
+                "elapsed_s": round(elapsed, 2),
+            }
+        trace.append({"tool": intent.tool, "input": intent.tool_input, "output": agent_result, "fast_path": True})
+        if not agent_result.get("ok", True):
+            return
+
+        prompt = (
+            f"Resultat fra {intent.tool}:\n{compact_tool_result(intent.tool, agent_result, memo_scope)}\n\n"
+            f"Besvar brugerens besked ud fra resultatet:\n{user_message}"
+        )
+        parts: list[str] = []
+        async for ev in self._llm.stream(
+            system_prompt, [*messages, {"role": "user", "content": prompt}], max_tokens=2048, temperature=0.2,
+        ):
+            if ev.type == "text":
+                parts.append(ev.text)
+                yield "delta", {"text": ev.text}
+        yield "done", {"answer": "".join(parts), "trace": trace, "ok": True}
 
     # ------------------------------------------------------------------
     # Tool dispatch
     # ------------------------------------------------------------------
 
-    async def _dispatch(self, tool_name: str, tool_input: dict) -> dict:
-        """Route a tool call to the correct specialist agent."""
-        # Lazy imports to avoid circular dependencies
-        if tool_name == "check_vsme_compliance":
-            from .vsme_compliance import VSMEComplianceAgent
-            return await VSMEComplianceAgent().safe_run(tool_input)
-
-        elif tool_name == "assess_climate_risks":
-            from .climate_risk import ClimateRiskAgent
-            return await ClimateRiskAgent().safe_run(tool_input)
-
-        elif tool_name == "generate_improvement_actions":
-            from .improvement import ImprovementAgent
-            return await ImprovementAgent().safe_run(tool_input)
-
-        elif tool_name == "build_roadmap":
-            from .roadmap import RoadmapAgent
-            return await RoadmapAgent().safe_run(tool_input)
-
-        elif tool_name == "validate_report_quality":
-            from .qa_validator import QAValidatorAgent
-            return await QAValidatorAgent().safe_run(tool_input)
-
-        elif tool_name == "benchmark_vs_peers":
-            from .benchmark import BenchmarkAgent
-            return await BenchmarkAgent().safe_run(tool_input)
-
-        elif tool_name == "research_company":
-            from .company_researcher import CompanyResearcherAgent
-            return await CompanyResearcherAgent().safe_run(tool_input)
-
-        elif tool_name == "calculate_ghg_emissions":
-            from .ghg_calculator import GHGCalculatorAgent
-            return await GHGCalculatorAgent().safe_run(tool_input)
-
-        elif tool_name == "run_materiality_assessment":
-            from .materiality_assessor import MaterialityAssessorAgent
-            return await MaterialityAssessorAgent().safe_run(tool_input)
-
-        elif tool_name == "write_report_sections":
-            from .report_writer_agent import ReportWriterAgent
-            return await ReportWriterAgent().safe_run(tool_input)
+    async def _run_tools(
+        self, blocks: list, memo_scope: str = "", company_id: str = "",
+    ) -> AsyncIterator[tuple[int, dict, float]]:
+        """
+        Dispatch every tool_use block concurrently. Yields (block index, result,
+        elapsed seconds) as each call finishes. Pending calls are cancelled if
+        the consumer stops early (client disconnected).
+        """
+        async def call(i: int, block) -> tuple[int, dict, float]:
+            timeout = _TOOL_TIMEOUTS.get(block.name, _DEFAULT_TOOL_TIMEOUT)
+            logger.info("Orchestrator → calling tool: %s", block.name)
+            started = time.perf_counter()
+            try:
+                tool_input = _with_company(block.name, block.input, company_id)
+                result = await asyncio.wait_for(self._dispatch(block.name, tool_input, memo_scope), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Orchestrator tool %s timed out after %.0fs", block.name, timeout)
+                result = {"ok": False, "error": f"Værktøjet svarede ikke inden for {timeout:.0f} sekunder"}
+            return i, result, time.perf_counter() - started
+
+        pending = {asyncio.ensure_future(call(i, block)) for i, block in enumerate(blocks)}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _dispatch(self, tool_name: str, tool_input: dict, memo_scope: str = "") -> dict:
+        """
+        Route a tool call to the shared instance of the specialist agent.
+        Successful results of deterministic tools are memoized per `memo_scope` (company).
+        """
+        from .registry import get_agent_registry   # lazy — registry imports this module
 
-        else:
+        if tool_name == READ_TOOL:
+            return read_tool_result(tool_input, memo_scope)
+        agent = get_agent_registry().for_tool(tool_name)
+        if agent is None:
             return {"ok": False, "error": f"Unknown tool: {tool_name}"}
 
+        key = _memo_key(tool_name, tool_input, memo_scope)
+        if key is not None:
+            cached = _tool_memo().get(key)
+            if cached is not None:
+                logger.info("Orchestrator → %s answered from memo", tool_name)
+                return {**cached, "memoized": True}
+        result = await agent.safe_run(tool_input)
+        if key is not None and result.get("ok", True):
+            _tool_memo().set(key, result)
+        return result
+
     # ------------------------------------------------------------------
     # System prompt
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _build_system(context: dict) -> str:
+    def _build_context(context: dict) -> str | None:
+        """Per-request addendum to _SYSTEM_PROMPT (not cached)."""
         company_name = context.get("company_name", "virksomheden")
-        lines = [
-            "Du er ESG Copilot Orchestrator — en intelligent dansk ESG-rådgiver for SMV'er.",
-            "Du hjælper virksomheder med VSME Basic Modul (EFRAG 2024) rapportering og bæredygtighedsstrategi.",
-            "",
-            "REGLER:",
-            "1. Svar ALTID på dansk, professionelt og konkret.",
-            "2. Brug de tilgængelige værktøjer til at hente præcise data, inden du svarer.",
-            "3. Opfind aldrig tal — brug kun data fra værktøjsresultater eller den medfølgende kontekst.",
-            "4. Hold svar fokuserede og handlingsorienterede.",
-            "5. Afslut altid med et klart næste skridt eller en anbefaling.",
-        ]
+        lines: list[str] = []
         if company_name != "virksomheden":
             lines.append(f"\nDu arbejder aktuelt med: {company_name}")
 
@@ -395,4 +553,42 @@ class AgentOrchestrator:
         if context.get("industry_code"):
             lines.append(f"Branche: {context['industry_code']}")
 
-        return "\n".join(lines)
+        return "\n" + "\n".join(lines) if lines else None
+
+
+def _with_company(tool_name: str, tool_input: dict, company_id: str) -> dict:
+    """Replace any company_id from Claude or the client with the caller's own."""
+    if tool_name not in _COMPANY_TOOLS:
+        return tool_input
+    tool_input = {k: v for k, v in tool_input.items() if k != "company_id"}
+    if company_id:
+        tool_input["company_id"] = company_id
+    return tool_input
+
+
+# ---------------------------------------------------------------------------
+# Tool-result memo
+# ---------------------------------------------------------------------------
+
+def _memo_key(tool_name: str, tool_input: dict, memo_scope: str) -> str | None:
+    from app.core.config import settings
+
+    if not settings.ORCHESTRATOR_TOOL_MEMO_ENABLED or tool_name not in _MEMOIZED_TOOLS:
+        return None
+    if not memo_scope:                 # no trusted tenant — don't share results
+        return None
+    if tool_name == "calculate_ghg_emissions" and tool_input.get("explain_anomalies", True):
+        return None
+    return request_key(memo_scope, tool_name, tool_input)
+
+
+_memo: TTLCache | None = None
+
+
+def _tool_memo() -> TTLCache:
+    global _memo
+    if _memo is None:
+        from app.core.cache import TTLCache
+        from app.core.config import settings
+        _memo = TTLCache(settings.ORCHESTRATOR_TOOL_MEMO_MAX_ENTRIES, settings.ORCHESTRATOR_TOOL_MEMO_TTL_SECONDS)
+    return _memo
@@ -17,6 +17,10 @@ from typing import Any
 
 from .base import BaseAgent
 from ..ai.llm_client import LLMClient
+from ..document_processor.context_packer import PassageIndex
+
+# Passages mentioning these (or the cross-validation figures) are reviewed first
+_QA_KEYWORDS = ["co2", "co2e", "tco2e", "scope", "kwh", "medarbejdere", "score", "mål", "reduktion"]
 
 
 class QAValidatorAgent(BaseAgent):
@@ -31,9 +35,11 @@ class QAValidatorAgent(BaseAgent):
         "governance_narrative",
     ]
 
+    CONTEXT_TOKENS = 800
+
     def __init__(self) -> None:
         super().__init__()
-        self._llm = LLMClient()
+        self._llm = LLMClient(task="qa_review")
 
     async def run(self, inputs: dict[str, Any]) -> dict[str, Any]:
         """
@@ -63,9 +69,10 @@ class QAValidatorAgent(BaseAgent):
                 if not found:
                     issues.append(f"CO2-total ({total:.0f} tCO2e) ikke nævnt i resumé")
 
-        # 3. LLM quality check
-        all_text = "\n\n---\n\n".join(
-            f"[{k}]\n{v}" for k, v in sections.items() if v
+        # 3. LLM quality check — on the passages with the most figures to check,
+        #    not just the first 3000 characters
+        all_text = PassageIndex.from_sections(sections).pack(
+            self.CONTEXT_TOKENS, keywords=_QA_KEYWORDS + _figures(co2_data, esg_scores),
         )
         if all_text:
             system = (
@@ -76,7 +83,7 @@ class QAValidatorAgent(BaseAgent):
             co2_ctx = f"CO2-data til krydsvalidering: {co2_data}" if co2_data else ""
             score_ctx = f"ESG-scorer til krydsvalidering: {esg_scores}" if esg_scores else ""
             prompt = (
-                f"Rapporttekst:\n{all_text[:3000]}\n\n"
+                f"Rapporttekst:\n{all_text}\n\n"
                 f"{co2_ctx}\n{score_ctx}\n\n"
                 "Evaluer:\n"
                 "1. Er sprogkvaliteten professionel og konsistent dansk?\n"
@@ -104,3 +111,13 @@ class QAValidatorAgent(BaseAgent):
             "qa_narrative":  qa_text,
             "passed":        quality_score >= 70 and len(issues) == 0,
         }
+
+
+def _figures(*sources: dict) -> list[str]:
+    """Rounded numeric values from the cross-validation dicts, as keywords."""
+    figures = []
+    for source in sources:
+        for value in (source or {}).values():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+                figures.append(str(round(value)))
+    return figures
@@ -0,0 +1,122 @@
+"""
+AgentRegistry
+==============
+Long-lived specialist agent instances, shared by the /agent routes and the
+orchestrator's tool dispatch.
+
+Agents hold no per-request state — only their LLMClient (which uses the shared
+pooled Anthropic client) and helpers such as GHGCalculatorAgent's
+CO2Calculator — so one instance per class serves every request.
+Previously each route call and each orchestrator tool call built a fresh agent.
+
+    agent = get_agent(ClimateRiskAgent)
+    result = await agent.safe_run({...})
+
+    agent = get_agent_registry().for_tool("assess_climate_risks")
+
+Instances are created on first use; `warm()` creates them all at app start-up
+and `shutdown_agent_registry()` drops them on shutdown (see main.lifespan).
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from typing import TypeVar
+
+logger = logging.getLogger("agents.registry")
+
+T = TypeVar("T")
+
+# Orchestrator tool name → (module, class) of the specialist agent that serves it
+TOOL_AGENTS: dict[str, tuple[str, str]] = {
+    "check_vsme_compliance":        ("vsme_compliance", "VSMEComplianceAgent"),
+    "assess_climate_risks":         ("climate_risk", "ClimateRiskAgent"),
+    "generate_improvement_actions": ("improvement", "ImprovementAgent"),
+    "build_roadmap":                ("roadmap", "RoadmapAgent"),
+    "validate_report_quality":      ("qa_validator", "QAValidatorAgent"),
+    "benchmark_vs_peers":           ("benchmark", "BenchmarkAgent"),
+    "research_company":             ("company_researcher", "CompanyResearcherAgent"),
+    "calculate_ghg_emissions":      ("ghg_calculator", "GHGCalculatorAgent"),
+    "run_materiality_assessment":   ("materiality_assessor", "MaterialityAssessorAgent"),
+    "write_report_sections":        ("report_writer_agent", "ReportWriterAgent"),
+}
+
+# Created by warm() in addition to the tool agents
+_EXTRA_AGENTS: list[tuple[str, str]] = [
+    ("sustainability_coach", "SustainabilityCoachAgent"),
+    ("orchestrator", "AgentOrchestrator"),
+]
+
+
+def _load_class(module: str, cls_name: str) -> type:
+    return getattr(importlib.import_module(f"{__package__}.{module}"), cls_name)
+
+
+class AgentRegistry:
+    def __init__(self) -> None:
+        self._instances: dict[type, object] = {}
+        self._tool_classes: dict[str, type] = {}
+        self._lock = threading.Lock()
+
+    def get(self, agent_cls: type[T]) -> T:
+        """The shared instance of `agent_cls` (created on first use)."""
+        agent = self._instances.get(agent_cls)
+        if agent is None:
+            with self._lock:
+                agent = self._instances.get(agent_cls)
+                if agent is None:
+                    agent = agent_cls()
+                    self._instances[agent_cls] = agent
+        return agent  # type: ignore[return-value]
+
+    def for_tool(self, tool_name: str):
+        """Agent serving an orchestrator tool, or None for an unknown tool."""
+        cls = self._tool_classes.get(tool_name)
+        if cls is None:
+            spec = TOOL_AGENTS.get(tool_name)
+            if spec is None:
+                return None
+            cls = self._tool_classes[tool_name] = _load_class(*spec)
+        return self.get(cls)
+
+    def warm(self) -> int:
+        """Instantiate every agent now. Returns how many are ready."""
+        skipped: list[str] = []
+        for module, cls_name in [*TOOL_AGENTS.values(), *_EXTRA_AGENTS]:
+            try:
+                self.get(_load_class(module, cls_name))
+            except RuntimeError as exc:
+                # No ANTHROPIC_API_KEY — LLM agents are created (and fail) on first use instead
+                skipped.append(cls_name)
+                reason = str(exc)
+        if skipped:
+            logger.warning("Agents not preloaded (%s): %s", reason, ", ".join(skipped))
+        return len(self._instances)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._instances.clear()
+
+
+# Module-level singleton
+_registry: AgentRegistry | None = None
+
+
+def get_agent_registry() -> AgentRegistry:
+    global _registry
+    if _registry is None:
+        _registry = AgentRegistry()
+    return _registry
+
+
+def get_agent(agent_cls: type[T]) -> T:
+    return get_agent_registry().get(agent_cls)
+
+
+def shutdown_agent_registry() -> None:
+    global _registry
+    if _registry is not None:
+        _registry.shutdown()
+        _registry = None
@@ -128,7 +128,8 @@ class ReportWriterAgent(BaseAgent):
         # Optional QA validation
         if run_qa:
             from .qa_validator import QAValidatorAgent
-            qa_result = await QAValidatorAgent().safe_run({
+            from .registry import get_agent
+            qa_result = await get_agent(QAValidatorAgent).safe_run({
                 "report_sections": result["sections"],
                 "co2_data": calc_dict,
                 "esg_scores": score_dict,
@@ -18,7 +18,7 @@ class RoadmapAgent(BaseAgent):
 
     def __init__(self) -> None:
         super().__init__()
-        self._llm = LLMClient()
+        self._llm = LLMClient(task="roadmap")
 
     async def run(self, inputs: dict[str, Any]) -> dict[str, Any]:
         """
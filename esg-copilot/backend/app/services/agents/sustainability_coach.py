@@ -9,14 +9,25 @@ Handles:
   - VSME/CSRD compliance questions
   - Personalised advice based on company context
   - Practical next steps and troubleshooting
+
+First-turn questions are answered from a response cache when the same
+question was asked before with the same company context ("hvad er Scope 3?",
+"hvor uploader jeg en elregning?"). Key: normalised message + fingerprint of
+the company status block + PROMPT_VERSION + model. See core/cache.py.
 """
 
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+import re
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from .base import BaseAgent
 from ..ai.llm_client import LLMClient
+from ..ai.prompt_cache import cached_system
+
+if TYPE_CHECKING:
+    from app.core.cache import TieredCache
 
 _SYSTEM_PROMPT = """Du er ESG Coach — den indbyggede assistent i ESG Copilot platformen.
 
@@ -165,6 +176,13 @@ Gå til "Forbedringer" i menuen — her vises præcis hvilke tiltag der vil forb
 → Direktive CSRD kræver ikke noget af ikke-børsnoterede SMV'er endnu. Men jeres kunder og banker efterspørger ESG-data, og VSME Basic Module er det anerkendte svar.
 """
 
+_GREETING = "Hej! Jeg er din ESG Coach. Hvad kan jeg hjælpe dig med?"
+_MAX_TOKENS = 800
+
+# Bump when _SYSTEM_PROMPT changes meaningfully — invalidates cached answers
+PROMPT_VERSION = "1.0"
+_MAX_CACHED_QUESTION_CHARS = 300    # longer messages are rarely repeated verbatim
+
 
 class SustainabilityCoachAgent(BaseAgent):
     """Conversational Danish ESG coach + ESG Copilot system expert."""
@@ -173,7 +191,7 @@ class SustainabilityCoachAgent(BaseAgent):
 
     def __init__(self) -> None:
         super().__init__()
-        self._llm = LLMClient()
+        self._llm = LLMClient(task="chat")
 
     async def run(self, inputs: dict[str, Any]) -> dict[str, Any]:
         """
@@ -182,41 +200,67 @@ class SustainabilityCoachAgent(BaseAgent):
           history: list[dict] — prior turns [{role, content}]
           context: dict       — company context (name, score, page, etc.)
         """
+        if not inputs.get("message", "").strip():
+            return {"ok": True, "response": _GREETING}
+
+        key = self._cache_key(inputs)
+        response = await get_coach_cache().get(key) if key else None
+        if response is None:
+            system, messages = self._prepare(inputs)
+            response = await self._llm.chat(system, messages, max_tokens=_MAX_TOKENS)
+            if key and response:
+                await get_coach_cache().set(key, response)
+
+        return {
+            "ok":       True,
+            "response": response,
+            "role":     "assistant",
+        }
+
+    async def stream(self, inputs: dict[str, Any]) -> AsyncIterator[str]:
+        """Same inputs as run(); yields the answer as text deltas while it is generated."""
+        if not inputs.get("message", "").strip():
+            yield _GREETING
+            return
+
+        key = self._cache_key(inputs)
+        cached = await get_coach_cache().get(key) if key else None
+        if cached is not None:
+            yield cached
+            return
+
+        system, messages = self._prepare(inputs)
+        parts: list[str] = []
+        async for event in self._llm.stream(system, messages, max_tokens=_MAX_TOKENS):
+            if event.type == "text":
+                parts.append(event.text)
+                yield event.text
+        if key and parts:
+            await get_coach_cache().set(key, "".join(parts))
+
+    def _cache_key(self, inputs: dict[str, Any]) -> str | None:
+        """Response-cache key, or None when the answer depends on the conversation so far."""
+        from app.core.config import settings
+
+        message = inputs.get("message", "")
+        if not settings.COACH_CACHE_ENABLED or inputs.get("history") or len(message) > _MAX_CACHED_QUESTION_CHARS:
+            return None
+        normalised = re.sub(r"\s+", " ", message.lower()).strip().rstrip("?!. ")
+        h = hashlib.sha256()
+        for part in (PROMPT_VERSION, self._llm.model, normalised, _company_status(inputs.get("context", {})) or ""):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    @staticmethod
+    def _prepare(inputs: dict[str, Any]) -> tuple[list[dict] | str, list[dict[str, str]]]:
+        """System prompt (static part cached) and message thread for one turn."""
         message = inputs.get("message", "")
         history = inputs.get("history", [])
         context = inputs.get("context", {})
 
-        if not message.strip():
-            return {"ok": True, "response": "Hej! Jeg er din ESG Coach. Hvad kan jeg hjælpe dig med?"}
-
-        # Build contextual addendum from company data
-        ctx_lines = []
-        if context.get("company_name"):
-            ctx_lines.append(f"Virksomhed: {context['company_name']}")
-        if context.get("esg_score_total"):
-            ctx_lines.append(
-                f"Aktuel ESG-score: {context['esg_score_total']}/100 "
-                f"(Rating: {context.get('esg_rating', '?')})"
-            )
-        if context.get("esg_score_e") is not None:
-            ctx_lines.append(
-                f"E-score: {context['esg_score_e']}/40  "
-                f"S-score: {context.get('esg_score_s', '?')}/30  "
-                f"G-score: {context.get('esg_score_g', '?')}/30"
-            )
-        if context.get("industry_code"):
-            ctx_lines.append(f"Branche: {context['industry_code']}")
-        if context.get("total_co2e_tonnes"):
-            ctx_lines.append(f"CO₂-aftryk: {context['total_co2e_tonnes']:.1f} tCO₂e/år")
-        if context.get("current_page"):
-            ctx_lines.append(f"Brugerens aktuelle side i systemet: {context['current_page']}")
-        if context.get("completion_pct") is not None:
-            ctx_lines.append(f"Guide-udfyldelse: {context['completion_pct']}% færdig")
-
-        system = _SYSTEM_PROMPT
-        if ctx_lines:
-            system += "\n\n## VIRKSOMHEDENS AKTUELLE STATUS\n" + "\n".join(ctx_lines)
-            system += "\n\nBrug denne kontekst til at give personlige og præcise svar."
+        # Static prompt is cached; the per-company status block follows it uncached
+        system = cached_system(_SYSTEM_PROMPT, _company_status(context))
 
         # Build message thread
         messages: list[dict[str, str]] = []
@@ -226,11 +270,62 @@ class SustainabilityCoachAgent(BaseAgent):
             if role in ("user", "assistant") and content:
                 messages.append({"role": role, "content": content})
         messages.append({"role": "user", "content": message})
-
-        response = await self._llm.chat(system, messages, max_tokens=800)
-
-        return {
-            "ok":       True,
-            "response": response,
-            "role":     "assistant",
-        }
+        return system, messages
+
+
+def _company_status(context: dict[str, Any]) -> str | None:
+    """Contextual addendum from company data (None without context)."""
+    ctx_lines = []
+    if context.get("company_name"):
+        ctx_lines.append(f"Virksomhed: {context['company_name']}")
+    if context.get("esg_score_total"):
+        ctx_lines.append(
+            f"Aktuel ESG-score: {context['esg_score_total']}/100 "
+            f"(Rating: {context.get('esg_rating', '?')})"
+        )
+    if context.get("esg_score_e") is not None:
+        ctx_lines.append(
+            f"E-score: {context['esg_score_e']}/40  "
+            f"S-score: {context.get('esg_score_s', '?')}/30  "
+            f"G-score: {context.get('esg_score_g', '?')}/30"
+        )
+    if context.get("industry_code"):
+        ctx_lines.append(f"Branche: {context['industry_code']}")
+    if context.get("total_co2e_tonnes"):
+        ctx_lines.append(f"CO₂-aftryk: {context['total_co2e_tonnes']:.1f} tCO₂e/år")
+    if context.get("current_page"):
+        ctx_lines.append(f"Brugerens aktuelle side i systemet: {context['current_page']}")
+    if context.get("completion_pct") is not None:
+        ctx_lines.append(f"Guide-udfyldelse: {context['completion_pct']}% færdig")
+
+    company_status = None
+    if ctx_lines:
+        company_status = "\n\n## VIRKSOMHEDENS AKTUELLE STATUS\n" + "\n".join(ctx_lines)
+        company_status += "\n\nBrug denne kontekst til at give personlige og præcise svar."
+    return company_status
+
+
+# Module-level singleton
+_cache: TieredCache | None = None
+
+
+def get_coach_cache() -> TieredCache:
+    global _cache
+    if _cache is None:
+        from app.core.cache import TieredCache
+        from app.core.config import settings
+        _cache = TieredCache(
+            "coach",
+            ttl_seconds=settings.COACH_CACHE_TTL_SECONDS,
+            max_entries=settings.COACH_CACHE_MAX_ENTRIES,
+            redis_url=settings.REDIS_URL if settings.COACH_CACHE_BACKEND == "redis" else None,
+            local_ttl_seconds=settings.COACH_CACHE_LOCAL_TTL_SECONDS,
+        )
+    return _cache
+
+
+async def shutdown_coach_cache() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.aclose()
+        _cache = None
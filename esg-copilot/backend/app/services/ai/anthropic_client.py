@@ -0,0 +1,101 @@
+"""
+Anthropic Client Factory — ESG Copilot
+=======================================
+One process-wide `anthropic.AsyncAnthropic` with a keep-alive connection pool,
+shared by LLMClient, the orchestrator, document extraction and materiality.
+
+Creating a client per call meant a fresh httpx pool — and a fresh TLS
+handshake — for every LLM request. With the shared client, connections to
+api.anthropic.com are reused across requests.
+
+    client = get_anthropic_client()
+    response = await client.messages.create(...)
+
+httpx connections belong to the event loop they were opened on. The API runs
+one loop for its lifetime; Celery tasks run one loop per task, so the client
+is rebuilt when it is requested from a different loop.
+
+Closed on app shutdown by `close_anthropic_client()` (see main.lifespan).
+
+With ANTHROPIC_TRANSPORT=record|replay the client talks to fixture files
+instead of (or in addition to) the API — see replay_transport.py. Replay
+needs no API key.
+"""
+
+import asyncio
+import logging
+import os
+
+import anthropic
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: anthropic.AsyncAnthropic | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _api_key() -> str:
+    from app.core.config import settings
+    key = os.environ.get("ANTHROPIC_API_KEY", "") or settings.ANTHROPIC_API_KEY
+    if not key and settings.ANTHROPIC_TRANSPORT == "replay":
+        return "replay"              # never sent anywhere
+    return key
+
+
+def _build_client(api_key: str) -> anthropic.AsyncAnthropic:
+    from app.core.config import settings
+
+    from .replay_transport import build_transport_from_settings
+
+    http_client = anthropic.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.ANTHROPIC_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        transport=build_transport_from_settings(),     # None = real API
+    )
+    logger.info(
+        "Anthropic client created (max_connections=%d, keepalive=%d)",
+        settings.ANTHROPIC_MAX_CONNECTIONS, settings.ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    # Retries are handled by resilience.py (retry-after, jitter, circuit breaker)
+    return anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client, max_retries=0)
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Shared pooled client. Raises RuntimeError if ANTHROPIC_API_KEY is not set."""
+    global _client, _client_loop
+    api_key = _api_key()
+    if not api_key:
+        raise RuntimeError("ANTHROPIC_API_KEY not set")
+
+    loop = _running_loop()
+    if _client is not None and _client_loop is not None and loop is not None and loop is not _client_loop:
+        # Previous loop (e.g. a finished Celery task) — its connections are unusable
+        _client = None
+    if _client is None:
+        _client = _build_client(api_key)
+        _client_loop = loop
+    elif _client_loop is None:
+        _client_loop = loop
+    return _client
+
+
+async def close_anthropic_client() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        try:
+            await _client.close()
+        except Exception as exc:
+            logger.warning("Closing Anthropic client failed: %s", exc)
+        _client = None
+        _client_loop = None
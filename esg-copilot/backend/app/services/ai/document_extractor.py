@@ -20,11 +20,14 @@ Supported document types:
 import base64
 import json
 import logging
-import os
 import re
 from typing import Literal, TypedDict
 
-import anthropic
+from app.core.singleflight import SingleFlight, request_key
+
+from .anthropic_client import get_anthropic_client
+from .prompt_cache import cached_system
+from .model_router import create_message_for
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,9 @@ DocumentType = Literal[
     "fuel_receipt", "waste_invoice", "general"
 ]
 
+# The same file uploaded twice while the first extraction runs → one Claude call
+_flight = SingleFlight("extraction")
+
 # Field descriptions for each document type — tells Claude what to look for
 _FIELD_TARGETS: dict[str, dict] = {
     "electricity_bill": {
@@ -128,12 +134,7 @@ async def extract_document_data(
     Returns:
         ExtractionResult with extracted fields, confidence, and raw excerpt
     """
-    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-    if not api_key:
-        raise RuntimeError("ANTHROPIC_API_KEY not set")
-
-    model = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-6")
-    client = anthropic.AsyncAnthropic(api_key=api_key)
+    get_anthropic_client()       # fail fast if ANTHROPIC_API_KEY is missing
 
     target = _FIELD_TARGETS.get(document_type, _FIELD_TARGETS["general"])
     fields_list = "\n".join(f'    "{f}": <number|string|null>' for f in target["fields"])
@@ -158,38 +159,30 @@ Returner præcis dette JSON-format:
 
     logger.info("Running document extraction: type=%s ext=%s size=%d bytes", document_type, file_extension, len(file_bytes))
 
-    import asyncio
-    last_err = None
-    for attempt in range(1, 4):
-        try:
-            response = await client.messages.create(
-                model=model,
-                max_tokens=1000,
-                temperature=0.1,   # Very low — extraction should be deterministic
-                system=_SYSTEM,
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "document" if file_extension == ".pdf" else "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": content_type,
-                                "data": encoded,
-                            },
+    response = await _flight.do(
+        request_key(file_bytes, file_extension, document_type),
+        lambda: create_message_for(
+            "extraction",
+            max_tokens=1000,
+            temperature=0.1,   # Very low — extraction should be deterministic
+            system=cached_system(_SYSTEM),
+            messages=[{
+                "role": "user",
+                "content": [
+                    {
+                        "type": "document" if file_extension == ".pdf" else "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": content_type,
+                            "data": encoded,
                         },
-                        {"type": "text", "text": user_prompt},
-                    ],
-                }],
-            )
-            raw = response.content[0].text.strip() if response.content else "{}"
-            break
-        except (anthropic.RateLimitError, anthropic.InternalServerError) as e:
-            logger.warning("Document extractor attempt %d failed: %s", attempt, e)
-            last_err = e
-            await asyncio.sleep(5 * attempt)
-    else:
-        raise RuntimeError(f"Document extraction failed after retries: {last_err}")
+                    },
+                    {"type": "text", "text": user_prompt},
+                ],
+            }],
+        ),
+    )
+    raw = response.content[0].text.strip() if response.content else "{}"
 
     result = _parse_extraction_response(raw, document_type)
     logger.info(
@@ -6,20 +6,39 @@ Thin wrapper around Anthropic Claude API for narrative generation only.
 Rules:
 - Temperature kept at 0.3 for consistent, factual output
 - All prompts must include calculated numbers — LLM never invents figures
-- Retry on transient errors (rate limits, timeouts)
+- Retry on transient errors (rate limits, overload, timeouts) — see resilience.py
+- Every request holds a governor slot (see llm_governor.py)
+- System prompts are sent as cacheable blocks (see prompt_cache.py)
+- The model is chosen per task type (see model_router.py)
+- Identical calls already in flight are joined, not repeated (core/singleflight.py)
 """
 
-import os
 import logging
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
 
 import anthropic
 
+from app.core.singleflight import SingleFlight, request_key
+
+from .anthropic_client import get_anthropic_client
+from .llm_governor import llm_slot
+from .model_router import route_for
+from .prompt_cache import cached_system
+from .resilience import TRANSIENT_ERRORS, RetryLoop, create_message_with_model
+
 logger = logging.getLogger(__name__)
 
-MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = 2
-OVERLOAD_DELAY_SECONDS = 8  # 529 needs longer waits — but cap total latency for web requests
+_flight = SingleFlight("llm")
+
+
+@dataclass
+class StreamEvent:
+    """One event from LLMClient.stream()."""
+    type: str                 # "text" | "tool_use" | "message"
+    text: str = ""            # text delta
+    name: str = ""            # tool name (tool_use)
+    message: Any = None       # final anthropic Message (message)
 
 
 class LLMClient:
@@ -27,29 +46,44 @@ class LLMClient:
     Anthropic Claude API wrapper for structured narrative generation.
 
     Usage:
-        client = LLMClient()
+        client = LLMClient()                   # or LLMClient(task="qa_review")
         text = await client.generate(system_prompt, user_prompt)
+        async for event in client.stream(system_prompt, messages):
+            if event.type == "text": ...
     """
 
-    def __init__(self):
-        api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-        if not api_key:
-            raise RuntimeError("ANTHROPIC_API_KEY environment variable is not set")
-        self.client = anthropic.AsyncAnthropic(api_key=api_key)
-        self.model = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-6")
+    def __init__(self, task: str = "narrative"):
+        get_anthropic_client()       # fail fast if ANTHROPIC_API_KEY is missing
+        self.route = route_for(task)
+        self.model = self.route.model
         self.temperature = 0.3       # Low = more deterministic, less hallucination
         self.default_max_tokens = 2000
 
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """Shared pooled client (see anthropic_client.py)."""
+        return get_anthropic_client()
+
     async def generate(
         self,
-        system_prompt: str,
+        system_prompt: str | list[dict],
         user_prompt: str,
         max_tokens: Optional[int] = None,
     ) -> str:
         """
-        Generate narrative text (single-turn). Retries up to MAX_RETRIES on transient errors.
+        Generate narrative text (single-turn). Transient errors are retried (see resilience.py).
         Raises RuntimeError if all retries exhausted.
         """
+        text, _model = await self.generate_with_model(system_prompt, user_prompt, max_tokens)
+        return text
+
+    async def generate_with_model(
+        self,
+        system_prompt: str | list[dict],
+        user_prompt: str,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, str]:
+        """generate(), plus the model that answered — self.model, or route.fallback_model after failures."""
         return await self._call(
             system_prompt=system_prompt,
             messages=[{"role": "user", "content": user_prompt}],
@@ -58,57 +92,123 @@ class LLMClient:
 
     async def chat(
         self,
-        system_prompt: str,
+        system_prompt: str | list[dict],
         history: list[dict],
         max_tokens: Optional[int] = None,
     ) -> str:
         """
         Multi-turn chat completion. history is a list of {role, content} dicts.
         The last message must have role="user".
+        system_prompt may be a prompt_cache.cached_system(static, dynamic) block list
+        so that only the static part is cached.
         Raises RuntimeError if all retries exhausted.
         """
-        return await self._call(
+        text, _model = await self._call(
             system_prompt=system_prompt,
             messages=history,
             max_tokens=max_tokens,
         )
+        return text
 
     async def _call(
         self,
-        system_prompt: str,
+        system_prompt: str | list[dict],
         messages: list[dict],
         max_tokens: Optional[int] = None,
-    ) -> str:
-        """Internal: call Anthropic API with retry logic."""
-        import asyncio
-
-        last_error = None
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                response = await self.client.messages.create(
+    ) -> tuple[str, str]:
+        """Internal: one resilient messages.create call. Returns (text, model that answered)."""
+        system = cached_system(system_prompt) if isinstance(system_prompt, str) else system_prompt
+        params: dict[str, Any] = dict(
+            temperature=self.temperature,
+            max_tokens=max_tokens or self.default_max_tokens,
+            system=system,
+            messages=messages,
+        )
+        with self.route.timed():
+            response, model = await _flight.do(
+                request_key(self.model, params),
+                lambda: create_message_with_model(
                     model=self.model,
-                    temperature=self.temperature,
-                    max_tokens=max_tokens or self.default_max_tokens,
-                    system=system_prompt,
-                    messages=messages,
-                )
-                return response.content[0].text if response.content else ""
-
-            except anthropic.RateLimitError as e:
-                logger.warning("Anthropic rate limit hit (attempt %d/%d). Waiting %ds.", attempt, MAX_RETRIES, RETRY_DELAY_SECONDS * attempt)
-                last_error = e
-                await asyncio.sleep(RETRY_DELAY_SECONDS * attempt)
-
-            except anthropic.InternalServerError as e:
-                # 529 Overloaded — use longer backoff than rate limits
-                wait = OVERLOAD_DELAY_SECONDS * attempt
-                logger.warning("Anthropic overloaded (attempt %d/%d). Waiting %ds.", attempt, MAX_RETRIES, wait)
-                last_error = e
-                await asyncio.sleep(wait)
-
-            except (anthropic.APITimeoutError, anthropic.APIConnectionError) as e:
-                logger.warning("Anthropic transient error (attempt %d/%d): %s", attempt, MAX_RETRIES, e)
-                last_error = e
-                await asyncio.sleep(RETRY_DELAY_SECONDS)
-
-        raise RuntimeError(f"LLM generation failed after {MAX_RETRIES} retries: {last_error}")
+                    fallback_model=self.route.fallback_model,
+                    timeout=self.route.budget_seconds,
+                    **params,
+                ),
+            )
+        return (response.content[0].text if response.content else ""), model
+
+    async def stream(
+        self,
+        system_prompt: str | list[dict],
+        messages: list[dict],
+        max_tokens: Optional[int] = None,
+        tools: Optional[list[dict]] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Streaming completion. Yields StreamEvent("text", text=delta) as tokens
+        arrive, StreamEvent("tool_use", name=...) when the model starts a tool
+        call, and finally StreamEvent("message", message=<final Message>).
+
+        Transient errors are retried only until the first event has been
+        yielded — after that the caller already has partial output, so the
+        call fails with RuntimeError.
+        """
+        system = cached_system(system_prompt) if isinstance(system_prompt, str) else system_prompt
+        kwargs: dict[str, Any] = dict(
+            temperature=self.temperature if temperature is None else temperature,
+            max_tokens=max_tokens or self.default_max_tokens,
+            system=system,
+            messages=messages,
+        )
+        if tools:
+            kwargs["tools"] = tools
+
+        retry = RetryLoop(self.model, self.route.fallback_model)
+        with self.route.timed():
+            while True:
+                model = retry.model()
+                started = False
+                try:
+                    # The slot is held until the stream is fully consumed
+                    async with llm_slot(), self.client.messages.stream(model=model, **kwargs) as stream:
+                        async for event in stream:
+                            if event.type == "text":
+                                started = True
+                                yield StreamEvent("text", text=event.text)
+                            elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+                                started = True
+                                yield StreamEvent("tool_use", name=event.content_block.name)
+                        final = await stream.get_final_message()
+                except TRANSIENT_ERRORS as e:
+                    await retry.failed(model, e, retry=not started)
+                    continue
+                retry.succeeded(model)
+                record_usage(model, final)
+                yield StreamEvent("message", message=final)
+                return
+
+
+def record_usage(model: str, response) -> None:
+    """
+    Token usage → current trace span + llm_tokens_total counters.
+    Prompt-cache reads/writes are counted separately (input_tokens excludes them).
+    """
+    from app.core.metrics import counter
+    from app.core.tracing import record
+
+    usage = getattr(response, "usage", None)
+    tokens = {
+        "input": getattr(usage, "input_tokens", 0) or 0,
+        "output": getattr(usage, "output_tokens", 0) or 0,
+        "cache_read": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+    }
+    record(
+        input_tokens=tokens["input"],
+        output_tokens=tokens["output"],
+        cache_read_tokens=tokens["cache_read"],
+        cache_write_tokens=tokens["cache_write"],
+        llm_calls=1,
+    )
+    for direction, n in tokens.items():
+        counter("llm_tokens_total", "LLM tokens consumed", labels={"model": model, "direction": direction}).inc(n)
@@ -0,0 +1,377 @@
+"""
+LLM Governor — ESG Copilot
+===========================
+One admission gate in front of every Claude call (LLMClient, orchestrator,
+document extraction, materiality).
+
+Each call must hold a slot while its request is in flight:
+
+    async with llm_slot():
+        response = await client.messages.create(...)
+
+A slot is granted when
+  - fewer than LLM_MAX_CONCURRENCY calls are in flight,
+  - the request token bucket (LLM_REQUESTS_PER_MINUTE, burst LLM_BURST) has a
+    token, and no 429 pause is active (see `throttle()`),
+  - no higher-priority call is waiting.
+
+Priority lanes — waiting calls are served in priority order, and batch calls
+may never hold more than LLM_BATCH_MAX_CONCURRENCY slots, so chat and
+extraction always find headroom while the monthly cron is running:
+
+    INTERACTIVE  chat, analyze, document extraction, materiality (default)
+    STANDARD     user-triggered report generation
+    BATCH        monthly auto-reports
+
+The lane is taken from a context variable, so long call chains (pipeline →
+ReportWriter → LLMClient) don't need to pass it along:
+
+    with llm_priority(LLMPriority.BATCH):
+        await _run_report_pipeline(...)
+
+Backends (LLM_GOVERNOR_BACKEND):
+  memory — per process (default; one API worker)
+  redis  — shared by all API and Celery workers via REDIS_URL. If Redis is
+           unreachable, calls fall back to the in-process governor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    INTERACTIVE = 0
+    STANDARD = 1
+    BATCH = 2
+
+
+_priority: ContextVar[LLMPriority] = ContextVar("llm_priority", default=LLMPriority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority) -> Iterator[None]:
+    """Run the enclosed LLM calls in the given lane."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> LLMPriority:
+    return _priority.get()
+
+
+def _observe_wait(priority: LLMPriority, seconds: float) -> None:
+    from app.core.metrics import histogram
+    from app.core.tracing import record
+
+    histogram(
+        "llm_governor_wait_seconds", "Time LLM calls waited for a governor slot",
+        labels={"priority": priority.name.lower()},
+    ).observe(seconds)
+    record(llm_wait_ms=round(seconds * 1000))
+
+
+# ── In-process backend ────────────────────────────────────────────────────────
+
+class LocalLLMGovernor:
+    def __init__(
+        self,
+        max_concurrency: int,
+        batch_max_concurrency: int,
+        requests_per_minute: float,
+        burst: int,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_max_concurrency = max(1, min(batch_max_concurrency, self.max_concurrency))
+        self._rate = max(requests_per_minute, 1) / 60.0      # tokens per second
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._batch_in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []   # heap of (priority, seq, future)
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self, priority: LLMPriority | None = None) -> AsyncIterator[None]:
+        priority = current_priority() if priority is None else priority
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    async def acquire(self, priority: LLMPriority) -> None:
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(priority)      # granted just as we were cancelled
+            else:
+                future.cancel()             # _dispatch drops cancelled waiters
+                self._dispatch()
+            raise
+        _observe_wait(priority, time.monotonic() - started)
+
+    def release(self, priority: LLMPriority) -> None:
+        self._in_flight -= 1
+        if priority == LLMPriority.BATCH:
+            self._batch_in_flight -= 1
+        self._dispatch()
+
+    def throttle(self, seconds: float) -> None:
+        """Hold back every new call for `seconds` (after a 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                return
+            if priority == LLMPriority.BATCH and self._batch_in_flight >= self.batch_max_concurrency:
+                return
+            wait = self._take_token()
+            if wait > 0:
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            if priority == LLMPriority.BATCH:
+                self._batch_in_flight += 1
+            future.set_result(None)
+
+    def _take_token(self) -> float:
+        """Consume a token and return 0, or return seconds until one is available."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    def _wake_in(self, seconds: float) -> None:
+        if self._timer is not None:
+            return
+        self._timer = asyncio.get_running_loop().call_later(seconds, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+
+# ── Redis backend ─────────────────────────────────────────────────────────────
+
+# Atomic admission check. Returns 0 when the slot is granted, otherwise the
+# number of milliseconds to wait before asking again.
+#   KEYS: slots zset, batch slots zset, bucket hash, waiter zsets (one per lane)
+#   ARGV: member, priority, max_concurrency, batch_max, rate_per_s, burst, lease_s
+_ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local member, prio = ARGV[1], tonumber(ARGV[2])
+local max_conc, batch_max = tonumber(ARGV[3]), tonumber(ARGV[4])
+local rate, burst, lease = tonumber(ARGV[5]), tonumber(ARGV[6]), tonumber(ARGV[7])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+for i = 4, #KEYS do
+  redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+end
+
+local own_waiters = KEYS[4 + prio]
+redis.call('ZADD', own_waiters, now + 5, member)
+for p = 0, prio - 1 do
+  if redis.call('ZCARD', KEYS[4 + p]) > 0 then return 50 end
+end
+if redis.call('ZCARD', KEYS[1]) >= max_conc then return 50 end
+if prio == 2 and redis.call('ZCARD', KEYS[2]) >= batch_max then return 100 end
+
+local tokens = tonumber(redis.call('HGET', KEYS[3], 'tokens') or burst)
+local ts = tonumber(redis.call('HGET', KEYS[3], 'ts') or now)
+local paused = tonumber(redis.call('HGET', KEYS[3], 'paused_until') or 0)
+if now < paused then return math.ceil((paused - now) * 1000) end
+tokens = math.min(burst, tokens + (now - ts) * rate)
+if tokens < 1 then
+  redis.call('HSET', KEYS[3], 'tokens', tokens, 'ts', now)
+  return math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[3], 'tokens', tokens - 1, 'ts', now)
+redis.call('ZREM', own_waiters, member)
+redis.call('ZADD', KEYS[1], now + lease, member)
+if prio == 2 then redis.call('ZADD', KEYS[2], now + lease, member) end
+return 0
+"""
+
+_KEY_PREFIX = "llm:governor:"
+
+
+class RedisLLMGovernor:
+    """Fleet-wide governor. Falls back to `fallback` while Redis is unreachable."""
+
+    def __init__(self, url: str, fallback: LocalLLMGovernor, lease_seconds: int) -> None:
+        from redis import asyncio as aioredis
+
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._acquire_script = self._redis.register_script(_ACQUIRE_LUA)
+        self._fallback = fallback
+        self._lease_seconds = lease_seconds
+        self._slots = _KEY_PREFIX + "slots"
+        self._batch_slots = _KEY_PREFIX + "slots:batch"
+        self._bucket = _KEY_PREFIX + "bucket"
+        self._waiters = [f"{_KEY_PREFIX}waiting:{p.name.lower()}" for p in LLMPriority]
+        self._warned_at = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: LLMPriority | None = None) -> AsyncIterator[None]:
+        priority = current_priority() if priority is None else priority
+        member = uuid.uuid4().hex
+        try:
+            await self._acquire(member, priority)
+        except asyncio.CancelledError:
+            await self._forget(member, priority)
+            raise
+        except Exception as exc:
+            self._warn(exc)
+            async with self._fallback.slot(priority):
+                yield
+            return
+        try:
+            yield
+        finally:
+            await self._forget(member, priority)
+
+    async def throttle(self, seconds: float) -> None:
+        self._fallback.throttle(seconds)
+        try:
+            await self._redis.hset(self._bucket, mapping={"paused_until": time.time() + seconds, "tokens": 0})
+        except Exception as exc:
+            self._warn(exc)
+
+    async def _acquire(self, member: str, priority: LLMPriority) -> None:
+        from app.core.config import settings
+
+        started = time.monotonic()
+        keys = [self._slots, self._batch_slots, self._bucket, *self._waiters]
+        args = [
+            member, int(priority),
+            settings.LLM_MAX_CONCURRENCY, settings.LLM_BATCH_MAX_CONCURRENCY,
+            max(settings.LLM_REQUESTS_PER_MINUTE, 1) / 60.0, settings.LLM_BURST,
+            self._lease_seconds,
+        ]
+        while True:
+            wait_ms = int(await self._acquire_script(keys=keys, args=args))
+            if wait_ms == 0:
+                break
+            await asyncio.sleep(min(wait_ms, 1000) / 1000)
+        _observe_wait(priority, time.monotonic() - started)
+
+    async def _forget(self, member: str, priority: LLMPriority) -> None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.zrem(self._slots, member)
+                pipe.zrem(self._batch_slots, member)
+                pipe.zrem(self._waiters[int(priority)], member)
+                await pipe.execute()
+        except Exception as exc:
+            # The slot lease expires on its own after LLM_SLOT_LEASE_SECONDS
+            self._warn(exc)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+    def _warn(self, exc: Exception) -> None:
+        if time.monotonic() - self._warned_at > 60:
+            self._warned_at = time.monotonic()
+            logger.warning("LLM governor: Redis unavailable, using in-process limits (%s)", exc)
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+def _build_local() -> LocalLLMGovernor:
+    from app.core.config import settings
+
+    return LocalLLMGovernor(
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        batch_max_concurrency=settings.LLM_BATCH_MAX_CONCURRENCY,
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        burst=settings.LLM_BURST,
+    )
+
+
+# Module-level singleton. Waiters and timers belong to an event loop, so —
+# like the Anthropic client — the governor is rebuilt for a new loop (Celery).
+_governor: LocalLLMGovernor | RedisLLMGovernor | None = None
+_governor_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_llm_governor() -> LocalLLMGovernor | RedisLLMGovernor:
+    global _governor, _governor_loop
+    from app.core.config import settings
+
+    loop = asyncio.get_running_loop()
+    if _governor is None or _governor_loop is not loop:
+        if settings.LLM_GOVERNOR_BACKEND == "redis":
+            _governor = RedisLLMGovernor(settings.REDIS_URL, _build_local(), settings.LLM_SLOT_LEASE_SECONDS)
+        else:
+            _governor = _build_local()
+        _governor_loop = loop
+    return _governor
+
+
+def llm_slot(priority: LLMPriority | None = None):
+    """`async with llm_slot(): ...` around one Claude request."""
+    return get_llm_governor().slot(priority)
+
+
+async def throttle_llm_calls(seconds: float) -> None:
+    """Pause admissions for every caller (all workers with redis) after a 429."""
+    from app.core.metrics import counter
+
+    counter("llm_governor_throttles_total", "429-triggered pauses of the LLM governor").inc()
+    governor = get_llm_governor()
+    if isinstance(governor, RedisLLMGovernor):
+        await governor.throttle(seconds)
+    else:
+        governor.throttle(seconds)
+
+
+async def shutdown_llm_governor() -> None:
+    global _governor, _governor_loop
+    if isinstance(_governor, RedisLLMGovernor):
+        try:
+            await _governor.aclose()
+        except Exception as exc:
+            logger.debug("LLM governor Redis close failed: %s", exc)
+    _governor = None
+    _governor_loop = None
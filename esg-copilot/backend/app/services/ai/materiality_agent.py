@@ -17,16 +17,21 @@ Output is cached per company and invalidated when profile changes.
 
 import json
 import logging
-import os
 import re
 from typing import TypedDict
 
-import anthropic
+from app.core.singleflight import SingleFlight, request_key
+
+from .anthropic_client import get_anthropic_client
+from .model_router import create_message_for
 
 logger = logging.getLogger(__name__)
 
 PROMPT_VERSION = "1.0"
 
+# Two tabs assessing the same company profile share one Claude call
+_flight = SingleFlight("materiality")
+
 # ── All VSME Basic Module datapoints with descriptions ────────────────────────
 VSME_DATAPOINTS: dict[str, dict] = {
     # B3 — Energy & Scope 1 (direct combustion)
@@ -139,14 +144,7 @@ async def run_materiality_assessment(
 
     Returns a MaterialityResult with the full assessment dict.
     """
-    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-    if not api_key:
-        raise RuntimeError("ANTHROPIC_API_KEY not set")
-
-    # Use Haiku for materiality classification — it's 3-5x faster and perfectly
-    # capable of this structured classification task (avoids HTTP proxy timeouts).
-    model = "claude-haiku-4-5-20251001"
-    client = anthropic.AsyncAnthropic(api_key=api_key)
+    get_anthropic_client()       # fail fast if ANTHROPIC_API_KEY is missing
 
     # Build the list of datapoints for Claude to assess
     datapoints_text = "\n".join(
@@ -188,26 +186,20 @@ Returner PRÆCIS dette JSON-format (ingen markdown, ingen forklaring udenfor JSO
         industry_code, size_label, country_code,
     )
 
-    # Claude call with retry — keep delays short to avoid Railway proxy timeout
-    import asyncio
-    last_err = None
-    for attempt in range(1, 4):
-        try:
-            response = await client.messages.create(
-                model=model,
-                max_tokens=8000,   # Haiku supports 8192; generous headroom for 50 fields
-                temperature=0.2,   # Low temp for consistent classification
-                system=_SYSTEM,
-                messages=[{"role": "user", "content": user_prompt}],
-            )
-            raw = response.content[0].text.strip() if response.content else ""
-            break
-        except (anthropic.RateLimitError, anthropic.InternalServerError) as e:
-            logger.warning("Materiality agent attempt %d failed: %s", attempt, e)
-            last_err = e
-            await asyncio.sleep(2 * attempt)   # 2s, 4s max — not 5/10/15s
-    else:
-        raise RuntimeError(f"Materiality agent failed after retries: {last_err}")
+    # The "materiality" route runs on Haiku — 3-5x faster and perfectly capable of this
+    # structured classification task. Retries are bounded by LLM_RETRY_BUDGET_SECONDS and
+    # the route's latency budget — keeps us inside the Railway proxy timeout.
+    response = await _flight.do(
+        request_key(PROMPT_VERSION, user_prompt),
+        lambda: create_message_for(
+            "materiality",
+            max_tokens=8000,   # Haiku supports 8192; generous headroom for 50 fields
+            temperature=0.2,   # Low temp for consistent classification
+            system=_SYSTEM,
+            messages=[{"role": "user", "content": user_prompt}],
+        ),
+    )
+    raw = response.content[0].text.strip() if response.content else ""
 
     # Parse JSON — handle markdown code blocks if Claude adds them
     assessment = _parse_json_response(raw)
@@ -224,7 +216,7 @@ Returner PRÆCIS dette JSON-format (ingen markdown, ingen forklaring udenfor JSO
 
     return MaterialityResult(
         assessment=assessment,
-        model_used=model,
+        model_used=response.model,
         prompt_version=PROMPT_VERSION,
     )
 
@@ -0,0 +1,239 @@
+"""
+Message Batches — ESG Copilot
+==============================
+Runs many independent Claude requests as one asynchronous job through the
+Anthropic Message Batches API: 50% of the normal token price and no load on
+the interactive rate limit. Results usually arrive within minutes (at most
+24 h), so this is for non-interactive work only — see
+services/report_batch.py (monthly reports).
+
+    recorder = RequestRecorder(model)
+    await ReportWriter(llm=recorder).write_co2_narrative(...)   # records, doesn't call Claude
+    texts = await get_batch_backend().run(recorder.requests)    # same order; None = failed
+
+`run(..., on_submitted=...)` reports each Anthropic batch id as soon as it
+exists, so the caller can persist it; after a restart `resume(batch_id,
+requests)` picks the batch up again. Transient errors while polling are
+retried; on any other failure the batch is cancelled before the error is
+raised, so nothing keeps running (and billing) unobserved.
+
+Backends (NARRATIVE_BATCH_BACKEND):
+  anthropic — Message Batches API (default)
+  local     — one ordinary create_message() per request; for development and
+              tests (pass `responder` to avoid calling Claude at all)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from .anthropic_client import get_anthropic_client
+from .prompt_cache import cached_system
+from .resilience import TRANSIENT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+_MAX_REQUESTS_PER_BATCH = 10_000
+_MAX_POLL_ERRORS = 10          # consecutive transient errors while polling before giving up
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    model: str
+    system: str
+    prompt: str
+    max_tokens: int
+    temperature: float
+
+    def params(self) -> dict:
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "system": cached_system(self.system),
+            "messages": [{"role": "user", "content": self.prompt}],
+        }
+
+    def key(self) -> tuple:
+        """Identity of a request across processes — matches a re-recorded prompt to a stored one."""
+        return (self.model, self.system, self.prompt, self.max_tokens)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class RequestRecorder:
+    """
+    Stands in for LLMClient: `generate()` records the request and returns ""
+    instead of calling Claude. (ReportWriter does not cache empty texts.)
+    """
+
+    def __init__(self, model: str, temperature: float = 0.3, default_max_tokens: int = 2000) -> None:
+        self.model = model
+        self.temperature = temperature
+        self.default_max_tokens = default_max_tokens
+        self.requests: list[BatchRequest] = []
+
+    async def generate(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        self.requests.append(BatchRequest(
+            model=self.model,
+            system=system_prompt,
+            prompt=user_prompt,
+            max_tokens=max_tokens or self.default_max_tokens,
+            temperature=self.temperature,
+        ))
+        return ""
+
+    async def generate_with_model(
+        self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None,
+    ) -> tuple[str, str]:
+        return await self.generate(system_prompt, user_prompt, max_tokens), self.model
+
+
+def _text(message) -> str | None:
+    return message.content[0].text if message.content else None
+
+
+# (Anthropic batch id, its requests in custom_id order) — called right after creation
+SubmittedHandler = Callable[[str, list[BatchRequest]], Awaitable[None]]
+
+
+class AnthropicBatchBackend:
+    def __init__(self, poll_seconds: float, timeout_seconds: float) -> None:
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+
+    async def run(
+        self, requests: list[BatchRequest], on_submitted: SubmittedHandler | None = None,
+    ) -> list[str | None]:
+        chunks = [
+            requests[i:i + _MAX_REQUESTS_PER_BATCH]
+            for i in range(0, len(requests), _MAX_REQUESTS_PER_BATCH)
+        ]
+        results = await asyncio.gather(*(self._run_one(chunk, on_submitted) for chunk in chunks))
+        return [text for chunk in results for text in chunk]
+
+    async def resume(self, batch_id: str, requests: list[BatchRequest]) -> list[str | None]:
+        """Results of a batch submitted earlier (possibly by another process), in `requests` order."""
+        batch = await self._retrieve(batch_id)
+        logger.info("Message batch %s resumed: %d requests", batch_id, len(requests))
+        return await self._collect(batch, requests)
+
+    async def _run_one(
+        self, requests: list[BatchRequest], on_submitted: SubmittedHandler | None,
+    ) -> list[str | None]:
+        client = get_anthropic_client()
+        batch = await client.messages.batches.create(requests=[
+            {"custom_id": f"req-{i}", "params": r.params()} for i, r in enumerate(requests)
+        ])
+        logger.info("Message batch %s submitted: %d requests", batch.id, len(requests))
+        if on_submitted:
+            try:
+                await on_submitted(batch.id, requests)
+            except Exception:
+                # Still collected by this process — only a restart would lose it
+                logger.exception("Could not persist message batch %s", batch.id)
+        return await self._collect(batch, requests)
+
+    async def _collect(self, batch, requests: list[BatchRequest]) -> list[str | None]:
+        from .llm_client import record_usage
+
+        client = get_anthropic_client()
+        try:
+            # Measured from creation, so a resumed batch keeps its original deadline
+            deadline = batch.created_at + timedelta(seconds=self.timeout_seconds)
+            cancelled = batch.processing_status == "canceling"
+            while batch.processing_status != "ended":
+                if not cancelled and datetime.now(timezone.utc) > deadline:
+                    # Whatever finished before the cancel is still returned; the rest fall back
+                    logger.warning("Message batch %s exceeded %ss — cancelling", batch.id, self.timeout_seconds)
+                    await client.messages.batches.cancel(batch.id)
+                    cancelled = True
+                await asyncio.sleep(self.poll_seconds)
+                batch = await self._retrieve(batch.id)
+
+            results: list[str | None] = [None] * len(requests)
+            async for entry in await client.messages.batches.results(batch.id):
+                i = int(entry.custom_id.removeprefix("req-"))
+                if entry.result.type == "succeeded":
+                    record_usage(requests[i].model, entry.result.message)
+                    results[i] = _text(entry.result.message)
+                else:
+                    logger.warning("Message batch %s: %s %s", batch.id, entry.custom_id, entry.result.type)
+        except Exception:
+            await self._cancel_quietly(batch.id)
+            raise
+        logger.info(
+            "Message batch %s ended: %d/%d succeeded",
+            batch.id, sum(r is not None for r in results), len(requests),
+        )
+        return results
+
+    async def _retrieve(self, batch_id: str):
+        client = get_anthropic_client()
+        for attempt in range(1, _MAX_POLL_ERRORS + 1):
+            try:
+                return await client.messages.batches.retrieve(batch_id)
+            except TRANSIENT_ERRORS as exc:
+                if attempt == _MAX_POLL_ERRORS:
+                    raise
+                logger.warning("Polling message batch %s failed (%s) — retrying", batch_id, exc)
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _cancel_quietly(self, batch_id: str) -> None:
+        try:
+            await get_anthropic_client().messages.batches.cancel(batch_id)
+            logger.warning("Message batch %s cancelled after a failure", batch_id)
+        except Exception as exc:
+            logger.warning("Cancelling message batch %s failed: %s", batch_id, exc)
+
+
+Responder = Callable[[BatchRequest], Awaitable[str]]
+
+
+class LocalBatchBackend:
+    """Answers each request directly — same contract as AnthropicBatchBackend."""
+
+    def __init__(self, responder: Responder | None = None) -> None:
+        self._responder = responder or self._create
+
+    @staticmethod
+    async def _create(request: BatchRequest) -> str | None:
+        from .resilience import create_message
+        # No fallback model — like the Batches API, the answer comes from request.model
+        return _text(await create_message(fallback_model="", **request.params()))
+
+    async def run(
+        self, requests: list[BatchRequest], on_submitted: SubmittedHandler | None = None,
+    ) -> list[str | None]:
+        # Answered before returning — nothing to persist or resume
+        async def one(request: BatchRequest) -> str | None:
+            try:
+                return await self._responder(request)
+            except Exception as exc:
+                logger.warning("Local batch request failed: %s", exc)
+                return None
+
+        return list(await asyncio.gather(*(one(r) for r in requests)))
+
+
+# Module-level singleton
+_backend: AnthropicBatchBackend | LocalBatchBackend | None = None
+
+
+def get_batch_backend() -> AnthropicBatchBackend | LocalBatchBackend:
+    global _backend
+    if _backend is None:
+        from app.core.config import settings
+        if settings.NARRATIVE_BATCH_BACKEND == "local":
+            _backend = LocalBatchBackend()
+        else:
+            _backend = AnthropicBatchBackend(
+                poll_seconds=settings.NARRATIVE_BATCH_POLL_SECONDS,
+                timeout_seconds=settings.NARRATIVE_BATCH_TIMEOUT_MINUTES * 60,
+            )
+    return _backend
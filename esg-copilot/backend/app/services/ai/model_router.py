@@ -0,0 +1,104 @@
+"""
+Model Router — ESG Copilot
+===========================
+Picks the Claude model per task type instead of one global ANTHROPIC_MODEL.
+Short, structured tasks (QA review, anomaly commentary, roadmap, materiality)
+run several times faster on a small model; customer-facing narratives, chat
+and document extraction stay on the primary model.
+
+    route = route_for("qa_review")
+    client = LLMClient(task="qa_review")                       # uses the route
+    response = await create_message_for("materiality", max_tokens=..., system=..., messages=...)
+
+Each route (settings.LLM_MODEL_ROUTES) has
+  model          — "" = ANTHROPIC_MODEL
+  fallback       — used while the model's circuit breaker is open or after an
+                   attempt ran over the budget; missing = ANTHROPIC_FALLBACK_MODEL
+  budget_seconds — latency budget. A single non-streaming attempt is cut off
+                   after this long (the retry then goes to the fallback model)
+
+Per-task latency is recorded as llm_task_seconds{task} and
+llm_task_over_budget_total{task} so the table can be tuned from /metrics.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+TASKS = (
+    "narrative", "chat", "extraction", "materiality", "qa_review", "anomaly_commentary", "roadmap",
+    "conversation_summary", "intent",
+)
+
+# Generation can legitimately take a minute; budgets are generous upper bounds
+_LATENCY_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 90.0, 120.0)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    task: str
+    model: str
+    fallback_model: str
+    budget_seconds: float
+
+    @contextmanager
+    def timed(self) -> Iterator[None]:
+        """Record the wall time of one logical call (retries included) for this task."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _observe(self, time.perf_counter() - start)
+
+
+def route_for(task: str) -> ModelRoute:
+    """Resolve the configured route for `task`. Raises ValueError for unknown tasks."""
+    from app.core.config import settings
+
+    if task not in TASKS:
+        raise ValueError(f"Unknown LLM task {task!r} — expected one of {', '.join(TASKS)}")
+    config = settings.LLM_MODEL_ROUTES.get(task, {})
+    return ModelRoute(
+        task=task,
+        model=config.get("model") or settings.ANTHROPIC_MODEL,
+        fallback_model=config.get("fallback", settings.ANTHROPIC_FALLBACK_MODEL),
+        budget_seconds=float(config.get("budget_seconds", 60.0)),
+    )
+
+
+async def create_message_for(task: str, **kwargs: Any):
+    """create_message() with the task's model, fallback and latency budget."""
+    from .resilience import create_message
+
+    route = route_for(task)
+    with route.timed():
+        return await create_message(
+            model=route.model,
+            fallback_model=route.fallback_model,
+            timeout=route.budget_seconds,
+            **kwargs,
+        )
+
+
+def _observe(route: ModelRoute, seconds: float) -> None:
+    from app.core.metrics import counter, histogram
+
+    histogram(
+        "llm_task_seconds", "Wall time of LLM calls per task, retries included",
+        buckets=_LATENCY_BUCKETS, labels={"task": route.task},
+    ).observe(seconds)
+    if seconds > route.budget_seconds:
+        counter(
+            "llm_task_over_budget_total", "LLM calls that exceeded their task's latency budget",
+            labels={"task": route.task},
+        ).inc()
+        logger.warning(
+            "LLM task %s took %.1fs (budget %.0fs, model %s)",
+            route.task, seconds, route.budget_seconds, route.model,
+        )
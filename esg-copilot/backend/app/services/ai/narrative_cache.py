@@ -0,0 +1,68 @@
+"""
+Narrative Cache — ESG Copilot
+==============================
+Content-addressed cache for AI report narratives.
+
+Every narrative prompt is hashed together with the model, the system prompt and
+max_tokens. If the hash is already in the narrative_cache table the stored text
+is returned and Claude is not called — unchanged sections of a re-generated or
+monthly auto-generated report cost nothing.
+
+The cache is best-effort: any DB error is logged and treated as a miss.
+"""
+
+import hashlib
+import logging
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.narrative_cache import NarrativeCache
+
+logger = logging.getLogger(__name__)
+
+
+def narrative_cache_key(model: str, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+    """SHA-256 over every input that determines the generated text."""
+    h = hashlib.sha256()
+    for part in (model, system_prompt, user_prompt, str(max_tokens)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")   # separator — avoids ambiguity between adjacent fields
+    return h.hexdigest()
+
+
+async def get_cached_narrative(prompt_hash: str) -> Optional[str]:
+    """Return cached text and bump its hit counter in one round-trip, or None on miss."""
+    from app.core.database import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(NarrativeCache)
+                .where(NarrativeCache.prompt_hash == prompt_hash)
+                .values(hit_count=NarrativeCache.hit_count + 1, last_hit_at=func.now())
+                .returning(NarrativeCache.content)
+            )
+            content = result.scalar_one_or_none()
+            await db.commit()
+            return content
+    except Exception as exc:
+        logger.warning("Narrative cache lookup failed (treating as miss): %s", exc)
+        return None
+
+
+async def store_narrative(prompt_hash: str, model: str, content: str) -> None:
+    """Insert a generated narrative. Concurrent writers of the same hash are harmless."""
+    from app.core.database import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                insert(NarrativeCache)
+                .values(prompt_hash=prompt_hash, model=model, content=content, hit_count=0)
+                .on_conflict_do_nothing(index_elements=["prompt_hash"])
+            )
+            await db.commit()
+    except Exception as exc:
+        logger.warning("Narrative cache store failed: %s", exc)
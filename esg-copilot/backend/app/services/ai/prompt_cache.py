@@ -0,0 +1,74 @@
+"""
+Prompt Caching — ESG Copilot
+=============================
+Helpers for Anthropic prompt caching (cache_control breakpoints).
+
+The large static prefixes — the coach/report-writer system prompts, the
+orchestrator's tool schemas — are identical on every call. Marking them with
+`cache_control: {"type": "ephemeral"}` lets Anthropic serve that prefix from
+cache (5 min TTL, refreshed on every hit): lower time-to-first-token and
+cache reads billed at a fraction of normal input tokens.
+
+Cache order is tools → system → messages, and a breakpoint caches everything
+before it. At most 4 breakpoints are allowed per request; we use up to three:
+
+    tools=cached_tools(_TOOLS)                        # 1: after the last tool
+    system=cached_system(STATIC_PROMPT, per_company)  # 2: after the static part
+    messages=with_message_breakpoint(messages)        # 3: end of the conversation so far
+
+Prefixes shorter than the model minimum (1024 tokens for Sonnet) are simply
+not cached — marking them is harmless.
+
+Disable with PROMPT_CACHING_ENABLED=false.
+"""
+
+from typing import Any
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def caching_enabled() -> bool:
+    from app.core.config import settings
+    return settings.PROMPT_CACHING_ENABLED
+
+
+def cached_system(static: str, dynamic: str | None = None) -> str | list[dict]:
+    """System prompt as content blocks: cached static prefix + uncached per-call suffix."""
+    if not caching_enabled():
+        return static + (dynamic or "")
+    blocks: list[dict] = [{"type": "text", "text": static, "cache_control": _EPHEMERAL}]
+    if dynamic:
+        blocks.append({"type": "text", "text": dynamic})
+    return blocks
+
+
+def cached_tools(tools: list[dict]) -> list[dict]:
+    """Copy of the tool list with a breakpoint on the last tool (caches all tool schemas)."""
+    if not tools or not caching_enabled():
+        return tools
+    return [*tools[:-1], {**tools[-1], "cache_control": _EPHEMERAL}]
+
+
+def with_message_breakpoint(messages: list[dict]) -> list[dict]:
+    """
+    Copy of `messages` with a breakpoint on the last content block.
+
+    Used in multi-turn loops: turn N reads turns 1..N-1 from cache. The input
+    list is not modified, so breakpoints never accumulate across turns.
+    """
+    if not messages or not caching_enabled():
+        return messages
+    last = messages[-1]
+    content: Any = last.get("content")
+    if isinstance(content, str):
+        if not content:
+            return messages
+        blocks = [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+    elif isinstance(content, list) and content:
+        tail = content[-1]
+        if not isinstance(tail, dict):
+            tail = tail.model_dump(exclude_none=True)   # SDK content block (assistant turn)
+        blocks = [*content[:-1], {**tail, "cache_control": _EPHEMERAL}]
+    else:
+        return messages
+    return [*messages[:-1], {**last, "content": blocks}]
@@ -0,0 +1,368 @@
+"""
+Record/Replay Transport — ESG Copilot
+======================================
+An httpx transport for the shared Anthropic client (anthropic_client.py) that
+records real API exchanges to fixture files and replays them offline, with
+realistic latency and injected 429/529 errors. Everything that goes through
+the shared client — LLMClient, the orchestrator's streaming tool-use loop,
+vision extraction, materiality — works unchanged, so the report pipeline,
+chat and orchestrator can be load-tested on CI without an API key.
+
+    ANTHROPIC_TRANSPORT=record  ANTHROPIC_FIXTURES_DIR=fixtures/llm   # real calls, saved
+    ANTHROPIC_TRANSPORT=replay  ANTHROPIC_FIXTURES_DIR=fixtures/llm   # no network, no key
+    ANTHROPIC_REPLAY_LATENCY=lognormal:2.5,0.5   # median 2.5 s; or recorded | fixed:0.8
+    ANTHROPIC_REPLAY_429_RATE=0.05  ANTHROPIC_REPLAY_529_RATE=0.02
+
+Matching a request to a fixture:
+  1. exact — SHA-256 of method, path and the canonical JSON body
+  2. loose — same path, model, system prompt and stream flag; fixtures of a
+     group are replayed round-robin (prompts with dates/ids still replay)
+  3. otherwise a synthetic answer ("{}" when JSON is asked for, else filler
+     text), or an error response with ANTHROPIC_REPLAY_ON_MISS=error
+
+Streaming requests are replayed as server-sent events: the first event after
+~30% of the sampled latency, the rest spread over the remainder. In record
+mode streamed responses are buffered before they are returned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_FIRST_EVENT_SHARE = 0.3       # time-to-first-token as a share of the total latency
+
+
+# ── Latency model ─────────────────────────────────────────────────────────────
+
+@dataclass
+class LatencyModel:
+    """'recorded' | 'fixed:<s>' | 'lognormal:<median s>,<sigma>', scaled by `scale`."""
+
+    kind: str = "recorded"
+    params: tuple[float, ...] = ()
+    scale: float = 1.0
+
+    @classmethod
+    def parse(cls, spec: str, scale: float = 1.0) -> "LatencyModel":
+        kind, _, raw = (spec or "recorded").partition(":")
+        params = tuple(float(p) for p in raw.split(",") if p.strip())
+        if kind not in ("recorded", "fixed", "lognormal"):
+            raise ValueError(f"Unknown replay latency model {spec!r}")
+        return cls(kind, params, scale)
+
+    def sample(self, rng: random.Random, recorded: float | None) -> float:
+        if self.kind == "fixed":
+            seconds = self.params[0] if self.params else 0.0
+        elif self.kind == "lognormal":
+            median = self.params[0] if self.params else 1.0
+            sigma = self.params[1] if len(self.params) > 1 else 0.5
+            seconds = rng.lognormvariate(math.log(max(median, 1e-3)), sigma)
+        else:
+            seconds = recorded if recorded is not None else 1.0
+        return max(0.0, seconds * self.scale)
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+@dataclass
+class Fixture:
+    key: str
+    loose_key: str
+    status: int
+    content_type: str
+    body: str
+    elapsed_s: float | None = None
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "key": self.key, "loose_key": self.loose_key, "status": self.status,
+            "content_type": self.content_type, "elapsed_s": self.elapsed_s,
+            "meta": self.meta, "body": self.body,
+        }
+
+
+def _system_text(system: Any) -> str:
+    if isinstance(system, list):
+        return "".join(block.get("text", "") for block in system if isinstance(block, dict))
+    return system or ""
+
+
+def request_keys(method: str, path: str, body: dict[str, Any]) -> tuple[str, str]:
+    """(exact key, loose key) for a request."""
+    exact = hashlib.sha256(
+        f"{method} {path}\x00".encode() + json.dumps(body, sort_keys=True, ensure_ascii=False).encode()
+    ).hexdigest()
+    loose = hashlib.sha256("\x00".join([
+        path, str(body.get("model", "")), _system_text(body.get("system")), str(bool(body.get("stream"))),
+    ]).encode()).hexdigest()
+    return exact, loose
+
+
+# ── Transport ─────────────────────────────────────────────────────────────────
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        fixtures_dir: str | Path,
+        mode: str = "replay",
+        latency: LatencyModel | None = None,
+        rate_limit_rate: float = 0.0,
+        overload_rate: float = 0.0,
+        on_miss: str = "synthesize",
+        seed: int | None = None,
+        inner: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown transport mode {mode!r} — expected record or replay")
+        self.mode = mode
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency = latency or LatencyModel()
+        self.rate_limit_rate = rate_limit_rate
+        self.overload_rate = overload_rate
+        self.on_miss = on_miss
+        self._rng = random.Random(seed)
+        self._inner = inner
+        self._exact: dict[str, Fixture] = {}
+        self._loose: dict[str, list[Fixture]] = {}
+        self._turn: dict[str, int] = {}
+        self.stats = {"requests": 0, "exact": 0, "loose": 0, "synthesized": 0, "recorded": 0,
+                      "injected_429": 0, "injected_529": 0}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.fixtures_dir.is_dir():
+            return
+        for path in sorted(self.fixtures_dir.glob("*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self._add(Fixture(**{k: data.get(k) for k in (
+                    "key", "loose_key", "status", "content_type", "body", "elapsed_s",
+                )}, meta=data.get("meta") or {}))
+            except Exception as exc:
+                logger.warning("Skipping unreadable LLM fixture %s: %s", path, exc)
+        logger.info("Loaded %d LLM fixtures from %s", len(self._exact), self.fixtures_dir)
+
+    def _add(self, fixture: Fixture) -> None:
+        self._exact[fixture.key] = fixture
+        self._loose.setdefault(fixture.loose_key, []).append(fixture)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats["requests"] += 1
+        raw = await request.aread()
+        body = json.loads(raw) if raw else {}
+        exact, loose = request_keys(request.method, request.url.path, body)
+        if self.mode == "record":
+            return await self._record(request, body, exact, loose)
+        return await self._replay(request, body, exact, loose)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
+
+    # ── record ────────────────────────────────────────────────────────────────
+
+    async def _record(self, request: httpx.Request, body: dict, exact: str, loose: str) -> httpx.Response:
+        if self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport()
+        started = time.monotonic()
+        response = await self._inner.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+        elapsed = time.monotonic() - started
+
+        content_type = response.headers.get("content-type", "application/json")
+        if response.status_code == 200:
+            fixture = Fixture(
+                key=exact, loose_key=loose, status=200, content_type=content_type,
+                body=content.decode("utf-8"), elapsed_s=round(elapsed, 3),
+                meta={"path": request.url.path, "model": body.get("model"), "stream": bool(body.get("stream"))},
+            )
+            self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+            (self.fixtures_dir / f"{exact[:24]}.json").write_text(
+                json.dumps(fixture.to_json(), ensure_ascii=False, indent=1), encoding="utf-8",
+            )
+            self._add(fixture)
+            self.stats["recorded"] += 1
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    # ── replay ────────────────────────────────────────────────────────────────
+
+    async def _replay(self, request: httpx.Request, body: dict, exact: str, loose: str) -> httpx.Response:
+        fixture = self._match(exact, loose)
+        latency = self.latency.sample(self._rng, fixture.elapsed_s if fixture else None)
+
+        injected = self._inject_error(request)
+        if injected is not None:
+            await asyncio.sleep(latency * 0.05)      # errors come back fast
+            return injected
+
+        if fixture is None:
+            if self.on_miss == "error" or not request.url.path.endswith("/messages"):
+                await asyncio.sleep(latency * 0.05)
+                return _error_response(request, 404, "not_found_error", "No LLM fixture matches this request")
+            self.stats["synthesized"] += 1
+            fixture = _synthesize(body, exact, loose)
+
+        if fixture.content_type.startswith("text/event-stream"):
+            return httpx.Response(
+                fixture.status, headers={"content-type": fixture.content_type},
+                content=self._paced(fixture.body, latency), request=request,
+            )
+        await asyncio.sleep(latency)
+        return httpx.Response(
+            fixture.status, headers={"content-type": fixture.content_type},
+            content=fixture.body.encode("utf-8"), request=request,
+        )
+
+    def _match(self, exact: str, loose: str) -> Fixture | None:
+        if exact in self._exact:
+            self.stats["exact"] += 1
+            return self._exact[exact]
+        group = self._loose.get(loose)
+        if group:
+            self.stats["loose"] += 1
+            turn = self._turn.get(loose, 0)
+            self._turn[loose] = turn + 1
+            return group[turn % len(group)]
+        return None
+
+    def _inject_error(self, request: httpx.Request) -> httpx.Response | None:
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            self.stats["injected_429"] += 1
+            return _error_response(request, 429, "rate_limit_error", "Injected rate limit (replay)",
+                                   headers={"retry-after": "1"})
+        if roll < self.rate_limit_rate + self.overload_rate:
+            self.stats["injected_529"] += 1
+            return _error_response(request, 529, "overloaded_error", "Injected overload (replay)")
+        return None
+
+    async def _paced(self, sse: str, latency: float) -> AsyncIterator[bytes]:
+        events = [e for e in sse.split("\n\n") if e.strip()]
+        await asyncio.sleep(latency * _FIRST_EVENT_SHARE)
+        gap = latency * (1 - _FIRST_EVENT_SHARE) / max(len(events) - 1, 1)
+        for i, event in enumerate(events):
+            if i:
+                await asyncio.sleep(gap)
+            yield (event + "\n\n").encode("utf-8")
+
+
+def _error_response(
+    request: httpx.Request, status: int, kind: str, message: str, headers: dict | None = None,
+) -> httpx.Response:
+    return httpx.Response(
+        status,
+        headers={"content-type": "application/json", **(headers or {})},
+        json={"type": "error", "error": {"type": kind, "message": message}},
+        request=request,
+    )
+
+
+# ── Synthetic answers ─────────────────────────────────────────────────────────
+
+_FILLER = "Syntetisk svar fra replay-transporten uden optaget fixture."
+
+
+def _message_text(messages: list[dict]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(b.get("text", "") for b in content if isinstance(b, dict) and b.get("type") == "text")
+    return "\n".join(parts)
+
+
+def _synthesize(body: dict[str, Any], exact: str, loose: str) -> Fixture:
+    prompt = _system_text(body.get("system")) + "\n" + _message_text(body.get("messages", []))
+    if "json" in prompt.lower():
+        text = "{}"
+    else:
+        words = max(10, min(int(body.get("max_tokens", 400)) // 4, 150))
+        filler = _FILLER.split()
+        text = " ".join(filler[i % len(filler)] for i in range(words))
+    message = {
+        "id": f"msg_replay_{exact[:16]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", ""),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": len(prompt) // 4, "output_tokens": max(1, len(text) // 4)},
+    }
+    if body.get("stream"):
+        return Fixture(exact, loose, 200, "text/event-stream", message_to_sse(message))
+    return Fixture(exact, loose, 200, "application/json", json.dumps(message, ensure_ascii=False))
+
+
+def message_to_sse(message: dict[str, Any], chunk_chars: int = 40) -> str:
+    """A complete Message as the server-sent events the streaming API would send."""
+    def event(kind: str, data: dict) -> str:
+        return f"event: {kind}\ndata: {json.dumps({'type': kind, **data}, ensure_ascii=False)}"
+
+    start = {**message, "content": [], "stop_reason": None,
+             "usage": {**message.get("usage", {}), "output_tokens": 1}}
+    events = [event("message_start", {"message": start})]
+    for i, block in enumerate(message.get("content", [])):
+        if block["type"] == "tool_use":
+            events.append(event("content_block_start", {"index": i, "content_block": {**block, "input": {}}}))
+            events.append(event("content_block_delta", {"index": i, "delta": {
+                "type": "input_json_delta", "partial_json": json.dumps(block.get("input", {}), ensure_ascii=False),
+            }}))
+        else:
+            text = block.get("text", "")
+            events.append(event("content_block_start", {"index": i, "content_block": {"type": "text", "text": ""}}))
+            for j in range(0, len(text), chunk_chars):
+                events.append(event("content_block_delta", {"index": i, "delta": {
+                    "type": "text_delta", "text": text[j:j + chunk_chars],
+                }}))
+        events.append(event("content_block_stop", {"index": i}))
+    events.append(event("message_delta", {
+        "delta": {"stop_reason": message.get("stop_reason"), "stop_sequence": None},
+        "usage": {"output_tokens": message.get("usage", {}).get("output_tokens", 0)},
+    }))
+    events.append(event("message_stop", {}))
+    return "\n\n".join(events) + "\n\n"
+
+
+def build_transport_from_settings() -> ReplayTransport | None:
+    """The transport selected by ANTHROPIC_TRANSPORT, or None for the real API."""
+    from app.core.config import settings
+
+    if not settings.ANTHROPIC_TRANSPORT:
+        return None
+    inner = None
+    if settings.ANTHROPIC_TRANSPORT == "record":
+        inner = httpx.AsyncHTTPTransport(limits=httpx.Limits(
+            max_connections=settings.ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.ANTHROPIC_KEEPALIVE_EXPIRY_SECONDS,
+        ))
+    return ReplayTransport(
+        settings.ANTHROPIC_FIXTURES_DIR,
+        mode=settings.ANTHROPIC_TRANSPORT,
+        latency=LatencyModel.parse(settings.ANTHROPIC_REPLAY_LATENCY, settings.ANTHROPIC_REPLAY_LATENCY_SCALE),
+        rate_limit_rate=settings.ANTHROPIC_REPLAY_429_RATE,
+        overload_rate=settings.ANTHROPIC_REPLAY_529_RATE,
+        on_miss=settings.ANTHROPIC_REPLAY_ON_MISS,
+        seed=settings.ANTHROPIC_REPLAY_SEED,
+        inner=inner,
+    )
@@ -11,6 +11,7 @@ Alle afsnit følger VSME Basic Module (EFRAG 2024) strukturen:
 """
 
 from .llm_client import LLMClient
+from .narrative_cache import get_cached_narrative, narrative_cache_key, store_narrative
 from ..esg_engine.calculator import CalculationReport
 from ..esg_engine.scorer import ESGScore
 from ..esg_engine.gap_analyzer import GapReport
@@ -87,8 +88,45 @@ def _fmt_policy(policy_data: dict) -> str:
 class ReportWriter:
     """Genererer alle narrative afsnit af VSME-rapporten ved hjælp af LLM."""
 
-    def __init__(self):
-        self.llm = LLMClient()
+    def __init__(self, use_cache: bool | None = None, llm=None):
+        """`llm` defaults to LLMClient(); anything with `model` and `generate_with_model()` works
+        (message_batches.RequestRecorder collects prompts for the Batches API)."""
+        from app.core.config import settings
+        self.llm = llm or LLMClient()
+        self.use_cache = settings.NARRATIVE_CACHE_ENABLED if use_cache is None else use_cache
+        self.models_used: set[str] = set()     # models behind the AI-written sections (ai_model_used)
+
+    async def _generate(self, prompt: str, max_tokens: int) -> str:
+        """
+        Generate one section — served from the narrative cache when the prompt is unchanged.
+        Only answers from the routed model are cached; a fallback model's text is used once.
+        """
+        if not self.use_cache:
+            return await self._call_llm(prompt, max_tokens)
+
+        key = narrative_cache_key(self.llm.model, _SYSTEM_PROMPT, prompt, max_tokens)
+        cached = await get_cached_narrative(key)
+        if cached is not None:
+            from app.core.tracing import record
+            record(narrative_cache_hits=1)
+            self.models_used.add(self.llm.model)
+            return cached
+        text, model = await self.llm.generate_with_model(_SYSTEM_PROMPT, prompt, max_tokens=max_tokens)
+        if text:
+            self.models_used.add(model)
+            if model == self.llm.model:
+                await store_narrative(key, model, text)
+        return text
+
+    async def _call_llm(self, prompt: str, max_tokens: int) -> str:
+        text, model = await self.llm.generate_with_model(_SYSTEM_PROMPT, prompt, max_tokens=max_tokens)
+        if text:
+            self.models_used.add(model)
+        return text
+
+    def model_used(self) -> str | None:
+        """Value for ReportResults.ai_model_used — None when every section is templated."""
+        return ", ".join(sorted(self.models_used)) or None
 
     async def write_executive_summary(
         self,
@@ -164,7 +202,7 @@ class ReportWriter:
             f"## De 3 vigtigste næste skridt\n\n"
             f"Afslut med den obligatoriske ansvarsfraskrivelse."
         )
-        return await self.llm.generate(_SYSTEM_PROMPT, prompt, max_tokens=1000)
+        return await self._generate(prompt, max_tokens=1000)
 
     async def write_co2_narrative(
         self,
@@ -215,7 +253,7 @@ class ReportWriter:
             f"Beregn og nævn procentandele for de vigtigste emissionskilder. "
             f"Afslut med ansvarsfraskrivelse."
         )
-        return await self.llm.generate(_SYSTEM_PROMPT, prompt, max_tokens=800)
+        return await self._generate(prompt, max_tokens=800)
 
     async def write_esg_narrative(
         self,
@@ -286,7 +324,7 @@ class ReportWriter:
             f"Henvis til konkrete tal og procenter i hvert afsnit. "
             f"Afslut med ansvarsfraskrivelse."
         )
-        return await self.llm.generate(_SYSTEM_PROMPT, prompt, max_tokens=750)
+        return await self._generate(prompt, max_tokens=750)
 
     async def write_improvements(
         self,
@@ -336,7 +374,7 @@ class ReportWriter:
             f"  - 3-5 konkrete handlinger med estimeret effekt\n\n"
             f"Afslut med ansvarsfraskrivelse."
         )
-        return await self.llm.generate(_SYSTEM_PROMPT, prompt, max_tokens=1100)
+        return await self._generate(prompt, max_tokens=1100)
 
     async def write_roadmap_narrative(
         self,
@@ -376,4 +414,4 @@ class ReportWriter:
             f"Nævn forventet score-gevinst pr. kvartal. "
             f"Afslut med ansvarsfraskrivelse."
         )
-        return await self.llm.generate(_SYSTEM_PROMPT, prompt, max_tokens=900)
+        return await self._generate(prompt, max_tokens=900)
@@ -0,0 +1,307 @@
+"""
+LLM Resilience — ESG Copilot
+=============================
+Retry, backoff and circuit breaking for every Claude call, in one place.
+
+    response = await create_message(model=model, max_tokens=..., system=..., messages=...)
+
+replaces the hand-rolled `for attempt in range(1, 4): ... sleep(N * attempt)`
+loops. Worst case those slept 2+4+6 s (rate limit) or 8+16+24 s (overload)
+before giving up — longer than the web proxy timeout.
+
+Retries
+  - `retry-after` / `retry-after-ms` response headers are honoured (capped at
+    LLM_RETRY_MAX_DELAY_SECONDS); otherwise exponential backoff with jitter,
+    so workers that failed together don't retry together.
+  - At most LLM_MAX_ATTEMPTS attempts, and the total time spent sleeping is
+    bounded by LLM_RETRY_BUDGET_SECONDS: when the next wait would exceed the
+    budget the call fails now instead of later.
+  - A 429 also pauses the LLM governor for everyone (see llm_governor.py).
+  - The Anthropic SDK's own retries are disabled (anthropic_client.py) so
+    attempts are not multiplied.
+
+Circuit breaker (per model)
+  LLM_BREAKER_FAILURE_THRESHOLD consecutive overload/5xx errors open the
+  breaker for LLM_BREAKER_COOLDOWN_SECONDS. While open, calls go straight to
+  ANTHROPIC_FALLBACK_MODEL (if set and its own breaker is closed) or fail
+  immediately with LLMUnavailableError. After the cooldown one probe call is
+  let through (half-open); its outcome closes or re-opens the breaker.
+
+Streaming calls cannot be replayed once output has been sent, so
+LLMClient.stream() drives a RetryLoop directly instead of create_message().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+import anthropic
+
+from .anthropic_client import get_anthropic_client
+from .llm_governor import llm_slot, throttle_llm_calls
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# APITimeoutError is a subclass of APIConnectionError
+TRANSIENT_ERRORS = (anthropic.RateLimitError, anthropic.InternalServerError, anthropic.APIConnectionError)
+
+# Backoff base per error kind (seconds) — doubled per attempt, then jittered
+_BASE_DELAY = {"rate_limit": 1.0, "overloaded": 2.0, "connection": 0.5}
+
+
+class LLMUnavailableError(RuntimeError):
+    """Circuit breaker open for the model (and any fallback) — not worth calling now."""
+
+
+def _settings():
+    from app.core.config import settings
+    return settings
+
+
+# ── Circuit breaker ───────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, model: str, failure_threshold: int, cooldown_seconds: float) -> None:
+        self.model = model
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+
+    def allow(self) -> bool:
+        """May a request be sent now? In half-open state only one probe at a time."""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.cooldown_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            # A probe that ended in a non-transient error never reports back — let it lapse
+            if self._probe_in_flight and now - self._probe_started < self.cooldown_seconds:
+                return False
+            self._probe_in_flight = True
+            self._probe_started = now
+        return True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("LLM circuit breaker for %s closed", self.model)
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """The probe failed for a reason unrelated to overload (429, network) — allow another."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                from app.core.metrics import counter
+                counter("llm_breaker_trips_total", "LLM circuit breaker trips", labels={"model": self.model}).inc()
+                logger.warning(
+                    "LLM circuit breaker for %s opened after %d failures (cooldown %ss)",
+                    self.model, self._failures, self.cooldown_seconds,
+                )
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    breaker = _breakers.get(model)
+    if breaker is None:
+        s = _settings()
+        breaker = _breakers[model] = CircuitBreaker(
+            model, s.LLM_BREAKER_FAILURE_THRESHOLD, s.LLM_BREAKER_COOLDOWN_SECONDS,
+        )
+    return breaker
+
+
+def reset_breakers() -> None:
+    _breakers.clear()
+
+
+# ── Backoff ───────────────────────────────────────────────────────────────────
+
+def error_kind(error: Exception) -> str:
+    if isinstance(error, anthropic.RateLimitError):
+        return "rate_limit"
+    if isinstance(error, anthropic.InternalServerError):
+        return "overloaded"        # 529 Overloaded and other 5xx
+    return "connection"
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Server-requested wait from `retry-after-ms` / `retry-after` (seconds or HTTP date)."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            when = email.utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retry number `attempt` (1-based)."""
+    cap = _settings().LLM_RETRY_MAX_DELAY_SECONDS
+    hinted = retry_after_seconds(error)
+    if hinted is not None:
+        # Small jitter on top so callers told the same value don't return in lockstep
+        return min(cap, hinted) + random.uniform(0, 0.25)
+    ceiling = min(cap, _BASE_DELAY[error_kind(error)] * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _record_retry(model: str, reason: str) -> None:
+    from app.core.metrics import counter
+    from app.core.tracing import record
+
+    record(retries=1)
+    counter("llm_retries_total", "LLM call retries", labels={"model": model, "reason": reason}).inc()
+
+
+# ── Retry loop ────────────────────────────────────────────────────────────────
+
+class RetryLoop:
+    """
+    Retry state for one logical call:
+
+        loop = RetryLoop("claude-sonnet-4-6")
+        while True:
+            model = loop.model()                 # may switch to the fallback model
+            try:
+                result = await call(model)
+            except TRANSIENT_ERRORS as e:
+                await loop.failed(model, e)      # sleeps, or raises when out of attempts/budget
+                continue
+            loop.succeeded(model)
+            return result
+    """
+
+    def __init__(self, model: str, fallback_model: str | None = None) -> None:
+        s = _settings()
+        self.requested_model = model
+        self.fallback_model = s.ANTHROPIC_FALLBACK_MODEL if fallback_model is None else fallback_model
+        self.max_attempts = max(1, s.LLM_MAX_ATTEMPTS)
+        self.attempt = 0
+        self._deadline = time.monotonic() + s.LLM_RETRY_BUDGET_SECONDS
+        self._timed_out = False
+
+    def model(self) -> str:
+        """Model for the next attempt. Raises LLMUnavailableError if every breaker is open."""
+        self.attempt += 1
+        # After a timeout (latency budget, see model_router.py) the retry prefers the fallback
+        if not self._timed_out and get_breaker(self.requested_model).allow():
+            return self.requested_model
+        fallback = self.fallback_model
+        if fallback and fallback != self.requested_model and get_breaker(fallback).allow():
+            from app.core.metrics import counter
+            counter(
+                "llm_fallback_total", "LLM calls sent to the fallback model",
+                labels={"model": self.requested_model, "fallback": fallback},
+            ).inc()
+            return fallback
+        if self._timed_out and get_breaker(self.requested_model).allow():
+            return self.requested_model
+        raise LLMUnavailableError(f"Claude model {self.requested_model} temporarily unavailable (circuit open)")
+
+    def succeeded(self, model: str) -> None:
+        get_breaker(model).record_success()
+
+    async def failed(self, model: str, error: Exception, retry: bool = True) -> None:
+        """Record a transient failure; wait before the next attempt or re-raise as RuntimeError."""
+        kind = error_kind(error)
+        if isinstance(error, anthropic.APITimeoutError):
+            self._timed_out = True
+        breaker = get_breaker(model)
+        if kind == "overloaded":
+            breaker.record_failure()
+        else:
+            breaker.release_probe()
+
+        delay = backoff_delay(error, self.attempt)
+        if kind == "rate_limit":
+            await throttle_llm_calls(delay)     # hold back every other caller too
+
+        remaining = self._deadline - time.monotonic()
+        if not retry or self.attempt >= self.max_attempts or delay > remaining:
+            raise RuntimeError(
+                f"LLM call to {model} failed after {self.attempt} attempt(s): {error}"
+            ) from error
+
+        logger.warning(
+            "Anthropic %s on %s (attempt %d/%d). Retrying in %.1fs.",
+            kind, model, self.attempt, self.max_attempts, delay,
+        )
+        _record_retry(model, kind)
+        await asyncio.sleep(delay)
+
+
+async def call_with_retries(
+    model: str,
+    call: Callable[[str], Awaitable[T]],
+    fallback_model: str | None = None,
+) -> T:
+    """Run `call(model)` under the retry loop and circuit breakers."""
+    loop = RetryLoop(model, fallback_model)
+    while True:
+        current = loop.model()
+        try:
+            result = await call(current)
+        except TRANSIENT_ERRORS as e:
+            await loop.failed(current, e)
+            continue
+        loop.succeeded(current)
+        return result
+
+
+async def create_message(*, model: str, fallback_model: str | None = None, **kwargs: Any):
+    """
+    `client.messages.create(model=..., **kwargs)` with governor slot, retries,
+    circuit breaker/fallback and usage accounting. Raises RuntimeError when
+    the call cannot be completed (LLMUnavailableError if the breaker is open).
+    """
+    response, _model = await create_message_with_model(model=model, fallback_model=fallback_model, **kwargs)
+    return response
+
+
+async def create_message_with_model(*, model: str, fallback_model: str | None = None, **kwargs: Any):
+    """create_message(), plus the model that answered — `model` or, after failures, the fallback."""
+    from .llm_client import record_usage
+
+    async def attempt(current: str):
+        async with llm_slot():
+            response = await get_anthropic_client().messages.create(model=current, **kwargs)
+        record_usage(current, response)
+        return response, current
+
+    return await call_with_retries(model, attempt, fallback_model)
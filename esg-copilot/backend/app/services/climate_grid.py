@@ -0,0 +1,199 @@
+"""
+ClimateGrid
+===========
+Site-level physical climate exposure for Denmark: flood, cloudburst, storm
+surge and heat, each 0–100, from a bundled raster that is memory-mapped
+(one open per process, no parsing). A lookup is a constant-time read of
+len(HAZARDS) bytes, so whole portfolios can be scored in one batch.
+
+Sites are located by coordinates, else postcode, else city name. Postcodes
+resolve through anchor postcodes (data/climate_risk/dk_postcodes.json) —
+an unlisted postcode takes the nearest lower anchor in its postal region
+(_POSTCODE_REGIONS), since Danish postcodes are numbered by area — so
+postcode precision is "area", not address. Numbers outside those regions
+(Greenland 3900–3999, the Faroe Islands, unused ranges) are not placed.
+
+The bundled grid (data/climate_risk/dk_climate_grid.bin) is an indicative
+model built by tools/build_climate_grid.py from known Danish hotspots
+(west-coast and Wadden Sea surge, river valleys, cities). GRID_SOURCE is
+reported with every result; replace the file with a raster built from e.g.
+DMI Klimaatlas data in the same format for survey-grade values.
+
+File format (little-endian): header _HEADER (magic, version, layers, rows,
+cols, south latitude, west longitude, cell size in degrees) followed by
+rows × cols cells of `layers` uint8 values, row 0 = southernmost.
+
+    risk = get_climate_grid().site_risk({"zipcode": "6700"})
+    risks = get_climate_grid().batch_site_risk(sites)
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "climate_risk"
+GRID_PATH = DATA_DIR / "dk_climate_grid.bin"
+POSTCODES_PATH = DATA_DIR / "dk_postcodes.json"
+
+HAZARDS = ("flood", "cloudburst", "storm_surge", "heat")
+GRID_SOURCE = "ESG Copilot indikativ klimarisikomodel v1 (ikke DMI-data)"
+
+# Danish postal regions; a postcode only resolves to an anchor in its own region
+_POSTCODE_REGIONS = (
+    (1000, 3699),       # Copenhagen, North Zealand
+    (3700, 3799),       # Bornholm
+    (4000, 4999),       # Zealand, Lolland-Falster, Møn
+    (5000, 5999),       # Funen
+    (6000, 6999),       # South Jutland
+    (7000, 7999),       # Central and West Jutland
+    (8000, 8999),       # East Jutland
+    (9000, 9999),       # North Jutland
+)
+_NON_DK_POSTCODES = {2412}                 # Greenland (Santa Claus) inside the Copenhagen range
+
+_MAGIC = b"DKCR"
+_HEADER = struct.Struct("<4sBBHHfff")      # magic, version, layers, rows, cols, lat0, lon0, step
+
+
+class ClimateGrid:
+    """Memory-mapped hazard raster plus the postcode anchors."""
+
+    def __init__(self, path: Path = GRID_PATH, postcodes_path: Path = POSTCODES_PATH) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.layers, self.rows, self.cols, self.lat0, self.lon0, self.step = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or self.layers != len(HAZARDS):
+            self._mm.close()
+            raise ValueError(f"{path} is not a climate grid with layers {', '.join(HAZARDS)}")
+        if len(self._mm) < _HEADER.size + self.rows * self.cols * self.layers:
+            self._mm.close()
+            raise ValueError(f"{path} is truncated")
+        self._anchors = _load_anchors(postcodes_path)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def at(self, lat: float, lon: float) -> dict[str, int] | None:
+        """Hazard values of the cell containing (lat, lon); None outside the grid."""
+        row = int((lat - self.lat0) / self.step)
+        col = int((lon - self.lon0) / self.step)
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        offset = _HEADER.size + (row * self.cols + col) * self.layers
+        return dict(zip(HAZARDS, self._mm[offset:offset + self.layers]))
+
+    def locate(self, site: dict[str, Any]) -> tuple[float, float, str] | None:
+        """(lat, lon, precision) of a site: coordinates, else postcode, else city."""
+        lat, lon = site.get("latitude"), site.get("longitude")
+        if lat is not None and lon is not None:
+            return float(lat), float(lon), "coordinates"
+        postcode = _postcode(site.get("zipcode") or site.get("postcode"))
+        region_start = _region_start(postcode)
+        if region_start is not None:
+            codes, coords = self._anchors["codes"], self._anchors["coords"]
+            i = bisect.bisect_right(codes, postcode) - 1
+            if i >= 0 and codes[i] >= region_start:
+                return (*coords[i], "postcode" if codes[i] == postcode else "postcode_area")
+        city = _city_key(site.get("city"))
+        if city and city in self._anchors["cities"]:
+            return (*self._anchors["cities"][city], "city")
+        return None
+
+    def site_risk(self, site: dict[str, Any]) -> dict[str, Any] | None:
+        """Exposure of one site ({zipcode|postcode, city, latitude, longitude}); None if it can't be placed."""
+        located = self.locate(site)
+        if located is None:
+            return None
+        lat, lon, precision = located
+        values = self.at(lat, lon)
+        if values is None:
+            return None
+        top = max(values, key=values.get)
+        return {
+            **values,
+            "score":     round(max(values.values()) / 10, 1),      # 0–10, like the industry scores
+            "top_hazard": top,
+            "precision": precision,
+            "source":    GRID_SOURCE,
+        }
+
+    def batch_site_risk(self, sites: Iterable[dict[str, Any]]) -> list[dict[str, Any] | None]:
+        """site_risk() for many sites (e.g. every site of every company in a portfolio), in order."""
+        return [self.site_risk(site) for site in sites]
+
+
+# ---------------------------------------------------------------------------
+# Postcodes
+# ---------------------------------------------------------------------------
+
+def _postcode(value: Any) -> int | None:
+    digits = "".join(ch for ch in str(value or "") if ch.isdigit())
+    return int(digits) if len(digits) == 4 else None
+
+
+def _region_start(postcode: int | None) -> int | None:
+    """First postcode of the Danish postal region containing `postcode`; None if it isn't Danish."""
+    if postcode is None or postcode in _NON_DK_POSTCODES:
+        return None
+    for start, end in _POSTCODE_REGIONS:
+        if start <= postcode <= end:
+            return start
+    return None
+
+
+def _city_key(value: Any) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def _load_anchors(path: Path) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    anchors = sorted(
+        (int(code), (value[0], value[1]), value[2]) for code, value in raw.items() if code.isdigit()
+    )
+    cities: dict[str, tuple[float, float]] = {}
+    for _, coords, city in anchors:
+        cities.setdefault(_city_key(city), coords)
+        # "Odense C" / "Aarhus N" → also "odense" / "aarhus"
+        base = _city_key(city).rsplit(" ", 1)
+        if len(base) == 2 and len(base[1]) <= 2:
+            cities.setdefault(base[0], coords)
+    return {
+        "codes":  [code for code, _, _ in anchors],
+        "coords": [coords for _, coords, _ in anchors],
+        "cities": cities,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Shared instance
+# ---------------------------------------------------------------------------
+
+_grid: ClimateGrid | None = None
+
+
+def get_climate_grid() -> ClimateGrid:
+    global _grid
+    if _grid is None:
+        _grid = ClimateGrid()
+        logger.info("Climate grid mapped: %dx%d cells, %s", _grid.rows, _grid.cols, GRID_SOURCE)
+    return _grid
+
+
+def shutdown_climate_grid() -> None:
+    """Unmap the grid (called at app shutdown)."""
+    global _grid
+    if _grid is not None:
+        _grid.close()
+        _grid = None
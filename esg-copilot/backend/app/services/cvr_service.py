@@ -0,0 +1,236 @@
+"""
+CVR Service — ESG Copilot
+=========================
+One client for cvrapi.dk (Danish Central Business Register), shared by
+GET /companies/cvr-lookup and CompanyResearcherAgent.
+
+  - one pooled httpx.AsyncClient per event loop (like anthropic_client.py)
+  - TieredCache "cvr": companies are kept CVR_CACHE_TTL_SECONDS (registry
+    data changes rarely), unknown numbers CVR_NEGATIVE_TTL_SECONDS
+  - single-flight per CVR number, so a burst of identical lookups makes one
+    upstream request
+  - CVR_TRANSPORT=fixtures answers from CVR_FIXTURES_DIR/<cvr>.json (raw
+    cvrapi.dk responses) instead of the network — for tests and offline
+    development; numbers without a file are 404
+
+    company = await lookup_cvr("DK-1234 5678")
+    # {"cvr", "name", "industry_code", "industry_desc", "address", "zipcode",
+    #  "city", "country_code", "employee_count", "founded_year"}
+
+Raises CVRNotFound (unknown number), CVRTimeout or CVRUnavailable (upstream
+problems), and ValueError for anything that is not an 8-digit CVR number.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = "ESG-Copilot/1.0 (support@esgcopilot.dk)"
+
+# cvrapi.dk industry description → our industry_code (first match wins). Substrings,
+# so compounds like "Engroshandel" match — except "it", which must be a word.
+_INDUSTRY_PATTERNS: list[tuple[re.Pattern, str]] = [
+    (re.compile(pattern), code) for pattern, code in [
+        (r"fremstilling",      "manufacturing"),
+        (r"handel",            "retail"),
+        (r"service",           "retail"),
+        (r"byggeri",           "construction"),
+        (r"anlæg",             "construction"),
+        (r"transport",         "logistics"),
+        (r"landbrug",          "agriculture"),
+        (r"skovbrug",          "agriculture"),
+        (r"fiskeri",           "agriculture"),
+        (r"hotel",             "hospitality"),
+        (r"restauration",      "hospitality"),
+        (r"sundhed",           "healthcare"),
+        (r"social",            "healthcare"),
+        (r"finans",            "finance"),
+        (r"forsikring",        "finance"),
+        (r"\bit\b",            "technology"),
+        (r"telekommunikation", "technology"),
+        (r"information",       "technology"),
+    ]
+]
+_DEFAULT_INDUSTRY = "technology"
+
+_flight = SingleFlight("cvr")
+
+
+class CVRError(Exception):
+    """Base class for CVR lookup failures."""
+
+
+class CVRNotFound(CVRError):
+    pass
+
+
+class CVRUnavailable(CVRError):
+    pass
+
+
+class CVRTimeout(CVRUnavailable):
+    pass
+
+
+def normalise_cvr(value: Any) -> str:
+    """'DK-1234 5678' → '12345678'. Raises ValueError unless exactly 8 digits remain."""
+    digits = re.sub(r"\D", "", str(value or ""))
+    if len(digits) != 8:
+        raise ValueError("CVR-nummer skal være 8 cifre")
+    return digits
+
+
+def industry_code_for(description: str) -> str:
+    text = (description or "").lower()
+    for pattern, code in _INDUSTRY_PATTERNS:
+        if pattern.search(text):
+            return code
+    return _DEFAULT_INDUSTRY
+
+
+async def lookup_cvr(cvr: str) -> dict[str, Any]:
+    """Company data for a CVR number — cached, coalesced, from one pooled client."""
+    from app.core.config import settings
+
+    cvr = normalise_cvr(cvr)
+    cached = await get_cvr_cache().get(cvr)
+    if cached is not None:
+        if cached.get("not_found"):
+            raise CVRNotFound(f"CVR {cvr} ikke fundet i CVR-registret")
+        return dict(cached)
+
+    async def fetch() -> dict[str, Any]:
+        try:
+            company = await _fetch(cvr)
+        except CVRNotFound:
+            await get_cvr_cache().set(cvr, {"not_found": True}, settings.CVR_NEGATIVE_TTL_SECONDS)
+            raise
+        await get_cvr_cache().set(cvr, company)
+        return company
+
+    return dict(await _flight.do(cvr, fetch))
+
+
+async def _fetch(cvr: str) -> dict[str, Any]:
+    from app.core.config import settings
+
+    try:
+        resp = await get_cvr_client().get(settings.CVR_API_URL, params={"search": cvr, "country": "dk"})
+        if resp.status_code == 404:
+            raise CVRNotFound(f"CVR {cvr} ikke fundet i CVR-registret")
+        resp.raise_for_status()
+        data = resp.json()
+    except httpx.TimeoutException as exc:
+        raise CVRTimeout("CVR-opslag timeout") from exc
+    except CVRError:
+        raise
+    except Exception as exc:
+        logger.warning("CVR lookup failed for %s: %s", cvr, exc)
+        raise CVRUnavailable("CVR-opslag utilgængeligt") from exc
+    # cvrapi.dk answers unknown numbers with 200 + {"error": "NOT_FOUND"} as well. Other
+    # errors (e.g. QUOTA_EXCEEDED) say nothing about the company, so they are not cached
+    error = data.get("error")
+    if error == "NOT_FOUND":
+        raise CVRNotFound(f"CVR {cvr} ikke fundet i CVR-registret")
+    if error:
+        logger.warning("CVR lookup failed for %s: %s", cvr, error)
+        raise CVRUnavailable("CVR-opslag utilgængeligt")
+
+    industry_desc = data.get("industrydesc") or ""
+    return {
+        "cvr":            cvr,
+        "name":           data.get("name") or "",
+        "industry_code":  industry_code_for(industry_desc),
+        "industry_desc":  industry_desc,
+        "address":        data.get("address") or "",
+        "zipcode":        str(data.get("zipcode") or ""),
+        "city":           data.get("city") or "",
+        "country_code":   "DK",
+        "employee_count": data.get("employees") or None,
+        "founded_year":   data["startdate"][-4:] if data.get("startdate") else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """Answers cvrapi.dk requests from <dir>/<cvr>.json; 404 when there is no file."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        cvr = re.sub(r"\D", "", request.url.params.get("search", ""))
+        path = self.directory / f"{cvr}.json"
+        if not cvr or not path.is_file():
+            return httpx.Response(404, json={"error": "NOT_FOUND"}, request=request)
+        return httpx.Response(200, json=json.loads(path.read_text(encoding="utf-8")), request=request)
+
+
+# ---------------------------------------------------------------------------
+# Shared client + cache
+# ---------------------------------------------------------------------------
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_cache = None
+
+
+def get_cvr_client() -> httpx.AsyncClient:
+    """Shared pooled client; rebuilt when requested from a different event loop (Celery tasks)."""
+    from app.core.config import settings
+
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        transport = FixtureTransport(settings.CVR_FIXTURES_DIR) if settings.CVR_TRANSPORT == "fixtures" else None
+        _client = httpx.AsyncClient(
+            timeout=settings.CVR_TIMEOUT_SECONDS,
+            headers={"User-Agent": _USER_AGENT},
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            transport=transport,
+        )
+        _client_loop = loop
+    return _client
+
+
+def get_cvr_cache():
+    global _cache
+    if _cache is None:
+        from app.core.cache import TieredCache
+        from app.core.config import settings
+        _cache = TieredCache(
+            "cvr",
+            ttl_seconds=settings.CVR_CACHE_TTL_SECONDS,
+            max_entries=settings.CVR_CACHE_MAX_ENTRIES,
+            redis_url=settings.REDIS_URL if settings.CVR_CACHE_BACKEND == "redis" else None,
+        )
+    return _cache
+
+
+async def close_cvr_service() -> None:
+    """Close the pooled client and the cache (called at app shutdown)."""
+    global _client, _client_loop, _cache
+    if _client is not None:
+        try:
+            await _client.aclose()
+        except Exception as exc:
+            logger.warning("Closing CVR client failed: %s", exc)
+        _client = None
+        _client_loop = None
+    if _cache is not None:
+        await _cache.aclose()
+        _cache = None
@@ -0,0 +1,140 @@
+"""
+Context Packer — ESG Copilot
+=============================
+Chooses which parts of a long text go into an LLM prompt. Cutting at a fixed
+length (`raw_text[:6000]`) drops the consumption table on page 4 and spends
+the budget on the cover page and table of contents.
+
+    index = PassageIndex.from_pages(result.pages)
+    context = index.pack(budget_tokens=1500, patterns=_PATTERNS, keywords=_KEYWORDS)
+
+1. Each page (or report section) is split into paragraphs; long paragraphs
+   are cut at line breaks into passages of at most _MAX_PASSAGE_CHARS.
+2. Passages are scored: regex hits (pattern library) weigh most, then
+   distinct keyword hits, then how dense the passage is in numbers.
+3. The best passages are taken until the token budget is full and emitted
+   in document order under their page/section label.
+
+Pure Python and in-memory — no embeddings, no extra calls.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+_MAX_PASSAGE_CHARS = 800
+_CHARS_PER_TOKEN = 4            # rough estimate for mixed Danish/English text
+_NUMBER = re.compile(r"\d[\d.,]*")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // _CHARS_PER_TOKEN)
+
+
+@dataclass
+class Passage:
+    label: str          # "Side 4" / section name
+    order: int          # position in the document
+    text: str
+    score: float = 0.0
+
+
+class PassageIndex:
+    def __init__(self, blocks: Iterable[tuple[str, str]]) -> None:
+        """`blocks` — (label, text) pairs in document order."""
+        self.passages: list[Passage] = []
+        for label, text in blocks:
+            for chunk in _split(text):
+                self.passages.append(Passage(label, len(self.passages), chunk))
+
+    @classmethod
+    def from_pages(cls, pages: list[str]) -> "PassageIndex":
+        return cls((f"Side {n}", page) for n, page in enumerate(pages, start=1))
+
+    @classmethod
+    def from_sections(cls, sections: dict[str, str]) -> "PassageIndex":
+        return cls((name, text) for name, text in sections.items() if text)
+
+    def rank(
+        self,
+        patterns: dict[str, list[str]] | None = None,
+        keywords: Iterable[str] = (),
+    ) -> list[Passage]:
+        """Passages scored and sorted best first (ties: earlier passage first)."""
+        compiled = [re.compile(p, re.IGNORECASE) for group in (patterns or {}).values() for p in group]
+        terms = [
+            re.compile(rf"(?<!\w){re.escape(k.lower())}(?!\w)")
+            for k in {k for k in keywords if k}
+        ]
+        for passage in self.passages:
+            passage.score = _score(passage.text, compiled, terms)
+        return sorted(self.passages, key=lambda p: (-p.score, p.order))
+
+    def pack(
+        self,
+        budget_tokens: int,
+        patterns: dict[str, list[str]] | None = None,
+        keywords: Iterable[str] = (),
+    ) -> str:
+        """The highest-value passages that fit in `budget_tokens`, in document order."""
+        if not self.passages:
+            return ""
+        ranked = self.rank(patterns, keywords)
+        chosen: list[Passage] = []
+        used = 0
+        for passage in ranked:
+            cost = estimate_tokens(passage.text) + 1
+            if used + cost <= budget_tokens:
+                chosen.append(passage)
+                used += cost
+        if not chosen:
+            # Even the best passage is larger than the budget — send its beginning
+            best = ranked[0]
+            chosen = [Passage(best.label, best.order, best.text[: budget_tokens * _CHARS_PER_TOKEN])]
+
+        out: list[str] = []
+        label = None
+        for passage in sorted(chosen, key=lambda p: p.order):
+            if passage.label != label:
+                label = passage.label
+                out.append(f"[{label}]")
+            out.append(passage.text)
+        return "\n\n".join(out)
+
+
+def _split(text: str) -> list[str]:
+    chunks: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= _MAX_PASSAGE_CHARS:
+            chunks.append(paragraph)
+            continue
+        # PDF text often has no blank lines — group lines into passages instead
+        current = ""
+        for line in paragraph.splitlines():
+            while len(line) > _MAX_PASSAGE_CHARS:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(line[:_MAX_PASSAGE_CHARS])
+                line = line[_MAX_PASSAGE_CHARS:]
+            if current and len(current) + len(line) + 1 > _MAX_PASSAGE_CHARS:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current.strip():
+            chunks.append(current)
+    return chunks
+
+
+def _score(text: str, patterns: list[re.Pattern], terms: list[re.Pattern]) -> float:
+    lower = text.lower()
+    pattern_hits = sum(1 for p in patterns if p.search(lower))
+    keyword_hits = sum(1 for t in terms if t.search(lower))
+    numbers = len(_NUMBER.findall(text))
+    density = min(2.0, numbers * 100 / max(len(text), 1))     # numbers per 100 chars, capped
+    return 3.0 * pattern_hits + 1.0 * keyword_hits + density
@@ -9,14 +9,18 @@ Two-phase approach:
 1. PyPDF2 → raw text extraction (deterministic, free)
 2. LLM structuring → map text to EnergyDataInput fields (AI, paid)
    LLM is instructed to return ONLY values it finds in the text — never invent.
+   Only the most relevant passages are sent (see context_packer.py).
 """
 
 import re
 import logging
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from .context_packer import PassageIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +33,7 @@ class PDFExtractionResult:
     detected_document_type: str      # "utility_bill" | "sustainability_report" | "financial" | "unknown"
     extracted_values: dict           # field_name -> value (pattern-matched)
     extraction_warnings: list[str] = field(default_factory=list)
+    pages: list[str] = field(default_factory=list)   # text per page, same order as the PDF
 
 
 # ── Pattern library for common ESG document fields ───────────────────────────
@@ -84,6 +89,25 @@ _DOCTYPE_SIGNALS = {
 }
 
 
+# Terms that mark a passage as worth sending to the LLM (besides _PATTERNS hits)
+_CONTEXT_KEYWORDS = [
+    "kwh", "mwh", "gj", "m3", "m³", "liter", "tco2e", "co2", "co₂", "scope",
+    "forbrug", "elforbrug", "naturgas", "fjernvarme", "diesel", "benzin", "brændstof",
+    "medarbejdere", "ansatte", "omsætning", "vedvarende", "udledning", "periode",
+    "consumption", "emissions", "employees", "revenue", "renewable", "period",
+]
+
+
+@lru_cache(maxsize=1)
+def _context_keywords() -> tuple[str, ...]:
+    """_CONTEXT_KEYWORDS plus the words of every field name the extractors look for."""
+    from app.services.ai.document_extractor import _FIELD_TARGETS
+
+    fields = set(_PATTERNS) | {f for target in _FIELD_TARGETS.values() for f in target["fields"]}
+    words = {w for f in fields for w in f.split("_") if len(w) >= 3 and w not in ("pct", "count", "total")}
+    return tuple(_CONTEXT_KEYWORDS) + tuple(sorted(words))
+
+
 class PDFParser:
     """
     Parses PDF documents and extracts ESG-relevant data fields.
@@ -94,6 +118,8 @@ class PDFParser:
         structured = await parser.structure_with_llm(result)
     """
 
+    CONTEXT_TOKENS = 1500     # ≈ the old 6000-character cut, but filled with the best passages
+
     def parse(self, content: bytes) -> PDFExtractionResult:
         """Extract text and run pattern matching. No LLM involved."""
         try:
@@ -131,6 +157,7 @@ class PDFParser:
             confidence=confidence,
             detected_document_type=doc_type,
             extracted_values=values,
+            pages=pages,
         )
 
     async def structure_with_llm(
@@ -146,8 +173,9 @@ class PDFParser:
         if llm_client is None:
             return result.extracted_values
 
-        # Truncate to avoid massive token usage — first 6000 chars covers most utility bills
-        text_snippet = result.raw_text[:6000]
+        # Highest-value passages from any page, not just the first 6000 chars
+        index = PassageIndex.from_pages(result.pages or [result.raw_text])
+        text_snippet = index.pack(self.CONTEXT_TOKENS, patterns=_PATTERNS, keywords=_context_keywords())
 
         system = (
             "You are a data extraction assistant. Extract ONLY values explicitly stated in the "
@@ -4,6 +4,11 @@ PDF Report Builder — ESG Copilot
 Renders a Jinja2 HTML template with report data, then converts it to
 a PDF using WeasyPrint. Returns raw bytes ready for upload to storage.
 
+The Jinja2 environment, compiled template, parsed stylesheet and font
+configuration are built once per process and reused. Inside the async app,
+render through app.services.pdf.render_service (worker process pool) rather
+than calling build_pdf directly — WeasyPrint is CPU-bound and blocks the loop.
+
 WeasyPrint requires system libraries (libpango, libcairo2) — these are
 pre-installed in the Docker image. On Windows dev machines, install
 WeasyPrint via: https://doc.courtbouillon.org/weasyprint/stable/first_steps.html
@@ -11,30 +16,76 @@ WeasyPrint via: https://doc.courtbouillon.org/weasyprint/stable/first_steps.html
 
 from __future__ import annotations
 
-import io
 import logging
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 logger = logging.getLogger(__name__)
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+_WEASYPRINT_MISSING = (
+    "WeasyPrint is not installed. Run: pip install weasyprint\n"
+    "On Windows, see: https://doc.courtbouillon.org/weasyprint/stable/first_steps.html"
+)
 
-def _build_html(context: dict) -> str:
-    """Render the Jinja2 template with the given context."""
+
+@lru_cache(maxsize=1)
+def _template() -> Template:
     env = Environment(
         loader=FileSystemLoader(str(TEMPLATES_DIR)),
         autoescape=select_autoescape(["html"]),
     )
-    template = env.get_template("report.html")
-    return template.render(**context)
+    return env.get_template("report.html")
+
+
+@lru_cache(maxsize=1)
+def _weasy_assets():
+    """(HTML class, parsed report.css, FontConfiguration) — loaded once per process."""
+    try:
+        from weasyprint import HTML, CSS
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        raise ImportError(_WEASYPRINT_MISSING)
+
+    font_config = FontConfiguration()
+    stylesheet = CSS(filename=str(TEMPLATES_DIR / "report.css"), font_config=font_config)
+    return HTML, stylesheet, font_config
+
+
+def _build_html(context: dict) -> str:
+    """Render the Jinja2 template with the given context."""
+    return _template().render(**context)
 
 
-def build_pdf(
+def warm() -> None:
+    """Preload template, stylesheet and fonts. Safe to call when WeasyPrint is missing."""
+    _template()
+    try:
+        _weasy_assets()
+    except ImportError:
+        logger.warning("WeasyPrint not installed — PDF renderer warmed without it")
+
+
+def render_pdf(context: dict) -> bytes:
+    """Render a context produced by build_context() to PDF bytes."""
+    HTML, stylesheet, font_config = _weasy_assets()
+    try:
+        html_content = _build_html(context)
+        pdf_bytes = HTML(string=html_content, base_url=str(TEMPLATES_DIR)).write_pdf(
+            stylesheets=[stylesheet], font_config=font_config,
+        )
+        logger.info("PDF generated successfully: %d bytes", len(pdf_bytes))
+        return pdf_bytes
+    except Exception as exc:
+        logger.exception("PDF generation failed: %s", exc)
+        raise
+
+
+def build_context(
     *,
     company_name: str,
     reporting_year: int,
@@ -67,23 +118,9 @@ def build_pdf(
     roadmap_narrative: str,
     # Legal
     disclaimer: str,
-) -> bytes:
-    """
-    Build and return the PDF as bytes.
-
-    Raises:
-        ImportError: if WeasyPrint is not installed
-        Exception: for any rendering failures (logged before re-raising)
-    """
-    try:
-        from weasyprint import HTML, CSS
-    except ImportError:
-        raise ImportError(
-            "WeasyPrint is not installed. Run: pip install weasyprint\n"
-            "On Windows, see: https://doc.courtbouillon.org/weasyprint/stable/first_steps.html"
-        )
-
-    context = {
+) -> dict:
+    """Assemble the template context. Plain data only — picklable for the render workers."""
+    return {
         "company_name": company_name,
         "reporting_year": reporting_year,
         "industry_code": industry_code,
@@ -118,11 +155,13 @@ def build_pdf(
         "disclaimer": disclaimer,
     }
 
-    try:
-        html_content = _build_html(context)
-        pdf_bytes = HTML(string=html_content, base_url=str(TEMPLATES_DIR)).write_pdf()
-        logger.info("PDF generated successfully: %d bytes", len(pdf_bytes))
-        return pdf_bytes
-    except Exception as exc:
-        logger.exception("PDF generation failed: %s", exc)
-        raise
+
+def build_pdf(**kwargs) -> bytes:
+    """
+    Build and return the PDF as bytes (synchronous). Accepts build_context() kwargs.
+
+    Raises:
+        ImportError: if WeasyPrint is not installed
+        Exception: for any rendering failures (logged before re-raising)
+    """
+    return render_pdf(build_context(**kwargs))
@@ -0,0 +1,168 @@
+"""
+PDF Render Service — ESG Copilot
+=================================
+Runs WeasyPrint in a pool of long-lived worker processes so PDF rendering
+never blocks the API event loop.
+
+- Each worker preloads the Jinja2 template, report.css and the font
+  configuration once at start-up (pdf_builder.warm) and reuses them.
+- Jobs are submitted to the pool's work queue; an asyncio semaphore caps how
+  many are in flight (settings.PDF_RENDER_MAX_CONCURRENCY), the rest wait.
+- Render wall time (including queue wait) is recorded in the
+  `pdf_render_seconds` histogram.
+- PDF_RENDER_MODE=inline renders in a thread instead (asyncio.to_thread).
+  Celery prefork workers use it — they are daemonic and cannot start child
+  processes (see tasks/celery_app.py). If the pool fails to start anywhere
+  else, the service switches to inline rendering rather than losing the PDF.
+
+Usage:
+    renderer = get_pdf_renderer()
+    pdf_bytes = await renderer.render(build_context(...))
+    size = await renderer.render_to_path(build_context(...), Path("/tmp/report.pdf"))
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+RENDER_SECONDS = histogram("pdf_render_seconds", "PDF render wall time incl. queue wait (seconds)")
+QUEUE_WAIT_SECONDS = histogram("pdf_render_queue_wait_seconds", "Time a render job waited for a slot (seconds)")
+
+
+# ── Worker-side functions (run in the pool processes) ─────────────────────────
+
+def _worker_init() -> None:
+    from app.services.pdf.pdf_builder import warm
+    warm()
+
+
+def _render_in_worker(context: dict) -> bytes:
+    from app.services.pdf.pdf_builder import render_pdf
+    return render_pdf(context)
+
+
+def _render_to_path_in_worker(context: dict, dest: str) -> int:
+    """Render and write straight to disk — avoids shipping the bytes back over the pipe."""
+    from app.services.pdf.pdf_builder import render_pdf
+    pdf_bytes = render_pdf(context)
+    path = Path(dest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(pdf_bytes)
+    return len(pdf_bytes)
+
+
+def _ping() -> bool:
+    return True
+
+
+# ── Service ───────────────────────────────────────────────────────────────────
+
+class PDFRenderService:
+    def __init__(self, workers: int, max_concurrency: int, mode: str = "pool"):
+        self.workers = max(1, workers)
+        self.max_concurrency = max(1, max_concurrency)
+        self.mode = mode                     # "pool" | "inline"
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor | None:
+        """The worker pool, or None when rendering inline."""
+        if self.mode == "inline":
+            return None
+        if self._pool is None:
+            # spawn, not fork: the parent runs an event loop and driver threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_worker_init,
+            )
+            logger.info("PDF render pool started: %d workers", self.workers)
+        return self._pool
+
+    def _run(self, fn, *args) -> asyncio.Future:
+        """Hand one job to the pool, or to a thread when rendering inline."""
+        pool = self._ensure_pool()
+        if pool is not None:
+            try:
+                # submit() starts the worker processes
+                return asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+            except Exception as exc:
+                logger.warning("PDF render pool could not start (%s) — rendering inline", exc)
+                self.shutdown()
+                self.mode = "inline"
+        return asyncio.ensure_future(asyncio.to_thread(fn, *args))
+
+    def _slots_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # Semaphores bind to one event loop; Celery tasks each run their own loop
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    async def _submit(self, fn, *args):
+        slots = self._slots_for(asyncio.get_running_loop())
+        with RENDER_SECONDS.time():
+            with QUEUE_WAIT_SECONDS.time():
+                await slots.acquire()
+            try:
+                return await self._run(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM, segfault in a native lib) — rebuild on next job
+                logger.error("PDF render pool broken — restarting on next job")
+                self.shutdown()
+                raise
+            finally:
+                slots.release()
+
+    async def warm(self) -> None:
+        """Start every worker now so the first report doesn't pay process start-up."""
+        if self._ensure_pool() is None:
+            await asyncio.to_thread(_worker_init)
+            return
+        await asyncio.gather(*(self._run(_ping) for _ in range(self.workers)))
+
+    async def render(self, context: dict) -> bytes:
+        """Render a pdf_builder.build_context() dict to PDF bytes."""
+        return await self._submit(_render_in_worker, context)
+
+    async def render_to_path(self, context: dict, dest: Path) -> int:
+        """Render directly to a file (local storage). Returns the size in bytes."""
+        return await self._submit(_render_to_path_in_worker, context, str(dest))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("PDF render pool stopped")
+
+
+# Module-level singleton
+_renderer: PDFRenderService | None = None
+
+
+def get_pdf_renderer() -> PDFRenderService:
+    global _renderer
+    if _renderer is None:
+        _renderer = PDFRenderService(
+            workers=settings.PDF_RENDER_WORKERS,
+            max_concurrency=settings.PDF_RENDER_MAX_CONCURRENCY,
+            mode=settings.PDF_RENDER_MODE,
+        )
+    return _renderer
+
+
+def shutdown_pdf_renderer() -> None:
+    global _renderer
+    if _renderer is not None:
+        _renderer.shutdown()
+        _renderer = None
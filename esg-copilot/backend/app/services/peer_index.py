@@ -0,0 +1,343 @@
+"""
+PeerIndex
+=========
+"Companies like us": k-nearest-neighbour search over anonymised company
+profiles, used by BenchmarkAgent next to the static industry averages.
+
+One profile per company, from its latest EsgSnapshot (+ Company.revenue_eur).
+Only the company id (for updates), the feature vector and a few metrics are
+kept — no names — and callers only report aggregates over at least
+PEER_INDEX_MIN_PEERS companies.
+
+Features (fixed centre/spread, so vectors never need re-normalising as
+companies are added): size (log FTE), revenue (log EUR), CO2 per FTE (log),
+scope 1 and scope 2 share of the footprint, and the E/S/G scores. Industry is
+not a feature: each industry has its own KD-tree, and a search that finds
+fewer than k peers in the industry is topped up from the all-company tree.
+
+Incremental updates: new snapshots are upserted at once. Until the next
+rebuild they are scanned linearly next to the trees (the replaced tree entry
+is skipped); the trees are rebuilt once the pending set grows past
+max(REBUILD_AFTER, sqrt(n)). Snapshots saved by other workers arrive with
+the periodic reload (PEER_INDEX_REFRESH_SECONDS).
+
+    index = await ensure_peer_index()
+    for distance, peer in index.nearest(peer_vector(...), "manufacturing", k=20):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+ALL_INDUSTRIES = "*"
+
+# feature → (centre, spread) after the transform in peer_vector()
+_SCALES: dict[str, tuple[float, float]] = {
+    "employees":    (1.4, 0.5),     # log10(FTE + 1)            ~25 FTE
+    "revenue":      (6.6, 0.7),     # log10(EUR + 1)            ~4 M EUR
+    "co2_per_fte":  (0.5, 0.5),     # log10(tCO2e/FTE + 0.1)    ~3 t/FTE
+    "scope1_share": (0.3, 0.25),
+    "scope2_share": (0.3, 0.25),
+    "esg_e":        (0.5, 0.2),     # share of max (E 40, S 30, G 30)
+    "esg_s":        (0.5, 0.2),
+    "esg_g":        (0.5, 0.2),
+}
+FEATURES = tuple(_SCALES)
+
+
+@dataclass(frozen=True, eq=False)
+class Peer:
+    company_id: str
+    industry: str
+    vector: tuple[float, ...]
+    size_band: str
+    metrics: dict[str, float] = field(default_factory=dict)   # esg_score_total, co2_per_fte, esg_score_e/s/g
+
+
+def size_band(employee_count: int | None) -> str:
+    if not employee_count:
+        return "ukendt"
+    if employee_count < 10:
+        return "micro"
+    if employee_count < 50:
+        return "small"
+    if employee_count < 250:
+        return "medium"
+    return "large"
+
+
+def peer_vector(
+    *,
+    employee_count: int | None = None,
+    revenue_eur: float | None = None,
+    total_co2e_tonnes: float | None = None,
+    scope1_co2e_tonnes: float | None = None,
+    scope2_co2e_tonnes: float | None = None,
+    esg_score_e: float | None = None,
+    esg_score_s: float | None = None,
+    esg_score_g: float | None = None,
+) -> tuple[float, ...]:
+    """Normalised feature vector. Missing values sit at the feature's centre."""
+    total = total_co2e_tonnes or 0.0
+    raw: dict[str, float | None] = {
+        "employees":    math.log10(employee_count + 1) if employee_count else None,
+        "revenue":      math.log10(revenue_eur + 1) if revenue_eur else None,
+        "co2_per_fte":  math.log10(total / employee_count + 0.1) if total > 0 and employee_count else None,
+        "scope1_share": (scope1_co2e_tonnes or 0.0) / total if total > 0 else None,
+        "scope2_share": (scope2_co2e_tonnes or 0.0) / total if total > 0 else None,
+        "esg_e":        esg_score_e / 40 if esg_score_e is not None else None,
+        "esg_s":        esg_score_s / 30 if esg_score_s is not None else None,
+        "esg_g":        esg_score_g / 30 if esg_score_g is not None else None,
+    }
+    return tuple(
+        0.0 if raw[name] is None else (raw[name] - centre) / spread
+        for name, (centre, spread) in _SCALES.items()
+    )
+
+
+def peer_from_snapshot(snapshot: Any, revenue_eur: float | None = None) -> Peer | None:
+    """Peer profile from an EsgSnapshot row; None without an ESG score."""
+    if snapshot.esg_score_total is None:
+        return None
+
+    def num(value: Any) -> float | None:
+        return float(value) if value is not None else None
+
+    employees = snapshot.employee_count
+    total = num(snapshot.total_co2e_tonnes)
+    metrics = {
+        "esg_score_total": float(snapshot.esg_score_total),
+        "esg_score_e": num(snapshot.esg_score_e),
+        "esg_score_s": num(snapshot.esg_score_s),
+        "esg_score_g": num(snapshot.esg_score_g),
+        "co2_per_fte": total / employees if total and employees else None,
+    }
+    return Peer(
+        company_id=str(snapshot.company_id),
+        industry=snapshot.industry_code or "unknown",
+        vector=peer_vector(
+            employee_count=employees,
+            revenue_eur=num(revenue_eur),
+            total_co2e_tonnes=total,
+            scope1_co2e_tonnes=num(snapshot.scope1_co2e_tonnes),
+            scope2_co2e_tonnes=num(snapshot.scope2_co2e_tonnes),
+            esg_score_e=metrics["esg_score_e"],
+            esg_score_s=metrics["esg_score_s"],
+            esg_score_g=metrics["esg_score_g"],
+        ),
+        size_band=size_band(employees),
+        metrics={k: v for k, v in metrics.items() if v is not None},
+    )
+
+
+# ---------------------------------------------------------------------------
+# KD-tree
+# ---------------------------------------------------------------------------
+
+def _distance2(a: tuple[float, ...], b: tuple[float, ...]) -> float:
+    return math.dist(a, b) ** 2
+
+
+class _KDTree:
+    """Static KD-tree over peers. Inner nodes split on the widest axis at the median."""
+
+    LEAF_SIZE = 16
+
+    def __init__(self, peers: list[Peer]) -> None:
+        self.size = len(peers)
+        self._root = self._build(list(peers)) if peers else None
+
+    def _build(self, peers: list[Peer]):
+        if len(peers) <= self.LEAF_SIZE:
+            return peers
+        axis = max(
+            range(len(peers[0].vector)),
+            key=lambda d: max(p.vector[d] for p in peers) - min(p.vector[d] for p in peers),
+        )
+        peers.sort(key=lambda p: p.vector[axis])
+        mid = len(peers) // 2
+        return axis, peers[mid].vector[axis], self._build(peers[:mid]), self._build(peers[mid:])
+
+    def nearest(self, point: tuple[float, ...], k: int, skip: Callable[[Peer], bool]) -> list[tuple[float, Peer]]:
+        """Up to k (squared distance, peer) pairs, nearest first."""
+        heap: list[tuple[float, int, Peer]] = []     # max-heap on distance via negation
+        dist = math.dist
+
+        def visit(node) -> None:
+            if isinstance(node, list):
+                for peer in node:
+                    d = dist(point, peer.vector) ** 2
+                    if len(heap) == k and d >= -heap[0][0] or skip(peer):
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, id(peer), peer))
+                    else:
+                        heapq.heapreplace(heap, (-d, id(peer), peer))
+                return
+            axis, split, left, right = node
+            diff = point[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far)
+
+        if self._root is not None and k > 0:
+            visit(self._root)
+        return sorted(((-d, peer) for d, _, peer in heap), key=lambda pair: pair[0])
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class PeerIndex:
+    REBUILD_AFTER = 64          # pending upserts before the trees are rebuilt
+
+    def __init__(self) -> None:
+        self._peers: dict[str, Peer] = {}
+        self._trees: dict[str, _KDTree] = {}
+        self._pending: dict[str, Peer] = {}       # upserted since the last rebuild
+        self.loaded_at = 0.0                      # monotonic time of the last full load
+
+    def __len__(self) -> int:
+        return len(self._peers)
+
+    def rebuild(self, peers: Iterable[Peer] | None = None) -> None:
+        """Rebuild all trees — from `peers` (full reload) or the current profiles."""
+        if peers is not None:
+            self._peers = {peer.company_id: peer for peer in peers}
+            self.loaded_at = time.monotonic()
+        by_industry: dict[str, list[Peer]] = {}
+        for peer in self._peers.values():
+            by_industry.setdefault(peer.industry, []).append(peer)
+        trees = {industry: _KDTree(members) for industry, members in by_industry.items()}
+        trees[ALL_INDUSTRIES] = _KDTree(list(self._peers.values()))
+        self._trees = trees
+        self._pending.clear()
+
+    def upsert(self, peer: Peer) -> None:
+        """Add or replace a company's profile; searchable immediately."""
+        self._peers[peer.company_id] = peer
+        self._pending[peer.company_id] = peer
+        if len(self._pending) > max(self.REBUILD_AFTER, math.isqrt(len(self._peers))):
+            self.rebuild()
+
+    def nearest(
+        self, vector: tuple[float, ...], industry: str, k: int = 20, exclude: str | None = None,
+    ) -> list[tuple[float, Peer]]:
+        """
+        The k most similar companies: same industry first (nearest first),
+        topped up from other industries when the industry has fewer than k.
+        Distances are Euclidean in normalised feature space.
+        """
+        found = self._search(industry, vector, k, exclude)
+        if len(found) < k:
+            same = {peer.company_id for _, peer in found}
+            found += [
+                pair for pair in self._search(ALL_INDUSTRIES, vector, k, exclude, skip_ids=same)
+                if pair[1].industry != industry
+            ][: k - len(found)]
+        return [(math.sqrt(d), peer) for d, peer in found]
+
+    def _search(
+        self, key: str, vector: tuple[float, ...], k: int, exclude: str | None, skip_ids: set[str] = frozenset(),
+    ) -> list[tuple[float, Peer]]:
+        def skip(peer: Peer) -> bool:
+            # Replaced profiles stay in the tree until the next rebuild
+            return self._peers.get(peer.company_id) is not peer or peer.company_id == exclude \
+                or peer.company_id in skip_ids
+
+        tree = self._trees.get(key)
+        hits = tree.nearest(vector, k, skip) if tree else []
+        hits += [
+            (_distance2(vector, peer.vector), peer)
+            for peer in self._pending.values()
+            if (key == ALL_INDUSTRIES or peer.industry == key) and not skip(peer)
+        ]
+        hits.sort(key=lambda pair: pair[0])
+        return hits[:k]
+
+
+# ---------------------------------------------------------------------------
+# Shared instance
+# ---------------------------------------------------------------------------
+
+_index: PeerIndex | None = None
+_load_lock: asyncio.Lock | None = None
+
+_LOAD_TIMEOUT_SECONDS = 10.0
+
+
+def get_peer_index() -> PeerIndex:
+    global _index
+    if _index is None:
+        _index = PeerIndex()
+    return _index
+
+
+async def ensure_peer_index() -> PeerIndex:
+    """The shared index, (re)loaded from the database when older than PEER_INDEX_REFRESH_SECONDS."""
+    from app.core.config import settings
+
+    global _load_lock
+    index = get_peer_index()
+    if index.loaded_at and time.monotonic() - index.loaded_at < settings.PEER_INDEX_REFRESH_SECONDS:
+        return index
+    if _load_lock is None:
+        _load_lock = asyncio.Lock()
+    async with _load_lock:
+        if index.loaded_at and time.monotonic() - index.loaded_at < settings.PEER_INDEX_REFRESH_SECONDS:
+            return index
+        started = time.perf_counter()
+        try:
+            peers = await asyncio.wait_for(_load_peers(), _LOAD_TIMEOUT_SECONDS)
+        except Exception as e:
+            # Keep serving what we have; try again after the next refresh interval
+            logger.warning("Peer index load failed: %s", e)
+            index.loaded_at = time.monotonic()
+            return index
+        index.rebuild(peers)
+        logger.info("Peer index loaded: %d companies in %.0fms", len(index), (time.perf_counter() - started) * 1000)
+    return index
+
+
+def record_snapshot(snapshot: Any, revenue_eur: float | None = None) -> None:
+    """Add a freshly saved snapshot to the index (no-op until the index has been loaded)."""
+    index = get_peer_index()
+    if not index.loaded_at:
+        return
+    peer = peer_from_snapshot(snapshot, revenue_eur)
+    if peer is not None:
+        index.upsert(peer)
+
+
+async def _load_peers() -> list[Peer]:
+    """Latest snapshot per company, with the company's revenue."""
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.company import Company
+    from app.models.esg_snapshot import EsgSnapshot
+
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(EsgSnapshot, Company.revenue_eur)
+            .join(Company, Company.id == EsgSnapshot.company_id)
+            .where(EsgSnapshot.esg_score_total.is_not(None))
+            .order_by(EsgSnapshot.company_id, EsgSnapshot.snapshot_year.desc(), EsgSnapshot.snapshot_month.desc())
+        )
+        latest: dict[str, Peer | None] = {}
+        for snapshot, revenue in rows:
+            key = str(snapshot.company_id)
+            if key not in latest:
+                latest[key] = peer_from_snapshot(snapshot, revenue)
+    return [peer for peer in latest.values() if peer is not None]
@@ -0,0 +1,313 @@
+"""
+Batched report generation
+=========================
+Runs many report pipelines with all of their narratives generated by ONE
+Message Batches API job (services/ai/message_batches.py) instead of five
+live Claude calls per report. Used for the monthly auto-report run.
+
+    statuses = await run_report_batch([(report_id, submission_id), ...])
+
+Per report, using the pipeline phases from routes/reports.py:
+  1. _prepare_report — load, calculate, score, gap analysis
+  2. record the narrative prompts (ReportWriter with a RequestRecorder).
+     Sections found in the narrative cache need no request.
+  3. once every report has reached this point, submit all prompts as one
+     batch; wait for it to end
+  4. fill the narratives (templated fallback for failed requests), store the
+     new texts in the narrative cache, _complete_report — PDF, save, snapshot
+
+DB phases are bounded by `concurrency`; no DB connection is held while the
+batch is processing. Each report keeps its own trace (Report.timings).
+
+With a `batch_id`, every submitted Anthropic batch is stored in
+narrative_batches (models/narrative_batch.py) together with its reports and
+requests, under a lease this process keeps renewing. If the process dies or
+is shut down before the reports are completed, claim_unfinished_batches()
+(startup, monthly cron) hands the batch to run_report_batch(resume=...) in
+another process: steps 1–2 are repeated (deterministic, no Claude calls),
+then the stored batch is polled again instead of submitting a new one.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.ai.message_batches import AnthropicBatchBackend, BatchRequest, LocalBatchBackend
+    from app.services.report_scheduler import BatchProgress
+
+logger = logging.getLogger(__name__)
+
+_LEASE_SECONDS = 10 * 60       # a narrative batch nobody renewed for this long is resumed elsewhere
+
+
+@dataclass(frozen=True)
+class ClaimedBatch:
+    """A persisted narrative batch this process now owns (see claim_unfinished_batches)."""
+    batch_id: str
+    jobs: list[tuple[str, str]]                          # reports still processing
+    submitted: list[tuple[str, list[BatchRequest]]]      # (Anthropic batch id, its requests)
+
+
+async def run_report_batch(
+    jobs: list[tuple[str, str]],
+    progress: BatchProgress | None = None,
+    backend: AnthropicBatchBackend | LocalBatchBackend | None = None,
+    concurrency: int | None = None,
+    batch_id: str | None = None,
+    resume: list[tuple[str, list[BatchRequest]]] | None = None,
+) -> dict[str, str | None]:
+    """
+    Generate reports for (report_id, submission_id) pairs. Returns report_id → final status.
+    `batch_id` persists the narrative batch so it survives a restart; `resume`
+    collects already submitted batches instead of submitting new ones.
+    """
+    from app.api.v1.routes.reports import (  # avoid circular import
+        _complete_report, _emit, _mark_report_failed, _narrative_plan, _prepare_report,
+    )
+    from app.core.tracing import span, start_trace
+    from app.services.ai.llm_governor import LLMPriority, llm_priority
+    from app.services.ai.message_batches import RequestRecorder, get_batch_backend
+    from app.services.ai.model_router import route_for
+    from app.services.ai.report_writer import ReportWriter
+
+    backend = backend or get_batch_backend()
+    db_slots = asyncio.Semaphore(concurrency or settings.MONTHLY_REPORT_CONCURRENCY)
+    model = route_for("narrative").model
+
+    requests = []                      # all reports' BatchRequests, in submission order
+    results: list[str | None] = []
+    collected = 0
+    all_collected = asyncio.Event()
+    results_ready = asyncio.Event()
+
+    def arrived() -> None:
+        nonlocal collected
+        collected += 1
+        if collected == len(jobs):
+            all_collected.set()
+
+    async def one(report_id: str, submission_id: str) -> str | None:
+        if progress:
+            progress.start()
+        status: str | None = "failed"
+        with start_trace("report_pipeline") as trace, llm_priority(LLMPriority.BATCH):
+            waiting = False
+            try:
+                async with db_slots:
+                    draft = await _prepare_report(report_id, submission_id)
+                if draft is None:
+                    status = None
+                    return status
+
+                # Record prompts; cached sections come back with their text
+                recorder = RequestRecorder(model)
+                writer = ReportWriter(llm=recorder)
+                sections: list[tuple[str, str, str, int | None]] = []   # section, text, fallback, request index
+                for section, coro, fallback in _narrative_plan(writer, draft):
+                    before = len(recorder.requests)
+                    text = await coro
+                    index = len(requests) if len(recorder.requests) > before else None
+                    if index is not None:
+                        requests.append(recorder.requests[-1])
+                    sections.append((section, text, fallback, index))
+                await _emit(report_id, "stage", stage="narratives", batched=True)
+
+                waiting = True
+                arrived()
+                await results_ready.wait()
+
+                narratives: dict[str, str] = {}
+                ai_written = False
+                with span("narratives", batched=True):
+                    for section, text, fallback, index in sections:
+                        if index is not None:
+                            text = results[index] or ""
+                        used_fallback = not text
+                        ai_written = ai_written or not used_fallback
+                        narratives[section] = text or fallback
+                        await _emit(report_id, "section", section=section, fallback=used_fallback)
+
+                async with db_slots:
+                    # Batch requests have no fallback model: every AI text comes from `model`
+                    status = await _complete_report(draft, narratives, trace, ai_model=model if ai_written else None)
+                return status
+            except Exception as e:
+                logger.exception("Batched report pipeline failed: report_id=%s", report_id)
+                await _mark_report_failed(report_id, e, trace)
+                return status
+            finally:
+                if not waiting:
+                    arrived()
+                if progress:
+                    progress.finish(status)
+
+    async def persist(anthropic_batch_id: str, submitted: list[BatchRequest]) -> None:
+        await _persist_batch(batch_id, anthropic_batch_id, jobs, submitted)
+
+    tasks = [asyncio.create_task(one(r, s)) for r, s in jobs]
+    lease = asyncio.create_task(_renew_lease(batch_id)) if batch_id else None
+    try:
+        if jobs:
+            await all_collected.wait()
+        if resume is not None:
+            results = await _resumed_results(backend, resume, requests)
+        elif requests:
+            try:
+                results = await backend.run(requests, on_submitted=persist if batch_id else None)
+            except Exception:
+                logger.exception("Narrative batch failed — all %d sections use fallback text", len(requests))
+                results = [None] * len(requests)
+        if requests:
+            await _store_in_cache(requests, results)
+    except asyncio.CancelledError:
+        # Shutdown: leave the batch "submitted" and let the next process resume it now
+        for task in tasks:
+            task.cancel()
+        if batch_id:
+            lease.cancel()
+            await _release_batches(batch_id)
+        raise
+    finally:
+        results_ready.set()
+    statuses = await asyncio.gather(*tasks)
+    if batch_id:
+        lease.cancel()
+        await _finish_batches(batch_id)
+    return {report_id: status for (report_id, _), status in zip(jobs, statuses)}
+
+
+async def _resumed_results(backend, resume, requests) -> list[str | None]:
+    """
+    Texts of stored batches, matched to the re-recorded requests by content —
+    a section whose prompt changed meanwhile (or whose batch failed) gets None.
+    """
+    by_key: dict[tuple, str] = {}
+    for anthropic_batch_id, submitted in resume:
+        try:
+            texts = await backend.resume(anthropic_batch_id, submitted)
+        except Exception:
+            logger.exception("Resumed narrative batch %s failed — its sections use fallback text", anthropic_batch_id)
+            continue
+        by_key.update((request.key(), text) for request, text in zip(submitted, texts) if text)
+    return [by_key.get(request.key()) for request in requests]
+
+
+# ── narrative_batches persistence ────────────────────────────────────────────
+
+def _lease_until() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=_LEASE_SECONDS)
+
+
+async def _persist_batch(batch_id, anthropic_batch_id, jobs, submitted) -> None:
+    from app.core.database import AsyncSessionLocal
+    from app.models.narrative_batch import NarrativeBatch
+
+    async with AsyncSessionLocal() as db:
+        db.add(NarrativeBatch(
+            batch_id=batch_id,
+            anthropic_batch_id=anthropic_batch_id,
+            jobs=dict(jobs),
+            requests=[r.to_dict() for r in submitted],
+            lease_until=_lease_until(),
+        ))
+        await db.commit()
+
+
+async def _update_batches(batch_id: str, **values) -> None:
+    from sqlalchemy import update
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.narrative_batch import NarrativeBatch
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(NarrativeBatch)
+                .where(NarrativeBatch.batch_id == batch_id, NarrativeBatch.status == "submitted")
+                .values(**values)
+            )
+            await db.commit()
+    except Exception as exc:
+        logger.warning("Updating narrative batches of %s failed: %s", batch_id, exc)
+
+
+async def _renew_lease(batch_id: str) -> None:
+    while True:
+        await asyncio.sleep(_LEASE_SECONDS / 3)
+        await _update_batches(batch_id, lease_until=_lease_until())
+
+
+async def _release_batches(batch_id: str) -> None:
+    await _update_batches(batch_id, lease_until=datetime.now(timezone.utc))
+
+
+async def _finish_batches(batch_id: str) -> None:
+    await _update_batches(batch_id, status="done", lease_until=None)
+
+
+async def claim_unfinished_batches() -> list[ClaimedBatch]:
+    """
+    Take over persisted narrative batches whose lease ran out. The claim is one
+    conditional UPDATE, so of several processes starting at once only one
+    gets a given batch.
+    """
+    from sqlalchemy import select, update
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.narrative_batch import NarrativeBatch
+    from app.models.report import Report
+    from app.services.ai.message_batches import BatchRequest
+
+    now = datetime.now(timezone.utc)
+    expired = (NarrativeBatch.status == "submitted", NarrativeBatch.lease_until < now)
+    claimed: list[ClaimedBatch] = []
+    async with AsyncSessionLocal() as db:
+        batch_ids = (await db.execute(
+            select(NarrativeBatch.batch_id).where(*expired).distinct()
+        )).scalars().all()
+        for batch_id in batch_ids:
+            rows = (await db.execute(
+                update(NarrativeBatch)
+                .where(NarrativeBatch.batch_id == batch_id, *expired)
+                .values(lease_until=_lease_until())
+                .returning(NarrativeBatch.anthropic_batch_id, NarrativeBatch.jobs, NarrativeBatch.requests)
+            )).all()
+            await db.commit()
+            if not rows:
+                continue                                    # claimed by another process
+            jobs = {r: s for row in rows for r, s in row.jobs.items()}
+            processing = {str(r) for r in (await db.execute(
+                select(Report.id).where(Report.id.in_([UUID(r) for r in jobs]), Report.status == "processing")
+            )).scalars().all()}
+            claimed.append(ClaimedBatch(
+                batch_id=batch_id,
+                jobs=[(r, s) for r, s in jobs.items() if r in processing],
+                submitted=[
+                    (row.anthropic_batch_id, [BatchRequest(**r) for r in row.requests]) for row in rows
+                ],
+            ))
+    for batch in claimed:
+        if not batch.jobs:
+            await _finish_batches(batch.batch_id)           # every report already finished
+    if claimed:
+        logger.info("Claimed %d unfinished narrative batches", len(claimed))
+    return [batch for batch in claimed if batch.jobs]
+
+
+async def _store_in_cache(requests, results) -> None:
+    """Batched narratives are cached like live ones, so unchanged inputs are free next month."""
+    from app.services.ai.narrative_cache import narrative_cache_key, store_narrative
+
+    if not settings.NARRATIVE_CACHE_ENABLED:
+        return
+    for request, text in zip(requests, results):
+        if text:
+            key = narrative_cache_key(request.model, request.system, request.prompt, request.max_tokens)
+            await store_narrative(key, request.model, text)
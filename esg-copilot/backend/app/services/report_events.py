@@ -0,0 +1,153 @@
+"""
+ReportEvents
+============
+Pub/sub bus for report-generation progress.
+
+The report pipeline publishes stage transitions, per-section narrative
+completion and the PDF-ready event; GET /reports/{id}/events relays them to the
+browser as Server-Sent Events instead of the client polling /status.
+
+Backends (settings.EVENT_BUS_BACKEND):
+  memory — in-process asyncio fan-out. Fine while the pipeline runs as a
+           BackgroundTask in the same process as the API.
+  redis  — Redis pub/sub on settings.REDIS_URL, so events cross process
+           boundaries (several API workers, Celery).
+
+Publishing never raises — progress events are best-effort and must not fail a report.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Events after which no further events are published for a report
+TERMINAL_EVENTS = frozenset({"completed", "failed"})
+
+_CHANNEL_PREFIX = "report-events:"
+_MAX_QUEUED_EVENTS = 100
+
+
+@dataclass(frozen=True)
+class ReportEvent:
+    event: str                              # stage | section | pdf_ready | completed | failed
+    data: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.event in TERMINAL_EVENTS
+
+    def to_json(self) -> str:
+        return json.dumps({"event": self.event, "data": self.data}, default=str)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "ReportEvent":
+        obj = json.loads(raw)
+        return cls(event=obj["event"], data=obj.get("data") or {})
+
+
+# ── In-process backend ────────────────────────────────────────────────────────
+
+class _MemorySubscription:
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+
+    async def next(self, timeout: float) -> ReportEvent | None:
+        """Wait for the next event; None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoryEventBus:
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, report_id: str, event: ReportEvent) -> None:
+        for queue in list(self._subscribers.get(report_id, ())):
+            if queue.full():
+                # Slow consumer — drop the oldest event rather than block the pipeline
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, report_id: str) -> AsyncIterator[_MemorySubscription]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_MAX_QUEUED_EVENTS)
+        self._subscribers[report_id].add(queue)
+        try:
+            yield _MemorySubscription(queue)
+        finally:
+            subs = self._subscribers.get(report_id)
+            if subs is not None:
+                subs.discard(queue)
+                if not subs:
+                    del self._subscribers[report_id]
+
+
+# ── Redis backend ─────────────────────────────────────────────────────────────
+
+class _RedisSubscription:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def next(self, timeout: float) -> ReportEvent | None:
+        msg = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if msg is None or msg.get("type") != "message":
+            return None
+        return ReportEvent.from_json(msg["data"])
+
+
+class RedisEventBus:
+    def __init__(self, url: str) -> None:
+        from redis import asyncio as aioredis
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    async def publish(self, report_id: str, event: ReportEvent) -> None:
+        await self._redis.publish(_CHANNEL_PREFIX + report_id, event.to_json())
+
+    @asynccontextmanager
+    async def subscribe(self, report_id: str) -> AsyncIterator[_RedisSubscription]:
+        channel = _CHANNEL_PREFIX + report_id
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            yield _RedisSubscription(pubsub)
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception as exc:
+                logger.debug("Redis pubsub close failed: %s", exc)
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+
+async def publish_report_event(report_id: str, event: str, **data: Any) -> None:
+    """Publish a progress event for a report. Never raises."""
+    try:
+        await get_event_bus().publish(str(report_id), ReportEvent(event=event, data=data))
+    except Exception as exc:
+        logger.warning("Report event publish failed (%s/%s): %s", report_id, event, exc)
+
+
+# Module-level singleton
+_bus: MemoryEventBus | RedisEventBus | None = None
+
+
+def get_event_bus() -> MemoryEventBus | RedisEventBus:
+    global _bus
+    if _bus is None:
+        if settings.EVENT_BUS_BACKEND == "redis":
+            _bus = RedisEventBus(settings.REDIS_URL)
+        else:
+            _bus = MemoryEventBus()
+    return _bus
@@ -0,0 +1,393 @@
+"""
+ReportScheduler
+===============
+Bounded, rate-limited work queue for the monthly auto-report run.
+
+The cron endpoint creates all Report rows in one go and hands the jobs to the
+scheduler, which:
+  - runs at most `concurrency` pipelines at a time (MONTHLY_REPORT_CONCURRENCY),
+  - spreads job start times evenly over a time window
+    (MONTHLY_REPORT_WINDOW_MINUTES), so a few hundred subscribers don't hit
+    Claude and the DB pool in the same second,
+  - runs pipelines in the LLM governor's BATCH lane, so their Claude calls
+    queue behind chat and extraction,
+  - tracks per-batch progress for GET /billing/monthly-reports/{batch_id}.
+
+With MONTHLY_REPORTS_VIA_MESSAGE_BATCH the cron uses submit_message_batch()
+instead: narratives for the whole batch go to Claude as one Message Batches
+API job at half price (see report_batch.py).
+
+State is in-process: the batch is executed by the API worker that received the
+cron call. Report rows remain the source of truth for outcomes. Jobs lost to
+a restart must not stay "processing" forever (the cron would skip them and
+POST /reports/generate would answer 409), so:
+  - shutdown() marks the reports it had not finished as failed,
+  - recover_stale_reports() — run by start_recovery() every few minutes and
+    by the cron — fails reports
+    still "processing" long after the window plus REPORT_PROCESSING_TIMEOUT_MINUTES
+    (a crashed worker). Failed reports are picked up by the next cron call.
+Reports waiting on a submitted narrative batch are exempt: their batch is
+persisted and resume_message_batches() finishes them after a restart.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_FINISHED_BATCHES = 20
+_RECOVERY_INTERVAL_SECONDS = 10 * 60      # resume/fail sweep; matches the narrative batch lease
+
+# (report_id, submission_id) -> final status ("completed" | "failed" | None)
+JobRunner = Callable[[str, str], Awaitable[str | None]]
+# report_ids whose jobs were dropped by shutdown()
+InterruptedHandler = Callable[[list[str]], Awaitable[None]]
+
+INTERRUPTED_MESSAGE = "Report generation was interrupted by a server restart — generate the report again"
+STALE_MESSAGE = "Report generation did not finish (worker lost) — generate the report again"
+
+
+@dataclass
+class BatchProgress:
+    batch_id: str
+    total: int
+    window_seconds: float
+    concurrency: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.completed + self.failed >= self.total
+
+    def start(self) -> None:
+        self.queued -= 1
+        self.running += 1
+
+    def finish(self, status: str | None) -> None:
+        self.running -= 1
+        if status == "completed":
+            self.completed += 1
+        else:
+            self.failed += 1
+        if self.done and self.finished_at is None:
+            self.finished_at = datetime.now(timezone.utc)
+            logger.info(
+                "Report batch %s finished: completed=%d failed=%d",
+                self.batch_id, self.completed, self.failed,
+            )
+
+    def to_dict(self) -> dict:
+        return {
+            "batch_id": self.batch_id,
+            "total": self.total,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "done": self.done,
+            "concurrency": self.concurrency,
+            "window_seconds": self.window_seconds,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+@dataclass(frozen=True)
+class _Job:
+    batch_id: str
+    report_id: str
+    submission_id: str
+    not_before: float          # time.monotonic() at which the job may start
+
+
+class ReportScheduler:
+    def __init__(
+        self,
+        run_job: JobRunner,
+        concurrency: int,
+        window_seconds: float,
+        on_interrupted: InterruptedHandler | None = None,
+    ):
+        self._run_job = run_job
+        self._on_interrupted = on_interrupted
+        self.concurrency = max(1, concurrency)
+        self.window_seconds = max(0.0, window_seconds)
+        self._queue: asyncio.Queue[_Job] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._batch_tasks: list[asyncio.Task] = []
+        self._batches: dict[str, BatchProgress] = {}
+        self._next_slot = 0.0
+        self._unfinished: set[str] = set()     # report_ids queued or running
+        self._recovery: asyncio.Task | None = None
+
+    def submit(self, batch_id: str, jobs: list[tuple[str, str]]) -> BatchProgress:
+        """Enqueue (report_id, submission_id) pairs as one batch. Returns its progress record."""
+        self._ensure_workers()
+        self._prune()
+
+        batch = BatchProgress(
+            batch_id=batch_id,
+            total=len(jobs),
+            window_seconds=self.window_seconds,
+            concurrency=self.concurrency,
+            queued=len(jobs),
+        )
+        if not jobs:
+            batch.finished_at = batch.created_at
+        self._batches[batch_id] = batch
+
+        # Evenly spaced start slots; a new batch queues behind any batch still in its window
+        interval = self.window_seconds / len(jobs) if jobs else 0.0
+        start = max(time.monotonic(), self._next_slot)
+        for i, (report_id, submission_id) in enumerate(jobs):
+            self._unfinished.add(report_id)
+            self._queue.put_nowait(_Job(batch_id, report_id, submission_id, start + i * interval))
+        self._next_slot = start + len(jobs) * interval
+
+        logger.info(
+            "Report batch %s queued: %d jobs, concurrency=%d, window=%ds",
+            batch_id, len(jobs), self.concurrency, self.window_seconds,
+        )
+        return batch
+
+    def submit_message_batch(self, batch_id: str, jobs: list[tuple[str, str]]) -> BatchProgress:
+        """
+        Like submit(), but all narratives of the batch go to Claude as one
+        Message Batches API job (services/report_batch.py). No start-time
+        window is needed: the batch never touches the interactive rate limit.
+        """
+        batch = self._start_message_batch(batch_id, jobs)
+        logger.info("Report batch %s queued as message batch: %d jobs", batch_id, len(jobs))
+        return batch
+
+    async def resume_message_batches(self) -> list[BatchProgress]:
+        """Pick up narrative batches a stopped or crashed process left unfinished."""
+        from app.services.report_batch import claim_unfinished_batches
+
+        resumed = []
+        for claimed in await claim_unfinished_batches():
+            resumed.append(self._start_message_batch(claimed.batch_id, claimed.jobs, resume=claimed.submitted))
+            logger.info("Report batch %s resumed: %d jobs", claimed.batch_id, len(claimed.jobs))
+        return resumed
+
+    def start_recovery(self) -> None:
+        """
+        Periodically resume orphaned narrative batches and fail stale reports —
+        at startup, and again once the lease of a crashed process has run out.
+        """
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.create_task(self._recover_forever(), name="report-recovery")
+
+    def progress(self, batch_id: str) -> BatchProgress | None:
+        return self._batches.get(batch_id)
+
+    async def shutdown(self) -> None:
+        """Cancel all work; reports that were queued or running are handed to on_interrupted."""
+        tasks = self._workers + self._batch_tasks + ([self._recovery] if self._recovery else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._batch_tasks = []
+        self._recovery = None
+        self._queue = None
+
+        interrupted = sorted(self._unfinished)
+        self._unfinished.clear()
+        if interrupted and self._on_interrupted:
+            logger.warning("Report scheduler stopped with %d unfinished reports", len(interrupted))
+            try:
+                await self._on_interrupted(interrupted)
+            except Exception:
+                logger.exception("Could not mark interrupted reports as failed")
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    async def _recover_forever(self) -> None:
+        while True:
+            try:
+                await self.resume_message_batches()
+                await recover_stale_reports()
+            except Exception as exc:
+                logger.warning("Report recovery sweep failed: %s", exc)
+            await asyncio.sleep(_RECOVERY_INTERVAL_SECONDS)
+
+    def _start_message_batch(self, batch_id: str, jobs: list[tuple[str, str]], resume=None) -> BatchProgress:
+        from app.services.report_batch import run_report_batch
+
+        self._prune()
+        batch = BatchProgress(
+            batch_id=batch_id,
+            total=len(jobs),
+            window_seconds=0.0,
+            concurrency=self.concurrency,
+            queued=len(jobs),
+        )
+        if not jobs:
+            batch.finished_at = batch.created_at
+        self._batches[batch_id] = batch
+        self._batch_tasks = [t for t in self._batch_tasks if not t.done()]
+        report_ids = {report_id for report_id, _ in jobs}
+        self._unfinished |= report_ids
+        task = asyncio.create_task(
+            run_report_batch(
+                jobs, progress=batch, concurrency=self.concurrency, batch_id=batch_id, resume=resume,
+            ),
+            name=f"report-batch-{batch_id}",
+        )
+        task.add_done_callback(lambda t: t.cancelled() or self._unfinished.difference_update(report_ids))
+        self._batch_tasks.append(task)
+        return batch
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [t for t in self._workers if not t.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker(), name=f"report-worker-{len(self._workers)}"))
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                delay = job.not_before - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: _Job) -> None:
+        batch = self._batches.get(job.batch_id)
+        if batch:
+            batch.start()
+        try:
+            status = await self._run_job(job.report_id, job.submission_id)
+        except Exception:
+            logger.exception("Scheduled report %s crashed", job.report_id)
+            status = "failed"
+        self._unfinished.discard(job.report_id)
+        if batch:
+            batch.finish(status)
+
+    def _prune(self) -> None:
+        finished = [b for b in self._batches.values() if b.done]
+        finished.sort(key=lambda b: b.created_at)
+        excess = len(finished) - _MAX_FINISHED_BATCHES
+        for b in finished[:max(0, excess)]:
+            del self._batches[b.batch_id]
+
+
+# Module-level singleton
+_scheduler: ReportScheduler | None = None
+
+
+def get_report_scheduler() -> ReportScheduler:
+    global _scheduler
+    if _scheduler is None:
+        from app.api.v1.routes.reports import _run_report_pipeline  # avoid circular import
+        from app.services.ai.llm_governor import LLMPriority
+
+        _scheduler = ReportScheduler(
+            # Monthly reports yield to interactive LLM traffic (see llm_governor.py)
+            run_job=functools.partial(_run_report_pipeline, priority=LLMPriority.BATCH),
+            concurrency=settings.MONTHLY_REPORT_CONCURRENCY,
+            window_seconds=settings.MONTHLY_REPORT_WINDOW_MINUTES * 60,
+            on_interrupted=functools.partial(fail_processing_reports, message=INTERRUPTED_MESSAGE),
+        )
+    return _scheduler
+
+
+async def shutdown_report_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.shutdown()
+        _scheduler = None
+
+
+def _awaiting_narrative_batch():
+    """Reports in a submitted narrative batch are resumed after a restart, not failed."""
+    from sqlalchemy import String, cast, exists
+
+    from app.models.narrative_batch import NarrativeBatch
+    from app.models.report import Report
+
+    return exists().where(
+        NarrativeBatch.status == "submitted",
+        NarrativeBatch.jobs.has_key(cast(Report.id, String)),
+    )
+
+
+async def fail_processing_reports(report_ids: list[str], message: str) -> list[str]:
+    """Mark the given reports failed if they are still "processing". Returns the ids changed."""
+    from uuid import UUID
+
+    from sqlalchemy import update
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.report import Report
+
+    if not report_ids:
+        return []
+    async with AsyncSessionLocal() as db:
+        failed = (await db.execute(
+            update(Report)
+            .where(
+                Report.id.in_([UUID(r) for r in report_ids]),
+                Report.status == "processing",
+                ~_awaiting_narrative_batch(),
+            )
+            .values(status="failed", error_message=message)
+            .returning(Report.id)
+        )).scalars().all()
+        await db.commit()
+    return await _announce_failed([str(r) for r in failed], message)
+
+
+async def recover_stale_reports() -> int:
+    """
+    Fail reports left "processing" by a worker that died without shutdown().
+    A report is stale once it has not been touched for the monthly window plus
+    REPORT_PROCESSING_TIMEOUT_MINUTES — longer than any queued job may wait.
+    """
+    from sqlalchemy import update
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.report import Report
+
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        minutes=settings.MONTHLY_REPORT_WINDOW_MINUTES + settings.REPORT_PROCESSING_TIMEOUT_MINUTES,
+    )
+    async with AsyncSessionLocal() as db:
+        stale = (await db.execute(
+            update(Report)
+            .where(Report.status == "processing", Report.updated_at < cutoff, ~_awaiting_narrative_batch())
+            .values(status="failed", error_message=STALE_MESSAGE)
+            .returning(Report.id)
+        )).scalars().all()
+        await db.commit()
+    if stale:
+        logger.warning("Recovered %d stale processing reports", len(stale))
+    return len(await _announce_failed([str(r) for r in stale], STALE_MESSAGE))
+
+
+async def _announce_failed(report_ids: list[str], message: str) -> list[str]:
+    from app.services.report_events import publish_report_event
+
+    for report_id in report_ids:
+        await publish_report_event(report_id, "failed", status="failed", error_message=message)
+    return report_ids
@@ -14,6 +14,7 @@ from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.esg_snapshot import EsgSnapshot
+from app.services.peer_index import record_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,7 @@ async def save_snapshot(
     company_id: str,
     report_id: str,
     results: Any,          # ReportResults ORM object
-    company: Any,          # Company ORM object
+    company: Any,          # Company ORM object or SubmissionBundle.company
     reporting_year: int | None = None,
 ) -> EsgSnapshot:
     """
@@ -68,6 +69,7 @@ async def save_snapshot(
     db.add(snap)
     await db.commit()
     await db.refresh(snap)
+    record_snapshot(snap, getattr(company, "revenue_eur", None))
     logger.info("Snapshot saved for company %s (%d/%d)", company_id, now.month, now.year)
     return snap
 
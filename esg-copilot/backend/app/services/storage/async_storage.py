@@ -0,0 +1,250 @@
+"""
+Async Storage Service — ESG Copilot
+=====================================
+Non-blocking counterpart to FileStorage, used from async routes and the report
+pipeline. Same backends, same key layout, selected by STORAGE_BACKEND.
+
+    storage = get_async_storage()
+    size = await storage.put_stream(key, pdf_bytes, content_type="application/pdf")
+    async for chunk in storage.get_stream(key): ...
+    url = await storage.presign(key, expires_in=300)
+
+- `put_stream` accepts bytes or an async iterable of byte chunks.
+- S3: objects above MULTIPART_THRESHOLD are sent as a multipart upload
+  (parts of MULTIPART_PART_SIZE), so a large PDF is never buffered whole.
+  All boto3 calls run in a worker thread on the shared, connection-pooled
+  client (see file_storage.get_s3_client).
+- Local: file I/O runs in a worker thread; writes go to a temp file and are
+  renamed into place, so readers never see a half-written object. This
+  backend is the drop-in for tests and dev.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator
+
+from app.core.config import settings
+from app.services.storage.file_storage import StorageError, _content_type, get_s3_client
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024                    # 1 MiB read chunks
+MULTIPART_THRESHOLD = 8 * 1024 * 1024       # S3 multipart above 8 MiB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024       # S3 minimum is 5 MiB (except the last part)
+
+
+async def _iter_chunks(data: bytes | AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        for i in range(0, len(view), CHUNK_SIZE):
+            yield bytes(view[i:i + CHUNK_SIZE])
+        return
+    async for chunk in data:
+        if chunk:
+            yield chunk
+
+
+class AsyncStorage(ABC):
+    @abstractmethod
+    async def put_stream(
+        self,
+        key: str,
+        data: bytes | AsyncIterable[bytes],
+        *,
+        content_type: str = "application/octet-stream",
+        metadata: dict[str, str] | None = None,
+    ) -> int:
+        """Store an object and return its size in bytes."""
+
+    @abstractmethod
+    def get_stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yield the object's content in chunks. Raises StorageError if missing."""
+
+    @abstractmethod
+    async def presign(self, key: str, expires_in: int = 3600) -> str:
+        """Temporary download URL."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def get_bytes(self, key: str) -> bytes:
+        return b"".join([chunk async for chunk in self.get_stream(key)])
+
+
+# ── Local disk ────────────────────────────────────────────────────────────────
+
+class LocalAsyncStorage(AsyncStorage):
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise StorageError(f"Invalid storage key: {key}")
+        return path
+
+    async def put_stream(self, key, data, *, content_type="application/octet-stream", metadata=None) -> int:
+        dest = self.path_for(key)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+        await asyncio.to_thread(dest.parent.mkdir, parents=True, exist_ok=True)
+        fh = await asyncio.to_thread(open, tmp, "wb")
+        size = 0
+        try:
+            async for chunk in _iter_chunks(data):
+                await asyncio.to_thread(fh.write, chunk)
+                size += len(chunk)
+            await asyncio.to_thread(fh.close)
+            await asyncio.to_thread(os.replace, tmp, dest)
+        except BaseException:
+            fh.close()
+            tmp.unlink(missing_ok=True)
+            raise
+        logger.info("Stored file locally: %s (%d bytes)", dest, size)
+        return size
+
+    async def get_stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        path = self.path_for(key)
+        try:
+            fh = await asyncio.to_thread(open, path, "rb")
+        except FileNotFoundError:
+            raise StorageError(f"File not found: {key}")
+        try:
+            while chunk := await asyncio.to_thread(fh.read, chunk_size):
+                yield chunk
+        finally:
+            fh.close()
+
+    async def presign(self, key: str, expires_in: int = 3600) -> str:
+        # Local dev: just return the path (handled by a static file mount or direct read)
+        return f"/dev/files/{key}"
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.path_for(key).unlink, missing_ok=True)
+        logger.info("Deleted file: %s", key)
+
+
+# ── S3 / R2 ───────────────────────────────────────────────────────────────────
+
+class S3AsyncStorage(AsyncStorage):
+    def __init__(self, bucket: str):
+        self._bucket = bucket
+        self._s3 = get_s3_client()
+
+    async def put_stream(self, key, data, *, content_type="application/octet-stream", metadata=None) -> int:
+        extra = {"ServerSideEncryption": "AES256", "ContentType": content_type, "Metadata": metadata or {}}
+        buffer = bytearray()
+        chunks = _iter_chunks(data)
+
+        # Buffer up to the threshold: small objects go up in a single PUT
+        async for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= MULTIPART_THRESHOLD:
+                return await self._multipart(key, buffer, chunks, extra)
+
+        await asyncio.to_thread(
+            self._s3.put_object, Bucket=self._bucket, Key=key, Body=bytes(buffer), **extra
+        )
+        logger.info("Uploaded to S3: s3://%s/%s (%d bytes)", self._bucket, key, len(buffer))
+        return len(buffer)
+
+    async def _multipart(self, key: str, buffer: bytearray, rest: AsyncIterator[bytes], extra: dict) -> int:
+        upload = await asyncio.to_thread(
+            self._s3.create_multipart_upload, Bucket=self._bucket, Key=key, **extra
+        )
+        upload_id = upload["UploadId"]
+        parts: list[dict] = []
+        size = 0
+
+        async def send(body: bytes) -> None:
+            nonlocal size
+            number = len(parts) + 1
+            resp = await asyncio.to_thread(
+                self._s3.upload_part,
+                Bucket=self._bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body,
+            )
+            parts.append({"ETag": resp["ETag"], "PartNumber": number})
+            size += len(body)
+
+        try:
+            async for chunk in rest:
+                buffer += chunk
+                while len(buffer) >= MULTIPART_PART_SIZE:
+                    await send(bytes(buffer[:MULTIPART_PART_SIZE]))
+                    del buffer[:MULTIPART_PART_SIZE]
+            while len(buffer) >= MULTIPART_PART_SIZE:
+                await send(bytes(buffer[:MULTIPART_PART_SIZE]))
+                del buffer[:MULTIPART_PART_SIZE]
+            if buffer:
+                await send(bytes(buffer))
+            await asyncio.to_thread(
+                self._s3.complete_multipart_upload,
+                Bucket=self._bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await asyncio.to_thread(
+                self._s3.abort_multipart_upload, Bucket=self._bucket, Key=key, UploadId=upload_id
+            )
+            raise
+        logger.info("Multipart upload to S3: s3://%s/%s (%d bytes, %d parts)", self._bucket, key, size, len(parts))
+        return size
+
+    async def get_stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            obj = await asyncio.to_thread(self._s3.get_object, Bucket=self._bucket, Key=key)
+        except self._s3.exceptions.NoSuchKey:
+            raise StorageError(f"File not found: {key}")
+        body = obj["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def presign(self, key: str, expires_in: int = 3600) -> str:
+        # Signing is local CPU work — no network round-trip, no need for a thread
+        return self._s3.generate_presigned_url(
+            "get_object", Params={"Bucket": self._bucket, "Key": key}, ExpiresIn=expires_in,
+        )
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._s3.delete_object, Bucket=self._bucket, Key=key)
+        logger.info("Deleted file: %s", key)
+
+
+# ── Keys ──────────────────────────────────────────────────────────────────────
+
+def document_key(company_id: str, original_filename: str) -> str:
+    """Randomised key — no guessable paths."""
+    ext = Path(original_filename).suffix.lower()
+    return f"companies/{company_id}/docs/{uuid.uuid4().hex}{ext}"
+
+
+def content_type_for(filename: str) -> str:
+    return _content_type(Path(filename).suffix.lower())
+
+
+def report_pdf_key(company_id: str, reporting_year: int, version: int) -> str:
+    return f"companies/{company_id}/reports/esg-report-{reporting_year}-v{version}-{uuid.uuid4().hex[:8]}.pdf"
+
+
+# Module-level singleton
+_async_storage: AsyncStorage | None = None
+
+
+def get_async_storage() -> AsyncStorage:
+    global _async_storage
+    if _async_storage is None:
+        if settings.STORAGE_BACKEND == "local":
+            _async_storage = LocalAsyncStorage(settings.LOCAL_STORAGE_PATH)
+        elif settings.STORAGE_BACKEND == "s3":
+            _async_storage = S3AsyncStorage(settings.S3_BUCKET_NAME)
+        else:
+            raise StorageError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+    return _async_storage
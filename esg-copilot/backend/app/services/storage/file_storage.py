@@ -1,12 +1,15 @@
 """
 File Storage Service — ESG Copilot
 Abstracts local disk vs. S3/R2 so swap is one config change.
+
+Synchronous API. From async code use async_storage.get_async_storage().
 """
 
 import os
 import uuid
 import hashlib
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import BinaryIO
 
@@ -22,6 +25,27 @@ class StorageError(Exception):
     pass
 
 
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """
+    Process-wide boto3 S3 client. boto3 clients are thread-safe, so the sync and
+    async storage services share one client and its HTTP connection pool.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+        config=Config(
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 5, "mode": "adaptive"},
+        ),
+    )
+
+
 class FileStorage:
     """
     Upload and retrieve documents.
@@ -34,13 +58,7 @@ class FileStorage:
             self._local_root = Path(settings.LOCAL_STORAGE_PATH)
             self._local_root.mkdir(parents=True, exist_ok=True)
         elif self.backend == "s3":
-            import boto3
-            self._s3 = boto3.client(
-                "s3",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION,
-            )
+            self._s3 = get_s3_client()
             self._bucket = settings.S3_BUCKET_NAME
         else:
             raise StorageError(f"Unknown STORAGE_BACKEND: {self.backend}")
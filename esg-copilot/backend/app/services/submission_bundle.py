@@ -0,0 +1,239 @@
+"""
+SubmissionBundle
+================
+Loads a data submission, its company and all six data sections in ONE joined
+query and exposes them as an immutable snapshot with the engine inputs
+(Scope1/2/3Input, ScorerInput) built once and cached.
+
+Every caller that feeds the ESG engine — calculate-preview, score-preview,
+report generation and the report pipeline — uses this, so the ORM → engine
+mapping lives in exactly one place.
+
+    bundle = await load_submission_bundle(db, submission_id)
+    co2 = bundle.co2              # CalculationReport (cached)
+    score = bundle.score          # ESGScore (cached)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.company import Company
+from app.models.submission import (
+    DataSubmission, EnergyData, ESGPolicyData, ProcurementData, TravelData,
+    VSMEEnvironmentData, VSMEWorkforceData,
+)
+from app.services.esg_engine.calculator import (
+    CalculationReport, CO2Calculator, Scope1Input, Scope2Input, Scope3Input,
+)
+from app.services.esg_engine.scorer import ESGScore, ESGScorer, ScorerInput
+
+EUR_TO_DKK = 7.46
+_META_COLUMNS = frozenset({"id", "submission_id", "created_at", "updated_at"})
+
+Section = Optional[Mapping[str, Any]]
+
+
+def _section(row) -> Section:
+    """ORM row → read-only {column: value} mapping (None if the section is missing)."""
+    if row is None:
+        return None
+    return MappingProxyType({
+        c.name: getattr(row, c.name) for c in row.__table__.columns if c.name not in _META_COLUMNS
+    })
+
+
+def _num(section: Section, key: str, default: float = 0.0) -> float:
+    if not section:
+        return default
+    value = section.get(key)
+    return float(value) if value is not None else default
+
+
+def _opt_num(section: Section, key: str) -> Optional[float]:
+    """None when not reported (missing, NULL or 0)."""
+    if not section or not section.get(key):
+        return None
+    return float(section[key])
+
+
+def _flag(section: Section, key: str) -> bool:
+    return bool(section.get(key)) if section else False
+
+
+@dataclass(frozen=True)
+class CompanyInfo:
+    id: UUID
+    name: str
+    industry_code: str
+    country_code: str
+    employee_count: int
+    revenue_eur: float
+    city: Optional[str] = None
+    registration_number: Optional[str] = None
+    nace_code: Optional[str] = None
+
+    @property
+    def revenue_dkk(self) -> float:
+        return self.revenue_eur * EUR_TO_DKK
+
+
+@dataclass(frozen=True)
+class SubmissionBundle:
+    submission_id: UUID
+    company_id: UUID
+    reporting_year: int
+    status: str
+    company: CompanyInfo
+    energy: Section = None
+    travel: Section = None
+    procurement: Section = None
+    policy: Section = None
+    workforce: Section = None
+    environment: Section = None
+
+    # ── Engine inputs (built once) ────────────────────────────────────────────
+
+    @cached_property
+    def scope1_input(self) -> Scope1Input:
+        ed = self.energy
+        return Scope1Input(
+            natural_gas_m3=_num(ed, "natural_gas_m3"),
+            diesel_liters=_num(ed, "diesel_liters"),
+            petrol_liters=_num(ed, "petrol_liters"),
+            lpg_liters=_num(ed, "lpg_liters"),
+            heating_oil_liters=_num(ed, "heating_oil_liters"),
+            coal_kg=_num(ed, "coal_kg"),
+            company_car_km=_num(ed, "company_car_km"),
+            company_van_km=_num(ed, "company_van_km"),
+            company_truck_km=_num(ed, "company_truck_km"),
+        )
+
+    @cached_property
+    def scope2_input(self) -> Scope2Input:
+        return Scope2Input(
+            electricity_kwh=_num(self.energy, "electricity_kwh"),
+            district_heating_kwh=_num(self.energy, "district_heating_kwh"),
+            country_code=self.company.country_code,
+        )
+
+    @cached_property
+    def scope3_input(self) -> Scope3Input:
+        td, pd = self.travel, self.procurement
+        return Scope3Input(
+            air_short_haul_km=_num(td, "air_short_haul_km"),
+            air_long_haul_km=_num(td, "air_long_haul_km"),
+            air_business_class_pct=_num(td, "air_business_class_pct"),
+            rail_km=_num(td, "rail_km"),
+            rental_car_km=_num(td, "rental_car_km"),
+            taxi_km=_num(td, "taxi_km"),
+            employee_count=self.company.employee_count,
+            avg_commute_km_one_way=_num(td, "avg_commute_km_one_way"),
+            commute_days_per_year=int(td.get("commute_days_per_year") or 220) if td else 220,
+            purchased_goods_spend_eur=_num(pd, "purchased_goods_spend_eur"),
+            industry_code=self.company.industry_code,
+        )
+
+    @cached_property
+    def co2(self) -> CalculationReport:
+        return CO2Calculator().calculate(
+            scope1=self.scope1_input, scope2=self.scope2_input, scope3=self.scope3_input,
+        )
+
+    @cached_property
+    def scorer_input(self) -> ScorerInput:
+        ed, pol, co, co2 = self.energy, self.policy, self.company, self.co2
+        return ScorerInput(
+            industry_code=co.industry_code,
+            employee_count=co.employee_count,
+            country_code=co.country_code,
+            revenue_eur=co.revenue_eur,
+            reporting_year=self.reporting_year,
+            total_co2e_tonnes=co2.total_tonnes,
+            scope2_co2e_tonnes=co2.scope2_tonnes,
+            electricity_kwh=_num(ed, "electricity_kwh"),
+            renewable_electricity_pct=_num(ed, "renewable_electricity_pct"),
+            has_energy_reduction_target=_flag(pol, "has_energy_reduction_target"),
+            has_net_zero_target=_flag(pol, "has_net_zero_target"),
+            waste_recycled_pct=_opt_num(pol, "waste_recycled_pct"),
+            has_waste_policy=_flag(pol, "has_waste_policy"),
+            has_water_policy=_flag(pol, "has_water_policy"),
+            has_health_safety_policy=_flag(pol, "has_health_safety_policy"),
+            lost_time_injury_rate=_opt_num(pol, "lost_time_injury_rate"),
+            has_training_program=_flag(pol, "has_training_program"),
+            avg_training_hours_per_employee=_num(pol, "avg_training_hours_per_employee"),
+            has_diversity_policy=_flag(pol, "has_diversity_policy"),
+            female_management_pct=_opt_num(pol, "female_management_pct"),
+            living_wage_commitment=_flag(pol, "living_wage_commitment"),
+            has_esg_policy=_flag(pol, "has_esg_policy"),
+            has_code_of_conduct=_flag(pol, "has_code_of_conduct"),
+            has_anti_corruption_policy=_flag(pol, "has_anti_corruption_policy"),
+            has_data_privacy_policy=_flag(pol, "has_data_privacy_policy"),
+            has_board_esg_oversight=_flag(pol, "has_board_esg_oversight"),
+            esg_reporting_year=pol.get("esg_reporting_year") if pol else None,
+            supply_chain_code_of_conduct=_flag(pol, "supply_chain_code_of_conduct"),
+        )
+
+    @cached_property
+    def score(self) -> ESGScore:
+        return ESGScorer().score(self.scorer_input)
+
+    # ── Plain dicts for the AI narrative prompts ──────────────────────────────
+
+    def section_dict(self, name: str) -> Optional[dict]:
+        """"policy" | "workforce" | "environment" … as a mutable dict copy, or None."""
+        section = getattr(self, name)
+        return dict(section) if section is not None else None
+
+
+async def load_submission_bundle(db: AsyncSession, submission_id: UUID) -> Optional[SubmissionBundle]:
+    """Fetch submission + company + every data section in a single round-trip."""
+    result = await db.execute(
+        select(
+            DataSubmission, Company, EnergyData, TravelData, ProcurementData,
+            ESGPolicyData, VSMEWorkforceData, VSMEEnvironmentData,
+        )
+        .join(Company, Company.id == DataSubmission.company_id)
+        .outerjoin(EnergyData, EnergyData.submission_id == DataSubmission.id)
+        .outerjoin(TravelData, TravelData.submission_id == DataSubmission.id)
+        .outerjoin(ProcurementData, ProcurementData.submission_id == DataSubmission.id)
+        .outerjoin(ESGPolicyData, ESGPolicyData.submission_id == DataSubmission.id)
+        .outerjoin(VSMEWorkforceData, VSMEWorkforceData.submission_id == DataSubmission.id)
+        .outerjoin(VSMEEnvironmentData, VSMEEnvironmentData.submission_id == DataSubmission.id)
+        .where(DataSubmission.id == submission_id)
+        .limit(1)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    sub, co, ed, td, pd, pol, wf, env = row
+    return SubmissionBundle(
+        submission_id=sub.id,
+        company_id=sub.company_id,
+        reporting_year=sub.reporting_year,
+        status=sub.status,
+        company=CompanyInfo(
+            id=co.id,
+            name=co.name,
+            industry_code=co.industry_code or "general",
+            country_code=co.country_code or "EU_AVERAGE",
+            employee_count=co.employee_count or 0,
+            revenue_eur=float(co.revenue_eur or 0),
+            city=co.city,
+            registration_number=co.registration_number,
+            nace_code=co.nace_code,
+        ),
+        energy=_section(ed),
+        travel=_section(td),
+        procurement=_section(pd),
+        policy=_section(pol),
+        workforce=_section(wf),
+        environment=_section(env),
+    )
@@ -1,6 +1,7 @@
 """Celery app configuration"""
 
 from celery import Celery
+from celery.signals import worker_process_init
 from app.core.config import settings
 
 celery_app = Celery(
@@ -20,3 +21,10 @@ celery_app.conf.update(
     task_acks_late=True,             # re-queue on worker crash
     worker_prefetch_multiplier=1,    # one task at a time per worker
 )
+
+
+@worker_process_init.connect
+def _init_worker_process(**_):
+    # Prefork children are daemonic and cannot start the PDF render pool's
+    # processes — render PDFs in a thread there (see services/pdf/render_service.py)
+    settings.PDF_RENDER_MODE = "inline"
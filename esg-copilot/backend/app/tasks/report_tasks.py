@@ -1,8 +1,10 @@
 """
 Async report generation task — ESG Copilot
-Week 5 will fill this in. Stub shows the full pipeline flow.
+Runs the same traced pipeline as the API's BackgroundTasks path
+(app.api.v1.routes.reports._run_report_pipeline) inside a Celery worker.
 """
 
+import asyncio
 import logging
 from app.tasks.celery_app import celery_app
 
@@ -14,22 +16,33 @@ def generate_report(self, report_id: str, submission_id: str):
     """
     Full report generation pipeline (runs async via Celery):
 
-    1. Load submission data from DB
-    2. Build Scope1Input / Scope2Input / Scope3Input
-    3. CO2Calculator.calculate()           → deterministic
-    4. ESGScorer.score()                   → deterministic
-    5. GapAnalyzer.analyze()               → deterministic
-    6. Save scores + breakdowns to report_results
-    7. ReportWriter.write_executive_summary()  → LLM narrative
-    8. ReportWriter.write_co2_narrative()      → LLM narrative
-    9. ReportWriter.write_esg_narrative()      → LLM narrative
-    10. ReportWriter.write_roadmap_narrative() → LLM narrative
-    11. PDFBuilder.build()                 → WeasyPrint PDF
-    12. Upload PDF to S3
-    13. Update report status to 'completed'
-
-    On failure: update report status to 'failed', store error_message.
+    1. Load submission data from DB (SubmissionBundle)
+    2. CO2Calculator.calculate()           → deterministic
+    3. ESGScorer.score()                   → deterministic
+    4. GapAnalyzer.analyze()               → deterministic
+    5. ReportWriter narratives             → LLM
+    6. PDF render (worker pool) + upload
+    7. Save results, status 'completed', timing summary on Report.timings
+    8. ESG snapshot for trend tracking
+
+    On failure the pipeline marks the report 'failed' and stores error_message.
+    Returns the final status ("completed" | "failed" | None if the report is gone).
     """
     logger.info("Report generation task started: report_id=%s", report_id)
-    # TODO: implement in Week 5
-    raise NotImplementedError("Report generation pipeline — implement in Week 5")
+    return asyncio.run(_run(report_id, submission_id))
+
+
+async def _run(report_id: str, submission_id: str) -> str | None:
+    from app.api.v1.routes.reports import _run_report_pipeline
+    from app.core.database import engine
+    from app.services.ai.anthropic_client import close_anthropic_client
+    from app.services.ai.llm_governor import shutdown_llm_governor
+
+    try:
+        return await _run_report_pipeline(report_id, submission_id)
+    finally:
+        # Each task runs its own event loop; pooled connections (asyncpg, the
+        # shared Anthropic httpx client, the governor's redis client) can't cross loops
+        await close_anthropic_client()
+        await shutdown_llm_governor()
+        await engine.dispose()
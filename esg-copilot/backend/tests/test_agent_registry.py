@@ -0,0 +1,60 @@
+"""
+Tests for the shared Anthropic client and the long-lived agent registry.
+No network calls — only object construction is exercised.
+
+Run: pytest tests/test_agent_registry.py -v
+"""
+import pytest
+
+from app.core.config import settings
+from app.services.agents.registry import TOOL_AGENTS, AgentRegistry
+from app.services.ai import anthropic_client
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(anthropic_client, "_client", None)
+    monkeypatch.setattr(anthropic_client, "_client_loop", None)
+
+
+class TestAnthropicClient:
+    async def test_client_is_shared(self):
+        assert anthropic_client.get_anthropic_client() is anthropic_client.get_anthropic_client()
+        await anthropic_client.close_anthropic_client()
+
+    def test_missing_key_raises(self, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "")
+        monkeypatch.setattr(settings, "ANTHROPIC_API_KEY", "")
+        with pytest.raises(RuntimeError):
+            anthropic_client.get_anthropic_client()
+
+
+class TestAgentRegistry:
+    def test_same_instance_per_class(self):
+        registry = AgentRegistry()
+        first = registry.for_tool("benchmark_vs_peers")
+        assert first is registry.for_tool("benchmark_vs_peers")
+        assert first is registry.get(type(first))
+
+    def test_unknown_tool(self):
+        assert AgentRegistry().for_tool("does_not_exist") is None
+
+    def test_every_tool_resolves(self):
+        registry = AgentRegistry()
+        for tool in TOOL_AGENTS:
+            assert registry.for_tool(tool) is not None
+
+    def test_llm_agents_share_the_pooled_client(self):
+        registry = AgentRegistry()
+        risk_llm = registry.for_tool("assess_climate_risks")._llm
+        roadmap_llm = registry.for_tool("build_roadmap")._llm
+        assert risk_llm.client is roadmap_llm.client
+
+    async def test_orchestrator_dispatch_uses_registry(self):
+        from app.services.agents import registry as registry_module
+        from app.services.agents.orchestrator import AgentOrchestrator
+
+        result = await AgentOrchestrator()._dispatch("nope", {})
+        assert result == {"ok": False, "error": "Unknown tool: nope"}
+        registry_module.shutdown_agent_registry()
@@ -0,0 +1,90 @@
+"""
+Tests for the SSE agent streams (/agent/chat/stream, /agent/analyze/stream).
+
+Run: pytest tests/test_agent_streaming.py -v
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.core.sse import KEEPALIVE_COMMENT, sse_from_events
+from app.services.agents.orchestrator import AgentOrchestrator
+from app.services.ai.llm_client import StreamEvent
+
+
+async def _collect(agen) -> list:
+    return [item async for item in agen]
+
+
+class TestSseFromEvents:
+    async def test_frames_in_order(self):
+        async def events():
+            yield "delta", {"text": "Hej"}
+            yield "done", {"response": "Hej"}
+
+        frames = await _collect(sse_from_events(events()))
+        assert frames == [
+            'event: delta\ndata: {"text": "Hej"}\n\n',
+            'event: done\ndata: {"response": "Hej"}\n\n',
+        ]
+
+    async def test_keepalive_while_producer_is_busy(self):
+        async def events():
+            await asyncio.sleep(0.05)
+            yield "done", {}
+
+        frames = await _collect(sse_from_events(events(), keepalive_seconds=0.01))
+        assert frames[0] == KEEPALIVE_COMMENT
+        assert frames[-1].startswith("event: done")
+
+    async def test_exception_becomes_error_frame(self):
+        async def events():
+            yield "delta", {"text": "x"}
+            raise RuntimeError("boom")
+
+        frames = await _collect(sse_from_events(events()))
+        assert frames[-1].startswith("event: error")
+        assert json.loads(frames[-1].split("data: ")[1]) == {"detail": "boom"}
+
+
+class _ScriptedLLM:
+    """Replays one list of StreamEvents per LLM turn."""
+
+    def __init__(self, turns):
+        self._turns = iter(turns)
+        self.model = "test-model"
+        self.sent: list[list] = []
+
+    async def stream(self, system_prompt, messages, **kwargs):
+        self.sent.append(list(messages))
+        for event in next(self._turns):
+            yield event
+
+
+def _message(stop_reason, *blocks):
+    return StreamEvent("message", message=SimpleNamespace(stop_reason=stop_reason, content=list(blocks)))
+
+
+class TestOrchestratorStream:
+    async def test_tool_turn_then_answer(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        tool_block = SimpleNamespace(type="tool_use", name="build_roadmap", input={"improvement_actions": []}, id="t1")
+        text_block = SimpleNamespace(type="text", text="Færdig.")
+
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        orchestrator._llm = _ScriptedLLM([
+            [StreamEvent("tool_use", name="build_roadmap"), _message("tool_use", tool_block)],
+            [StreamEvent("text", text="Fær"), StreamEvent("text", text="dig."), _message("end_turn", text_block)],
+        ])
+
+        async def fake_dispatch(name, tool_input, memo_scope=""):
+            return {"ok": True, "roadmap": []}
+        monkeypatch.setattr(orchestrator, "_dispatch", fake_dispatch)
+
+        events = await _collect(orchestrator.stream({"user_message": "Lav en plan"}))
+        assert [e for e, _ in events] == ["tool_call", "tool_result", "delta", "delta", "done"]
+        assert events[1][1]["tool"] == "build_roadmap" and events[1][1]["ok"] is True
+        done = events[-1][1]
+        assert done["answer"] == "Færdig."
+        assert done["trace"][0]["tool"] == "build_roadmap"
@@ -0,0 +1,58 @@
+"""
+Tests for the local async storage backend.
+No S3 required — uses a temporary directory.
+Run: pytest tests/test_async_storage.py -v
+"""
+
+import pytest
+
+from app.services.storage import async_storage
+from app.services.storage.async_storage import LocalAsyncStorage, document_key
+from app.services.storage.file_storage import StorageError
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalAsyncStorage(tmp_path)
+
+
+class TestLocalAsyncStorage:
+    async def test_put_and_get_bytes(self, storage):
+        size = await storage.put_stream("companies/c1/reports/r.pdf", b"%PDF-1.7 test")
+        assert size == 13
+        assert await storage.get_bytes("companies/c1/reports/r.pdf") == b"%PDF-1.7 test"
+
+    async def test_put_stream_from_async_chunks(self, storage, monkeypatch):
+        monkeypatch.setattr(async_storage, "CHUNK_SIZE", 4)
+
+        async def chunks():
+            for part in (b"abc", b"", b"defgh"):
+                yield part
+
+        assert await storage.put_stream("k/streamed.bin", chunks()) == 8
+        got = [c async for c in storage.get_stream("k/streamed.bin", chunk_size=4)]
+        assert got == [b"abcd", b"efgh"]
+
+    async def test_no_partial_files_left_behind(self, storage, tmp_path):
+        await storage.put_stream("k/a.pdf", b"x" * 100)
+        assert [p.name for p in (tmp_path / "k").iterdir()] == ["a.pdf"]
+
+    async def test_missing_key_raises(self, storage):
+        with pytest.raises(StorageError):
+            await storage.get_bytes("nope.pdf")
+
+    async def test_delete_is_idempotent(self, storage):
+        await storage.put_stream("k/a.pdf", b"x")
+        await storage.delete("k/a.pdf")
+        await storage.delete("k/a.pdf")
+        with pytest.raises(StorageError):
+            await storage.get_bytes("k/a.pdf")
+
+    def test_rejects_path_traversal(self, storage):
+        with pytest.raises(StorageError):
+            storage.path_for("../../etc/passwd")
+
+    def test_document_key_is_randomised(self):
+        a, b = document_key("c1", "Elregning.PDF"), document_key("c1", "Elregning.PDF")
+        assert a != b
+        assert a.startswith("companies/c1/docs/") and a.endswith(".pdf")
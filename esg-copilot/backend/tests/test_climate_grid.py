@@ -0,0 +1,98 @@
+"""
+Tests for the memory-mapped Danish climate-risk grid and its use in ClimateRiskAgent.
+
+Run: pytest tests/test_climate_grid.py -v
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services.agents.climate_risk import ClimateRiskAgent
+from app.services.climate_grid import GRID_PATH, GRID_SOURCE, HAZARDS, ClimateGrid, get_climate_grid
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+
+class TestClimateGrid:
+    def test_postcode_city_and_coordinate_lookups(self):
+        grid = get_climate_grid()
+        esbjerg = grid.site_risk({"zipcode": "6700"})
+        assert set(HAZARDS) <= set(esbjerg) and esbjerg["precision"] == "postcode"
+        assert esbjerg["top_hazard"] == "storm_surge" and esbjerg["score"] >= 6
+
+        # Unlisted postcode → nearest lower anchor; city names with and without district letter
+        assert grid.site_risk({"zipcode": "DK-1552"})["precision"] == "postcode_area"
+        assert grid.site_risk({"city": "Aarhus"})["precision"] == "city"
+        assert grid.site_risk({"latitude": 56.0, "longitude": 9.3})["precision"] == "coordinates"
+
+        assert grid.site_risk({"zipcode": "0800"}) is None               # below every anchor
+        assert grid.site_risk({"latitude": 48.1, "longitude": 11.6}) is None   # outside Denmark
+        assert grid.site_risk({"city": "Atlantis"}) is None
+
+    @pytest.mark.parametrize("postcode", ["3900", "3962", "3985", "3800", "2412", "0100"])
+    def test_non_danish_postcodes_are_not_placed(self, postcode):
+        # Greenland (3900–3999, 2412) and unused ranges must not fall back to the Bornholm anchor
+        assert get_climate_grid().locate({"zipcode": postcode}) is None
+
+    def test_postcode_stays_in_its_region(self):
+        grid = get_climate_grid()
+        assert grid.locate({"zipcode": "3790"})[:2] == grid.locate({"zipcode": "3730"})[:2]   # Bornholm
+        assert grid.locate({"zipcode": "4050"})[:2] == grid.locate({"zipcode": "4000"})[:2]
+
+    def test_batch_keeps_order(self):
+        sites = [{"zipcode": "8000"}, {"city": "?"}, {"zipcode": "3700"}]
+        risks = get_climate_grid().batch_site_risk(sites)
+        assert risks[1] is None
+        assert risks[0] == get_climate_grid().site_risk(sites[0])
+        assert risks[2] == get_climate_grid().site_risk(sites[2])
+
+    def test_bundled_file_matches_the_generator(self):
+        from build_climate_grid import build
+
+        assert GRID_PATH.read_bytes() == build(0.05)
+
+    def test_truncated_file_is_rejected(self, tmp_path):
+        broken = tmp_path / "grid.bin"
+        broken.write_bytes(GRID_PATH.read_bytes()[:1000])
+        with pytest.raises(ValueError):
+            ClimateGrid(broken)
+
+
+class _FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate(self, system, user_prompt, max_tokens=None):
+        self.prompts.append(user_prompt)
+        return "Vurdering."
+
+
+class TestClimateRiskAgent:
+    async def test_site_exposure_is_informational_by_default(self):
+        agent = ClimateRiskAgent.__new__(ClimateRiskAgent)
+        agent._llm = _FakeLLM()
+
+        inland = await agent.run({"industry_code": "technology"})
+        coastal = await agent.run({"industry_code": "technology", "zipcode": "6700", "city": "Esbjerg"})
+
+        assert coastal["physical_score"] == inland["physical_score"]
+        assert coastal["key_physical"] == inland["key_physical"]
+        assert coastal["site_risk"][0]["label"] == "6700 Esbjerg"
+        assert coastal["site_risk"][0]["source"] == GRID_SOURCE
+        assert "Lokation" not in agent._llm.prompts[-1]
+
+    async def test_site_exposure_raises_physical_score_when_enabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "CLIMATE_SITE_RISK_IN_SCORE", True)
+        agent = ClimateRiskAgent.__new__(ClimateRiskAgent)
+        agent._llm = _FakeLLM()
+
+        inland = await agent.run({"industry_code": "technology"})
+        coastal = await agent.run({"industry_code": "technology", "zipcode": "6700", "city": "Esbjerg"})
+
+        assert "site_risk" not in inland
+        assert coastal["physical_score"] > inland["physical_score"]
+        assert coastal["site_risk"][0]["label"] == "6700 Esbjerg"
+        assert any("stormflod ved 6700 Esbjerg" == risk for risk in coastal["key_physical"])
+        assert "Lokation 6700 Esbjerg: " in agent._llm.prompts[-1]
@@ -0,0 +1,95 @@
+"""
+Tests for orchestrator conversation compaction (tool-result handles, history summaries).
+No API key required — the summariser is replaced or falls back to the extractive summary.
+
+Run: pytest tests/test_conversation_compaction.py -v
+"""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.agents import conversation
+from app.services.agents.conversation import compact_history, compact_tool_result, read_tool_result
+from app.services.document_processor.context_packer import estimate_tokens
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stores(monkeypatch):
+    monkeypatch.setattr(conversation, "_handle_store", None)
+    monkeypatch.setattr(conversation, "_summary_store", None)
+    monkeypatch.setattr(settings, "ORCHESTRATOR_TOOL_RESULT_TOKENS", 200)
+
+
+def _big_result() -> dict:
+    return {
+        "ok": True,
+        "total_co2e_tonnes": 123.4,
+        "narrative": "Lang tekst om emissioner. " * 200,
+        "breakdown": {"scope3": {"categories": [{"id": i, "tonnes": i * 1.5} for i in range(40)]}},
+    }
+
+
+class TestToolResults:
+    def test_small_result_is_sent_as_is(self):
+        result = {"ok": True, "percentile": 62}
+        assert json.loads(compact_tool_result("benchmark_vs_peers", result)) == result
+
+    def test_large_result_becomes_summary_with_handle(self):
+        content = compact_tool_result("calculate_ghg_emissions", _big_result(), scope="c1")
+        compact = json.loads(content)
+        assert estimate_tokens(content) < 400
+        assert compact["compacted"] is True and compact["handle"].startswith("tr_")
+        assert compact["summary"]["total_co2e_tonnes"] == 123.4       # numbers stay intact
+        assert compact["summary"]["narrative"].endswith("tegn)")
+
+        read = read_tool_result({"handle": compact["handle"], "path": "breakdown.scope3.categories.39"}, scope="c1")
+        assert read == {"ok": True, "path": "breakdown.scope3.categories.39", "value": {"id": 39, "tonnes": 58.5}}
+        assert read_tool_result({"handle": compact["handle"], "path": "nope"}, scope="c1")["ok"] is False
+
+    def test_handles_are_scoped_to_the_company(self):
+        handle = json.loads(compact_tool_result("calculate_ghg_emissions", _big_result(), scope="c1"))["handle"]
+        assert read_tool_result({"handle": handle}, scope="c2")["ok"] is False
+
+
+class TestHistory:
+    @staticmethod
+    def _history(exchanges: int) -> list[dict]:
+        history = []
+        for i in range(exchanges):
+            history.append({"role": "user", "content": f"Spørgsmål {i}: " + "hvordan? " * 40})
+            history.append({"role": "assistant", "content": f"Svar {i}: " + "sådan. " * 120})
+        return history
+
+    async def test_short_history_is_unchanged(self):
+        history = self._history(2)
+        assert await compact_history(history, budget_tokens=4000) == history
+
+    async def test_tokens_stay_flat_as_history_grows(self, monkeypatch):
+        calls = []
+
+        async def fake_summary(turns):
+            calls.append(len(turns))
+            return f"{len(turns)} beskeder opsummeret"
+        monkeypatch.setattr(conversation, "_llm_summary", fake_summary)
+
+        sizes = []
+        for exchanges in (10, 20, 40, 80):
+            messages = await compact_history(self._history(exchanges), budget_tokens=1500)
+            assert messages[0]["role"] == "user" and "opsummeret" in messages[0]["content"]
+            assert [m["role"] for m in messages[2:4]] == ["user", "assistant"]
+            sizes.append(sum(estimate_tokens(m["content"]) for m in messages))
+        assert max(sizes) < 1500 and sizes[-1] <= sizes[1]     # 80 exchanges cost no more than 20
+
+        # Same prefix → summary served from cache
+        before = len(calls)
+        await compact_history(self._history(80), budget_tokens=1500)
+        assert len(calls) == before
+
+    async def test_summary_failure_falls_back_to_extractive(self, monkeypatch):
+        async def failing(turns):
+            raise RuntimeError("Claude unavailable")
+        monkeypatch.setattr(conversation, "_llm_summary", failing)
+
+        messages = await compact_history(self._history(20), budget_tokens=1500)
+        assert "- Bruger: Spørgsmål 0:" in messages[0]["content"]
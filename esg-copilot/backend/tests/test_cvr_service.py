@@ -0,0 +1,113 @@
+"""
+Tests for the shared CVR lookup client (cache, coalescing, negative cache, fixtures).
+No network — CVR_TRANSPORT=fixtures answers from a temporary fixtures directory.
+
+Run: pytest tests/test_cvr_service.py -v
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services import cvr_service
+from app.services.agents.company_researcher import CompanyResearcherAgent
+from app.services.cvr_service import CVRNotFound, CVRUnavailable, industry_code_for, lookup_cvr, normalise_cvr
+
+
+class CountingTransport(cvr_service.FixtureTransport):
+    requests: list[str] = []
+
+    async def handle_async_request(self, request):
+        CountingTransport.requests.append(request.url.params["search"])
+        await asyncio.sleep(0.01)
+        return await super().handle_async_request(request)
+
+
+@pytest.fixture(autouse=True)
+async def _fixtures(tmp_path, monkeypatch):
+    (tmp_path / "12345678.json").write_text(json.dumps({
+        "vat": 12345678, "name": "Nordisk Metal ApS", "address": "Havnevej 1", "zipcode": "6700",
+        "city": "Esbjerg", "employees": 42, "industrydesc": "Fremstilling af metalkonstruktioner",
+        "startdate": "01/03 - 2004",
+    }), encoding="utf-8")
+    monkeypatch.setattr(settings, "CVR_TRANSPORT", "fixtures")
+    monkeypatch.setattr(settings, "CVR_FIXTURES_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "CVR_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(cvr_service, "FixtureTransport", CountingTransport)
+    monkeypatch.setattr(cvr_service, "_client", None)
+    monkeypatch.setattr(cvr_service, "_cache", None)
+    CountingTransport.requests = []
+    yield
+    await cvr_service.close_cvr_service()
+
+
+class TestLookup:
+    async def test_fixture_company_is_normalised(self):
+        company = await lookup_cvr("DK-1234 5678")
+        assert company["cvr"] == "12345678"
+        assert company["name"] == "Nordisk Metal ApS"
+        assert company["industry_code"] == "manufacturing"
+        assert company["zipcode"] == "6700"
+        assert company["employee_count"] == 42
+        assert company["founded_year"] == "2004"
+
+    async def test_second_lookup_is_served_from_cache(self):
+        await lookup_cvr("12345678")
+        company = await lookup_cvr("12345678")
+        company["name"] = "changed"                        # callers get copies
+        assert (await lookup_cvr("12345678"))["name"] == "Nordisk Metal ApS"
+        assert CountingTransport.requests == ["12345678"]
+
+    async def test_concurrent_lookups_make_one_request(self):
+        results = await asyncio.gather(*(lookup_cvr("12345678") for _ in range(10)))
+        assert {r["name"] for r in results} == {"Nordisk Metal ApS"}
+        assert CountingTransport.requests == ["12345678"]
+
+    async def test_unknown_cvr_is_negatively_cached(self):
+        for _ in range(3):
+            with pytest.raises(CVRNotFound):
+                await lookup_cvr("87654321")
+        assert CountingTransport.requests == ["87654321"]
+
+    async def test_not_found_error_body_is_negatively_cached(self, tmp_path):
+        (tmp_path / "11112222.json").write_text(json.dumps({"error": "NOT_FOUND"}), encoding="utf-8")
+        for _ in range(2):
+            with pytest.raises(CVRNotFound):
+                await lookup_cvr("11112222")
+        assert CountingTransport.requests == ["11112222"]
+
+    async def test_other_api_errors_are_unavailable_and_not_cached(self, tmp_path):
+        (tmp_path / "33334444.json").write_text(json.dumps({"error": "QUOTA_EXCEEDED"}), encoding="utf-8")
+        for _ in range(2):
+            with pytest.raises(CVRUnavailable):
+                await lookup_cvr("33334444")
+        assert CountingTransport.requests == ["33334444", "33334444"]
+
+    async def test_invalid_cvr_is_rejected_without_request(self):
+        with pytest.raises(ValueError):
+            await lookup_cvr("1234")
+        with pytest.raises(ValueError):
+            normalise_cvr("123456789")
+        assert CountingTransport.requests == []
+
+
+class TestIndustryMapping:
+    @pytest.mark.parametrize("description,code", [
+        ("Engroshandel med fødevarer", "retail"),
+        ("Hotel og restauration", "hospitality"),
+        ("IT og telekommunikation", "technology"),
+        ("Finans og forsikring", "finance"),
+        ("Vognmandsforretninger (transport)", "logistics"),
+    ])
+    def test_description_maps_to_industry(self, description, code):
+        assert industry_code_for(description) == code
+
+
+class TestCompanyResearcher:
+    async def test_uses_shared_lookup(self):
+        result = await CompanyResearcherAgent().run({"cvr": "12345678"})
+        assert result["ok"] is True and result["industry_code"] == "manufacturing"
+        assert (await CompanyResearcherAgent().run({"cvr": "87654321"}))["ok"] is False
+        await lookup_cvr("12345678")
+        assert CountingTransport.requests == ["12345678", "87654321"]
@@ -75,3 +75,58 @@ class TestPDFParserPatterns:
         parser = PDFParser()
         doc_type = parser._detect_document_type("esg sustainability report scope 1 ghg protocol emissions")
         assert doc_type == "sustainability_report"
+
+
+class TestContextPacker:
+    """Relevance-ranked packing of document text into an LLM token budget."""
+
+    _COVER = "Bæredygtighedsrapport 2024\n\nNordisk Tømrer ApS\n\nIndholdsfortegnelse\n" + "Forord og introduktion\n" * 40
+    _DATA_PAGE = "Energiforbrug\n\nTotal electricity consumption: 45,000 kWh in 2024.\n\nNaturgas: 1.200 m³"
+
+    def test_values_on_late_page_survive(self):
+        from app.services.document_processor.context_packer import PassageIndex
+        from app.services.document_processor.pdf_parser import _PATTERNS
+        pages = [self._COVER, "Lorem ipsum " * 200, "Ledelsens beretning " * 100, self._DATA_PAGE]
+        index = PassageIndex.from_pages(pages)
+        assert index.rank(_PATTERNS)[0].label == "Side 4"
+        context = index.pack(40, patterns=_PATTERNS)
+        assert "45,000 kWh" in context
+        assert "[Side 4]" in context
+        assert "Forord" not in context
+
+    def test_output_keeps_document_order_and_budget(self):
+        from app.services.document_processor.context_packer import PassageIndex, estimate_tokens
+        index = PassageIndex.from_sections({
+            "executive_summary": "Udledningen var 120 tCO2e.",
+            "social_narrative": "Virksomheden har 25 medarbejdere.",
+            "governance_narrative": "",
+        })
+        context = index.pack(100, keywords=["medarbejdere", "tco2e"])
+        assert context.index("[executive_summary]") < context.index("[social_narrative]")
+        assert "governance_narrative" not in context
+        assert estimate_tokens(context) <= 100
+
+    def test_long_page_without_blank_lines_is_split(self):
+        from app.services.document_processor.context_packer import PassageIndex
+        page = "\n".join(f"Linje {i} med tekst" for i in range(200))
+        index = PassageIndex.from_pages([page])
+        assert len(index.passages) > 1
+        assert all(len(p.text) <= 800 for p in index.passages)
+
+    async def test_structure_with_llm_sends_relevant_page(self):
+        from app.services.document_processor.pdf_parser import PDFExtractionResult, PDFParser
+
+        class FakeLLM:
+            async def generate(self, system, prompt, max_tokens=None):
+                self.prompt = prompt
+                return '{"electricity_kwh": 45000}'
+
+        pages = [self._COVER * 10, self._DATA_PAGE]
+        result = PDFExtractionResult(
+            raw_text="\n".join(pages), page_count=2, confidence="medium",
+            detected_document_type="sustainability_report", extracted_values={}, pages=pages,
+        )
+        llm = FakeLLM()
+        assert await PDFParser().structure_with_llm(result, llm) == {"electricity_kwh": 45000}
+        assert "45,000 kWh" in llm.prompt
+        assert len(llm.prompt) < len(result.raw_text)
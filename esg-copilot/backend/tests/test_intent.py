@@ -0,0 +1,71 @@
+"""
+Tests for the orchestrator intent fast-path classifier.
+No API key required — the small-model fallback is replaced where it is used.
+
+Run: pytest tests/test_intent.py -v
+"""
+import pytest
+
+from app.services.agents import intent as intent_module
+from app.services.agents.intent import classify_intent, tool_input_for
+
+_CONTEXT = {
+    "industry_code": "manufacturing",
+    "esg_score_total": 58,
+    "employee_count": 40,
+    "submission_data": {"scope1": {"diesel_liters": 1200}, "scope2": {"electricity_kwh": 90000}},
+}
+
+
+@pytest.fixture
+def no_model(monkeypatch):
+    calls = []
+
+    async def fake(message):
+        calls.append(message)
+        return None
+    monkeypatch.setattr(intent_module, "_ask_model", fake)
+    return calls
+
+
+class TestRules:
+    @pytest.mark.parametrize("message, tool", [
+        ("Tjek compliance", "check_vsme_compliance"),
+        ("Mangler vi noget i VSME-indberetningen?", "check_vsme_compliance"),
+        ("Beregn CO2", "calculate_ghg_emissions"),
+        ("Kan du udregne vores scope 2?", "calculate_ghg_emissions"),
+        ("Sammenlign os med branchen", "benchmark_vs_peers"),
+        ("Hvor ligger vi ift. branchegennemsnittet?", "benchmark_vs_peers"),
+    ])
+    async def test_unambiguous_requests_skip_the_model(self, message, tool, no_model):
+        intent = await classify_intent(message, _CONTEXT)
+        assert intent is not None and intent.tool == tool and intent.source == "rules"
+        assert no_model == []
+
+    async def test_open_questions_go_to_the_full_loop_without_a_model_call(self, no_model):
+        assert await classify_intent("Hvad betyder dobbelt væsentlighed?", _CONTEXT) is None
+        assert no_model == []
+
+    async def test_ambiguous_requests_ask_the_model(self, monkeypatch, no_model):
+        assert await classify_intent("Beregn CO2 og sammenlign med branchen", _CONTEXT) is None
+        assert no_model == ["Beregn CO2 og sammenlign med branchen"]
+
+        async def pick(message):
+            return "calculate_ghg_emissions"
+        monkeypatch.setattr(intent_module, "_ask_model", pick)
+        intent = await classify_intent("Hvorfor er det vigtigt at beregne vores CO2-udledning nu?", _CONTEXT)
+        assert intent.tool == "calculate_ghg_emissions" and intent.source == "model"
+
+
+class TestToolInput:
+    def test_input_is_built_from_context(self):
+        ghg = tool_input_for("calculate_ghg_emissions", _CONTEXT)
+        assert ghg["scope2"] == {"electricity_kwh": 90000} and ghg["scope3"] == {}
+        assert ghg["explain_anomalies"] is False
+        assert tool_input_for("benchmark_vs_peers", _CONTEXT) == {
+            "industry_code": "manufacturing", "esg_score_total": 58, "employee_count": 40,
+        }
+
+    async def test_missing_data_means_no_fast_path(self, no_model):
+        assert tool_input_for("check_vsme_compliance", {}) is None
+        assert await classify_intent("Sammenlign med branchen", {"industry_code": "retail"}) is None
@@ -0,0 +1,100 @@
+"""
+Tests for the LLM governor (concurrency limit, token bucket, priority lanes).
+
+Run: pytest tests/test_llm_governor.py -v
+"""
+import asyncio
+import time
+
+from app.services.ai.llm_governor import LLMPriority, LocalLLMGovernor, current_priority, llm_priority
+
+
+def _governor(**overrides) -> LocalLLMGovernor:
+    params = dict(max_concurrency=2, batch_max_concurrency=1, requests_per_minute=6000, burst=100)
+    params.update(overrides)
+    return LocalLLMGovernor(**params)
+
+
+class TestLocalLLMGovernor:
+    async def test_concurrency_is_capped(self):
+        governor = _governor()
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with governor.slot(LLMPriority.INTERACTIVE):
+                peak = max(peak, governor.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+        assert governor.in_flight == 0
+
+    async def test_waiters_served_in_priority_order(self):
+        governor = _governor(max_concurrency=1, batch_max_concurrency=1)
+        order: list[str] = []
+        gate = asyncio.Event()
+
+        async def hold():
+            async with governor.slot(LLMPriority.INTERACTIVE):
+                await gate.wait()
+
+        async def call(name, priority):
+            async with governor.slot(priority):
+                order.append(name)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(call("batch", LLMPriority.BATCH)),
+            asyncio.create_task(call("standard", LLMPriority.STANDARD)),
+            asyncio.create_task(call("chat", LLMPriority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(holder, *waiters)
+        assert order == ["chat", "standard", "batch"]
+
+    async def test_batch_lane_leaves_headroom(self):
+        governor = _governor(max_concurrency=3, batch_max_concurrency=1)
+        gate = asyncio.Event()
+
+        async def batch_call():
+            async with governor.slot(LLMPriority.BATCH):
+                await gate.wait()
+
+        batch = [asyncio.create_task(batch_call()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert governor.in_flight == 1
+
+        # Interactive call is admitted straight away despite queued batch work
+        await asyncio.wait_for(governor.acquire(LLMPriority.INTERACTIVE), timeout=0.5)
+        governor.release(LLMPriority.INTERACTIVE)
+        gate.set()
+        await asyncio.gather(*batch)
+
+    async def test_throttle_delays_admission(self):
+        governor = _governor()
+        governor.throttle(0.05)
+        started = time.monotonic()
+        async with governor.slot(LLMPriority.INTERACTIVE):
+            pass
+        assert time.monotonic() - started >= 0.04
+
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        governor = _governor(max_concurrency=1)
+        await governor.acquire(LLMPriority.INTERACTIVE)
+        waiter = asyncio.create_task(governor.acquire(LLMPriority.INTERACTIVE))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        governor.release(LLMPriority.INTERACTIVE)
+        assert governor.in_flight == 0
+
+
+class TestPriorityContext:
+    def test_default_is_interactive_and_restored(self):
+        assert current_priority() == LLMPriority.INTERACTIVE
+        with llm_priority(LLMPriority.BATCH):
+            assert current_priority() == LLMPriority.BATCH
+        assert current_priority() == LLMPriority.INTERACTIVE
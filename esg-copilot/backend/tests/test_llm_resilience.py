@@ -0,0 +1,139 @@
+"""
+Tests for LLM retry/backoff and the per-model circuit breaker.
+
+Run: pytest tests/test_llm_resilience.py -v
+"""
+import anthropic
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.ai import resilience
+from app.services.ai.resilience import (
+    CircuitBreaker,
+    LLMUnavailableError,
+    backoff_delay,
+    call_with_retries,
+    retry_after_seconds,
+)
+
+
+def _error(cls, status: int, headers: dict | None = None):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return cls("error", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch):
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    async def no_throttle(seconds):
+        pass
+
+    monkeypatch.setattr(resilience.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(resilience, "throttle_llm_calls", no_throttle)
+    monkeypatch.setattr(settings, "ANTHROPIC_FALLBACK_MODEL", "fallback-model")
+    resilience.reset_breakers()
+    yield sleeps
+    resilience.reset_breakers()
+
+
+class TestBackoff:
+    def test_retry_after_header_is_honoured(self):
+        assert retry_after_seconds(_error(anthropic.RateLimitError, 429, {"retry-after": "3"})) == 3.0
+        assert retry_after_seconds(_error(anthropic.RateLimitError, 429, {"retry-after-ms": "1500"})) == 1.5
+        assert retry_after_seconds(_error(anthropic.RateLimitError, 429)) is None
+
+    def test_delay_is_capped_and_jittered(self):
+        huge = _error(anthropic.RateLimitError, 429, {"retry-after": "600"})
+        assert backoff_delay(huge, 1) <= settings.LLM_RETRY_MAX_DELAY_SECONDS + 0.25
+        overload = _error(anthropic.InternalServerError, 529)
+        delays = {round(backoff_delay(overload, 2), 3) for _ in range(20)}
+        assert len(delays) > 1
+        assert all(2.0 <= d <= 4.0 for d in delays)
+
+
+class TestCallWithRetries:
+    async def test_retries_then_succeeds(self, _fast_retries):
+        calls = []
+
+        async def call(model):
+            calls.append(model)
+            if len(calls) < 2:
+                raise _error(anthropic.RateLimitError, 429, {"retry-after": "1"})
+            return "ok"
+
+        assert await call_with_retries("primary", call) == "ok"
+        assert calls == ["primary", "primary"]
+        assert 1.0 <= _fast_retries[0] <= 1.25
+
+    async def test_gives_up_after_max_attempts(self):
+        async def call(model):
+            raise _error(anthropic.InternalServerError, 529)
+
+        with pytest.raises(RuntimeError, match="3 attempt"):
+            await call_with_retries("primary", call)
+
+    async def test_open_breaker_routes_to_fallback(self):
+        breaker = resilience.get_breaker("primary")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        used = []
+
+        async def call(model):
+            used.append(model)
+            return model
+
+        assert await call_with_retries("primary", call) == "fallback-model"
+        assert used == ["fallback-model"]
+
+    async def test_create_message_reports_the_answering_model(self, monkeypatch):
+        from types import SimpleNamespace
+
+        async def create(model, **kwargs):
+            return SimpleNamespace(content=[SimpleNamespace(text=model)], usage=None)
+
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        monkeypatch.setattr(resilience, "get_anthropic_client", lambda: client)
+        breaker = resilience.get_breaker("primary")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        _response, model = await resilience.create_message_with_model(
+            model="primary", max_tokens=10, messages=[],
+        )
+        assert model == "fallback-model"
+
+    async def test_no_fallback_fails_fast(self, monkeypatch):
+        monkeypatch.setattr(settings, "ANTHROPIC_FALLBACK_MODEL", "")
+        breaker = resilience.get_breaker("primary")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        async def call(model):
+            raise AssertionError("must not be called")
+
+        with pytest.raises(LLMUnavailableError):
+            await call_with_retries("primary", call)
+
+
+class TestCircuitBreaker:
+    def test_half_open_allows_one_probe(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker("m", failure_threshold=2, cooldown_seconds=10)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        now[0] += 11
+        assert breaker.allow()            # the probe
+        assert not breaker.allow()        # everyone else waits for it
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
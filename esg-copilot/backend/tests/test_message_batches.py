@@ -0,0 +1,110 @@
+"""
+Tests for the Message Batches backend: polling, transient-error retries,
+cancel on failure and resuming a stored batch.
+No API key required — the Anthropic client is a scripted fake.
+Run: pytest tests/test_message_batches.py -v
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+import pytest
+
+from app.services.ai import message_batches
+from app.services.ai.message_batches import AnthropicBatchBackend, BatchRequest
+
+
+def _connection_error():
+    return anthropic.APIConnectionError(request=httpx.Request("GET", "https://api.anthropic.com"))
+
+
+def _batch(status, created_at=None):
+    return SimpleNamespace(
+        id="msgbatch_1", processing_status=status,
+        created_at=created_at or datetime.now(timezone.utc),
+    )
+
+
+class FakeBatches:
+    def __init__(self, polls, created_at=None):
+        self.polls = list(polls)          # batches or exceptions, one per retrieve()
+        self.created_at = created_at
+        self.cancelled: list[str] = []
+        self.created = 0
+
+    async def create(self, requests):
+        self.created += 1
+        self.custom_ids = [r["custom_id"] for r in requests]
+        return _batch("in_progress", self.created_at)
+
+    async def retrieve(self, batch_id):
+        item = self.polls.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+    async def results(self, batch_id):
+        async def entries():
+            for custom_id in self.custom_ids:
+                message = SimpleNamespace(content=[SimpleNamespace(text=f"AI {custom_id}")], usage=None)
+                yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="succeeded", message=message))
+        return entries()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    holder = SimpleNamespace(batches=None)
+    fake = SimpleNamespace(messages=holder)
+    monkeypatch.setattr(message_batches, "get_anthropic_client", lambda: fake)
+    return holder
+
+
+REQUESTS = [BatchRequest("m", "SYS", f"prompt {i}", 100, 0.3) for i in range(2)]
+
+
+class TestAnthropicBatchBackend:
+    async def test_transient_poll_errors_are_retried(self, client):
+        client.batches = FakeBatches([_connection_error(), _batch("in_progress"), _connection_error(), _batch("ended")])
+        results = await AnthropicBatchBackend(poll_seconds=0, timeout_seconds=60).run(REQUESTS)
+        assert results == ["AI req-0", "AI req-1"]
+        assert client.batches.cancelled == []
+
+    async def test_terminal_failure_cancels_the_batch(self, client):
+        client.batches = FakeBatches([ValueError("unexpected response")])
+        with pytest.raises(ValueError):
+            await AnthropicBatchBackend(poll_seconds=0, timeout_seconds=60).run(REQUESTS)
+        assert client.batches.cancelled == ["msgbatch_1"]
+
+    async def test_too_many_transient_errors_cancel_the_batch(self, client):
+        client.batches = FakeBatches([_connection_error()] * message_batches._MAX_POLL_ERRORS)
+        with pytest.raises(anthropic.APIConnectionError):
+            await AnthropicBatchBackend(poll_seconds=0, timeout_seconds=60).run(REQUESTS)
+        assert client.batches.cancelled == ["msgbatch_1"]
+
+    async def test_submitted_batch_is_reported_before_polling(self, client):
+        client.batches = FakeBatches([_batch("ended")])
+        seen = []
+
+        async def on_submitted(batch_id, requests):
+            seen.append((batch_id, requests, len(client.batches.polls)))
+
+        await AnthropicBatchBackend(poll_seconds=0, timeout_seconds=60).run(REQUESTS, on_submitted=on_submitted)
+        assert seen == [("msgbatch_1", REQUESTS, 1)]
+
+    async def test_resume_polls_the_stored_batch(self, client):
+        client.batches = FakeBatches([_batch("in_progress"), _batch("ended")])
+        client.batches.custom_ids = ["req-0", "req-1"]
+        results = await AnthropicBatchBackend(poll_seconds=0, timeout_seconds=60).resume("msgbatch_1", REQUESTS)
+        assert results == ["AI req-0", "AI req-1"]
+        assert client.batches.created == 0
+
+    async def test_resumed_batch_keeps_its_original_deadline(self, client):
+        long_ago = datetime.now(timezone.utc) - timedelta(hours=7)
+        client.batches = FakeBatches([_batch("in_progress", long_ago), _batch("ended", long_ago)])
+        client.batches.custom_ids = ["req-0", "req-1"]
+        await AnthropicBatchBackend(poll_seconds=0, timeout_seconds=6 * 3600).resume("msgbatch_1", REQUESTS)
+        assert client.batches.cancelled == ["msgbatch_1"]
@@ -0,0 +1,87 @@
+"""
+Tests for the task-aware model router.
+
+Run: pytest tests/test_model_router.py -v
+"""
+import anthropic
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import counter, histogram
+from app.services.ai import model_router, resilience
+from app.services.ai.model_router import ModelRoute, route_for
+from app.services.ai.resilience import call_with_retries
+
+
+class TestRouteFor:
+    def test_small_tasks_use_small_model(self):
+        for task in ("qa_review", "anomaly_commentary", "roadmap", "materiality"):
+            assert "haiku" in route_for(task).model
+
+    def test_empty_model_means_primary(self, monkeypatch):
+        monkeypatch.setattr(settings, "ANTHROPIC_MODEL", "primary")
+        monkeypatch.setattr(settings, "ANTHROPIC_FALLBACK_MODEL", "global-fallback")
+        monkeypatch.setattr(settings, "LLM_MODEL_ROUTES", {"chat": {"model": "", "budget_seconds": 5}})
+
+        chat = route_for("chat")
+        assert (chat.model, chat.fallback_model, chat.budget_seconds) == ("primary", "global-fallback", 5.0)
+        assert route_for("narrative").model == "primary"      # not configured → defaults
+
+    def test_unknown_task_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown LLM task"):
+            route_for("poetry")
+
+
+class TestLatency:
+    def test_over_budget_is_counted(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(model_router.time, "perf_counter", lambda: now[0])
+        route = ModelRoute("roadmap", "m", "f", budget_seconds=1.0)
+        over = counter("llm_task_over_budget_total", "", labels={"task": "roadmap"})
+        seconds = histogram("llm_task_seconds", "", labels={"task": "roadmap"})
+        before_over, before_count = over.value, seconds.snapshot()["count"]
+
+        with route.timed():
+            now[0] += 0.5
+        with route.timed():
+            now[0] += 2.0
+
+        assert seconds.snapshot()["count"] == before_count + 2
+        assert over.value == before_over + 1
+
+
+class TestTimeoutFallback:
+    @pytest.fixture(autouse=True)
+    def _fast(self, monkeypatch):
+        async def no_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(resilience.asyncio, "sleep", no_sleep)
+        resilience.reset_breakers()
+        yield
+        resilience.reset_breakers()
+
+    async def test_retry_after_timeout_uses_fallback(self):
+        used = []
+
+        async def call(model):
+            used.append(model)
+            if model == "slow":
+                raise anthropic.APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com"))
+            return model
+
+        assert await call_with_retries("slow", call, fallback_model="fast") == "fast"
+        assert used == ["slow", "fast"]
+
+    async def test_timeout_without_fallback_retries_same_model(self):
+        used = []
+
+        async def call(model):
+            used.append(model)
+            if len(used) == 1:
+                raise anthropic.APITimeoutError(request=httpx.Request("POST", "https://api.anthropic.com"))
+            return model
+
+        assert await call_with_retries("slow", call, fallback_model="") == "slow"
+        assert used == ["slow", "slow"]
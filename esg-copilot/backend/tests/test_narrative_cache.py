@@ -0,0 +1,114 @@
+"""
+Tests for the content-addressed narrative cache and ReportWriter._generate.
+No DB or API key required — the cache store and the LLM are replaced.
+
+Run: pytest tests/test_narrative_cache.py -v
+"""
+import pytest
+
+from app.core import database
+from app.services.ai import report_writer
+from app.services.ai.narrative_cache import get_cached_narrative, narrative_cache_key, store_narrative
+from app.services.ai.report_writer import ReportWriter
+
+
+class FakeLLM:
+    model = "claude-test"
+
+    def __init__(self, answered_by="claude-test"):
+        self.answered_by = answered_by
+        self.calls = []
+
+    async def generate_with_model(self, system_prompt, prompt, max_tokens=1000):
+        self.calls.append(prompt)
+        return f"Tekst til {prompt}", self.answered_by
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """In-memory stand-in for the narrative_cache table."""
+    rows: dict[str, str] = {}
+
+    async def get(key):
+        return rows.get(key)
+
+    async def put(key, model, content):
+        rows[key] = content
+
+    monkeypatch.setattr(report_writer, "get_cached_narrative", get)
+    monkeypatch.setattr(report_writer, "store_narrative", put)
+    return rows
+
+
+class TestCacheKey:
+    def test_key_is_stable(self):
+        key = narrative_cache_key("m", "system", "prompt", 800)
+        assert key == narrative_cache_key("m", "system", "prompt", 800)
+        assert len(key) == 64
+
+    @pytest.mark.parametrize("changed", [
+        ("m2", "system", "prompt", 800),
+        ("m", "system 2", "prompt", 800),
+        ("m", "system", "prompt 2", 800),
+        ("m", "system", "prompt", 801),
+        ("m", "systemprompt", "", 800),       # field boundaries are part of the key
+    ])
+    def test_any_input_change_misses(self, changed):
+        assert narrative_cache_key(*changed) != narrative_cache_key("m", "system", "prompt", 800)
+
+
+class TestGenerate:
+    async def test_hit_skips_the_llm(self, store):
+        llm = FakeLLM()
+        writer = ReportWriter(use_cache=True, llm=llm)
+        first = await writer._generate("afsnit 1", 800)
+        second = await writer._generate("afsnit 1", 800)
+        assert first == second == "Tekst til afsnit 1"
+        assert llm.calls == ["afsnit 1"]
+        assert len(store) == 1
+
+    async def test_max_tokens_change_regenerates(self, store):
+        llm = FakeLLM()
+        writer = ReportWriter(use_cache=True, llm=llm)
+        await writer._generate("afsnit 1", 800)
+        await writer._generate("afsnit 1", 1200)
+        assert llm.calls == ["afsnit 1", "afsnit 1"]
+
+    async def test_fallback_model_answer_is_not_cached(self, store):
+        llm = FakeLLM(answered_by="claude-fallback")
+        writer = ReportWriter(use_cache=True, llm=llm)
+        await writer._generate("afsnit 1", 800)
+        await writer._generate("afsnit 1", 800)
+        assert len(llm.calls) == 2 and store == {}
+        assert writer.model_used() == "claude-fallback"
+
+    async def test_model_used_reflects_cache_hits_and_answers(self, store):
+        writer = ReportWriter(use_cache=True, llm=FakeLLM())
+        assert writer.model_used() is None
+        await writer._generate("afsnit 1", 800)
+        await writer._generate("afsnit 1", 800)
+        assert writer.model_used() == "claude-test"
+
+    async def test_cache_disabled_always_generates(self, store):
+        llm = FakeLLM()
+        writer = ReportWriter(use_cache=False, llm=llm)
+        await writer._generate("afsnit 1", 800)
+        await writer._generate("afsnit 1", 800)
+        assert len(llm.calls) == 2 and store == {}
+
+
+class TestStoreErrors:
+    @pytest.fixture(autouse=True)
+    def _broken_db(self, monkeypatch):
+        def broken_session():
+            raise ConnectionError("database unavailable")
+        monkeypatch.setattr(database, "AsyncSessionLocal", broken_session)
+
+    async def test_read_and_write_errors_are_swallowed(self):
+        assert await get_cached_narrative("abc") is None
+        await store_narrative("abc", "m", "tekst")
+
+    async def test_generation_falls_through_on_cache_errors(self):
+        llm = FakeLLM()
+        text = await ReportWriter(use_cache=True, llm=llm)._generate("afsnit 1", 800)
+        assert text == "Tekst til afsnit 1" and llm.calls == ["afsnit 1"]
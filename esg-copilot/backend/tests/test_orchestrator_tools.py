@@ -0,0 +1,257 @@
+"""
+Tests for AgentOrchestrator tool execution: concurrent tool calls with
+per-tool timeouts, the single-tool fast path, the per-company tool memo and
+the trusted company_id passed to tools.
+No API key required — Claude is replaced by scripted turns.
+
+Run: pytest tests/test_orchestrator_tools.py -v
+"""
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.agents import orchestrator as orchestrator_module
+from app.services.agents.intent import Intent
+from app.services.agents.orchestrator import AgentOrchestrator
+from app.services.ai.llm_client import StreamEvent
+
+
+async def _collect(agen) -> list:
+    return [item async for item in agen]
+
+
+class _ScriptedLLM:
+    """Replays one list of StreamEvents per LLM turn."""
+
+    def __init__(self, turns):
+        self._turns = iter(turns)
+        self.model = "test-model"
+        self.sent: list[list] = []
+
+    async def stream(self, system_prompt, messages, **kwargs):
+        self.sent.append(list(messages))
+        for event in next(self._turns):
+            yield event
+
+
+def _message(stop_reason, *blocks):
+    return StreamEvent("message", message=SimpleNamespace(stop_reason=stop_reason, content=list(blocks)))
+
+
+def _tool_use(name, tool_id):
+    return SimpleNamespace(type="tool_use", name=name, input={}, id=tool_id)
+
+
+class TestConcurrentTools:
+    async def test_tools_of_one_turn_run_concurrently_in_order(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        monkeypatch.setitem(orchestrator_module._TOOL_TIMEOUTS, "research_company", 0.05)
+        blocks = [
+            SimpleNamespace(type="tool_use", name="calculate_ghg_emissions", input={}, id="t1"),
+            SimpleNamespace(type="tool_use", name="benchmark_vs_peers", input={}, id="t2"),
+            SimpleNamespace(type="tool_use", name="research_company", input={}, id="t3"),
+        ]
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        orchestrator._llm = _ScriptedLLM([
+            [_message("tool_use", *blocks)],
+            [_message("end_turn", SimpleNamespace(type="text", text="OK"))],
+        ])
+        running: set[str] = set()
+        overlap: list[int] = []
+
+        async def fake_dispatch(name, tool_input, memo_scope=""):
+            running.add(name)
+            overlap.append(len(running))
+            await asyncio.sleep({"calculate_ghg_emissions": 0.03, "benchmark_vs_peers": 0.0}.get(name, 10))
+            running.discard(name)
+            return {"ok": True, "tool": name}
+        monkeypatch.setattr(orchestrator, "_dispatch", fake_dispatch)
+
+        events = await _collect(orchestrator.stream({"user_message": "Analysér"}))
+        finished = [data["tool"] for event, data in events if event == "tool_result"]
+        assert finished == ["benchmark_vs_peers", "calculate_ghg_emissions", "research_company"]
+        assert max(overlap) == 3
+
+        tool_results = orchestrator._llm.sent[1][-1]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == ["t1", "t2", "t3"]
+        assert json.loads(tool_results[2]["content"])["ok"] is False          # timed out
+        assert [t["tool"] for t in events[-1][1]["trace"]] == [b.name for b in blocks]
+
+    async def test_timed_out_tool_reports_its_error_in_tool_use_order(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        monkeypatch.setitem(orchestrator_module._TOOL_TIMEOUTS, "research_company", 0.02)
+        blocks = [_tool_use("research_company", "t1"), _tool_use("benchmark_vs_peers", "t2")]
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        orchestrator._llm = _ScriptedLLM([
+            [_message("tool_use", *blocks)],
+            [_message("end_turn", SimpleNamespace(type="text", text="OK"))],
+        ])
+
+        async def slow_dispatch(name, tool_input, memo_scope=""):
+            if name == "research_company":
+                await asyncio.sleep(10)
+            return {"ok": True, "tool": name}
+        monkeypatch.setattr(orchestrator, "_dispatch", slow_dispatch)
+
+        events = await _collect(orchestrator.stream({"user_message": "Undersøg os"}))
+
+        # The fast tool finishes first, but Claude gets the results in tool_use order
+        assert [data["tool"] for event, data in events if event == "tool_result"] == [
+            "benchmark_vs_peers", "research_company",
+        ]
+        tool_results = orchestrator._llm.sent[1][-1]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == ["t1", "t2"]
+        timed_out = json.loads(tool_results[0]["content"])
+        assert timed_out["ok"] is False and "inden for" in timed_out["error"]
+        assert json.loads(tool_results[1]["content"])["ok"] is True
+
+
+class TestFastPath:
+    async def test_single_tool_request_takes_the_fast_path(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        orchestrator._llm = _ScriptedLLM([
+            [StreamEvent("text", text="I ligger over snittet.")],
+        ])
+
+        async def fake_dispatch(name, tool_input, memo_scope=""):
+            return {"ok": True, "percentile": 71}
+        monkeypatch.setattr(orchestrator, "_dispatch", fake_dispatch)
+
+        events = await _collect(orchestrator.stream({
+            "user_message": "Sammenlign os med branchen",
+            "context": {"industry_code": "retail", "esg_score_total": 64},
+        }))
+        assert [e for e, _ in events] == ["tool_call", "tool_result", "delta", "done"]
+        done = events[-1][1]
+        assert done["answer"] == "I ligger over snittet."
+        assert done["trace"][0]["fast_path"] is True
+        # One Claude call, and the tool result is in its prompt
+        assert len(orchestrator._llm.sent) == 1
+        assert '"percentile": 71' in orchestrator._llm.sent[0][-1]["content"]
+
+    async def test_fast_path_without_tool_result_falls_back(self, monkeypatch):
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+
+        async def no_results(blocks, memo_scope="", company_id=""):
+            return
+            yield
+        monkeypatch.setattr(orchestrator, "_run_tools", no_results)
+
+        intent = Intent("benchmark_vs_peers", {"industry_code": "retail"}, "rules")
+        trace = []
+        events = await _collect(orchestrator._fast_path(intent, "Sammenlign", [], [], "", trace))
+        assert [e for e, _ in events] == ["tool_call"]                 # no "done" → full loop runs
+        assert trace[0]["output"]["ok"] is False
+
+
+class TestToolMemo:
+    async def test_deterministic_tools_are_memoized_per_company(self, monkeypatch):
+        from app.services.agents import registry
+
+        runs = []
+
+        class Agent:
+            async def safe_run(self, tool_input):
+                runs.append(tool_input)
+                return {"ok": True, "n": len(runs)}
+
+        class Registry:
+            def for_tool(self, name):
+                return Agent()
+
+        monkeypatch.setattr(registry, "get_agent_registry", lambda: Registry())
+        monkeypatch.setattr(orchestrator_module, "_memo", None)
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        dispatch = orchestrator._dispatch
+
+        first = await dispatch("benchmark_vs_peers", {"industry_code": "it", "x": 1}, "company-a")
+        again = await dispatch("benchmark_vs_peers", {"x": 1, "industry_code": "it"}, "company-a")
+        other = await dispatch("benchmark_vs_peers", {"industry_code": "it", "x": 1}, "company-b")
+        assert first["n"] == again["n"] == 1 and again["memoized"] is True
+        assert other["n"] == 2
+
+        # LLM commentary and non-deterministic tools always run
+        await dispatch("calculate_ghg_emissions", {"scope1": {}}, "company-a")
+        await dispatch("calculate_ghg_emissions", {"scope1": {}}, "company-a")
+        await dispatch("build_roadmap", {}, "company-a")
+        await dispatch("build_roadmap", {}, "company-a")
+        assert len(runs) == 6
+        await dispatch("calculate_ghg_emissions", {"scope1": {}, "explain_anomalies": False}, "company-a")
+        await dispatch("calculate_ghg_emissions", {"scope1": {}, "explain_anomalies": False}, "company-a")
+        assert len(runs) == 7
+
+        # No trusted scope → nothing is shared
+        await dispatch("benchmark_vs_peers", {"industry_code": "it", "x": 1}, "")
+        await dispatch("benchmark_vs_peers", {"industry_code": "it", "x": 1}, "")
+        assert len(runs) == 9
+
+    async def test_scope_comes_from_inputs_not_client_context(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        orchestrator._llm = _ScriptedLLM([[StreamEvent("text", text="Svar.")]])
+        scopes = []
+
+        async def fake_dispatch(name, tool_input, memo_scope=""):
+            scopes.append(memo_scope)
+            return {"ok": True, "percentile": 71}
+        monkeypatch.setattr(orchestrator, "_dispatch", fake_dispatch)
+
+        await _collect(orchestrator.stream({
+            "user_message": "Sammenlign os med branchen",
+            "context": {"industry_code": "retail", "esg_score_total": 64, "company_id": "someone-else"},
+            "scope": "company:mine",
+        }))
+        assert scopes == ["company:mine"]
+
+
+class TestTrustedCompanyId:
+    async def test_analyze_route_injects_the_callers_company(self, monkeypatch):
+        from app.api.v1.routes import agent as agent_routes
+        from app.services.agents import registry
+
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        orchestrator._llm = _ScriptedLLM([[StreamEvent("text", text="Svar.")]])
+        inputs = []
+
+        async def fake_dispatch(name, tool_input, memo_scope=""):
+            inputs.append(tool_input)
+            return {"ok": True, "percentile": 71}
+        monkeypatch.setattr(orchestrator, "_dispatch", fake_dispatch)
+        monkeypatch.setattr(registry, "get_agent", lambda cls: orchestrator)
+
+        user = SimpleNamespace(id=uuid.uuid4(), company_id=uuid.uuid4())
+        body = agent_routes.AnalyzeRequest(
+            user_message="Sammenlign os med branchen",
+            context={"industry_code": "retail", "esg_score_total": 64, "company_id": "someone-else"},
+        )
+        result = await agent_routes.analyze(body, user)
+
+        assert result.answer == "Svar."
+        assert inputs[0]["company_id"] == str(user.company_id)
+
+    async def test_company_id_from_claude_is_replaced(self, monkeypatch):
+        orchestrator = AgentOrchestrator.__new__(AgentOrchestrator)
+        inputs = []
+
+        async def fake_dispatch(name, tool_input, memo_scope=""):
+            inputs.append((name, tool_input))
+            return {"ok": True}
+        monkeypatch.setattr(orchestrator, "_dispatch", fake_dispatch)
+
+        blocks = [
+            SimpleNamespace(name="benchmark_vs_peers", input={"industry_code": "it", "company_id": "other"}),
+            SimpleNamespace(name="research_company", input={"cvr": "12345678"}),
+        ]
+        await _collect(orchestrator._run_tools(blocks, "company:mine", "mine"))
+        assert sorted(inputs, key=lambda x: x[0]) == [
+            ("benchmark_vs_peers", {"industry_code": "it", "company_id": "mine"}),
+            ("research_company", {"cvr": "12345678"}),
+        ]
+
+        inputs.clear()
+        await _collect(orchestrator._run_tools(blocks[:1], "user:u1", ""))
+        assert inputs == [("benchmark_vs_peers", {"industry_code": "it"})]
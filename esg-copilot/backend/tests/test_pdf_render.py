@@ -0,0 +1,118 @@
+"""
+Tests for the PDF render service (slots, queue-wait metric, pool recovery,
+inline fallback) and pdf_builder.build_context.
+WeasyPrint is not needed — render jobs are stub functions.
+
+Run: pytest tests/test_pdf_render.py -v
+"""
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.pdf import pdf_builder, render_service
+from app.services.pdf.render_service import QUEUE_WAIT_SECONDS, PDFRenderService
+
+
+# Module-level so the spawned pool workers can unpickle them
+def _noop_init() -> None:
+    pass
+
+
+def _slow_job(seconds: float) -> float:
+    start = time.monotonic()
+    time.sleep(seconds)
+    return start
+
+
+def _crash_job() -> None:
+    os._exit(1)
+
+
+def _pid_job() -> int:
+    return os.getpid()
+
+
+def _fake_render_pdf(context: dict) -> bytes:
+    return b"%PDF-1.7 " + context["company_name"].encode()
+
+
+class TestSlots:
+    async def test_jobs_beyond_max_concurrency_queue(self):
+        renderer = PDFRenderService(workers=1, max_concurrency=1, mode="inline")
+        waited_before = QUEUE_WAIT_SECONDS.snapshot()
+
+        starts = await asyncio.gather(*(renderer._submit(_slow_job, 0.05) for _ in range(3)))
+
+        starts = sorted(starts)
+        assert all(b - a >= 0.04 for a, b in zip(starts, starts[1:]))   # one at a time
+        waited = QUEUE_WAIT_SECONDS.snapshot()
+        assert waited["count"] - waited_before["count"] == 3
+        assert waited["sum"] - waited_before["sum"] >= 0.14               # 0 + 0.05 + 0.10
+
+
+class TestInline:
+    async def test_render_to_path_writes_the_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pdf_builder, "render_pdf", _fake_render_pdf)
+        renderer = PDFRenderService(workers=1, max_concurrency=2, mode="inline")
+        dest = tmp_path / "reports" / "r1.pdf"
+
+        size = await renderer.render_to_path({"company_name": "Nordisk Metal"}, dest)
+
+        assert dest.read_bytes() == b"%PDF-1.7 Nordisk Metal"
+        assert size == len(dest.read_bytes())
+
+    async def test_pool_start_failure_falls_back_to_inline(self, monkeypatch):
+        class DaemonicPool:
+            def __init__(self, **kwargs):
+                pass
+
+            def submit(self, fn, *args):
+                raise AssertionError("daemonic processes are not allowed to have children")
+
+            def shutdown(self, **kwargs):
+                pass
+
+        monkeypatch.setattr(pdf_builder, "render_pdf", _fake_render_pdf)
+        monkeypatch.setattr(render_service, "ProcessPoolExecutor", DaemonicPool)
+        renderer = PDFRenderService(workers=1, max_concurrency=1)
+
+        assert await renderer.render({"company_name": "X"}) == b"%PDF-1.7 X"
+        assert renderer.mode == "inline"
+
+
+class TestPool:
+    async def test_broken_pool_is_replaced_on_next_job(self, monkeypatch):
+        monkeypatch.setattr(render_service, "_worker_init", _noop_init)
+        renderer = PDFRenderService(workers=1, max_concurrency=1)
+        try:
+            first_pid = await renderer._submit(_pid_job)
+            with pytest.raises(BrokenProcessPool):
+                await renderer._submit(_crash_job)
+            assert renderer._pool is None
+            second_pid = await renderer._submit(_pid_job)
+            assert second_pid != first_pid and second_pid != os.getpid()
+        finally:
+            renderer.shutdown()
+
+
+class TestBuildContext:
+    def test_context_is_plain_template_data(self):
+        context = pdf_builder.build_context(
+            company_name="Nordisk Metal ApS", reporting_year=2025, industry_code="manufacturing",
+            country_code="DK", engine_version="1.0",
+            scope1_co2e_tonnes=1.0, scope2_co2e_tonnes=2.0, scope3_co2e_tonnes=3.0, total_co2e_tonnes=6.0,
+            scope1_breakdown={}, scope2_breakdown={}, scope3_breakdown={},
+            esg_score_total=70.0, esg_score_e=60.0, esg_score_s=75.0, esg_score_g=80.0,
+            esg_rating="B", industry_percentile=55.0,
+            identified_gaps=[], recommendations=[],
+            executive_summary="Resumé", co2_narrative="", esg_narrative="",
+            improvements_narrative="", roadmap_narrative="", disclaimer="Udkast",
+        )
+        assert context["company_name"] == "Nordisk Metal ApS"
+        assert context["total_co2e_tonnes"] == 6.0
+        assert context["generated_date"]
+        html = pdf_builder._build_html(context)
+        assert "Nordisk Metal ApS" in html
@@ -0,0 +1,113 @@
+"""
+Tests for the peer nearest-neighbour index behind BenchmarkAgent.
+No database required — the index is filled directly.
+
+Run: pytest tests/test_peer_index.py -v
+"""
+import math
+import random
+import time
+
+import pytest
+
+from app.services import peer_index
+from app.services.agents.benchmark import BenchmarkAgent
+from app.services.peer_index import Peer, PeerIndex, peer_vector
+
+_INDUSTRIES = ("manufacturing", "retail", "technology")
+
+
+def _peer(i: int, rng: random.Random, industry: str | None = None) -> Peer:
+    employees = rng.randint(3, 240)
+    total = employees * rng.uniform(0.5, 15)
+    e, s, g = rng.uniform(5, 40), rng.uniform(5, 30), rng.uniform(5, 30)
+    return Peer(
+        company_id=f"c{i}",
+        industry=industry or rng.choice(_INDUSTRIES),
+        vector=peer_vector(
+            employee_count=employees, revenue_eur=rng.uniform(2e5, 5e7), total_co2e_tonnes=total,
+            scope1_co2e_tonnes=total * rng.random() * 0.5, scope2_co2e_tonnes=total * rng.random() * 0.5,
+            esg_score_e=e, esg_score_s=s, esg_score_g=g,
+        ),
+        size_band=peer_index.size_band(employees),
+        metrics={"esg_score_total": e + s + g, "co2_per_fte": total / employees},
+    )
+
+
+def _brute_force(peers, vector, industry, k):
+    pool = [p for p in peers if p.industry == industry]
+    return sorted(pool, key=lambda p: math.dist(vector, p.vector))[:k]
+
+
+class TestPeerIndex:
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        peers = [_peer(i, rng) for i in range(3000)]
+        index = PeerIndex()
+        index.rebuild(peers)
+        for _ in range(20):
+            query = _peer(-1, rng)
+            found = index.nearest(query.vector, "retail", k=20)
+            assert [p.company_id for _, p in found] == \
+                [p.company_id for p in _brute_force(peers, query.vector, "retail", 20)]
+            assert all(a[0] <= b[0] for a, b in zip(found, found[1:]))
+
+    def test_query_is_fast(self):
+        rng = random.Random(3)
+        index = PeerIndex()
+        index.rebuild([_peer(i, rng) for i in range(5000)])
+        queries = [_peer(-1, rng).vector for _ in range(200)]
+        started = time.perf_counter()
+        for vector in queries:
+            index.nearest(vector, "technology", k=20)
+        per_query = (time.perf_counter() - started) / len(queries)
+        assert per_query < 0.01          # ~0.5 ms on a laptop; generous for slow CI
+
+    def test_upserts_are_searchable_before_the_rebuild(self):
+        rng = random.Random(1)
+        index = PeerIndex()
+        index.rebuild([_peer(i, rng, "retail") for i in range(100)])
+        target = _peer(5000, rng, "retail")
+        index.upsert(target)
+        assert index.nearest(target.vector, "retail", k=1)[0][1] is target
+
+        # A company's new profile replaces the old one — no duplicates
+        moved = Peer("c1", "retail", target.vector, "small", {"esg_score_total": 50})
+        index.upsert(moved)
+        ids = [p.company_id for _, p in index.nearest(target.vector, "retail", k=10)]
+        assert ids.count("c1") == 1 and len(index) == 101
+        assert "c1" not in [p.company_id for _, p in index.nearest(target.vector, "retail", k=10, exclude="c1")]
+
+    def test_small_industry_is_topped_up_from_others(self):
+        rng = random.Random(2)
+        index = PeerIndex()
+        index.rebuild([_peer(i, rng, "retail") for i in range(50)] + [_peer(100 + i, rng, "finance") for i in range(3)])
+        found = index.nearest(_peer(-1, rng).vector, "finance", k=10)
+        assert [p.industry for _, p in found[:3]] == ["finance"] * 3
+        assert len(found) == 10 and {p.industry for _, p in found[3:]} == {"retail"}
+
+
+class TestBenchmarkPeers:
+    @pytest.fixture
+    def loaded_index(self, monkeypatch):
+        index = PeerIndex()
+        monkeypatch.setattr(peer_index, "_index", index)
+        return index
+
+    async def test_peer_block_from_nearest_companies(self, loaded_index):
+        rng = random.Random(4)
+        loaded_index.rebuild([_peer(i, rng, "manufacturing") for i in range(200)])
+        result = await BenchmarkAgent().run({
+            "industry_code": "manufacturing", "esg_score_total": 60, "total_co2e_tonnes": 300,
+            "employee_count": 40, "esg_score_e": 25, "esg_score_s": 18, "esg_score_g": 17, "company_id": "c0",
+        })
+        peers = result["peers"]
+        assert peers["count"] == 20 and peers["same_industry"] == 20
+        assert 0 <= peers["esg_percentile"] <= 100 and peers["p25_esg"] <= peers["median_esg"] <= peers["p75_esg"]
+        assert "sammenlignelige" in result["summary"]
+
+    async def test_too_few_peers_keeps_industry_averages_only(self, loaded_index):
+        rng = random.Random(5)
+        loaded_index.rebuild([_peer(i, rng, "retail") for i in range(3)])
+        result = await BenchmarkAgent().run({"industry_code": "retail", "esg_score_total": 50})
+        assert "peers" not in result and result["industry_avg_esg"] == 49
@@ -0,0 +1,54 @@
+"""
+Tests for Anthropic prompt-caching helpers (cache_control breakpoints).
+
+Run: pytest tests/test_prompt_cache.py -v
+"""
+from app.core.config import settings
+from app.services.ai.prompt_cache import cached_system, cached_tools, with_message_breakpoint
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+class TestCachedSystem:
+    def test_static_prefix_cached_dynamic_suffix_not(self):
+        blocks = cached_system("STATIC", "\nVirksomhed: Acme")
+        assert blocks[0] == {"type": "text", "text": "STATIC", "cache_control": _EPHEMERAL}
+        assert blocks[1] == {"type": "text", "text": "\nVirksomhed: Acme"}
+
+    def test_disabled_returns_plain_string(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROMPT_CACHING_ENABLED", False)
+        assert cached_system("STATIC", " + ctx") == "STATIC + ctx"
+
+
+class TestCachedTools:
+    def test_breakpoint_on_last_tool_only(self):
+        tools = [{"name": "a"}, {"name": "b"}]
+        out = cached_tools(tools)
+        assert "cache_control" not in out[0]
+        assert out[1]["cache_control"] == _EPHEMERAL
+        assert "cache_control" not in tools[1]   # original untouched
+
+
+class TestMessageBreakpoint:
+    def test_string_content_becomes_cached_block(self):
+        msgs = [{"role": "user", "content": "Hej"}]
+        out = with_message_breakpoint(msgs)
+        assert out[0]["content"] == [{"type": "text", "text": "Hej", "cache_control": _EPHEMERAL}]
+        assert msgs[0]["content"] == "Hej"
+
+    def test_only_last_tool_result_marked_and_no_accumulation(self):
+        msgs = [
+            {"role": "user", "content": "Hvad mangler vi?"},
+            {"role": "assistant", "content": [{"type": "text", "text": "…"}]},
+            {"role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": "t1", "content": "{}"},
+                {"type": "tool_result", "tool_use_id": "t2", "content": "{}"},
+            ]},
+        ]
+        first = with_message_breakpoint(msgs)
+        second = with_message_breakpoint(msgs)
+        marked = [b for m in second for b in (m["content"] if isinstance(m["content"], list) else [])
+                  if isinstance(b, dict) and "cache_control" in b]
+        assert len(marked) == 1 and marked[0]["tool_use_id"] == "t2"
+        assert first == second
+        assert "cache_control" not in msgs[2]["content"][1]
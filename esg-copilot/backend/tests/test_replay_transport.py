@@ -0,0 +1,122 @@
+"""
+Tests for the record/replay Anthropic transport.
+No network or API key required — recording uses an httpx.MockTransport.
+Run: pytest tests/test_replay_transport.py -v
+"""
+import anthropic
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.ai import anthropic_client
+from app.services.ai.replay_transport import (
+    Fixture,
+    LatencyModel,
+    ReplayTransport,
+    message_to_sse,
+    request_keys,
+)
+
+_NO_LATENCY = LatencyModel.parse("fixed:0")
+
+
+def _message(text: str, model: str = "claude-test") -> dict:
+    return {
+        "id": "msg_1", "type": "message", "role": "assistant", "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn", "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+
+
+def _client(transport: httpx.AsyncBaseTransport) -> anthropic.AsyncAnthropic:
+    return anthropic.AsyncAnthropic(
+        api_key="test", max_retries=0, http_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+async def _create(client, prompt: str, system: str = "Du er en ESG-assistent."):
+    return await client.messages.create(
+        model="claude-test", max_tokens=100, system=system,
+        messages=[{"role": "user", "content": prompt}],
+    )
+
+
+class TestRecordReplay:
+    async def test_recorded_answer_is_replayed_offline(self, tmp_path):
+        upstream = httpx.MockTransport(lambda request: httpx.Response(200, json=_message("Optaget svar")))
+        recorder = ReplayTransport(tmp_path, mode="record", inner=upstream)
+        assert (await _create(_client(recorder), "Hvad er Scope 3?")).content[0].text == "Optaget svar"
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        replay = ReplayTransport(tmp_path, latency=_NO_LATENCY)
+        client = _client(replay)
+        assert (await _create(client, "Hvad er Scope 3?")).content[0].text == "Optaget svar"
+        # Different prompt, same model + system prompt → loose match
+        assert (await _create(client, "Hvad er Scope 1?")).content[0].text == "Optaget svar"
+        assert replay.stats["exact"] == 1 and replay.stats["loose"] == 1
+
+    async def test_miss_is_synthesized_or_rejected(self, tmp_path):
+        synthetic = await _create(_client(ReplayTransport(tmp_path, latency=_NO_LATENCY)), "Returner JSON")
+        assert synthetic.content[0].text == "{}"
+
+        strict = _client(ReplayTransport(tmp_path, latency=_NO_LATENCY, on_miss="error"))
+        with pytest.raises(anthropic.NotFoundError):
+            await _create(strict, "Hej")
+
+
+class TestErrorInjection:
+    async def test_injected_429_and_529(self, tmp_path):
+        limited = _client(ReplayTransport(tmp_path, latency=_NO_LATENCY, rate_limit_rate=1.0))
+        with pytest.raises(anthropic.RateLimitError) as exc:
+            await _create(limited, "Hej")
+        assert exc.value.response.headers["retry-after"] == "1"
+
+        overloaded = _client(ReplayTransport(tmp_path, latency=_NO_LATENCY, overload_rate=1.0))
+        with pytest.raises(anthropic.InternalServerError):
+            await _create(overloaded, "Hej")
+
+
+class TestStreaming:
+    async def test_tool_use_stream_is_replayed(self, tmp_path):
+        message = _message("")
+        message["content"] = [
+            {"type": "text", "text": "Jeg beregner CO2."},
+            {"type": "tool_use", "id": "t1", "name": "calculate_co2", "input": {"year": 2024}},
+        ]
+        message["stop_reason"] = "tool_use"
+        fixture_dir = tmp_path / "fx"
+        fixture_dir.mkdir()
+        replay = ReplayTransport(fixture_dir, latency=_NO_LATENCY)
+        # Hand-made fixture for the loose key of this request
+        body = {"model": "claude-test", "max_tokens": 100, "system": "S", "stream": True,
+                "messages": [{"role": "user", "content": "Hej"}]}
+        _, loose = request_keys("POST", "/v1/messages", body)
+        replay._add(Fixture("other", loose, 200, "text/event-stream", message_to_sse(message)))
+
+        async with _client(replay).messages.stream(
+            model="claude-test", max_tokens=100, system="S", messages=[{"role": "user", "content": "Hej igen"}],
+        ) as stream:
+            text = "".join([t async for t in stream.text_stream])
+            final = await stream.get_final_message()
+
+        assert text == "Jeg beregner CO2."
+        assert final.stop_reason == "tool_use"
+        assert final.content[1].name == "calculate_co2" and final.content[1].input == {"year": 2024}
+
+
+class TestSharedClient:
+    async def test_llm_client_runs_on_replay_without_api_key(self, tmp_path, monkeypatch):
+        from app.services.ai.llm_client import LLMClient
+
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        monkeypatch.setattr(settings, "ANTHROPIC_API_KEY", "")
+        monkeypatch.setattr(settings, "ANTHROPIC_TRANSPORT", "replay")
+        monkeypatch.setattr(settings, "ANTHROPIC_FIXTURES_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "ANTHROPIC_REPLAY_LATENCY", "fixed:0")
+        monkeypatch.setattr(anthropic_client, "_client", None)
+        try:
+            text = await LLMClient(task="chat").generate("Du er en coach.", "Hvor uploader jeg en elregning?")
+        finally:
+            await anthropic_client.close_anthropic_client()
+        assert text.startswith("Syntetisk svar")
@@ -0,0 +1,121 @@
+"""
+Tests for batched report generation (one narrative batch for many reports).
+No DB or Claude required — pipeline phases are stubbed and the local batch
+backend answers with a stub responder.
+Run: pytest tests/test_report_batch.py -v
+"""
+
+import pytest
+
+from app.api.v1.routes import reports
+from app.core.config import settings
+from app.services.ai.message_batches import BatchRequest, LocalBatchBackend
+from app.services.ai.model_router import route_for
+from app.services.report_batch import run_report_batch
+from app.services.report_scheduler import BatchProgress
+
+
+@pytest.fixture
+def phases(monkeypatch):
+    calls = {"completed": {}, "failed": []}
+
+    async def prepare(report_id, submission_id):
+        if report_id == "broken":
+            raise ValueError("Submission not found")
+        return report_id
+
+    def plan(writer, draft):
+        return [
+            (section, writer.llm.generate("SYS", f"{draft}/{section}", 100), f"fallback {section}")
+            for section in ("executive_summary", "co2_narrative")
+        ]
+
+    async def complete(draft, narratives, trace, ai_model=None):
+        calls["completed"][draft] = narratives
+        return "completed"
+
+    async def mark_failed(report_id, error, trace):
+        calls["failed"].append(report_id)
+
+    async def emit(report_id, event, **data):
+        pass
+
+    monkeypatch.setattr(reports, "_prepare_report", prepare)
+    monkeypatch.setattr(reports, "_narrative_plan", plan)
+    monkeypatch.setattr(reports, "_complete_report", complete)
+    monkeypatch.setattr(reports, "_mark_report_failed", mark_failed)
+    monkeypatch.setattr(reports, "_emit", emit)
+    monkeypatch.setattr(settings, "NARRATIVE_CACHE_ENABLED", False)
+    return calls
+
+
+class TestRunReportBatch:
+    async def test_all_narratives_in_one_batch(self, phases):
+        batches = []
+
+        class Backend(LocalBatchBackend):
+            async def run(self, requests, on_submitted=None):
+                batches.append(requests)
+                return await super().run(requests, on_submitted)
+
+        async def responder(request):
+            return f"AI: {request.prompt}"
+
+        statuses = await run_report_batch([("r1", "s1"), ("r2", "s2")], backend=Backend(responder))
+
+        assert statuses == {"r1": "completed", "r2": "completed"}
+        assert len(batches) == 1 and len(batches[0]) == 4
+        assert phases["completed"]["r2"]["co2_narrative"] == "AI: r2/co2_narrative"
+
+    async def test_failed_request_uses_fallback(self, phases):
+        async def responder(request):
+            if request.prompt.endswith("co2_narrative"):
+                raise RuntimeError("errored")
+            return "AI text"
+
+        await run_report_batch([("r1", "s1")], backend=LocalBatchBackend(responder))
+        assert phases["completed"]["r1"] == {
+            "executive_summary": "AI text",
+            "co2_narrative": "fallback co2_narrative",
+        }
+
+    async def test_failed_report_does_not_block_the_batch(self, phases):
+        async def responder(request):
+            return "AI text"
+
+        progress = BatchProgress(batch_id="b1", total=2, window_seconds=0, concurrency=2, queued=2)
+        statuses = await run_report_batch(
+            [("broken", "s0"), ("r1", "s1")], progress=progress, backend=LocalBatchBackend(responder),
+        )
+        assert statuses == {"broken": "failed", "r1": "completed"}
+        assert phases["failed"] == ["broken"]
+        assert progress.done and progress.completed == 1 and progress.failed == 1
+
+    async def test_resume_matches_stored_results_by_prompt(self, phases):
+        model = route_for("narrative").model
+        stored = [
+            BatchRequest(model, "SYS", "r1/co2_narrative", 100, 0.3),
+            BatchRequest(model, "SYS", "r1/executive_summary (older data)", 100, 0.3),
+            BatchRequest(model, "SYS", "r2/executive_summary", 100, 0.3),
+        ]
+
+        class Backend:
+            submitted = []
+
+            async def run(self, requests, on_submitted=None):
+                self.submitted.append(requests)
+
+            async def resume(self, batch_id, requests):
+                assert batch_id == "msgbatch_1" and requests == stored
+                return [f"stored {r.prompt}" for r in requests]
+
+        backend = Backend()
+        await run_report_batch(
+            [("r1", "s1"), ("r2", "s2")], backend=backend, resume=[("msgbatch_1", stored)],
+        )
+        assert backend.submitted == []
+        assert phases["completed"]["r1"] == {
+            "executive_summary": "fallback executive_summary",     # prompt changed since submission
+            "co2_narrative": "stored r1/co2_narrative",
+        }
+        assert phases["completed"]["r2"]["executive_summary"] == "stored r2/executive_summary"
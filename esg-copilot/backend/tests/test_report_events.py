@@ -0,0 +1,67 @@
+"""
+Tests for the in-process report event bus (SSE progress) and its stream tokens.
+No DB or Redis required.
+Run: pytest tests/test_report_events.py -v
+"""
+
+import pytest
+from fastapi import HTTPException
+from jose import JWTError
+
+from app.core.deps import get_current_user
+from app.core.security import create_access_token, create_stream_token, decode_stream_token
+from app.core.sse import format_sse
+from app.services.report_events import MemoryEventBus, ReportEvent
+
+
+class TestMemoryEventBus:
+    async def test_subscriber_receives_events_in_order(self):
+        bus = MemoryEventBus()
+        async with bus.subscribe("r1") as sub:
+            await bus.publish("r1", ReportEvent("stage", {"stage": "scoring"}))
+            await bus.publish("r1", ReportEvent("completed", {"status": "completed"}))
+            first = await sub.next(timeout=1)
+            second = await sub.next(timeout=1)
+        assert first.data == {"stage": "scoring"}
+        assert second.is_terminal
+
+    async def test_events_are_scoped_per_report(self):
+        bus = MemoryEventBus()
+        async with bus.subscribe("r1") as sub:
+            await bus.publish("r2", ReportEvent("stage", {"stage": "pdf"}))
+            assert await sub.next(timeout=0.05) is None
+
+    async def test_unsubscribe_cleans_up(self):
+        bus = MemoryEventBus()
+        async with bus.subscribe("r1"):
+            pass
+        assert "r1" not in bus._subscribers
+        # Publishing with no subscribers is a no-op
+        await bus.publish("r1", ReportEvent("failed"))
+
+    def test_event_json_round_trip(self):
+        evt = ReportEvent("section", {"section": "co2_narrative", "fallback": False})
+        assert ReportEvent.from_json(evt.to_json()) == evt
+
+
+class TestFormatSse:
+    def test_frame_format(self):
+        frame = format_sse("stage", {"stage": "pdf"})
+        assert frame == 'event: stage\ndata: {"stage": "pdf"}\n\n'
+
+
+class TestStreamToken:
+    def test_token_is_scoped_to_its_report(self):
+        token = create_stream_token("u1", "r1")
+        assert decode_stream_token(token, "r1") == "u1"
+        with pytest.raises(JWTError):
+            decode_stream_token(token, "r2")
+
+    def test_access_token_cannot_open_a_stream(self):
+        with pytest.raises(JWTError):
+            decode_stream_token(create_access_token("u1", "admin", "c1"), "r1")
+
+    async def test_stream_token_is_not_a_bearer_token(self):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(create_stream_token("u1", "r1"), db=None)
+        assert exc.value.status_code == 401
@@ -0,0 +1,108 @@
+"""
+Tests for the bounded monthly report scheduler.
+No DB required — the pipeline is replaced by a stub coroutine.
+Run: pytest tests/test_report_scheduler.py -v
+"""
+
+import asyncio
+
+from app.services.report_scheduler import ReportScheduler
+
+
+class _StubPipeline:
+    def __init__(self, fail_ids=()):
+        self.running = 0
+        self.peak = 0
+        self.started: list[str] = []
+        self.fail_ids = set(fail_ids)
+
+    async def __call__(self, report_id: str, submission_id: str):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.started.append(report_id)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return "failed" if report_id in self.fail_ids else "completed"
+
+
+async def _wait_done(scheduler, batch_id, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not scheduler.progress(batch_id).done:
+        assert asyncio.get_running_loop().time() < deadline, "batch did not finish"
+        await asyncio.sleep(0.005)
+
+
+class TestReportScheduler:
+    async def test_concurrency_is_bounded(self):
+        stub = _StubPipeline()
+        scheduler = ReportScheduler(stub, concurrency=3, window_seconds=0)
+        jobs = [(f"r{i}", f"s{i}") for i in range(12)]
+        scheduler.submit("b1", jobs)
+        await _wait_done(scheduler, "b1")
+        await scheduler.shutdown()
+
+        assert stub.peak == 3
+        assert stub.started == [r for r, _ in jobs]   # FIFO
+
+    async def test_progress_counts_outcomes(self):
+        stub = _StubPipeline(fail_ids={"r1"})
+        scheduler = ReportScheduler(stub, concurrency=2, window_seconds=0)
+        batch = scheduler.submit("b1", [("r0", "s0"), ("r1", "s1"), ("r2", "s2")])
+        assert batch.queued == 3
+        await _wait_done(scheduler, "b1")
+        await scheduler.shutdown()
+
+        progress = scheduler.progress("b1").to_dict()
+        assert progress["completed"] == 2
+        assert progress["failed"] == 1
+        assert progress["queued"] == 0 and progress["running"] == 0
+        assert progress["finished_at"] is not None
+
+    async def test_starts_are_spread_over_window(self):
+        stub = _StubPipeline()
+        scheduler = ReportScheduler(stub, concurrency=4, window_seconds=0.2)
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        scheduler.submit("b1", [(f"r{i}", f"s{i}") for i in range(4)])
+        await _wait_done(scheduler, "b1")
+        await scheduler.shutdown()
+        # Last job may not start before 3/4 of the window has passed
+        assert loop.time() - t0 >= 0.15
+
+    async def test_empty_batch_is_done_immediately(self):
+        scheduler = ReportScheduler(_StubPipeline(), concurrency=1, window_seconds=60)
+        batch = scheduler.submit("b1", [])
+        assert batch.done and batch.finished_at is not None
+        await scheduler.shutdown()
+
+    async def test_shutdown_hands_over_unfinished_reports(self):
+        interrupted: list[list[str]] = []
+
+        async def on_interrupted(report_ids):
+            interrupted.append(report_ids)
+
+        async def pipeline(report_id, submission_id):
+            if report_id != "r0":
+                await asyncio.Event().wait()     # never finishes
+            return "completed"
+
+        scheduler = ReportScheduler(pipeline, concurrency=1, window_seconds=0, on_interrupted=on_interrupted)
+        scheduler.submit("b1", [("r0", "s0"), ("r1", "s1"), ("r2", "s2")])
+        while scheduler.progress("b1").completed < 1:
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.01)                # r1 running, r2 queued
+        await scheduler.shutdown()
+
+        assert interrupted == [["r1", "r2"]]
+
+    async def test_clean_shutdown_interrupts_nothing(self):
+        interrupted = []
+
+        async def on_interrupted(report_ids):
+            interrupted.append(report_ids)
+
+        scheduler = ReportScheduler(_StubPipeline(), concurrency=2, window_seconds=0, on_interrupted=on_interrupted)
+        scheduler.submit("b1", [("r0", "s0"), ("r1", "s1")])
+        await _wait_done(scheduler, "b1")
+        await scheduler.shutdown()
+        assert interrupted == []
@@ -0,0 +1,97 @@
+"""
+Tests for the in-process/Redis caches and the coach response cache.
+No Redis or Claude required — the Redis tier and the LLM are faked.
+Run: pytest tests/test_response_cache.py -v
+"""
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TieredCache, TTLCache
+from app.core.config import settings
+from app.core.metrics import counter
+from app.services.agents import sustainability_coach
+from app.services.agents.sustainability_coach import SustainabilityCoachAgent
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class TestTTLCache:
+    def test_expired_entries_are_gone(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        c = TTLCache(max_entries=10, ttl_seconds=5)
+        c.set("a", 1)
+        assert c.get("a") == 1
+        now[0] += 6
+        assert c.get("a") is None and len(c) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        c = TTLCache(max_entries=2, ttl_seconds=60)
+        c.set("a", 1)
+        c.set("b", 2)
+        c.get("a")
+        c.set("c", 3)
+        assert c.get("b") is None
+        assert (c.get("a"), c.get("c")) == (1, 3)
+
+
+class TestTieredCache:
+    async def test_redis_hit_fills_local_tier(self):
+        cache = TieredCache("t_tiered", ttl_seconds=60, max_entries=10)
+        cache._redis = _FakeRedis()
+        hits = counter("cache_hits_total", "", labels={"cache": "t_tiered", "tier": "redis"})
+        lookups = counter("cache_lookups_total", "", labels={"cache": "t_tiered"})
+
+        await cache.set("k", {"answer": 42})
+        cache.local.clear()                      # another worker: only Redis has it
+
+        assert await cache.get("k") == {"answer": 42}
+        assert await cache.get("k") == {"answer": 42}   # now from the local tier
+        assert await cache.get("missing") is None
+        assert hits.value == 1 and lookups.value == 3
+
+
+class _CountingLLM:
+    model = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, system, messages, max_tokens=None):
+        self.calls += 1
+        return f"Svar {self.calls}"
+
+
+@pytest.fixture
+def coach(monkeypatch):
+    monkeypatch.setattr(settings, "COACH_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "COACH_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(sustainability_coach, "_cache", None)
+    agent = SustainabilityCoachAgent.__new__(SustainabilityCoachAgent)
+    agent._llm = _CountingLLM()
+    return agent
+
+
+class TestCoachResponseCache:
+    async def test_repeated_question_is_answered_from_cache(self, coach):
+        first = await coach.run({"message": "Hvad er Scope 3?", "context": {"current_page": "/dashboard"}})
+        again = await coach.run({"message": "  hvad er scope 3 ", "context": {"current_page": "/dashboard"}})
+        assert first["response"] == again["response"] == "Svar 1"
+        assert coach._llm.calls == 1
+
+    async def test_context_and_history_change_the_answer(self, coach):
+        await coach.run({"message": "Hvad er Scope 3?", "context": {"company_name": "A ApS"}})
+        await coach.run({"message": "Hvad er Scope 3?", "context": {"company_name": "B ApS"}})
+        history = [{"role": "user", "content": "Hej"}, {"role": "assistant", "content": "Hej!"}]
+        await coach.run({"message": "Hvad er Scope 3?", "context": {"company_name": "A ApS"}, "history": history})
+        assert coach._llm.calls == 3
@@ -0,0 +1,89 @@
+"""
+Tests for single-flight coalescing of identical in-flight calls.
+
+Run: pytest tests/test_singleflight.py -v
+"""
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight, request_key
+
+
+class TestSingleFlight:
+    async def test_concurrent_identical_calls_run_once(self):
+        flight = SingleFlight("t")
+        runs = []
+        gate = asyncio.Event()
+
+        async def work(name):
+            runs.append(name)
+            await gate.wait()
+            return {"ok": name}
+
+        callers = [asyncio.create_task(flight.do("k", lambda: work("k"))) for _ in range(3)]
+        other = asyncio.create_task(flight.do("other", lambda: work("other")))
+        await asyncio.sleep(0)
+        gate.set()
+
+        results = await asyncio.gather(*callers, other)
+        assert runs == ["k", "other"]
+        assert results[:3] == [{"ok": "k"}] * 3
+        assert flight.in_flight() == 0
+
+        await flight.do("k", lambda: work("k"))      # finished calls are not cached
+        assert runs == ["k", "other", "k"]
+
+    async def test_error_is_shared(self):
+        flight = SingleFlight("t")
+
+        async def boom():
+            await asyncio.sleep(0)
+            raise RuntimeError("Claude unavailable")
+
+        results = await asyncio.gather(
+            flight.do("k", boom), flight.do("k", boom), return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_cancelled_waiter_does_not_cancel_the_others(self):
+        flight = SingleFlight("t")
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return 42
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await second == 42
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_work_is_cancelled_when_nobody_waits(self):
+        flight = SingleFlight("t")
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert flight.in_flight() == 0
+
+
+class TestRequestKey:
+    def test_dict_order_does_not_matter(self):
+        assert request_key({"a": 1, "b": [1, 2]}) == request_key({"b": [1, 2], "a": 1})
+        assert request_key(b"pdf", ".pdf") != request_key(b"pdf", ".png")
@@ -0,0 +1,81 @@
+"""
+Tests for SubmissionBundle — the single ORM → engine-input mapping.
+
+Run: pytest tests/test_submission_bundle.py -v
+"""
+import uuid
+from decimal import Decimal
+from types import MappingProxyType
+
+import pytest
+
+from app.services.esg_engine.calculator import CO2Calculator, Scope1Input, Scope2Input, Scope3Input
+from app.services.submission_bundle import CompanyInfo, SubmissionBundle
+
+
+def _bundle(**sections) -> SubmissionBundle:
+    return SubmissionBundle(
+        submission_id=uuid.uuid4(),
+        company_id=uuid.uuid4(),
+        reporting_year=2024,
+        status="submitted",
+        company=CompanyInfo(
+            id=uuid.uuid4(), name="Test ApS", industry_code="manufacturing",
+            country_code="DK", employee_count=25, revenue_eur=2_000_000.0,
+        ),
+        **{k: MappingProxyType(v) for k, v in sections.items()},
+    )
+
+
+class TestSubmissionBundle:
+    def test_empty_sections_default_to_zero(self):
+        b = _bundle()
+        assert b.co2.total_tonnes >= 0
+        assert b.scope3_input.rail_km == 0
+        assert b.section_dict("policy") is None
+
+    def test_all_travel_fields_are_mapped(self):
+        b = _bundle(travel={
+            "air_short_haul_km": Decimal("1000"), "air_long_haul_km": Decimal("5000"),
+            "air_business_class_pct": Decimal("20"), "rail_km": Decimal("800"),
+            "rental_car_km": Decimal("300"), "taxi_km": Decimal("150"),
+            "avg_commute_km_one_way": None, "commute_days_per_year": None,
+        })
+        s3 = b.scope3_input
+        assert (s3.rail_km, s3.rental_car_km, s3.taxi_km, s3.air_business_class_pct) == (800, 300, 150, 20)
+        assert s3.commute_days_per_year == 220
+
+    def test_matches_direct_calculation(self):
+        b = _bundle(
+            energy={"electricity_kwh": Decimal("50000"), "diesel_liters": Decimal("1200")},
+            travel={"taxi_km": Decimal("400")},
+            procurement={"purchased_goods_spend_eur": Decimal("100000")},
+        )
+        direct = CO2Calculator().calculate(
+            scope1=Scope1Input(diesel_liters=1200),
+            scope2=Scope2Input(electricity_kwh=50000, country_code="DK"),
+            scope3=Scope3Input(
+                taxi_km=400, employee_count=25, purchased_goods_spend_eur=100000,
+                industry_code="manufacturing",
+            ),
+        )
+        assert b.co2.total_kg == pytest.approx(direct.total_kg)
+
+    def test_engine_results_are_cached(self):
+        b = _bundle(energy={"electricity_kwh": Decimal("1000")})
+        assert b.co2 is b.co2
+        assert b.score is b.score
+        assert b.scorer_input.total_co2e_tonnes == b.co2.total_tonnes
+
+    def test_policy_zero_values_are_unreported(self):
+        b = _bundle(policy={"waste_recycled_pct": Decimal("0"), "has_esg_policy": True})
+        assert b.scorer_input.waste_recycled_pct is None
+        assert b.scorer_input.has_esg_policy is True
+
+    def test_sections_are_read_only(self):
+        b = _bundle(policy={"has_esg_policy": True})
+        with pytest.raises(TypeError):
+            b.policy["has_esg_policy"] = False
+        copy = b.section_dict("policy")
+        copy["has_esg_policy"] = False
+        assert b.policy["has_esg_policy"] is True
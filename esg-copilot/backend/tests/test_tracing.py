@@ -0,0 +1,108 @@
+"""
+Tests for pipeline tracing spans and the Prometheus metrics surface.
+
+Run: pytest tests/test_tracing.py -v
+"""
+import pytest
+
+from app.core.metrics import counter, histogram, render_prometheus
+from app.core.tracing import record, span, start_trace
+
+
+class TestTracing:
+    def test_spans_are_recorded_in_start_order(self):
+        with start_trace("test_trace_order") as trace:
+            with span("load"):
+                pass
+            with span("score"):
+                pass
+        names = [s["name"] for s in trace.summary()["spans"]]
+        assert names == ["load", "score"]
+        assert trace.summary()["total_ms"] >= 0
+
+    async def test_counters_roll_up_to_parent_and_totals(self):
+        with start_trace("test_trace_rollup") as trace:
+            with span("narratives"):
+                with span("narrative.exec") as s:
+                    record(input_tokens=100, output_tokens=40, retries=1)
+                    s.set(fallback=False)
+                with span("narrative.co2"):
+                    record(input_tokens=50, output_tokens=10)
+            with span("pdf.upload") as s:
+                s.add(bytes=2048)
+
+        summary = trace.summary()
+        by_name = {s["name"]: s for s in summary["spans"]}
+        assert by_name["narratives"]["input_tokens"] == 150
+        assert by_name["narrative.exec"]["parent"] == "narratives"
+        assert by_name["narrative.exec"]["fallback"] is False
+        assert summary["totals"] == {"input_tokens": 150, "output_tokens": 50, "retries": 1, "bytes": 2048}
+
+    def test_failed_span_is_marked_error(self):
+        with start_trace("test_trace_error") as trace:
+            with pytest.raises(ValueError):
+                with span("calculate"):
+                    raise ValueError("boom")
+        assert trace.summary()["spans"][0]["status"] == "error"
+
+    def test_record_outside_trace_is_noop(self):
+        record(input_tokens=10)   # must not raise
+        with span("detached") as s:
+            record(input_tokens=10)
+        assert s.counts == {"input_tokens": 10}
+
+    def test_stage_histogram_observed(self):
+        with start_trace("test_trace_metrics"):
+            with span("load"):
+                pass
+        h = histogram("test_trace_metrics_stage_seconds", "", labels={"stage": "load"})
+        assert h.snapshot()["count"] == 1
+
+
+class TestPrometheusRendering:
+    def test_histogram_and_counter_format(self):
+        h = histogram("test_render_seconds", "Render test", buckets=(0.1, 1.0), labels={"stage": "pdf"})
+        h.observe(0.5)
+        counter("test_render_total", "Counter test", labels={"direction": "input"}).inc(7)
+
+        text = render_prometheus()
+        assert "# TYPE test_render_seconds histogram" in text
+        assert 'test_render_seconds_bucket{stage="pdf",le="0.1"} 0' in text
+        assert 'test_render_seconds_bucket{stage="pdf",le="1"} 1' in text
+        assert 'test_render_seconds_bucket{stage="pdf",le="+Inf"} 1' in text
+        assert 'test_render_seconds_count{stage="pdf"} 1' in text
+        assert "# TYPE test_render_total counter" in text
+        assert 'test_render_total{direction="input"} 7' in text
+
+    def test_help_emitted_once_per_metric_family(self):
+        counter("test_family_total", "Family", labels={"k": "a"}).inc()
+        counter("test_family_total", "Family", labels={"k": "b"}).inc()
+        assert render_prometheus().count("# HELP test_family_total") == 1
+
+    def test_label_values_are_escaped(self):
+        counter("test_escape_total", "Escape", labels={"path": 'a"b\\c'}).inc()
+        assert 'test_escape_total{path="a\\"b\\\\c"} 1' in render_prometheus()
+
+
+class TestMetricsEndpointAuth:
+    @staticmethod
+    def _request(authorization=None):
+        from starlette.requests import Request
+        headers = [(b"authorization", authorization.encode())] if authorization else []
+        return Request({"type": "http", "method": "GET", "path": "/metrics", "headers": headers})
+
+    def test_token_is_required_when_configured(self, monkeypatch):
+        from fastapi import HTTPException
+        from app import main
+        monkeypatch.setattr(main.settings, "METRICS_TOKEN", "s3cret")
+
+        main._assert_metrics_token(self._request("Bearer s3cret"))
+        for header in (None, "Bearer wrong", "s3cretx"):
+            with pytest.raises(HTTPException) as exc:
+                main._assert_metrics_token(self._request(header))
+            assert exc.value.status_code == 401
+
+    def test_open_without_token_outside_production(self, monkeypatch):
+        from app import main
+        monkeypatch.setattr(main.settings, "METRICS_TOKEN", "")
+        main._assert_metrics_token(self._request())
@@ -0,0 +1,105 @@
+"""
+Build the bundled climate-risk grid — ESG Copilot
+=================================================
+Writes app/data/climate_risk/dk_climate_grid.bin (format: see
+app/services/climate_grid.py) from an indicative hotspot model of Denmark:
+each hazard is a base level plus Gaussian bumps around known exposed areas
+(west-coast and Wadden Sea storm surge, Limfjord, Lolland-Falster, river
+valleys, urban cloudburst and heat islands).
+
+This is a placeholder for survey data, not a measurement. To ship real
+values, replace _HOTSPOTS/_value() with a resampling of e.g. DMI Klimaatlas
+rasters onto the same grid and rerun. Run from the backend/ directory:
+
+    python tools/build_climate_grid.py [--step 0.05]
+"""
+
+import argparse
+import math
+import sys
+from pathlib import Path
+
+# Allow running from backend/ directory
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.climate_grid import _HEADER, _MAGIC, GRID_PATH, HAZARDS
+
+_VERSION = 1
+_SOUTH, _NORTH = 54.50, 57.80
+_WEST, _EAST = 8.00, 15.25
+
+# hazard → (base, [(lat, lon, radius_km, intensity), ...])
+_HOTSPOTS: dict[str, tuple[float, list[tuple[float, float, float, float]]]] = {
+    "flood": (10, [
+        (55.95, 8.70, 20, 70),    # Skjern Å
+        (56.46, 10.03, 12, 65),   # Gudenå, Randers
+        (56.17, 9.55, 12, 45),    # Gudenå, Silkeborg
+        (55.71, 9.53, 8, 60),     # Vejle
+        (55.49, 9.47, 8, 50),     # Kolding
+        (54.80, 11.30, 25, 55),   # Lolland
+        (54.93, 8.87, 15, 60),    # Tønder marsh
+        (55.33, 8.76, 12, 60),    # Ribe marsh
+        (55.40, 10.39, 10, 45),   # Odense Å
+    ]),
+    "cloudburst": (25, [
+        (55.69, 12.55, 15, 70),   # Copenhagen
+        (56.16, 10.20, 10, 55),   # Aarhus
+        (55.40, 10.39, 8, 45),    # Odense
+        (57.05, 9.92, 8, 45),     # Aalborg
+        (55.48, 8.46, 6, 35),     # Esbjerg
+    ]),
+    "storm_surge": (5, [
+        (56.00, 8.15, 25, 70),    # West coast, Ringkøbing Fjord
+        (56.50, 8.15, 25, 65),    # West coast, Harboøre
+        (55.50, 8.35, 25, 70),    # Esbjerg, Ho Bugt
+        (55.05, 8.70, 25, 85),    # Wadden Sea, Tønder marsh
+        (56.90, 8.30, 25, 55),    # Thy
+        (56.95, 9.00, 20, 50),    # Limfjord west
+        (57.05, 9.90, 15, 55),    # Limfjord, Aalborg
+        (54.75, 11.50, 25, 70),   # Lolland-Falster
+        (55.60, 12.30, 20, 50),   # Køge Bugt
+        (55.68, 12.60, 10, 45),   # Copenhagen harbour
+        (55.70, 9.55, 10, 50),    # Vejle Fjord
+    ]),
+    "heat": (15, [
+        (55.68, 12.57, 20, 45),   # Copenhagen heat island
+        (56.16, 10.20, 10, 30),   # Aarhus
+        (55.40, 10.39, 8, 25),    # Odense
+        (57.05, 9.92, 8, 20),     # Aalborg
+    ]),
+}
+
+
+def _value(hazard: str, lat: float, lon: float) -> int:
+    base, spots = _HOTSPOTS[hazard]
+    value = base
+    km_per_lon = 111.32 * math.cos(math.radians(lat))
+    for s_lat, s_lon, radius, intensity in spots:
+        d = math.hypot((lat - s_lat) * 110.57, (lon - s_lon) * km_per_lon)
+        value += intensity * math.exp(-((d / radius) ** 2))
+    if hazard == "heat":
+        # Warmer summers to the south-east
+        value += (lon - _WEST) * 3 + (_NORTH - lat) * 5
+    return max(0, min(100, round(value)))
+
+
+def build(step: float) -> bytes:
+    rows = round((_NORTH - _SOUTH) / step)
+    cols = round((_EAST - _WEST) / step)
+    cells = bytearray()
+    for row in range(rows):
+        lat = _SOUTH + (row + 0.5) * step
+        for col in range(cols):
+            lon = _WEST + (col + 0.5) * step
+            cells.extend(_value(hazard, lat, lon) for hazard in HAZARDS)
+    return _HEADER.pack(_MAGIC, _VERSION, len(HAZARDS), rows, cols, _SOUTH, _WEST, step) + bytes(cells)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--step", type=float, default=0.05, help="cell size in degrees")
+    parser.add_argument("--out", type=Path, default=GRID_PATH)
+    args = parser.parse_args()
+    data = build(args.step)
+    args.out.write_bytes(data)
+    print(f"Wrote {args.out} ({len(data)} bytes)")
@@ -0,0 +1,105 @@
+"""
+LLM load test — ESG Copilot
+===========================
+Runs coach chat, orchestrator and materiality calls concurrently against the
+record/replay transport (app/services/ai/replay_transport.py) and prints
+latency percentiles. Needs no API key. Run from the backend/ directory:
+
+    python tools/llm_load_test.py --requests 200 --concurrency 20 \\
+        --latency lognormal:2.5,0.5 --rate-429 0.05 --rate-529 0.02
+
+Fixtures are read from ANTHROPIC_FIXTURES_DIR (default fixtures/llm); record
+them first with ANTHROPIC_TRANSPORT=record against the real API. Requests
+without a fixture get a synthetic answer.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Allow running from backend/ directory
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+
+
+async def _chat(i: int) -> None:
+    from app.services.agents.registry import get_agent
+    from app.services.agents.sustainability_coach import SustainabilityCoachAgent
+
+    await get_agent(SustainabilityCoachAgent).run({"message": f"Hvad er Scope 3? ({i})", "context": {}})
+
+
+async def _orchestrator(i: int) -> None:
+    from app.services.agents.orchestrator import AgentOrchestrator
+
+    await AgentOrchestrator().run({"message": f"Giv mig et overblik over vores ESG-status ({i})", "context": {}})
+
+
+async def _materiality(i: int) -> None:
+    from app.services.ai.materiality_agent import run_materiality_assessment
+
+    await run_materiality_assessment("technology", 20 + i, 2_000_000, "DK")
+
+
+SCENARIOS = {"chat": _chat, "orchestrator": _orchestrator, "materiality": _materiality}
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.services.ai.anthropic_client import close_anthropic_client, get_anthropic_client
+
+    settings.ANTHROPIC_TRANSPORT = "replay"
+    settings.ANTHROPIC_REPLAY_LATENCY = args.latency
+    settings.ANTHROPIC_REPLAY_429_RATE = args.rate_429
+    settings.ANTHROPIC_REPLAY_529_RATE = args.rate_529
+    settings.ANTHROPIC_REPLAY_SEED = args.seed
+    settings.COACH_CACHE_ENABLED = False          # measure the LLM path, not the cache
+
+    scenarios = [SCENARIOS[name] for name in args.scenarios.split(",")]
+    gate = asyncio.Semaphore(args.concurrency)
+    timings: dict[str, list[float]] = {fn.__name__.lstrip("_"): [] for fn in scenarios}
+    failures: dict[str, int] = {name: 0 for name in timings}
+
+    async def one(i: int) -> None:
+        fn = scenarios[i % len(scenarios)]
+        name = fn.__name__.lstrip("_")
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await fn(i)
+            except Exception:
+                failures[name] += 1
+                return
+            timings[name].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - started
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {wall:.1f}s wall")
+    for name, values in timings.items():
+        if len(values) >= 2:
+            q = statistics.quantiles(values, n=100)
+            print(f"  {name:13s} ok={len(values):4d} failed={failures[name]:3d} "
+                  f"p50={q[49]:.2f}s p95={q[94]:.2f}s max={max(values):.2f}s")
+        else:
+            print(f"  {name:13s} ok={len(values):4d} failed={failures[name]:3d}")
+    transport = get_anthropic_client()._client._transport
+    print(f"  transport: {transport.stats}")
+    await close_anthropic_client()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", default="chat,orchestrator,materiality")
+    parser.add_argument("--latency", default="lognormal:2.0,0.5")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-529", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(main(parser.parse_args())))
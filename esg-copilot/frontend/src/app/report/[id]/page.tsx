@@ -2,7 +2,7 @@
 import { useEffect, useState } from "react"
 import { useParams, useRouter } from "next/navigation"
 import dynamic from "next/dynamic"
-import { getReportStatus, getReport, getMe, getCompany } from "@/lib/api"
+import { getReportStatus, getReport, getMe, getCompany, subscribeReportEvents } from "@/lib/api"
 import { PieChart, Pie, Cell, Tooltip, ResponsiveContainer } from "recharts"
 import Sidebar from "@/components/Sidebar"
 import { TrendingUp, Wind, ArrowLeft, Loader2, Target, Map, ChevronDown, ChevronUp } from "lucide-react"
@@ -259,11 +259,38 @@ export default function ReportPage() {
   const [report, setReport] = useState<ReportData | null>(null)
   const [companyName, setCompanyName] = useState("Min Virksomhed")
 
-  useEffect(() => { if (id) pollStatus() }, [id])
+  useEffect(() => {
+    if (!id) return
+    getMe().then(me => getCompany(me.company_id)).then(c => setCompanyName(c.name)).catch(() => {})
+
+    // Live progress via SSE; fall back to polling if the stream cannot be opened
+    if (typeof EventSource === "undefined") { pollStatus(); return }
+    let done = false
+    const source = subscribeReportEvents(
+      id,
+      async (event, data) => {
+        if (event === "status" || event === "completed" || event === "failed") {
+          const s = data.status as string
+          setStatus(s)
+          if (s === "completed" || s === "failed") {
+            done = true
+            source.close()
+            if (s === "completed") {
+              try { setReport(await getReport(id) as ReportData) } catch { router.push("/dashboard") }
+            }
+          }
+        }
+      },
+      () => {
+        source.close()
+        if (!done) pollStatus()
+      },
+    )
+    return () => source.close()
+  }, [id])
 
   async function pollStatus() {
     try {
-      getMe().then(me => getCompany(me.company_id)).then(c => setCompanyName(c.name)).catch(() => {})
       const s = await getReportStatus(id)
       setStatus(s.status)
       if (s.status === "completed") {
@@ -2,7 +2,7 @@
 
 import { useState, useRef, useEffect } from "react"
 import { MessageCircle, X, Send, Loader2, Minimize2, Bot, User } from "lucide-react"
-import { agentChat, type ChatMessage } from "@/lib/api"
+import { agentChat, streamAgentChat, type ChatMessage } from "@/lib/api"
 
 interface Props {
   context?: Record<string, unknown>
@@ -160,12 +160,31 @@ export default function ChatWidget({ context = {} }: Props) {
     setMessages(prev => [...prev, userMsg])
     setLoading(true)
 
+    const history = messages.slice(1).map(m => ({ role: m.role, content: m.content }))
+    let streamed = ""
     try {
-      const history = messages.slice(1).map(m => ({ role: m.role, content: m.content }))
-      const res = await agentChat(msg, history, context)
-      setMessages(prev => [...prev, { role: "assistant", content: res.response }])
+      // Render the answer as it is written; the first delta replaces the typing dots
+      await streamAgentChat(msg, history, context, delta => {
+        const first = !streamed
+        streamed += delta
+        const content = streamed
+        setMessages(prev => first
+          ? [...prev, { role: "assistant", content }]
+          : [...prev.slice(0, -1), { role: "assistant", content }])
+        setLoading(false)
+      })
     } catch {
-      setError("Beklager — kunne ikke nå serveren. Prøv igen.")
+      if (streamed) {
+        setError("Svaret blev afbrudt. Prøv igen.")
+      } else {
+        // Streaming unavailable (proxy, old backend) — fall back to the plain endpoint
+        try {
+          const res = await agentChat(msg, history, context)
+          setMessages(prev => [...prev, { role: "assistant", content: res.response }])
+        } catch {
+          setError("Beklager — kunne ikke nå serveren. Prøv igen.")
+        }
+      }
     } finally {
       setLoading(false)
     }
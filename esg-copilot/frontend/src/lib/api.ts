@@ -155,6 +155,37 @@ export async function getReportStatus(reportId: string) {
   return data
 }
 
+/**
+ * Live generation progress via Server-Sent Events.
+ * EventSource cannot send an Authorization header, so the stream is opened with a
+ * short-lived, report-scoped token from POST /reports/{id}/events/token.
+ * Returns a handle whose close() also cancels a stream that is still opening.
+ */
+export function subscribeReportEvents(
+  reportId: string,
+  onEvent: (event: string, data: any) => void,
+  onError: () => void,
+) {
+  let source: EventSource | null = null
+  let closed = false
+  api.post(`/reports/${reportId}/events/token`)
+    .then(({ data }) => {
+      if (closed) return
+      source = new EventSource(`${API_URL}/api/v1/reports/${reportId}/events?token=${encodeURIComponent(data.token)}`)
+      for (const name of ["status", "stage", "section", "pdf_ready", "completed", "failed"]) {
+        source.addEventListener(name, (e) => onEvent(name, JSON.parse((e as MessageEvent).data)))
+      }
+      source.onerror = () => onError()
+    })
+    .catch(() => { if (!closed) onError() })
+  return {
+    close() {
+      closed = true
+      source?.close()
+    },
+  }
+}
+
 export async function getReport(reportId: string) {
   const { data } = await api.get(`/reports/${reportId}`)
   return data
@@ -300,6 +331,87 @@ export async function agentAnalyze(
   return data as { answer: string; trace: unknown[]; ok: boolean }
 }
 
+/**
+ * POST + Server-Sent Events reader for the /agent/…/stream endpoints.
+ * EventSource only supports GET, so the response body is parsed with fetch.
+ * Resolves when the stream ends; rejects on HTTP or `error` events.
+ */
+async function postEventStream(
+  path: string,
+  body: Record<string, unknown>,
+  onEvent: (event: string, data: any) => void,
+  signal?: AbortSignal,
+) {
+  const token = typeof window !== "undefined" ? localStorage.getItem("token") : null
+  const res = await fetch(`${API_URL}/api/v1${path}`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Accept: "text/event-stream",
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify(body),
+    signal,
+  })
+  if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`)
+
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ""
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    let sep: number
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const frame = buffer.slice(0, sep)
+      buffer = buffer.slice(sep + 2)
+      let event = "message"
+      let data = ""
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7)
+        else if (line.startsWith("data: ")) data += line.slice(6)
+      }
+      if (!data) continue   // keep-alive comment
+      const parsed = JSON.parse(data)
+      if (event === "error") throw new Error(parsed.detail || "Stream fejl")
+      onEvent(event, parsed)
+    }
+  }
+}
+
+/** Streaming agentChat — onDelta receives text as it is generated. Resolves with the full answer. */
+export async function streamAgentChat(
+  message: string,
+  history: ChatMessage[] = [],
+  context: Record<string, unknown> = {},
+  onDelta: (text: string) => void,
+  signal?: AbortSignal,
+) {
+  let response = ""
+  await postEventStream("/agent/chat/stream", { message, history, context }, (event, data) => {
+    if (event === "delta") onDelta(data.text)
+    else if (event === "done") response = data.response
+  }, signal)
+  return response
+}
+
+/** Streaming agentAnalyze — events: delta, tool_call, tool_result, done (see backend docs). */
+export async function streamAgentAnalyze(
+  userMessage: string,
+  context: Record<string, unknown> = {},
+  history: Array<Record<string, unknown>> = [],
+  onEvent: (event: string, data: any) => void,
+  signal?: AbortSignal,
+) {
+  let result = { answer: "", trace: [] as unknown[], ok: false }
+  await postEventStream("/agent/analyze/stream", { user_message: userMessage, context, history }, (event, data) => {
+    if (event === "done") result = data
+    onEvent(event, data)
+  }, signal)
+  return result
+}
+
 export async function agentCompliance(submissionData: Record<string, unknown>, industryCode = "technology") {
   const { data } = await api.post("/agent/compliance", {
     submission_data: submissionData,